@@ -48,7 +48,7 @@ from taurus.core.util import SafeEvaluator
 from sardana.macroserver.msexception import UnknownEnv
 from sardana.macroserver.macro import Hookable, Macro, Type, ParamRepeat, \
     Table, List
-from sardana.macroserver.scan.gscan import SScan, CTScan, HScan, \
+from sardana.macroserver.scan.gscan import GScan, SScan, CTScan, HScan, \
     MoveableDesc, CSScan, TScan
 from sardana.util.motion import MotionPath
 from sardana.util.tree import BranchNode
@@ -78,6 +78,30 @@ def getCallable(repr):
         return lambda: None
 
 
+def _calculate_positions_array(moveable_node, positions):
+    '''Function to calculate many positions on the physical motors level at
+    once. Pseudo motors convert all the positions in a single request.
+    :param moveable_node: (BaseNode) node representing a moveable.
+                          Can be a BranchNode representing a PseudoMotor,
+                          or a LeafNode representing a PhysicalMotor).
+    :param positions: (sequence<float>) positions of the moveable
+
+    :return: (numpy.ndarray) 2D array with one row per position and one
+             column per physical motor. Column order is important and
+             preserved.'''
+    positions = numpy.asarray(positions, dtype='d')
+    if isinstance(moveable_node, BranchNode):
+        moveable = moveable_node.data
+        physical_positions = numpy.reshape(
+            moveable.calcPhysicalArray(positions), (len(positions), -1))
+        columns = []
+        for i, moveable_node in enumerate(moveable_node.children):
+            columns.append(_calculate_positions_array(
+                moveable_node, physical_positions[:, i]))
+        return numpy.hstack(columns)
+    return positions[:, numpy.newaxis]
+
+
 # TODO: remove starts
 def _calculate_positions(moveable_node, start, end):
     '''Function to calculate starting and ending positions on the physical
@@ -90,26 +114,33 @@ def _calculate_positions(moveable_node, start, end):
 
     :return: (list<(float,float)>) a list of tuples comprising starting
              and ending positions. List order is important and preserved.'''
-    start_positions = []
-    end_positions = []
-    if isinstance(moveable_node, BranchNode):
-        pseudo_node = moveable_node
-        moveable = pseudo_node.data
-        moveable_nodes = moveable_node.children
-        starts = moveable.calcPhysical(start)
-        ends = moveable.calcPhysical(end)
-        for moveable_node, start, end in zip(moveable_nodes, starts,
-                                             ends):
-            _start_positions, _end_positions = _calculate_positions(
-                moveable_node,
-                start, end)
-            start_positions += _start_positions
-            end_positions += _end_positions
-    else:
-        start_positions = [start]
-        end_positions = [end]
+    positions = _calculate_positions_array(moveable_node, [start, end])
+    return positions[0].tolist(), positions[1].tolist()
 
-    return start_positions, end_positions
+
+def _calculate_waypoints_positions(moveables_trees, starts, finals):
+    '''Function to calculate starting and ending positions on the physical
+    motors level of all the waypoints at once.
+    :param moveables_trees: (list<Tree>) trees of the scanned moveables
+    :param starts: (sequence<sequence<float>>) starting positions of the
+                   moveables (one row per waypoint)
+    :param finals: (sequence<sequence<float>>) ending positions of the
+                   moveables (one row per waypoint)
+
+    :return: (list<list<float>>, list<list<float>>) starting and ending
+             positions of the physical motors (one list per waypoint)'''
+    starts = numpy.asarray(starts, dtype='d')
+    finals = numpy.asarray(finals, dtype='d')
+    nb_waypoints = len(finals)
+    start_positions, end_positions = [], []
+    for i, moveable_tree in enumerate(moveables_trees):
+        positions = numpy.concatenate((starts[:, i], finals[:, i]))
+        physical_positions = _calculate_positions_array(moveable_tree.root(),
+                                                        positions)
+        start_positions.append(physical_positions[:nb_waypoints])
+        end_positions.append(physical_positions[nb_waypoints:])
+    return (numpy.hstack(start_positions).tolist(),
+            numpy.hstack(end_positions).tolist())
 
 
 class aNscan(Hookable):
@@ -257,19 +288,14 @@ class aNscan(Hookable):
         step["check_func"] = []
         step["active_time"] = self.nb_points * (self.integ_time
                                                 + self.latency_time)
-        step["positions"] = []
-        step["start_positions"] = []
-        starts = self.starts
-        for point_no, waypoint in enumerate(self.waypoints):
-            for start, end, moveable_tree in zip(starts, waypoint,
-                                                 moveables_trees):
-                moveable_root = moveable_tree.root()
-                start_positions, end_positions = _calculate_positions(
-                    moveable_root, start, end)
-                step["start_positions"] += start_positions
-                step["positions"] += end_positions
-                step["waypoint_id"] = point_no
-                starts = waypoint
+        waypoints = self.waypoints
+        starts = [self.starts] + list(waypoints[:-1])
+        start_positions, end_positions = _calculate_waypoints_positions(
+            moveables_trees, starts, waypoints)
+        for point_no in range(len(waypoints)):
+            step["start_positions"] = start_positions[point_no]
+            step["positions"] = end_positions[point_no]
+            step["waypoint_id"] = point_no
             yield step
 
     def _period_generator(self):
@@ -766,6 +792,19 @@ class mesh(Macro, Hookable):
                 point_no += 1
                 yield step
 
+    def getScanPositions(self):
+        m1start, m2start = self.starts
+        m1end, m2end = self.finals
+        points1, points2 = self.nr_intervs + 1
+        m1_space = numpy.linspace(m1start, m1end, points1)
+        m1_pos = numpy.tile(m1_space, (points2, 1))
+        if self.bidirectional_mode:
+            m1_pos[1::2] = m1_space[::-1]
+        m2_pos = numpy.repeat(numpy.linspace(m2start, m2end, points2),
+                              points1)
+        positions = numpy.column_stack((m1_pos.ravel(), m2_pos))
+        return positions, self.integ_time
+
     def run(self, *args):
         for step in self._gScan.step_scan():
             yield step
@@ -959,6 +998,9 @@ motor2 sqrt(y*x+3)
             step["point_id"] = i
             yield step
 
+    def getScanPositions(self):
+        return self.paths.T, self._integ_time
+
     def run(self, *args):
         for step in self._gScan.step_scan():
             yield step
@@ -1006,11 +1048,21 @@ class scanhist(Macro):
     ]
 
     def run(self, scan_number):
-        try:
-            hist = self.getEnv("ScanHistory")
-        except UnknownEnv:
-            print("No scan recorded in history")
-            return
+        hist = None
+        scan_catalog = self.getMacroServer().scan_catalog
+        if scan_catalog is not None:
+            if scan_number < 0:
+                hist = scan_catalog.find(limit=GScan.MAX_SCAN_HISTORY)
+                hist.reverse()
+            else:
+                hist = scan_catalog.find(serialno=scan_number, limit=1)
+        # scans not (yet) in the catalog may still be in the environment
+        if not hist:
+            try:
+                hist = self.getEnv("ScanHistory")
+            except UnknownEnv:
+                print("No scan recorded in history")
+                return
         if scan_number < 0:
             self.show_all(hist)
         else:
@@ -1788,21 +1840,15 @@ class meshct(Macro, Hookable):
                                                 + self.latency_time)
 
         points1, _ = self.nr_intervs + 1
+        start_positions, end_positions = _calculate_waypoints_positions(
+            moveables_trees, self.starts_points, self.waypoints)
         for i, waypoint in enumerate(self.waypoints):
             self.point_id = points1 * i
             step["waypoint_id"] = i
             self.starts = self.starts_points[i]
             self.finals = waypoint
-            step["positions"] = []
-            step["start_positions"] = []
-
-            for start, end, moveable_tree in zip(self.starts, self.finals,
-                                                 moveables_trees):
-                moveable_root = moveable_tree.root()
-                start_positions, end_positions = _calculate_positions(
-                    moveable_root, start, end)
-                step["start_positions"] += start_positions
-                step["positions"] += end_positions
+            step["start_positions"] = start_positions[i]
+            step["positions"] = end_positions[i]
 
             yield step
 
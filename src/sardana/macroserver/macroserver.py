@@ -53,7 +53,8 @@ from sardana.macroserver.msrecordermanager import RecorderManager
 from sardana.macroserver.mstypemanager import TypeManager
 from sardana.macroserver.msenvmanager import EnvironmentManager
 from sardana.macroserver.msparameter import ParamType
-from sardana.macroserver.msexception import UnknownMacroLibrary
+from sardana.macroserver.msexception import UnknownMacroLibrary, UnknownEnv
+from sardana.macroserver.scan.scancatalog import ScanCatalog
 
 CHANGE_EVT_TYPES = TaurusEventType.Change, TaurusEventType.Periodic
 
@@ -146,6 +147,8 @@ class MacroServer(MSContainer, MSObject, SardanaElementManager, SardanaIDManager
         self._pools = CaselessDict()
         self._max_parallel_macros = self.MaxParalellMacros
         self._path_id = None
+        self._scan_catalog = None
+        self._macro_index_file = None
 
         MSContainer.__init__(self)
         MSObject.__init__(self, full_name=full_name, name=name, id=InvalidId,
@@ -156,6 +159,9 @@ class MacroServer(MSContainer, MSObject, SardanaElementManager, SardanaIDManager
         self._type_manager = TypeManager(self)
         self._environment_manager = EnvironmentManager(self,
                                                        environment_db=environment_db)
+        if environment_db is not None:
+            self._init_scan_catalog(environment_db)
+            self._init_macro_index_file(environment_db)
         self._macro_manager = MacroManager(self, macro_path=macro_path)
         self._recorder_manager = RecorderManager(self,
                                                  recorder_path=recorder_path)
@@ -183,6 +189,66 @@ class MacroServer(MSContainer, MSObject, SardanaElementManager, SardanaIDManager
         :type env_db: :obj:`str`
         """
         self.environment_manager.setEnvironmentDb(environment_db)
+        self._init_scan_catalog(environment_db)
+        self._init_macro_index_file(environment_db)
+
+    def _init_scan_catalog(self, environment_db):
+        if self._scan_catalog is not None:
+            self._scan_catalog.close()
+        file_name = os.path.abspath(environment_db) + ".scans"
+        try:
+            self._scan_catalog = ScanCatalog(file_name)
+        except Exception:
+            self._scan_catalog = None
+            self.error("Failed to open scan catalog %s", file_name)
+            self.debug("Details:", exc_info=1)
+            return
+        if len(self._scan_catalog) == 0:
+            self._import_scan_history()
+
+    def _import_scan_history(self):
+        """Seeds the (empty) scan catalog with the scans of the ScanHistory
+        environment variable"""
+        try:
+            scan_history = self.environment_manager.getEnv("ScanHistory")
+        except UnknownEnv:
+            return
+        try:
+            for scan in scan_history:
+                self._scan_catalog.append(scan)
+        except Exception:
+            self.warning("Failed to import ScanHistory to the scan catalog")
+            self.debug("Details:", exc_info=1)
+
+    def _init_macro_index_file(self, environment_db):
+        self._macro_index_file = os.path.abspath(environment_db) + ".macros"
+
+    @property
+    def macro_index_file(self):
+        """The file of the macro library index (stored next to the
+        environment database) or None if not available (the index is kept in
+        memory)
+
+        :type: :obj:`str`"""
+        return self._macro_index_file
+
+    @property
+    def scan_catalog(self):
+        """The catalog of the executed scans (stored next to the environment
+        database) or None if not available
+
+        :type: :class:`~sardana.macroserver.scan.scancatalog.ScanCatalog`"""
+        return self._scan_catalog
+
+    def find_scans(self, **query):
+        """Returns the executed scans matching the given query, the latest
+        first (see :meth:`~sardana.macroserver.scan.scancatalog.ScanCatalog.find`)
+
+        :return: the scans information
+        :rtype: list<dict>"""
+        if self._scan_catalog is None:
+            raise Exception("Scan catalog is not available")
+        return self._scan_catalog.find(**query)
 
     # --------------------------------------------------------------------------
     # Python related methods
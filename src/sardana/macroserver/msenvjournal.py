@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""This module contains the class definition for the MacroServer environment
+journal: a crash-safe alternative to the shelve environment database"""
+
+__all__ = ["EnvironmentJournal"]
+
+__docformat__ = 'restructuredtext'
+
+import os
+import zlib
+import struct
+import pickle
+import collections.abc
+
+
+class EnvironmentJournal(collections.abc.MutableMapping):
+    """A persistent dictionary stored as an append-only log of records
+    (set or delete of a key). Each record is pickled and protected with
+    its length and CRC so a record torn by a crash is detected and discarded
+    when the journal is opened. The log is compacted (rewritten as a snapshot
+    of the current items and atomically replaced) on :meth:`sync` when it
+    contains much more records than items.
+
+    It implements the subset of the :class:`shelve.Shelf` interface used by
+    the environment manager (mapping, :meth:`sync` and :meth:`close`)."""
+
+    MAGIC = b"SARDANA-ENV-JOURNAL-1\n"
+
+    #: record header: payload length and payload CRC32
+    HEADER = struct.Struct("<II")
+
+    #: compact when the log has more than COMPACT_FACTOR records per item...
+    COMPACT_FACTOR = 4
+
+    #: ...and at least COMPACT_MIN_RECORDS records
+    COMPACT_MIN_RECORDS = 1000
+
+    def __init__(self, filename):
+        self._filename = filename
+        self._data = {}
+        self._records = 0
+        self._file = None
+        if os.path.exists(filename):
+            self._load()
+            self._file = open(filename, "ab")
+        else:
+            self._writeSnapshot()
+
+    @property
+    def filename(self):
+        return self._filename
+
+    @property
+    def records(self):
+        """Number of records in the log"""
+        return self._records
+
+    def _load(self):
+        data = self._data
+        with open(self._filename, "rb") as f:
+            if f.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError("%s is not an environment journal"
+                                 % self._filename)
+            valid = f.tell()
+            while True:
+                header = f.read(self.HEADER.size)
+                if len(header) < self.HEADER.size:
+                    break
+                length, crc = self.HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                record = pickle.loads(payload)
+                if record[0] == "set":
+                    data[record[1]] = record[2]
+                else:
+                    data.pop(record[1], None)
+                self._records += 1
+                valid = f.tell()
+            size = f.seek(0, os.SEEK_END)
+        # discard the record torn by a crash (if any)
+        if valid < size:
+            with open(self._filename, "r+b") as f:
+                f.truncate(valid)
+
+    def _encodeRecord(self, record):
+        payload = pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+        return self.HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+    def _append(self, record):
+        self._file.write(self._encodeRecord(record))
+        self._records += 1
+
+    def _writeSnapshot(self):
+        tmp_filename = self._filename + ".tmp"
+        with open(tmp_filename, "wb") as f:
+            f.write(self.MAGIC)
+            for key, value in self._data.items():
+                f.write(self._encodeRecord(("set", key, value)))
+            f.flush()
+            os.fsync(f.fileno())
+        if self._file is not None:
+            self._file.close()
+        os.replace(tmp_filename, self._filename)
+        self._file = open(self._filename, "ab")
+        self._records = len(self._data)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._append(("set", key, value))
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        if key not in self._data:
+            raise KeyError(key)
+        self._append(("del", key))
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def sync(self):
+        """Writes the log to disk and compacts it if necessary"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        if self._records > self.COMPACT_MIN_RECORDS and \
+                self._records > self.COMPACT_FACTOR * len(self._data):
+            self.compact()
+
+    def compact(self):
+        """Rewrites the log with one record per item"""
+        self._file.flush()
+        self._writeSnapshot()
+
+    def close(self):
+        if self._file is None:
+            return
+        self.sync()
+        self._file.close()
+        self._file = None
@@ -32,6 +32,7 @@ __docformat__ = 'restructuredtext'
 
 import os
 import shelve
+import threading
 from itertools import zip_longest
 import operator
 
@@ -39,6 +40,7 @@ from taurus.core.util.containers import CaselessDict
 
 from sardana.macroserver.msmanager import MacroServerManager
 from sardana.macroserver.msexception import UnknownEnv
+from sardana.macroserver.msenvjournal import EnvironmentJournal
 from sardana import sardanacustomsettings
 import collections
 
@@ -67,6 +69,27 @@ def _dbm_shelve(filename, backend):
         raise ValueError("'{}' is not a supported backend".format(backend))
 
 
+def _journal(filename):
+    """Opens the environment journal of the given environment. The first time
+    the environment of an existing shelve database is imported."""
+    journal_filename = filename + ".journal"
+    exists = os.path.exists(journal_filename)
+    journal = EnvironmentJournal(journal_filename)
+    if not exists and (os.path.exists(filename)
+                       or os.path.exists(filename + ".dat")):
+        env = shelve.open(filename, flag='r')
+        try:
+            journal.update(env)
+        finally:
+            env.close()
+        journal.sync()
+    return journal
+
+
+# marker of the environment keys pending to be deleted
+_DELETED = object()
+
+
 class EnvironmentManager(MacroServerManager):
     """The MacroServer environment manager class. It is designed to be a
     singleton for the entire application.
@@ -85,9 +108,23 @@ class EnvironmentManager(MacroServerManager):
         # a string containing the absolute filename containing the environment
         self._env_name = None
 
-        # the full enviroment (a shelf for now - can be accessed as a dict)
+        # the full enviroment (a shelf or a journal - can be accessed as a
+        # dict)
         self._env = None
 
+        # changes not yet written to the full environment
+        # dict<string, value> where:
+        #  - key: environment name
+        #  - value: environment value or _DELETED
+        self._pending_env = {}
+
+        # seconds the changes are kept in _pending_env before writing them
+        # (None means write them immediately)
+        self._write_behind = getattr(sardanacustomsettings,
+                                     "MS_ENV_WRITE_BEHIND", None)
+        self._write_timer = None
+        self._env_lock = threading.RLock()
+
         # cache environment for keys that start with door name
         # dict<string, dict<string, value> > where:
         #  - key: door name
@@ -118,6 +155,7 @@ class EnvironmentManager(MacroServerManager):
         if self.is_cleaned():
             return
 
+        self._closeEnv()
         self._clearEnv()
 
         MacroServerManager.cleanUp(self)
@@ -129,8 +167,14 @@ class EnvironmentManager(MacroServerManager):
     def _clearEnv(self):
         self._env = self._macro_env = self._global_env = self._door_env = None
 
+    def _closeEnv(self):
+        self.flushEnv()
+        if self._env is not None:
+            self._env.close()
+
     def setEnvironmentDb(self, f_name):
         """Sets up a new environment from a file"""
+        self._closeEnv()
         self._initEnv()
         f_name = os.path.abspath(f_name)
         self._env_name = f_name
@@ -143,7 +187,17 @@ class EnvironmentManager(MacroServerManager):
                 self.error("Creating environment: %s" % ose.strerror)
                 self.debug("Details:", exc_info=1)
                 raise ose
-        if os.path.exists(f_name) or os.path.exists(f_name + ".dat"):
+        backend = getattr(sardanacustomsettings, "MS_ENV_SHELVE_BACKEND",
+                          None)
+        if backend == "journal":
+            try:
+                self._env = _journal(f_name)
+            except Exception:
+                self.error("Failed to access environment journal of %s",
+                           f_name)
+                self.debug("Details:", exc_info=1)
+                raise
+        elif os.path.exists(f_name) or os.path.exists(f_name + ".dat"):
             try:
                 self._env = shelve.open(f_name, flag='w', writeback=False)
             except Exception:
@@ -151,8 +205,6 @@ class EnvironmentManager(MacroServerManager):
                 self.debug("Details:", exc_info=1)
                 raise
         else:
-            backend = getattr(sardanacustomsettings, "MS_ENV_SHELVE_BACKEND",
-                              None)
             try:
                 self._env = shelve.Shelf(_dbm_shelve(f_name, backend))
             except Exception:
@@ -310,7 +362,9 @@ class EnvironmentManager(MacroServerManager):
         """Gets the complete environment for the given macro and/or door. If
         both are None the the complete environment is returned"""
         if macro_name is None and door_name is None:
-            return dict(self._env)
+            with self._env_lock:
+                self.flushEnv()
+                return dict(self._env)
         elif not door_name is None and macro_name is None:
             return self.getDoorEnv(door_name)
         elif door_name and macro_name:
@@ -457,24 +511,65 @@ class EnvironmentManager(MacroServerManager):
                 self._door_env[door_name] = d = {}
         return d, key
 
+    def _hasStoredEnv(self, key):
+        value = self._pending_env.get(key, _DELETED)
+        if value is _DELETED:
+            return key not in self._pending_env and key in self._env
+        return True
+
     def _setOneEnv(self, key, value):
-        self._env[key] = value
-        self._env.sync()
+        self._pending_env[key] = value
         d, key = self._getCacheForKey(key)
         d[key] = value
 
     def _unsetOneEnv(self, key):
-        if key not in self._env:
+        if not self._hasStoredEnv(key):
             raise UnknownEnv("Unknown environment %s" % key)
-        del self._env[key]
-        self._env.sync()
+        self._pending_env[key] = _DELETED
         d, key = self._getCacheForKey(key)
         if key in d:
             del d[key]
 
     def _unsetEnv(self, env_names):
-        for key in env_names:
-            self._unsetOneEnv(key)
+        with self._env_lock:
+            try:
+                for key in env_names:
+                    self._unsetOneEnv(key)
+            finally:
+                self._writeEnv()
+
+    def _writeEnv(self):
+        """Writes the pending changes to the environment database now or,
+        in write-behind mode (MS_ENV_WRITE_BEHIND), after a while"""
+        if not self._write_behind:
+            self.flushEnv()
+        elif self._write_timer is None and self._pending_env:
+            self._write_timer = timer = threading.Timer(self._write_behind,
+                                                        self.flushEnv)
+            timer.daemon = True
+            timer.start()
+
+    def flushEnv(self):
+        """Writes the pending environment changes to the environment
+        database and synchronizes it (only once for all the changes)"""
+        with self._env_lock:
+            timer, self._write_timer = self._write_timer, None
+            if timer is not None:
+                timer.cancel()
+            pending, self._pending_env = self._pending_env, {}
+            env = self._env
+            if not pending or env is None:
+                return
+            for key, value in pending.items():
+                try:
+                    if value is _DELETED:
+                        env.pop(key, None)
+                    else:
+                        env[key] = value
+                except Exception:
+                    self.error("Failed to store environment %s", key)
+                    self.debug("Details:", exc_info=1)
+            env.sync()
 
     def setEnvObj(self, obj):
         """Sets the environment for the given object. If object is a sequence
@@ -496,8 +591,12 @@ class EnvironmentManager(MacroServerManager):
             raise TypeError("obj parameter must be a sequence or a map")
 
         obj = self._encode(obj)
-        for k, v in obj.items():
-            self._setOneEnv(k, v)
+        with self._env_lock:
+            try:
+                for k, v in obj.items():
+                    self._setOneEnv(k, v)
+            finally:
+                self._writeEnv()
         return obj
 
     def setEnv(self, key, value):
@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""This module contains the static scanner of the macro libraries used to
+index the macros metadata (see :class:`~sardana.sardanametaindex.MetaIndex`)
+without importing the macro libraries"""
+
+__all__ = ["SCANNER_VERSION", "MacroLibScanner", "scan_macro_lib",
+           "encode_definition", "decode_definition"]
+
+__docformat__ = 'restructuredtext'
+
+import ast
+import copy
+
+from sardana import Release
+from sardana.sardanametaindex import NotIndexable, ModuleScanner
+from sardana.macroserver.msparameter import Type, Optional, ParamRepeat
+from sardana.macroserver.macro import Macro, macro, imacro
+
+#: version of the macro library scanner (changing it invalidates the index)
+SCANNER_VERSION = "%s.1" % Release.version
+
+# arguments of the macro decorator
+_MACRO_ARGS = "param_def", "result_def", "env", "hints", "interactive"
+
+
+def encode_definition(obj):
+    """Encodes the parameters, result or hints definition into a JSON
+    serializable object
+
+    :raises: NotIndexable if the definition can not be encoded"""
+    if obj is Optional:
+        return {"__Optional__": True}
+    if isinstance(obj, ParamRepeat):
+        return {"__ParamRepeat__": [encode_definition(obj.param_def),
+                                    encode_definition(obj.opts)]}
+    if obj is None or isinstance(obj, (str, bool, int, float)):
+        return obj
+    if isinstance(obj, (list, tuple)):
+        return [encode_definition(item) for item in obj]
+    if isinstance(obj, dict):
+        ret = {}
+        for key, value in obj.items():
+            if not isinstance(key, str):
+                raise NotIndexable("unsupported key %r" % (key,))
+            ret[key] = encode_definition(value)
+        return ret
+    raise NotIndexable("unsupported value %r" % (obj,))
+
+
+def decode_definition(obj):
+    """Decodes the parameters, result or hints definition encoded with
+    :func:`encode_definition`"""
+    if isinstance(obj, list):
+        return [decode_definition(item) for item in obj]
+    if isinstance(obj, dict):
+        if "__Optional__" in obj:
+            return Optional
+        if "__ParamRepeat__" in obj:
+            param_def, opts = obj["__ParamRepeat__"]
+            return ParamRepeat(*decode_definition(param_def), **opts)
+        return {key: decode_definition(value) for key, value in obj.items()}
+    return obj
+
+
+class MacroLibScanner(ModuleScanner):
+    """Static scanner of a macro library: it finds the macros the same way
+    as :meth:`~sardana.macroserver.msmacromanager.MacroManager.reloadMacroLib`
+    (macro classes and functions decorated with
+    :class:`~sardana.macroserver.macro.macro`) and extracts their metadata
+    without importing the library.
+
+    .. note::
+        The MacroLibScanner class has been included in Sardana
+        on a provisional basis. Backwards incompatible changes
+        (up to and including removal of the class) may occur if
+        deemed necessary by the core developers.
+    """
+
+    trusted_modules = ("sardana.macroserver.macro",
+                       "sardana.macroserver.msparameter", "copy")
+
+    trusted_callables = (ParamRepeat, copy.copy, copy.deepcopy, int, float,
+                         str, tuple, list, dict)
+
+    def scan(self):
+        """Returns the library metadata: the library description and the
+        macros, each of them a dict with the name, the type ("class" or
+        "function"), the description and the (encoded) param_def, result_def
+        and hints
+
+        :return: the library metadata
+        :rtype: dict
+        :raises: NotIndexable if the library must be imported"""
+        macros, others = [], []
+        for stmt in self.tree.body:
+            if isinstance(stmt, ast.ClassDef):
+                info = self._scan_class(stmt)
+            elif isinstance(stmt, ast.FunctionDef):
+                info = self._scan_function(stmt)
+            elif isinstance(stmt, ast.AsyncFunctionDef):
+                if stmt.decorator_list:
+                    raise NotIndexable("decorated coroutine %s" % stmt.name)
+                continue
+            else:
+                others.append(stmt)
+                continue
+            if info is not None:
+                # the macro name must be bound only once
+                self.resolve_name(stmt.name)
+                macros.append(info)
+        # the macros and the classes they may inherit from
+        names = set(info["name"] for info in macros)
+        names.update(stmt.name for stmt in self.tree.body
+                     if isinstance(stmt, ast.ClassDef))
+        for stmt in others:
+            self._check_statement(stmt, names)
+        macros.sort(key=lambda info: info["name"])
+        return dict(description=ast.get_docstring(self.tree, clean=False),
+                    macros=macros)
+
+    def _check_statement(self, stmt, names):
+        """Checks that the top-level statement does not (conditionally) define
+        classes or functions nor use (e.g. alias or modify) the given
+        names"""
+        for node in ast.walk(stmt):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef,
+                                 ast.ClassDef)):
+                raise NotIndexable("conditional definition of %s (line %d)"
+                                   % (node.name, node.lineno))
+            if isinstance(node, ast.Name) and node.id in names:
+                raise NotIndexable("top-level use of %s (line %d)" %
+                                   (node.id, node.lineno))
+
+    def _get_type(self, type_name):
+        try:
+            return getattr(Type, type_name)
+        except AttributeError:
+            raise NotIndexable("unknown type %s" % type_name)
+
+    def _scan_class(self, node):
+        if Macro not in self.get_mro(node):
+            return None
+        if self._get_class_binding(node, "__doc__") is not None:
+            raise NotIndexable("%s.__doc__ is assigned" % node.name)
+        info = dict(name=node.name, type="class",
+                    description=ast.get_docstring(node, clean=False))
+        for name in ("param_def", "result_def", "hints"):
+            value = self.get_class_attribute(node, name)
+            info[name] = encode_definition(value)
+        return info
+
+    def _scan_function(self, node):
+        if not node.decorator_list:
+            return None
+        decorator = node.decorator_list[0]
+        if len(node.decorator_list) > 1 or \
+                not isinstance(decorator, ast.Call):
+            raise NotIndexable("function %s (line %d) decorators" %
+                               (node.name, node.lineno))
+        func = self.resolve(decorator.func)
+        if func is not macro and func is not imacro:
+            raise NotIndexable("function %s (line %d) decorators" %
+                               (node.name, node.lineno))
+        if len(decorator.args) > len(_MACRO_ARGS) or \
+                any(isinstance(arg, ast.Starred) for arg in decorator.args):
+            raise NotIndexable("macro decorator arguments (line %d)" %
+                               decorator.lineno)
+        values = dict(zip(_MACRO_ARGS, decorator.args))
+        for keyword in decorator.keywords:
+            if keyword.arg not in _MACRO_ARGS:
+                raise NotIndexable("macro decorator arguments (line %d)" %
+                                   decorator.lineno)
+            values[keyword.arg] = keyword.value
+        definitions = {}
+        for name in ("param_def", "result_def", "hints"):
+            value = values.get(name)
+            if value is not None:
+                value = self.evaluate(value)
+            definitions[name] = value
+
+        # the same checks as is_macro (inspect.getargspec fails with keyword
+        # only arguments and annotations)
+        args = node.args
+        arg_nodes = getattr(args, "posonlyargs", []) + args.args
+        all_arg_nodes = arg_nodes + [args.vararg, args.kwarg]
+        if args.kwonlyargs or node.returns is not None or \
+                any(arg is not None and arg.annotation is not None
+                    for arg in all_arg_nodes):
+            raise NotIndexable("function %s (line %d) arguments" %
+                               (node.name, node.lineno))
+        arg_names = [arg.arg for arg in arg_nodes]
+        if len(arg_names) == 0 or args.kwarg is not None or \
+                (args.vararg is not None and len(arg_names) > 1):
+            return None
+
+        # the same as MacroFunction.to_parameter_definition
+        if definitions["param_def"] is None:
+            any_type = self._get_type("Any")
+            if args.vararg is None:
+                if args.defaults:
+                    raise NotIndexable("function %s default values" %
+                                       node.name)
+                definitions["param_def"] = [
+                    [arg, any_type, None, arg + " parameter"]
+                    for arg in arg_names[1:]]
+            else:
+                varargs = args.vararg.arg
+                definitions["param_def"] = [
+                    [varargs, [[varargs, any_type, None,
+                                varargs + " parameter"]],
+                     None, "list of " + varargs]]
+        info = dict(name=node.name, type="function",
+                    description=ast.get_docstring(node, clean=False))
+        for name, value in definitions.items():
+            info[name] = encode_definition(value)
+        return info
+
+
+def scan_macro_lib(source, file_name="<unknown>"):
+    """Returns the metadata of the macro library (see
+    :meth:`MacroLibScanner.scan`)
+
+    :param source: the macro library source
+    :type source: :obj:`str` or :obj:`bytes`
+    :param file_name: the macro library file name
+    :type file_name: :obj:`str`
+    :return: the macro library metadata
+    :rtype: dict
+    :raises: NotIndexable if the library must be imported"""
+    return MacroLibScanner(source, file_name).scan()
@@ -55,14 +55,18 @@ except ImportError:
 from taurus.core.util.log import Logger
 from taurus.core.util.codecs import CodecFactory
 
+from sardana import sardanacustomsettings
 from sardana.sardanadefs import ElementType
 from sardana.sardanamodulemanager import ModuleManager
+from sardana.sardanametaindex import MetaIndex
 from sardana.sardanaexception import format_exception_only_str
 from sardana.sardanautils import is_pure_str, is_non_str_seq, recur_map
 
 from sardana.macroserver.msmanager import MacroServerManager
 from sardana.macroserver.msmetamacro import MACRO_TEMPLATE, MacroLibrary, \
     MacroClass, MacroFunction
+from sardana.macroserver.msmacroindex import SCANNER_VERSION, \
+    scan_macro_lib, decode_definition
 from sardana.macroserver.msparameter import ParamDecoder, FlatParamDecoder, \
     WrongParam
 from sardana.macroserver.macro import Macro, MacroFunc, ExecMacroHook, \
@@ -188,6 +192,10 @@ class MacroManager(MacroServerManager):
         # value - MacroExecutor object for the door
         self._macro_executors = {}
 
+        # serializes the loading of the macro libraries created from the
+        # macro library index
+        self._load_lock = threading.RLock()
+
         MacroServerManager.reInit(self)
 
     def cleanUp(self):
@@ -224,14 +232,26 @@ class MacroManager(MacroServerManager):
 
         self._macro_path = p
 
+        index = None
+        if getattr(sardanacustomsettings, "MS_LAZY_MACRO_LOADING", False):
+            index = MetaIndex("MacroLibIndex",
+                              self.macro_server.macro_index_file,
+                              scan_macro_lib, SCANNER_VERSION)
         macro_file_names = self._findMacroLibNames()
         for mod_name, file_name in macro_file_names.items():
             dir_name = os.path.dirname(file_name)
             path = [dir_name]
             try:
+                if index is not None:
+                    macro_lib = self._addIndexedMacroLib(mod_name, file_name,
+                                                         index)
+                    if macro_lib is not None:
+                        continue
                 self.reloadMacroLib(mod_name, path)
             except:
                 pass
+        if index is not None:
+            index.save()
 
     def getMacroPath(self):
         return self._macro_path
@@ -519,20 +539,8 @@ class MacroManager(MacroServerManager):
                                           logger=self)
             for _, macro in inspect.getmembers(m, _is_macro):
                 try:
-                    isoverwritten = False
-                    macro_name = macro.__name__
-                    if macro_name in self._overwritten_macros:
-                        isoverwritten = True
-                    elif (macro_name in list(self._macro_dict.keys())
-                            and self._macro_dict[macro_name].lib != macro_lib):
-                        isoverwritten = True
-                        msg = ('Macro "{}" defined in "{}" macro library'
-                               + ' has been overwritten by "{}" macro library')
-                        old_lib_name = self._macro_dict[macro_name].lib.name
-                        self.debug(msg.format(macro_name, old_lib_name,
-                                              macro_lib.name))
-                        self._overwritten_macros.append(macro_name)
-
+                    isoverwritten = self._isOverwrittenMacro(macro.__name__,
+                                                             macro_lib)
                     self.addMacro(macro_lib, macro, isoverwritten)
                     count_correct_macros += 1
                 except Exception as e:
@@ -565,6 +573,119 @@ class MacroManager(MacroServerManager):
                     msg += "\nUse relmaclib to reload the corrected macro(s)\n"
                 raise Exception(msg)
 
+    def _isOverwrittenMacro(self, macro_name, macro_lib):
+        """Returns True if the macro overwrites (or was overwritten by) a
+        macro with the same name defined in a different macro library"""
+        if macro_name in self._overwritten_macros:
+            return True
+        if (macro_name in list(self._macro_dict.keys())
+                and self._macro_dict[macro_name].lib != macro_lib):
+            msg = ('Macro "{}" defined in "{}" macro library'
+                   + ' has been overwritten by "{}" macro library')
+            old_lib_name = self._macro_dict[macro_name].lib.name
+            self.debug(msg.format(macro_name, old_lib_name, macro_lib.name))
+            self._overwritten_macros.append(macro_name)
+            return True
+        return False
+
+    def _addIndexedMacroLib(self, module_name, file_name, index):
+        """Adds the macro library from its metadata (see
+        :mod:`~sardana.macroserver.msmacroindex`) without importing it. The
+        library is imported on the first use of its code e.g. the first
+        execution of one of its macros (see :meth:`_loadMacroLib`).
+
+        :param module_name: macro library name (=python module name)
+        :param file_name: macro library absolute file name
+        :param index: the macro library index
+        :type index: :class:`~sardana.sardanametaindex.MetaIndex`
+        :return: the MacroLibrary object or None if the library is not
+                 indexable (it must be imported)"""
+        try:
+            lib_info = index.get(file_name)
+        except Exception:
+            self.debug("Failed to index macro library %s", module_name,
+                       exc_info=1)
+            return None
+        if lib_info is None:
+            return None
+        macro_lib = MacroLibrary(name=module_name, file_path=file_name,
+                                 description=lib_info['description'],
+                                 loader=self._loadMacroLib,
+                                 macro_server=self.macro_server)
+        macros = []
+        try:
+            for macro_info in lib_info['macros']:
+                definitions = {}
+                for name in ('param_def', 'result_def', 'hints'):
+                    definitions[name] = decode_definition(macro_info[name])
+                params = dict(macro_server=self.macro_server, lib=macro_lib,
+                              name=macro_info['name'],
+                              description=macro_info['description'],
+                              definitions=definitions)
+                if macro_info['type'] == 'class':
+                    macro = MacroClass(klass=None, **params)
+                else:
+                    macro = MacroFunction(function=None, **params)
+                macros.append(macro)
+        except Exception:
+            self.debug("Failed to add macro library %s from its index",
+                       module_name, exc_info=1)
+            return None
+
+        # if there was previous Macro Library info remove it
+        old_macro_lib = self._modules.pop(module_name, None)
+        if old_macro_lib is not None:
+            for macro in old_macro_lib.get_macros():
+                self._macro_dict.pop(macro.name)
+
+        for macro in macros:
+            macro_name = macro.name
+            self.debug("Adding indexed macro %s", macro_name)
+            macro.isoverwritten = self._isOverwrittenMacro(macro_name,
+                                                           macro_lib)
+            if macro.get_type() == ElementType.MacroClass:
+                macro_lib.add_macro_class(macro)
+            else:
+                macro_lib.add_macro_function(macro)
+            self._macro_dict[macro_name] = macro
+        if macro_lib.has_macros():
+            self._modules[module_name] = macro_lib
+        return macro_lib
+
+    def _loadMacroLib(self, macro_lib):
+        """Imports the macro library added from its metadata (see
+        :meth:`_addIndexedMacroLib`) and sets the code of its macros.
+
+        :raises:
+            LibraryError in case the macro library can not be imported or
+            its macros changed since it was indexed"""
+        with self._load_lock:
+            if macro_lib.is_loaded():
+                return
+            module_name = macro_lib.name
+            mod_manager = ModuleManager()
+            m = mod_manager.reloadModule(module_name, [macro_lib.path])
+            if m is None:
+                raise LibraryError("Error loading macro library '%s'" %
+                                   module_name)
+            _is_macro = functools.partial(is_macro,
+                                          abs_file=macro_lib.file_path,
+                                          logger=self)
+            codes = []
+            for macro in macro_lib.get_macros():
+                code = getattr(m, macro.name, None)
+                is_class = macro.get_type() == ElementType.MacroClass
+                if code is None or not _is_macro(code) or \
+                        inspect.isclass(code) != is_class:
+                    raise LibraryError("Macro %s changed since the macro "
+                                       "library '%s' was indexed. Use "
+                                       "relmaclib to reload it" %
+                                       (macro.name, module_name))
+                codes.append((macro, code))
+            for macro, code in codes:
+                macro.set_code_object(code)
+            macro_lib.set_module(m)
+
     def addMacro(self, macro_lib, macro, isoverwritten=False):
         add = self.addMacroFunction
         if inspect.isclass(macro):
@@ -741,6 +862,9 @@ class MacroManager(MacroServerManager):
         else:
             raise Exception("Wrong format of raw_params object")
         macro_meta = self.getMacro(macro_name)
+        # the macros added from the index are decoded (and executed) with
+        # the definitions of their code
+        macro_meta.lib.load()
         params_def = macro_meta.get_parameter()
         type_manager = door.type_manager
         try:
@@ -1529,6 +1653,8 @@ class MacroExecutor(Logger):
         finally:
             self._macro_stack = None
             self._xml_stack = None
+            # write the environment changes of the write-behind mode
+            self.macro_server.environment_manager.flushEnv()
 
     def __runStatelessXML(self, xml=None):
         if xml is None:
@@ -114,12 +114,33 @@ class MacroLibrary(SardanaLibrary):
 class Parameterizable(object):
     """Helper class to handle parameter and result definition for a
     :class:`~sardana.macroserver.msmetamacro.MacroClass` or a
-    :class:`~sardana.macroserver.msmetamacro.MacroFunction`"""
+    :class:`~sardana.macroserver.msmetamacro.MacroFunction`.
+
+    The macros created only from their metadata (see
+    :mod:`~sardana.macroserver.msmacroindex`) use the parameter, result and
+    hints definitions of the metadata until their code is loaded."""
+
+    # dict with the param_def, result_def and hints of the macro metadata
+    # (None if the definitions are taken from the macro code)
+    _definitions = None
 
     def __init__(self):
         self._parameter = self.build_parameter()
         self._result = self.build_result()
 
+    def set_code_definitions(self):
+        """Takes the parameter, result and hints definitions from the macro
+        code (once it is loaded) instead of the macro metadata"""
+        self._definitions = None
+        self._parameter = self.build_parameter()
+        self._result = self.build_result()
+
+    def get_hints(self):
+        """Returns the macro hints (as defined in the macro code)"""
+        if self._definitions is not None:
+            return self._definitions['hints']
+        return self.code_object.hints
+
     def get_parameter_definition(self):
         raise NotImplementedError
 
@@ -223,7 +244,7 @@ class Parameterizable(object):
         return info
 
     def get_info(self):
-        info = [self.full_name, self.description, str(self.code_object.hints)]
+        info = [self.full_name, self.description, str(self.get_hints())]
         info += self.get_parameter_info()
         info += self.get_result_info()
         return info
@@ -231,7 +252,7 @@ class Parameterizable(object):
     def serialize(self, *args, **kwargs):
         kwargs['macro_server'] = self.get_manager().name
         kwargs['id'] = InvalidId
-        kwargs['hints'] = self.code_object.hints
+        kwargs['hints'] = self.get_hints()
         param, result = self.get_parameter(), self.get_result()
         kwargs['parameters'] = param
         kwargs['result'] = result
@@ -243,6 +264,7 @@ class MacroClass(SardanaClass, Parameterizable):
     def __init__(self, **kwargs):
         kwargs['manager'] = kwargs.pop('macro_server')
         kwargs['elem_type'] = ElementType.MacroClass
+        self._definitions = kwargs.pop('definitions', None)
         SardanaClass.__init__(self, **kwargs)
         Parameterizable.__init__(self)
 
@@ -254,18 +276,26 @@ class MacroClass(SardanaClass, Parameterizable):
         kwargs = Parameterizable.serialize(self, *args, **kwargs)
         return kwargs
 
+    def set_code_object(self, code_obj):
+        SardanaClass.set_code_object(self, code_obj)
+        self.set_code_definitions()
+
     @property
     def macro_class(self):
         return self.klass
 
     def get_parameter_definition(self):
+        if self._definitions is not None:
+            return self._definitions['param_def']
         return self.klass.param_def
 
     def get_result_definition(self):
+        if self._definitions is not None:
+            return self._definitions['result_def']
         return self.klass.result_def
 
     def get_hints_definition(self):
-        return self.klass.hints
+        return self.get_hints()
 
 
 class MacroFunction(SardanaFunction, Parameterizable):
@@ -273,6 +303,7 @@ class MacroFunction(SardanaFunction, Parameterizable):
     def __init__(self, **kwargs):
         kwargs['manager'] = kwargs.pop('macro_server')
         kwargs['elem_type'] = ElementType.MacroFunction
+        self._definitions = kwargs.pop('definitions', None)
         SardanaFunction.__init__(self, **kwargs)
         Parameterizable.__init__(self)
 
@@ -284,6 +315,10 @@ class MacroFunction(SardanaFunction, Parameterizable):
         kwargs = Parameterizable.serialize(self, *args, **kwargs)
         return kwargs
 
+    def set_code_object(self, code_obj):
+        SardanaFunction.set_code_object(self, code_obj)
+        self.set_code_definitions()
+
     @property
     def macro_function(self):
         return self.function
@@ -309,14 +344,18 @@ class MacroFunction(SardanaFunction, Parameterizable):
         return param_def
 
     def get_parameter_definition(self):
+        if self._definitions is not None:
+            return self._definitions['param_def']
         param_def = self.function.param_def
         if param_def is None:
             param_def = self.to_parameter_definition()
         return param_def
 
     def get_result_definition(self):
+        if self._definitions is not None:
+            return self._definitions['result_def']
         result_def = self.function.result_def
         return result_def
 
     def get_hints_definition(self):
-        return self.function.hints or ()
+        return self.get_hints() or ()
@@ -34,11 +34,13 @@ __docformat__ = 'restructuredtext'
 
 import os
 import re
+import time
 import posixpath
 from datetime import datetime
 import numpy
 import h5py
 
+from sardana import sardanacustomsettings
 from sardana.sardanautils import is_pure_str
 from sardana.taurus.core.tango.sardana import PlotType
 from sardana.macroserver.scan.recorder import BaseFileRecorder, SaveModes
@@ -49,6 +51,9 @@ try:
 except AttributeError:
     VDS_available = False
 
+#: target size (in bytes) of the chunks of the measurement datasets
+CHUNK_SIZE = 64 * 1024
+
 
 def timedelta_total_seconds(timedelta):
     """Equivalent to timedelta.total_seconds introduced with python 2.7."""
@@ -58,11 +63,49 @@ def timedelta_total_seconds(timedelta):
         * 10 ** 6) / 10 ** 6
 
 
+class _ColumnBuffer(object):
+    """Rows of a measurement column waiting to be written to the file"""
+
+    def __init__(self, dtype, shape):
+        self.rows = numpy.empty(1, dtype=numpy.int64)
+        self.data = numpy.empty((1,) + tuple(shape), dtype=dtype)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, row, value):
+        if self.count == len(self.rows):
+            rows = numpy.empty(2 * self.count, dtype=self.rows.dtype)
+            rows[:self.count] = self.rows
+            data = numpy.empty((2 * self.count,) + self.data.shape[1:],
+                               dtype=self.data.dtype)
+            data[:self.count] = self.data
+            self.rows, self.data = rows, data
+        self.rows[self.count] = row
+        self.data[self.count] = value
+        self.count += 1
+
+    def take(self):
+        """Return the buffered rows and data and empty the buffer.
+        The returned arrays are only valid until the next append."""
+        count, self.count = self.count, 0
+        return self.rows[:count], self.data[:count]
+
+
 class NXscanH5_FileRecorder(BaseFileRecorder):
 
     """
     Saves data to a nexus file that follows the NXscan application definition
     (This is a pure h5py implementation that does not depend on the nxs module)
+
+    The records can be buffered in memory and written to the file in blocks
+    (see ``H5_RECORDER_BUFFER_SIZE`` and ``H5_RECORDER_BUFFER_TIME`` sardana
+    custom settings). In this case the measurement datasets are extended in
+    large steps and trimmed to the number of written records at the end of
+    the scan. The file is flushed according to the
+    ``H5_RECORDER_FLUSH_PERIOD`` and can be written in the SWMR mode
+    (``H5_RECORDER_SWMR``) so the live readers can follow it.
     """
     formats = {'h5': '.h5'}
     # from http://docs.h5py.org/en/latest/strings.html
@@ -86,6 +129,21 @@ class NXscanH5_FileRecorder(BaseFileRecorder):
         self._nxclass_map = {}
         self.entryname = 'entry'
 
+        self._buffer_size = max(1, getattr(
+            sardanacustomsettings, "H5_RECORDER_BUFFER_SIZE", 1))
+        self._buffer_time = getattr(
+            sardanacustomsettings, "H5_RECORDER_BUFFER_TIME", None)
+        self._flush_period = getattr(
+            sardanacustomsettings, "H5_RECORDER_FLUSH_PERIOD", 0)
+        self._swmr = getattr(sardanacustomsettings, "H5_RECORDER_SWMR", False)
+        self._swmr_active = False
+        self._buffers = {}
+        self._nb_rows = {}
+        self._nb_buffered = 0
+        self._buffer_start = None
+        self._last_flush = 0
+        self._pending_custom_data = []
+
         scheme = r'([A-Za-z][A-Za-z0-9\.\+\-]*)'
         authority = (r'//(?P<host>([\w\-_]+\.)*[\w\-_]+)'
                      + r'(:(?P<port>\d{1,5}))?')
@@ -123,10 +181,14 @@ class NXscanH5_FileRecorder(BaseFileRecorder):
         """Open the file with given filename (create if it does not exist)
         Populate the root of the file with some metadata from the NXroot
         definition"""
+        kwargs = {}
+        if self._swmr:
+            # SWMR requires the latest file format
+            kwargs["libver"] = "latest"
         if os.path.exists(fname):
-            fd = h5py.File(fname, mode='r+')
+            fd = h5py.File(fname, mode='r+', **kwargs)
         else:
-            fd = h5py.File(fname, mode='w-')
+            fd = h5py.File(fname, mode='w-', **kwargs)
             fd.attrs['NX_class'] = 'NXroot'
             fd.attrs['file_name'] = fname
             fd.attrs['file_time'] = datetime.now().isoformat()
@@ -242,11 +304,13 @@ class NXscanH5_FileRecorder(BaseFileRecorder):
                     dtype=dd.dtype,
                     shape=shape,
                     maxshape=([None] + list(dd.shape)),
-                    chunks=(1,) + tuple(dd.shape),
+                    chunks=self._chunks(dd, self._buffer_size),
                     compression=self._compression(shape)
                 )
                 if hasattr(dd, 'data_units'):
                     _ds.attrs['units'] = dd.data_units
+                self._buffers[dd.label] = _ColumnBuffer(dd.dtype, dd.shape)
+                self._nb_rows[dd.label] = 0
 
         else:
             # leave the creation of the datasets to _writeRecordList
@@ -256,6 +320,42 @@ class NXscanH5_FileRecorder(BaseFileRecorder):
         self._createPreScanSnapshot(env)
 
         self.fd.flush()
+        self._nb_buffered = 0
+        self._buffer_start = None
+        self._last_flush = time.time()
+        if self._swmr and self.savemode == SaveModes.Record:
+            self._startSWMR()
+
+    def _startSWMR(self):
+        """Switch the file to the SWMR mode. From now on no new objects
+        can be created in the file (until it is reopened)"""
+        try:
+            self.fd.swmr_mode = True
+        except Exception as e:
+            self.warning('Can not write %s in SWMR mode. Reason: %r',
+                         self.filename, e)
+        else:
+            self._swmr_active = True
+
+    def _stopSWMR(self):
+        """Reopen the file in the normal mode (so new objects can be
+        created) and write the custom data received in the SWMR mode"""
+        self.fd.close()
+        self.fd = h5py.File(self.filename, mode='r+')
+        self._swmr_active = False
+        pending, self._pending_custom_data = self._pending_custom_data, []
+        for args, kwargs in pending:
+            self._addCustomData(*args, **kwargs)
+
+    def _chunks(self, dd, max_rows):
+        """
+        Returns the chunk shape of the measurement dataset of the given
+        column: as many rows as fit in CHUNK_SIZE bytes but not more than
+        `max_rows` (the number of rows written at once).
+        """
+        row_size = numpy.dtype(dd.dtype).itemsize * int(numpy.prod(dd.shape))
+        rows = min(max_rows, CHUNK_SIZE // max(row_size, 1))
+        return (max(rows, 1),) + tuple(dd.shape)
 
     def _compression(self, shape, compfilter='gzip'):
         """
@@ -315,40 +415,99 @@ class NXscanH5_FileRecorder(BaseFileRecorder):
     def _writeRecord(self, record):
         if self.filename is None:
             return
-        _meas = self.fd[posixpath.join(self.entryname, 'measurement')]
+        self._bufferRecord(record)
+        if self._isBufferDue():
+            self._writeBuffers()
 
+    def writeRecords(self, records):
+        """Write a batch of records to the file at once (regardless of the
+        buffer size)."""
+        if self.filename is None:
+            return
+        for record in records:
+            self._bufferRecord(record)
+        self._writeBuffers()
+
+    def _bufferRecord(self, record):
         for dd in self.datadesc:
             if dd.name in record.data:
                 data = record.data[dd.name]
-                _ds = _meas[dd.label]
                 if data is None:
                     data = numpy.zeros(dd.shape, dtype=dd.dtype)
                 # skip NaN if value reference is enabled
                 if dd.value_ref_enabled and not is_pure_str(data):
                     continue
                 elif not hasattr(data, 'shape'):
-                    data = numpy.array([data], dtype=dd.dtype)
+                    if len(dd.shape) > 0:
+                        data = numpy.array(data, dtype=dd.dtype)
                 elif dd.dtype != data.dtype.name:
                     self.debug('%s casted to %s (was %s)',
                                dd.label, dd.dtype, data.dtype.name)
                     data = data.astype(dd.dtype)
-
-                # resize the dataset and add the latest chunk
-                if _ds.shape[0] <= record.recordno:
-                    _ds.resize(record.recordno + 1, axis=0)
-
-                # write the slab of data
-                _ds[record.recordno, ...] = data
-
+                self._buffers[dd.label].append(record.recordno, data)
             else:
                 self.debug('missing data for label %r', dd.label)
-        self.fd.flush()
+        self._nb_buffered += 1
+        if self._buffer_start is None:
+            self._buffer_start = time.time()
+
+    def _isBufferDue(self):
+        if self._nb_buffered >= self._buffer_size:
+            return True
+        return (self._buffer_time is not None
+                and time.time() - self._buffer_start >= self._buffer_time)
+
+    def _writeBuffers(self):
+        """Write the buffered records to the file and flush it if the
+        flush period has elapsed"""
+        _meas = self.fd[posixpath.join(self.entryname, 'measurement')]
+        for dd in self.datadesc:
+            buf = self._buffers[dd.label]
+            if len(buf) == 0:
+                continue
+            rows, data = buf.take()
+            _ds = _meas[dd.label]
+            nb_rows = max(self._nb_rows[dd.label], int(rows.max()) + 1)
+            self._nb_rows[dd.label] = nb_rows
+            # resize the dataset
+            length = _ds.shape[0]
+            if length < nb_rows:
+                if self._buffer_size > 1:
+                    # grow geometrically, trimmed in _endRecordList
+                    nb_rows = max(nb_rows, 2 * length)
+                _ds.resize(nb_rows, axis=0)
+            # write the slab(s) of data
+            first, last = rows[0], rows[-1]
+            if last - first == len(rows) - 1 and \
+                    numpy.all(numpy.diff(rows) == 1):
+                _ds[first:last + 1, ...] = data
+            else:
+                for row, value in zip(rows, data):
+                    _ds[row, ...] = value
+        self._nb_buffered = 0
+        self._buffer_start = None
+        now = time.time()
+        if now - self._last_flush >= self._flush_period:
+            self.fd.flush()
+            self._last_flush = now
 
     def _endRecordList(self, recordlist):
 
         if self.filename is None:
             return
 
+        if self.savemode == SaveModes.Record:
+            self._writeBuffers()
+            # trim the datasets to the written records
+            _meas = self.fd[posixpath.join(self.entryname, 'measurement')]
+            for dd in self.datadesc:
+                _ds = _meas[dd.label]
+                nb_rows = self._nb_rows[dd.label]
+                if _ds.shape[0] != nb_rows:
+                    _ds.resize(nb_rows, axis=0)
+        if self._swmr_active:
+            self._stopSWMR()
+
         self._populateInstrumentInfo()
         self._createNXData()
 
@@ -429,7 +588,7 @@ class NXscanH5_FileRecorder(BaseFileRecorder):
                 dd.label,
                 dtype=dd.dtype,
                 shape=shape,
-                chunks=(1,) + tuple(dd.shape),
+                chunks=self._chunks(dd, max(len(recordlist.records), 1)),
                 compression=self._compression(shape)
             )
             if hasattr(dd, 'data_units'):
@@ -572,6 +731,11 @@ class NXscanH5_FileRecorder(BaseFileRecorder):
         :param dtype: name of data type (it is inferred from value if not
                       given)
         """
+        if self._swmr_active:
+            # no new datasets can be created in SWMR mode
+            self._pending_custom_data.append(
+                ((value, name, nxpath, dtype), kwargs))
+            return
         if nxpath is None:
             nxpath = 'custom_data:NXcollection'
         if dtype is None:
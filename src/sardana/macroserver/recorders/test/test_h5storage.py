@@ -33,6 +33,7 @@ import h5py
 import numpy
 from taurus.external.unittest import TestCase
 
+from sardana import sardanacustomsettings
 from sardana.macroserver.scan import ColumnDesc
 from sardana.macroserver.recorders.h5storage import NXscanH5_FileRecorder
 
@@ -188,6 +189,73 @@ class TestNXscanH5_FileRecorder(TestCase):
             for path in part_file_paths:
                 os.remove(path)
 
+    def _buffered_scan(self, nb_records, **settings):
+        """Simulate sardana scan of a scalar and a spectrum channel
+        with the given sardana custom settings"""
+        data_desc = [
+            ColumnDesc(name=COL1_NAME, label=COL1_NAME, dtype="float64",
+                       shape=tuple()),
+            ColumnDesc(name="col2", label="col2", dtype="int32",
+                       shape=(3,))
+        ]
+        self.env["datadesc"] = data_desc
+        old_settings = {}
+        for name, value in settings.items():
+            old_settings[name] = getattr(sardanacustomsettings, name)
+            setattr(sardanacustomsettings, name, value)
+        try:
+            recorder = NXscanH5_FileRecorder(filename=self.path)
+        finally:
+            for name, value in old_settings.items():
+                setattr(sardanacustomsettings, name, value)
+        self.env["starttime"] = datetime.now()
+        recorder._startRecordList(self.record_list)
+        lengths = []
+        for i in range(nb_records):
+            record = Record({COL1_NAME: 0.1 * i,
+                             "col2": numpy.array([i, i, i])}, i)
+            recorder._writeRecord(record)
+            if i == 0:
+                recorder.addCustomData(1, "custom")
+            lengths.append(recorder.fd["entry0/measurement/col2"].shape[0])
+        self.env["endtime"] = datetime.now()
+        recorder._endRecordList(self.record_list)
+        return lengths
+
+    def _assert_buffered_scan(self, nb_records):
+        with h5py.File(self.path, "r") as file_:
+            measurement = file_["entry0"]["measurement"]
+            numpy.testing.assert_array_almost_equal(
+                measurement[COL1_NAME][:], 0.1 * numpy.arange(nb_records))
+            numpy.testing.assert_array_equal(
+                measurement["col2"][:],
+                numpy.repeat(numpy.arange(nb_records), 3).reshape(-1, 3))
+            self.assertEqual(file_["entry0/custom_data/custom"][()], 1)
+
+    def test_buffered(self):
+        """Test buffered writes: datasets grow in steps and are trimmed
+        to the number of records at the end"""
+        lengths = self._buffered_scan(10, H5_RECORDER_BUFFER_SIZE=4,
+                                      H5_RECORDER_FLUSH_PERIOD=60)
+        self.assertEqual(lengths, [0, 0, 0, 4, 4, 4, 4, 8, 8, 8])
+        self._assert_buffered_scan(10)
+        with h5py.File(self.path, "r") as file_:
+            measurement = file_["entry0"]["measurement"]
+            self.assertEqual(measurement[COL1_NAME].chunks, (4,))
+            self.assertEqual(measurement["col2"].chunks, (4, 3))
+
+    def test_unbuffered(self):
+        """Test that by default every record is written immediately"""
+        lengths = self._buffered_scan(3)
+        self.assertEqual(lengths, [1, 2, 3])
+        self._assert_buffered_scan(3)
+
+    def test_swmr(self):
+        """Test writing in SWMR mode (custom data is written at the end)"""
+        self._buffered_scan(5, H5_RECORDER_BUFFER_SIZE=2,
+                            H5_RECORDER_SWMR=True)
+        self._assert_buffered_scan(5)
+
     def tearDown(self):
         try:
             os.remove(self.path)
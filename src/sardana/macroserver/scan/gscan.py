@@ -56,9 +56,10 @@ from taurus.core.util.enumeration import Enumeration
 from taurus.core.util.threadpool import ThreadPool
 from taurus.core.util.event import CallableRef
 
+from sardana import sardanacustomsettings
 from sardana.util.tree import BranchNode, LeafNode, Tree
 from sardana.util.motion import Motor as VMotor
-from sardana.util.motion import MotionPath
+from sardana.util.motion import MotionPath, motion_durations
 from sardana.util.thread import CountLatch
 from sardana.pool.pooldefs import SynchDomain, SynchParam
 from sardana.macroserver.msexception import MacroServerException, UnknownEnv, \
@@ -845,6 +846,13 @@ class GScan(Logger):
         position) and acquisition time.
 
         Interval estimation is a number of scan trajectory intervals.
+
+        If the macro implements ``getScanPositions`` (returning positions of
+        all the scan points as an array of shape (nb_points, nb_moveables)
+        and the integration time - scalar or array of nb_points) the
+        generator is not used and the time is estimated for all the points
+        at once. Otherwise the positions are taken from the generator
+        (up to *max_iter* points).
         """
         with_time = hasattr(self.macro, "getTimeEstimation")
         with_interval = hasattr(self.macro, "getIntervalEstimation")
@@ -854,45 +862,54 @@ class GScan(Logger):
             return t, i
 
         max_iter = max_iter or self.MAX_ITER
-        iterator = self.generator()
         total_time = 0.0
         point_nb = 0
         interval_nb = None
-        try:
-            if not with_time:
-                try:
-                    start_pos = self.motion.readPosition(force=True)
-                    v_motors = self.get_virtual_motors()
-                    motion_time, acq_time = 0.0, 0.0
-                    while point_nb < max_iter:
-                        step = next(iterator)
-                        end_pos = step['positions']
-                        max_path_duration = 0.0
-                        for v_motor, start, stop in zip(v_motors,
-                                                        start_pos,
-                                                        end_pos):
-                            path = MotionPath(v_motor, start, stop)
-                            max_path_duration = max(
-                                max_path_duration, path.duration)
-                        integ_time = step.get("integ_time", 0.0)
-                        acq_time += integ_time
-                        motion_time += max_path_duration
-                        total_time += integ_time + max_path_duration
-                        point_nb += 1
-                        start_pos = end_pos
-                finally:
-                    if with_interval:
-                        interval_nb = self.macro.getIntervalEstimation()
-            else:
+        completed = True
+        if not with_time:
+            try:
+                start_pos = self.motion.readPosition(force=True)
+                v_motors = self.get_virtual_motors()
+                if hasattr(self.macro, "getScanPositions"):
+                    positions, integ_time = self.macro.getScanPositions()
+                    positions = np.asarray(positions, dtype=float)
+                    integ_time = np.broadcast_to(
+                        np.asarray(integ_time, dtype=float), len(positions))
+                else:
+                    positions, integ_time = [], []
+                    iterator = self.generator()
+                    try:
+                        while len(positions) < max_iter:
+                            step = next(iterator)
+                            positions.append(np.array(step['positions'],
+                                                      dtype=float))
+                            integ_time.append(step.get("integ_time", 0.0))
+                        else:
+                            completed = False
+                    except StopIteration:
+                        pass
+                point_nb = len(positions)
+                if point_nb > 0:
+                    motion_time = self._estimate_motion_time(
+                        v_motors, start_pos, positions)
+                    total_time = motion_time + float(np.sum(integ_time))
+            finally:
+                if with_interval:
+                    interval_nb = self.macro.getIntervalEstimation()
+        else:
+            iterator = self.generator()
+            try:
                 try:
                     while point_nb < max_iter:
-                        step = next(iterator)
+                        next(iterator)
                         point_nb += 1
-                finally:
-                    total_time = self.macro.getTimeEstimation()
-        except StopIteration:
-            pass
-        else:
+                    else:
+                        completed = False
+                except StopIteration:
+                    pass
+            finally:
+                total_time = self.macro.getTimeEstimation()
+        if not completed:
             # max iteration reached.
             total_time = -total_time
             point_nb = -point_nb
@@ -906,6 +923,32 @@ class GScan(Logger):
                 self.warning("Estimation of intervals have not succeeded")
         return total_time, interval_nb
 
+    @staticmethod
+    def _estimate_motion_time(v_motors, start_pos, positions):
+        """Estimate motion time of a scan - sum of the longest motion
+        (of all the moveables) of each step.
+
+        :param v_motors: virtual motors of the moveables
+        :type v_motors: seq<:class:`~sardana.util.motion.Motor`>
+        :param start_pos: positions of the moveables before the scan
+        :type start_pos: seq<float>
+        :param positions: positions of all the scan points
+            (nb_points, nb_moveables)
+        :type positions: seq<seq<float>>
+        :return: motion time
+        :rtype: float
+        """
+        positions = np.asarray(positions, dtype=float)
+        positions = positions.reshape(len(positions), -1)
+        max_durations = np.zeros(len(positions))
+        for v_motor, start, final in zip(v_motors, start_pos, positions.T):
+            initial = np.empty_like(final)
+            initial[0] = start
+            initial[1:] = final[:-1]
+            durations = motion_durations(v_motor, initial, final)
+            np.maximum(max_durations, durations, out=max_durations)
+        return float(np.sum(max_durations))
+
     @property
     def data(self):
         """Scan data."""
@@ -968,10 +1011,6 @@ class GScan(Logger):
             env['delaytime'] = total_time - acq_time - env['motiontime']
 
         self.data.end()
-        try:
-            scan_history = self.macro.getEnv('ScanHistory')
-        except UnknownEnv:
-            scan_history = []
 
         scan_file = env['ScanFile']
         if isinstance(scan_file, str):
@@ -985,10 +1024,24 @@ class GScan(Logger):
                        ScanFile=scan_file, ScanDir=env['ScanDir'],
                        endstatus=ScanEndStatus.whatis(env['endstatus']),
                        channels=names)
-        scan_history.append(history)
-        while len(scan_history) > self.MAX_SCAN_HISTORY:
-            scan_history.pop(0)
-        self.macro.setEnv('ScanHistory', scan_history)
+        scan_catalog = self.macro.getMacroServer().scan_catalog
+        if scan_catalog is not None:
+            try:
+                scan_catalog.append(history)
+            except Exception:
+                self.macro.warning("Failed to add scan to the catalog")
+                self.macro.debug("Details:", exc_info=1)
+        mirror = getattr(sardanacustomsettings, "MS_SCAN_HISTORY_MIRROR",
+                         True)
+        if scan_catalog is None or mirror:
+            try:
+                scan_history = self.macro.getEnv('ScanHistory')
+            except UnknownEnv:
+                scan_history = []
+            scan_history.append(history)
+            while len(scan_history) > self.MAX_SCAN_HISTORY:
+                scan_history.pop(0)
+            self.macro.setEnv('ScanHistory', scan_history)
 
     def scan(self):
         for _ in self.step_scan():
@@ -1059,13 +1112,16 @@ class SScan(GScan):
         scream = False
 
         self._deterministic_scan = False
+        self._prepared_integ_time = None
         if hasattr(macro, "nb_points"):
             nb_points = float(macro.nb_points)
             if hasattr(macro, "integ_time"):
+                # prepare measurement group once for all the points,
+                # so each step requires just start and value readout
                 integ_time = macro.integ_time
-                self.measurement_group.putIntegrationTime(integ_time)
-                self.measurement_group.setNbStarts(nb_points)
-                self.measurement_group.prepare()
+                self.measurement_group.prepare_count(integ_time,
+                                                     int(nb_points))
+                self._prepared_integ_time = integ_time
                 self._deterministic_scan = True
             scream = True
         else:
@@ -1151,6 +1207,11 @@ class SScan(GScan):
         integ_time = step['integ_time']
         # Acquire data
         self.debug("[START] acquisition")
+        if self._deterministic_scan \
+                and integ_time != self._prepared_integ_time:
+            # steps with a different integration time require preparation
+            # for each count
+            self._deterministic_scan = False
         if self._deterministic_scan:
             state, data_line = mg.count_raw()
         else:
@@ -1965,7 +2026,8 @@ class CAcquisition(object):
     def value_buffer_changed(self, channel, value_buffer):
         """Delegate processing of value buffer events to a worker thread."""
         # value_buffer is a dictionary with at least keys: data, index
-        # and its values are of type sequence
+        # and its values are of type sequence or numpy.ndarray (when
+        # using binary codecs)
         # e.g. dict(data=seq<float>, index=seq<int>)
         if value_buffer is None:
             return
@@ -1974,9 +2036,9 @@ class CAcquisition(object):
 
         info = {'label': full_name}
         if self._index_offset != 0:
-            idx = np.array(value_buffer['index'])
-            idx += self._index_offset
-            value_buffer['index'] = idx.tolist()
+            # binary codecs provide read-only arrays so make a new one
+            value_buffer['index'] = \
+                np.asarray(value_buffer['index']) + self._index_offset
         info.update(value_buffer)
         # info is a dictionary with at least keys: label, data,
         # index and its values are of type string for label and
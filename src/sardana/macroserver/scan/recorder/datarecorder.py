@@ -25,26 +25,285 @@
 
 """This is the macro server scan data recorder module"""
 
-__all__ = ["SaveModes", "RecorderStatus", "DataHandler", "DataRecorder"]
+__all__ = ["SaveModes", "RecorderStatus", "BackpressurePolicy",
+           "DataHandler", "DataRecorder", "RecorderWorker"]
 
 __docformat__ = 'restructuredtext'
 
 import time
+import queue
+import pickle
+import tempfile
+import threading
 
 from taurus.core.util.log import Logger
 from taurus.core.util.enumeration import Enumeration
 
+from sardana import sardanacustomsettings
+
 SaveModes = Enumeration('SaveModes', ('Record', 'Block'))
 RecorderStatus = Enumeration('RecorderStatus', ('Idle', 'Active', 'Disable'))
+BackpressurePolicy = Enumeration('BackpressurePolicy',
+                                 ('Block', 'Spool', 'Coalesce'))
+
+
+class _RecordBuffer(object):
+    """In memory FIFO of records which did not fit in the worker queue."""
+
+    def __init__(self):
+        self._records = []
+
+    def __len__(self):
+        return len(self._records)
+
+    def put(self, record):
+        self._records.append(record)
+
+    def take(self):
+        records, self._records = self._records, []
+        return records
+
+    def close(self):
+        self._records = []
+
+
+class _RecordSpool(object):
+    """FIFO of records which did not fit in the worker queue spooled to
+    a temporary file."""
+
+    def __init__(self):
+        self._file = None
+        self._nb_records = 0
+
+    def __len__(self):
+        return self._nb_records
+
+    def put(self, record):
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix="sardana_spool_")
+        pickle.dump(record, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._nb_records += 1
+
+    def take(self):
+        f, nb_records = self._file, self._nb_records
+        self._file, self._nb_records = None, 0
+        if f is None:
+            return []
+        # records are loaded lazily (when iterated) so the spool
+        # is released as soon as possible
+        return self._load(f, nb_records)
+
+    @staticmethod
+    def _load(f, nb_records):
+        try:
+            f.seek(0)
+            for _ in range(nb_records):
+                yield pickle.load(f)
+        finally:
+            f.close()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        self._file, self._nb_records = None, 0
+
+
+class RecorderWorker(Logger):
+    """Worker thread which passes the records to a recorder.
+
+    The records are put in a bounded queue and are written by the worker
+    in batches (see :meth:`DataRecorder.writeRecords`) so a slow recorder
+    does not stall the scan. When the queue is full the backpressure policy
+    applies:
+
+    - :attr:`BackpressurePolicy.Block` - wait until there is room
+      in the queue
+    - :attr:`BackpressurePolicy.Spool` - spool the records to a temporary
+      file on disk
+    - :attr:`BackpressurePolicy.Coalesce` - coalesce the records in memory
+      into a single batch (memory is not bounded)
+
+    The order of the records and other calls (e.g. custom data or end of
+    the record list) is always preserved.
+
+    .. note::
+        The RecorderWorker class has been included in Sardana
+        on a provisional basis. Backwards incompatible changes
+        (up to and including removal of the class) may occur if
+        deemed necessary by the core developers.
+    """
+
+    def __init__(self, recorder, queue_size=100,
+                 backpressure=BackpressurePolicy.Block):
+        name = "%s(%s)" % (self.__class__.__name__,
+                           recorder.__class__.__name__)
+        self.call__init__(Logger, name)
+        self.recorder = recorder
+        self.backpressure = backpressure
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._cond = threading.Condition()
+        if backpressure == BackpressurePolicy.Spool:
+            self._overflow = _RecordSpool()
+        else:
+            self._overflow = _RecordBuffer()
+        self._error = None
+        self._error_reported = False
+        #: number of records already processed (written) by the recorder
+        self.nb_processed = 0
+        self._thread = threading.Thread(target=self._run, name=name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _raise_error(self):
+        if self._error is None or self._error_reported:
+            return
+        self._error_reported = True
+        raise self._error
+
+    def putRecord(self, record):
+        """Put a record to be written by the recorder.
+
+        :raises: exception raised by the recorder when writing previous
+            records
+        """
+        self.putRecords([record])
+
+    def putRecords(self, records):
+        """Put a batch of records to be written by the recorder.
+
+        :raises: exception raised by the recorder when writing previous
+            records
+        """
+        self._raise_error()
+        task = "records", list(records)
+        if self.backpressure == BackpressurePolicy.Block:
+            self._queue.put(task)
+            return
+        with self._cond:
+            if len(self._overflow) > 0 or self._queue.full():
+                for record in task[1]:
+                    self._overflow.put(record)
+            else:
+                self._queue.put_nowait(task)
+
+    def _put_task(self, task):
+        with self._cond:
+            # the overflow records must go first
+            while len(self._overflow) > 0:
+                self._cond.wait()
+        # do not block on the full queue holding the condition: the worker
+        # needs it to take the overflow records
+        self._queue.put(task)
+
+    def putCall(self, method, *args, **kwargs):
+        """Put a recorder method call which must be executed after all the
+        records put so far.
+
+        :raises: exception raised by the recorder when processing previous
+            records or calls
+        """
+        self._raise_error()
+        self._put_task(("call", (method, args, kwargs)))
+
+    def stop(self, method=None, *args, **kwargs):
+        """Wait until all the pending records and calls are processed and
+        stop the worker. Optionally, execute the last recorder method call
+        e.g. to end the record list.
+
+        :raises: exception raised by the recorder and not yet reported
+        """
+        if method is not None:
+            self._put_task(("call", (method, args, kwargs)))
+        self._put_task(("stop", None))
+        self._thread.join()
+        self._overflow.close()
+        self._raise_error()
+
+    def _process(self, task):
+        kind, payload = task
+        if kind == "records":
+            # do not write more records after a failure (as it happens when
+            # the recorder is used synchronously)
+            try:
+                if self._error is None:
+                    self.recorder.writeRecords(payload)
+            finally:
+                self.nb_processed += len(payload)
+        elif kind == "call":
+            method, args, kwargs = payload
+            method(*args, **kwargs)
+
+    def _take_overflow(self):
+        with self._cond:
+            if not self._queue.empty() or len(self._overflow) == 0:
+                return None
+            records = self._overflow.take()
+            self._cond.notify_all()
+        return "records", records
+
+    def _run(self):
+        task = None
+        while True:
+            if task is None:
+                task = self._take_overflow()
+                if task is None:
+                    task = self._queue.get()
+            kind, payload = task
+            if kind == "stop":
+                break
+            next_task = None
+            if kind == "records":
+                # batch all the records which are already waiting
+                records = list(payload)
+                while True:
+                    try:
+                        next_task = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if next_task[0] != "records":
+                        break
+                    records.extend(next_task[1])
+                    next_task = None
+                task = kind, records
+            try:
+                self._process(task)
+            except Exception as e:
+                if self._error is None:
+                    self._error = e
+                self.error("%s failed to process %s", self.recorder, kind)
+                self.debug("Details:", exc_info=1)
+            task = next_task
 
 
 class DataHandler:
     """ The data handler is the data recording center of a system. It contains
     one or several recorders.  All data transit through the handler, then
-    given to recorders for final saving """
+    given to recorders for final saving
 
-    def __init__(self):
+    Optionally, the records may be passed to each recorder by its own worker
+    (see :class:`RecorderWorker`). By default it is configured with the
+    ``SCAN_RECORDER_ASYNC``, ``SCAN_RECORDER_QUEUE_SIZE`` and
+    ``SCAN_RECORDER_BACKPRESSURE`` sardana custom settings.
+    """
+
+    def __init__(self, asynchronous=None, queue_size=None,
+                 backpressure=None):
         self.recorders = []
+        if asynchronous is None:
+            asynchronous = getattr(sardanacustomsettings,
+                                   "SCAN_RECORDER_ASYNC", False)
+        if queue_size is None:
+            queue_size = getattr(sardanacustomsettings,
+                                 "SCAN_RECORDER_QUEUE_SIZE", 100)
+        if backpressure is None:
+            backpressure = getattr(sardanacustomsettings,
+                                   "SCAN_RECORDER_BACKPRESSURE", "block")
+        if isinstance(backpressure, str):
+            backpressure = BackpressurePolicy[backpressure.capitalize()]
+        self.asynchronous = asynchronous
+        self.queue_size = queue_size
+        self.backpressure = backpressure
+        self._workers = {}
 
     def addRecorder(self, recorder):
         if recorder is not None:
@@ -54,21 +313,66 @@ class DataHandler:
         for recorder in self.recorders:
             if recorder.savemode is SaveModes.Record:
                 recorder.startRecordList(recordlist)
+                if self.asynchronous:
+                    worker = RecorderWorker(recorder, self.queue_size,
+                                            self.backpressure)
+                    self._workers[recorder] = worker
 
     def endRecordList(self, recordlist):
+        workers, self._workers = self._workers, {}
+        error = None
         for recorder in self.recorders:
             if recorder.savemode is SaveModes.Record:
-                recorder.endRecordList(recordlist)
+                worker = workers.get(recorder)
+                if worker is None:
+                    recorder.endRecordList(recordlist)
+                    continue
+                # pending records are flushed before ending the record list
+                try:
+                    worker.stop(recorder.endRecordList, recordlist)
+                except Exception as e:
+                    error = error or e
             else:
                 recorder.writeRecordList(recordlist)
+        if error is not None:
+            raise error
 
     def addRecord(self, recordlist, record):
         for recorder in self.recorders:
             if recorder.savemode is SaveModes.Record:
-                recorder.writeRecord(record)
+                worker = self._workers.get(recorder)
+                if worker is None:
+                    recorder.writeRecord(record)
+                else:
+                    worker.putRecord(record)
             else:  # blockSave
                 pass
 
+    def getNbConsumedRecords(self):
+        """Returns the number of records of the current record list already
+        consumed by all the recorders.
+
+        :return: number of consumed records or None if the recorders consume
+            the records as soon as they are passed to the data handler
+            (no recorder workers)
+        :rtype: int or None
+        """
+        if len(self._workers) == 0:
+            return None
+        workers = list(self._workers.values())
+        return min(worker.nb_processed for worker in workers)
+
+    def addRecords(self, recordlist, records):
+        """Pass a batch of consecutive records to the recorders (see
+        :meth:`DataRecorder.writeRecords`)."""
+        for recorder in self.recorders:
+            if recorder.savemode is SaveModes.Record:
+                worker = self._workers.get(recorder)
+                if worker is None:
+                    recorder.writeRecords(records)
+                else:
+                    worker.putRecords(records)
+
     def addCustomData(self, value, name, **kwargs):
         '''Write data other than a record.
 
@@ -82,7 +386,11 @@ class DataHandler:
         method of each recorder to see what they use/require.
         '''
         for recorder in self.recorders:
-            recorder.addCustomData(value, name, **kwargs)
+            worker = self._workers.get(recorder)
+            if worker is None:
+                recorder.addCustomData(value, name, **kwargs)
+            else:
+                worker.putCall(recorder.addCustomData, value, name, **kwargs)
 #
 # Recorders
 #
@@ -141,6 +449,25 @@ class DataRecorder(Logger):
     def writeRecord(self, record):
         self._writeRecord(record)
 
+    def writeRecords(self, records):
+        """Write a batch of records.
+
+        Default implementation writes the records one by one. Recorders
+        which can write a batch more efficiently (e.g. in one file access)
+        may override it.
+
+        .. note::
+            The writeRecords method has been included in Sardana
+            on a provisional basis. Backwards incompatible changes
+            (up to and including removal of the method) may occur if
+            deemed necessary by the core developers.
+
+        :param records: records to be written
+        :type records: seq<:class:`~sardana.macroserver.scan.scandata.Record`>
+        """
+        for record in records:
+            self.writeRecord(record)
+
     def _writeRecord(self, record):
         pass
 
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""This module contains the class definition for the MacroServer scan
+catalog"""
+
+__all__ = ["ScanCatalog"]
+
+__docformat__ = 'restructuredtext'
+
+import os
+import json
+import bisect
+import threading
+
+
+class ScanCatalog(object):
+    """Append-only catalog of the executed scans. Each scan is a dict (see
+    :meth:`GScan.end`) stored as a JSON encoded line of a file.
+
+    The catalog is indexed in memory (when opened) by serial number, start
+    time, macro name (first word of the title) and channels so the lookups
+    only read the matching scans from the file."""
+
+    def __init__(self, filename):
+        self._filename = filename
+        self._lock = threading.RLock()
+        # record number -> file offset
+        self._offsets = []
+        # serial number -> record numbers
+        self._by_serialno = {}
+        # sorted list of (start timestamp, record number)
+        self._by_time = []
+        # macro name -> record numbers
+        self._by_macro = {}
+        # channel name -> record numbers
+        self._by_channel = {}
+        # record numbers of the scans stored in files
+        self._saved = []
+        if os.path.exists(filename):
+            self._load()
+        self._file = open(filename, "ab")
+        self._reader = open(filename, "rb")
+
+    @property
+    def filename(self):
+        return self._filename
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _load(self):
+        with open(self._filename, "rb") as f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # discard the scan torn by a crash
+                    break
+                try:
+                    scan = json.loads(line.decode("utf-8"))
+                except ValueError:
+                    pass
+                else:
+                    self._index(scan, offset)
+                offset += len(line)
+            size = f.seek(0, os.SEEK_END)
+        if offset < size:
+            with open(self._filename, "r+b") as f:
+                f.truncate(offset)
+
+    @staticmethod
+    def _get_macro_name(title):
+        words = (title or "").split(None, 1)
+        if words:
+            return words[0]
+
+    @staticmethod
+    def _is_saved(scan):
+        return scan.get("ScanDir") is not None and \
+            scan.get("ScanFile") is not None
+
+    def _index(self, scan, offset):
+        rec_nb = len(self._offsets)
+        self._offsets.append(offset)
+        self._by_serialno.setdefault(scan.get("serialno"), []).append(rec_nb)
+        bisect.insort(self._by_time, (scan.get("startts") or 0, rec_nb))
+        macro_name = self._get_macro_name(scan.get("title"))
+        self._by_macro.setdefault(macro_name, []).append(rec_nb)
+        for channel in scan.get("channels") or ():
+            self._by_channel.setdefault(channel, []).append(rec_nb)
+        if self._is_saved(scan):
+            self._saved.append(rec_nb)
+
+    def _read(self, rec_nb):
+        self._reader.seek(self._offsets[rec_nb])
+        return json.loads(self._reader.readline().decode("utf-8"))
+
+    def append(self, scan):
+        """Appends a scan to the catalog
+
+        :param scan: the scan information
+        :type scan: dict"""
+        line = json.dumps(scan, default=str) + "\n"
+        with self._lock:
+            offset = self._file.seek(0, os.SEEK_END)
+            self._file.write(line.encode("utf-8"))
+            self._file.flush()
+            self._index(scan, offset)
+
+    def get(self, serialno):
+        """Returns the latest scan with the given serial number
+
+        :param serialno: the scan serial number
+        :type serialno: int
+        :return: the scan information or None if not found
+        :rtype: dict"""
+        scans = self.find(serialno=serialno, limit=1)
+        if scans:
+            return scans[0]
+
+    def find(self, serialno=None, start=None, end=None, title=None,
+             channel=None, saved=None, limit=None):
+        """Returns the scans matching all the given criteria, the latest
+        first
+
+        :param serialno: scan serial number
+        :type serialno: int
+        :param start: scans started at or after this timestamp
+        :type start: float
+        :param end: scans started at or before this timestamp
+        :type end: float
+        :param title: scans whose title starts with this string
+        :type title: str
+        :param channel: scans with this channel
+        :type channel: str
+        :param saved: scans stored (or not stored) in files
+        :type saved: bool
+        :param limit: maximum number of scans to return
+        :type limit: int
+        :return: the scans information
+        :rtype: list<dict>"""
+        with self._lock:
+            candidates = self._get_candidates(serialno, start, end, title,
+                                              channel, saved)
+            scans = []
+            for rec_nb in reversed(candidates):
+                if limit is not None and len(scans) >= limit:
+                    break
+                scan = self._read(rec_nb)
+                if serialno is not None and scan.get("serialno") != serialno:
+                    continue
+                start_ts = scan.get("startts") or 0
+                if start is not None and start_ts < start:
+                    continue
+                if end is not None and start_ts > end:
+                    continue
+                if title is not None and \
+                        not (scan.get("title") or "").startswith(title):
+                    continue
+                if channel is not None and \
+                        channel not in (scan.get("channels") or ()):
+                    continue
+                if saved is not None and self._is_saved(scan) != saved:
+                    continue
+                scans.append(scan)
+            return scans
+
+    def _get_candidates(self, serialno, start, end, title, channel, saved):
+        """Returns the record numbers (in ascending order) given by the most
+        selective index"""
+        if serialno is not None:
+            return self._by_serialno.get(serialno, [])
+        if channel is not None:
+            return self._by_channel.get(channel, [])
+        if title is not None:
+            macro_name = self._get_macro_name(title)
+            if macro_name is not None and " " in title.strip():
+                return self._by_macro.get(macro_name, [])
+            # the title may only be the beginning of the macro name
+            return sorted(rec_nb
+                          for name, rec_nbs in self._by_macro.items()
+                          if (name or "").startswith(title.strip())
+                          for rec_nb in rec_nbs)
+        if start is not None or end is not None:
+            by_time = self._by_time
+            lo = 0
+            if start is not None:
+                lo = bisect.bisect_left(by_time, (start, -1))
+            hi = len(by_time)
+            if end is not None:
+                hi = bisect.bisect_right(by_time, (end, len(by_time)))
+            return sorted(rec_nb for _, rec_nb in by_time[lo:hi])
+        if saved:
+            return self._saved
+        return range(len(self._offsets))
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+            self._reader.close()
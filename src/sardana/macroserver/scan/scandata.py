@@ -26,10 +26,16 @@
 """This is the macro server scan data module"""
 
 __all__ = ["ColumnDesc", "MoveableDesc", "Record", "RecordEnvironment",
-           "ScanDataEnvironment", "RecordList", "ScanData", "ScanFactory"]
+           "ScanDataEnvironment", "RecordList", "SpooledRecords", "ScanData",
+           "ScanFactory"]
 
+import os
 import copy
 import math
+import mmap
+import array
+import pickle
+import tempfile
 
 from taurus.core.util.singleton import Singleton
 from taurus import Device, Attribute, getSchemeFromName, Factory
@@ -37,6 +43,7 @@ from taurus.core.taurusexception import TaurusException
 from taurus.core import TaurusElementType
 from taurus import Release as taurus_release
 
+from sardana import sardanacustomsettings
 from sardana.macroserver.scan.recorder import DataHandler
 
 
@@ -293,12 +300,130 @@ class ScanDataEnvironment(RecordEnvironment):
     needed = ['title', 'labels', 'user']
 
 
+class SpooledRecords(object):
+    """A list of records (append only) where the released records are moved
+    from memory to a temporary spool file. The spooled records are still
+    accessible (by index, slice or iteration) - they are loaded on demand
+    from the memory mapped spool file.
+
+    .. note::
+        Records loaded from the spool are copies - modifying them does not
+        modify the spooled records.
+
+    .. note::
+        The SpooledRecords class has been included in Sardana
+        on a provisional basis. Backwards incompatible changes
+        (up to and including removal of the class) may occur if
+        deemed necessary by the core developers.
+    """
+
+    def __init__(self):
+        self._records = {}
+        self._len = 0
+        self._nb_released = 0
+        self._offsets = array.array('q')
+        self._sizes = array.array('q')
+        self._file = None
+        self._map = None
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for idx in range(self._len):
+            yield self[idx]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self._len))]
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError("record index out of range")
+        if idx < self._nb_released:
+            return self._load(idx)
+        return self._records[idx]
+
+    # pickle (and copy) as a plain list
+    def __reduce__(self):
+        return list, (list(self),)
+
+    @property
+    def nb_released(self):
+        """Number of records moved to the spool file"""
+        return self._nb_released
+
+    @property
+    def nb_in_memory(self):
+        """Number of records kept in memory"""
+        return len(self._records)
+
+    def append(self, record):
+        self._records[self._len] = record
+        self._len += 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def release(self, stop):
+        """Move the records with index lower than stop to the spool file
+
+        :param stop: index of the first record to be kept in memory
+        :type stop: int
+        """
+        stop = min(stop, self._len)
+        if stop <= self._nb_released:
+            return
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix="sardana_records_")
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        for idx in range(self._nb_released, stop):
+            data = pickle.dumps(self._records.pop(idx),
+                                protocol=pickle.HIGHEST_PROTOCOL)
+            self._file.write(data)
+            self._offsets.append(offset)
+            self._sizes.append(len(data))
+            offset += len(data)
+        self._nb_released = stop
+
+    def _load(self, idx):
+        offset = self._offsets[idx]
+        end = offset + self._sizes[idx]
+        if self._map is None or end > len(self._map):
+            # (re)map the spool file - it has grown since the last mapping
+            self._file.flush()
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        return pickle.loads(self._map[offset:end])
+
+    def close(self):
+        """Close (and remove) the spool file"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
 class RecordList(dict):
     """  A RecordList is a set of records: for example a scan.
-    It is composed of a environment and a list of records"""
+    It is composed of a environment and a list of records
+
+    In the streaming mode (see ``SCAN_DATA_STREAMING`` sardana custom
+    setting) the records already consumed by the recorders are released
+    from memory to a spool file (all but the last one, needed for the
+    interpolation), so the memory used by the record list does not grow
+    with the number of records. The records are still accessible with
+    :attr:`records` and with the record number as the key."""
 
     def __init__(self, datahandler, environ=None, apply_interpolation=False,
-                 apply_extrapolation=False, initial_data=None):
+                 apply_extrapolation=False, initial_data=None,
+                 streaming=None):
 
         self.datahandler = datahandler
         self.apply_interpolation = apply_interpolation
@@ -308,7 +433,14 @@ class RecordList(dict):
             self.environ = RecordEnvironment()
         else:
             self.environ = environ
-        self.records = []
+        if streaming is None:
+            streaming = getattr(sardanacustomsettings,
+                                "SCAN_DATA_STREAMING", False)
+        self.streaming = streaming
+        if streaming:
+            self.records = SpooledRecords()
+        else:
+            self.records = []
         # currentIndex indicates the place in the records list
         # where the next completed record will be written
         self.currentIndex = 0
@@ -317,6 +449,27 @@ class RecordList(dict):
     def __getstate__(self):
         return dict(datahandler=None, environ=None, records=self.records)
 
+    def __missing__(self, key):
+        # in streaming mode the released records are not kept in the dict
+        if self.streaming and isinstance(key, int) \
+                and 0 <= key < self.currentIndex:
+            return self.records[key]
+        raise KeyError(key)
+
+    def _releaseRecords(self):
+        """In streaming mode, release the records already consumed by the
+        recorders but the last one (used by the interpolation)"""
+        if not self.streaming:
+            return
+        stop = self.currentIndex - 1
+        # the recorder workers may still be writing the records
+        nb_consumed = self.datahandler.getNbConsumedRecords()
+        if nb_consumed is not None:
+            stop = min(stop, nb_consumed)
+        for idx in range(self.records.nb_released, stop):
+            dict.pop(self, idx, None)
+        self.records.release(stop)
+
     def setEnviron(self, environ):
         self.environ = environ
 
@@ -353,6 +506,12 @@ class RecordList(dict):
             self.labels.append(dataDesc.name)
         for label in self.labels:
             self.columnIndexDict[label] = 0
+        # number of channels per column index - used to track the index of
+        # the first not completed record (the minimum of the channels
+        # column indexes) without checking all the channels
+        self._channelSet = set(self.channelLabels)
+        self._columnIndexCount = {0: len(self._channelSet)}
+        self._completeIndex = 0
         ####
         self.datahandler.startRecordList(self)
 
@@ -379,10 +538,30 @@ class RecordList(dict):
         self.recordno += 1
 
     def initRecords(self, nb_records):
-        '''Call nb_records times initRecord method
+        '''Init nb_records dummy records (see initRecord) and add them
+        to the records list in one block.
         '''
-        for _ in range(nb_records):
-            self.initRecord()
+        start = self.recordno
+        stop = start + nb_records
+        initial_data = self.initial_data or {}
+        template = {'point_nb': None, 'timestamp': None}
+        template.update(dict.fromkeys(self.channelLabels, float('NaN')))
+        template.update(dict.fromkeys(self.refMoveablesLabels))
+        block = []
+        for recordno in range(start, stop):
+            if recordno in initial_data:
+                self.records.extend(block)
+                block = []
+                self.recordno = recordno
+                self.initRecord()
+                continue
+            data = dict(template)
+            data['point_nb'] = recordno
+            rc = Record(data)
+            rc.setRecordNo(recordno)
+            block.append(rc)
+        self.records.extend(block)
+        self.recordno = stop
 
     def addRecord(self, record):
         rc = Record(record)
@@ -392,6 +571,7 @@ class RecordList(dict):
         self.recordno += 1
         self.datahandler.addRecord(self, rc)
         self.currentIndex += 1
+        self._releaseRecords()
 
     def applyZeroOrderInterpolation(self, record):
         ''' Apply a zero order interpolation to the given record
@@ -449,7 +629,9 @@ class RecordList(dict):
         idxs = data['index']
         # TODO: think if the ScanData.addData is the best API for
         # passing value references
-        rawData = data.get('value') or data.get('value_ref')
+        rawData = data.get('value')
+        if rawData is None:
+            rawData = data.get('value_ref')
 
 
         maxIdx = max(idxs)
@@ -460,34 +642,62 @@ class RecordList(dict):
         if missingRecords < 0:
             missingRecords = abs(missingRecords)
             self.initRecords(missingRecords)
+        records = self.records
         for idx, value in zip(idxs, rawData):
-            rc = self.records[idx]
+            rc = records[idx]
             rc.setRecordNo(idx)
             rc.data[label] = value
-            self.columnIndexDict[label] = idx + 1
+        self._setColumnIndex(label, idx + 1)
         self.tryToAdd(idx, label)
 
+    def _setColumnIndex(self, label, index):
+        """Set the column index of the label and update the index of the
+        first not completed record"""
+        old_index = self.columnIndexDict.get(label)
+        self.columnIndexDict[label] = index
+        if label not in self._channelSet or index == old_index:
+            return
+        count = self._columnIndexCount
+        count[old_index] -= 1
+        if count[old_index] == 0:
+            del count[old_index]
+        count[index] = count.get(index, 0) + 1
+        if index < self._completeIndex:
+            self._completeIndex = index
+        elif old_index == self._completeIndex:
+            # the minimum only moves forward - amortized O(1)
+            while self._completeIndex not in count:
+                self._completeIndex += 1
+
+    def _getCompleteIndex(self):
+        """Index of the first not completed record"""
+        if not self._channelSet:
+            return len(self.records)
+        return self._completeIndex
+
     def tryToAdd(self, idx, label):
         start = self.currentIndex
+        stop = min(idx + 1, self._getCompleteIndex())
+        if stop <= start:
+            return
         # apply extrapolation only at the beginning of the record list
         apply_extrapolation = (self.apply_extrapolation and start == 0)
-        for i in range(start, idx + 1):
-            if self.isRecordCompleted(i):
-                rc = self.records[i]
-                if apply_extrapolation:
-                    self.applyExtrapolation(rc)
-                self[self.currentIndex] = rc
-                if self.apply_interpolation:
-                    self.applyZeroOrderInterpolation(rc)
-                self.datahandler.addRecord(self, rc)
-                self.currentIndex += 1
+        records = self.records[start:stop]
+        for rc in records:
+            rc.completed = 1
+            if apply_extrapolation:
+                self.applyExtrapolation(rc)
+            self[self.currentIndex] = rc
+            if self.apply_interpolation:
+                self.applyZeroOrderInterpolation(rc)
+            self.currentIndex += 1
+        self.datahandler.addRecords(self, records)
+        self._releaseRecords()
 
     def isRecordCompleted(self, recordno):
-        rc = self.records[recordno]
-        for label in self.channelLabels:
-            if self.columnIndexDict[label] <= self.currentIndex:
-                return False
-        rc.completed = 1
+        if recordno >= self._getCompleteIndex():
+            return False
+        self.records[recordno].completed = 1
         return True
 
     def addRecords(self, records):
@@ -495,14 +705,19 @@ class RecordList(dict):
 
     def end(self):
         start = self.currentIndex
-        for i in range(start, len(self.records)):
-            rc = self.records[i]
+        records = self.records[start:len(self.records)]
+        for rc in records:
             self[self.currentIndex] = rc
             if self.apply_interpolation:
                 self.applyZeroOrderInterpolation(rc)
-            self.datahandler.addRecord(self, rc)
             self.currentIndex += 1
-        self.datahandler.endRecordList(self)
+        if records:
+            self.datahandler.addRecords(self, records)
+        try:
+            self.datahandler.endRecordList(self)
+        finally:
+            # the recorders have consumed all the records by now
+            self._releaseRecords()
 
     def getDataHandler(self):
         return self.datahandler
@@ -511,10 +726,11 @@ class RecordList(dict):
 class ScanData(RecordList):
 
     def __init__(self, environment=None, data_handler=None,
-                 apply_interpolation=False, apply_extrapolation=False):
+                 apply_interpolation=False, apply_extrapolation=False,
+                 streaming=None):
         dh = data_handler or DataHandler()
         RecordList.__init__(self, dh, environment, apply_interpolation,
-                            apply_extrapolation)
+                            apply_extrapolation, streaming=streaming)
 
 
 class ScanFactory(Singleton):
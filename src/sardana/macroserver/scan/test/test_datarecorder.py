@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import time
+import threading
+
+from taurus.external import unittest
+from taurus.test import insertTest
+
+from sardana.macroserver.scan.scandata import Record
+from sardana.macroserver.scan.recorder import DataHandler, DataRecorder
+from sardana.macroserver.scan.recorder.datarecorder import RecorderWorker
+
+
+class SlowRecorder(DataRecorder):
+    """Recorder which keeps track of the calls and may be blocked"""
+
+    def __init__(self, *args, **kwargs):
+        DataRecorder.__init__(self, *args, **kwargs)
+        self.calls = []
+        self.batches = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail_on = None
+
+    def _startRecordList(self, recordlist):
+        self.calls.append("start")
+
+    def writeRecords(self, records):
+        self.gate.wait()
+        records = list(records)
+        self.batches.append(len(records))
+        DataRecorder.writeRecords(self, records)
+
+    def _writeRecord(self, record):
+        if record.recordno == self.fail_on:
+            raise RuntimeError("can not write record %d" % record.recordno)
+        self.calls.append(record.recordno)
+
+    def _addCustomData(self, value, name, **kwargs):
+        self.calls.append(name)
+
+    def _endRecordList(self, recordlist):
+        self.calls.append("end")
+
+
+def _record(recordno):
+    record = Record({"point_nb": recordno})
+    record.setRecordNo(recordno)
+    return record
+
+
+@insertTest(helper_name="record", backpressure="block")
+@insertTest(helper_name="record", backpressure="spool")
+@insertTest(helper_name="record", backpressure="coalesce")
+@insertTest(helper_name="record", backpressure=None, asynchronous=False)
+class DataHandlerTestCase(unittest.TestCase):
+    """Test synchronous and asynchronous passing of the records to the
+    recorders."""
+
+    def _create(self, backpressure, asynchronous=True):
+        dh = DataHandler(asynchronous=asynchronous, queue_size=2,
+                         backpressure=backpressure)
+        recorder = SlowRecorder()
+        dh.addRecorder(recorder)
+        return dh, recorder
+
+    def record(self, backpressure, asynchronous=True):
+        """Records and other calls must be passed in order."""
+        dh, recorder = self._create(backpressure, asynchronous)
+        nb_records = 20
+        dh.startRecordList(None)
+        if asynchronous:
+            # block the recorder for a while
+            recorder.gate.clear()
+            timer = threading.Timer(0.2, recorder.gate.set)
+            timer.start()
+        for i in range(nb_records):
+            dh.addRecord(None, _record(i))
+            if i == 9:
+                dh.addCustomData(None, "custom")
+        dh.endRecordList(None)
+        expected = ["start"] + list(range(10)) + ["custom"] + \
+            list(range(10, nb_records)) + ["end"]
+        self.assertEqual(recorder.calls, expected)
+        if asynchronous and backpressure != "block":
+            # some records were passed in batches
+            self.assertLess(len(recorder.batches), nb_records)
+
+    def test_error(self):
+        """Recorder errors are reported to the scan."""
+        dh, recorder = self._create("block")
+        recorder.fail_on = 1
+        dh.startRecordList(None)
+        dh.addRecord(None, _record(0))
+        dh.addRecord(None, _record(1))
+        time.sleep(0.1)
+        with self.assertRaises(RuntimeError):
+            dh.addRecord(None, _record(2))
+        dh.endRecordList(None)
+        self.assertEqual(recorder.calls, ["start", 0, "end"])
+
+
+class RecorderWorkerTestCase(unittest.TestCase):
+    """Test the recorder worker with a full queue."""
+
+    def test_stop_full_queue(self):
+        """Stop must not deadlock when the queue is full (block policy)."""
+        recorder = SlowRecorder()
+        worker = RecorderWorker(recorder, queue_size=1)
+
+        def write_records(records):
+            time.sleep(0.01)
+            SlowRecorder.writeRecords(recorder, records)
+        recorder.writeRecords = write_records
+        nb_records = 20
+        for i in range(nb_records):
+            worker.putRecord(_record(i))
+        stopper = threading.Thread(target=worker.stop,
+                                   args=(recorder.endRecordList, None))
+        stopper.daemon = True
+        stopper.start()
+        stopper.join(5)
+        self.assertFalse(stopper.is_alive(), "stop() did not return")
+        self.assertEqual(recorder.calls, list(range(nb_records)) + ["end"])
@@ -25,10 +25,12 @@
 
 import math
 import os
+import time
+import pickle
 from taurus.external import unittest
 from taurus.test import insertTest
 from sardana.macroserver.scan.scandata import ScanData
-from sardana.macroserver.scan.recorder import DataHandler
+from sardana.macroserver.scan.recorder import DataHandler, DataRecorder
 from sardana.macroserver.recorders.storage import NXscan_FileRecorder
 from sardana.macroserver.scan.test.helper import (createScanDataEnvironment,
                                                   DummyEventSource)
@@ -167,3 +169,165 @@ class ScanDataTestCase(unittest.TestCase):
 
     def tearDown(self):
         unittest.TestCase.tearDown(self)
+
+
+class _RecordsRecorder(DataRecorder):
+    """Recorder which keeps the received records data"""
+
+    def __init__(self, **pars):
+        DataRecorder.__init__(self, **pars)
+        self.data = []
+
+    def _writeRecord(self, record):
+        self.data.append(dict(record.data))
+
+
+class _SlowRecordsRecorder(_RecordsRecorder):
+    """Recorder which keeps the number of the records released by the scan
+    data before writing each batch of records"""
+
+    def __init__(self, **pars):
+        _RecordsRecorder.__init__(self, **pars)
+        self.scan_data = None
+        self.released = []
+
+    def writeRecords(self, records):
+        self.released.append((self.scan_data.records.nb_released,
+                              len(self.data)))
+        time.sleep(0.01)
+        _RecordsRecorder.writeRecords(self, records)
+
+
+class StreamingScanDataTestCase(unittest.TestCase):
+    """Use ScanData in streaming mode and verify that the records passed
+    to the recorders are released from memory but are still accessible.
+    """
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.recorder = _RecordsRecorder()
+        data_handler = DataHandler()
+        data_handler.addRecorder(self.recorder)
+        env = createScanDataEnvironment(["ch1", "ch2"])
+        self.scan_data = ScanData(environment=env,
+                                  data_handler=data_handler,
+                                  apply_interpolation=True,
+                                  streaming=True)
+
+    def test_streaming(self):
+        nb_records = 100
+        self.scan_data.start()
+        for i in range(0, nb_records, 10):
+            idx = list(range(i, i + 10))
+            self.scan_data.addData(dict(label="ch1", index=idx,
+                                        value=[float(j) for j in idx]))
+            # ch2 misses some values - interpolated
+            values = [float("nan") if j % 2 else float(j) for j in idx]
+            self.scan_data.addData(dict(label="ch2", index=idx,
+                                        value=values))
+            records = self.scan_data.records
+            self.assertLessEqual(records.nb_in_memory, 1)
+        self.scan_data.end()
+        records = self.scan_data.records
+        self.assertEqual(len(records), nb_records)
+        self.assertEqual(records.nb_released, nb_records - 1)
+        self.assertEqual(len(self.recorder.data), nb_records)
+        for i, record in enumerate(records):
+            self.assertEqual(record.recordno, i)
+            self.assertEqual(record.data, self.recorder.data[i])
+        self.assertEqual(records[-1].data["ch1"], nb_records - 1)
+        self.assertEqual(records[11].data["ch2"], 10.)
+        self.assertEqual(self.scan_data[11].data["ch2"], 10.)
+        self.assertEqual(len(records[5:8]), 3)
+        # pickled as a plain list
+        records = pickle.loads(pickle.dumps(records))
+        self.assertEqual(len(records), nb_records)
+        self.assertEqual(records[12].data["ch2"], 12.)
+
+    def test_streaming_async(self):
+        """Records are released only once consumed by the recorder
+        workers"""
+        nb_records = 50
+        recorder = _SlowRecordsRecorder()
+        data_handler = DataHandler(asynchronous=True, queue_size=100)
+        data_handler.addRecorder(recorder)
+        env = createScanDataEnvironment(["ch1"])
+        scan_data = ScanData(environment=env, data_handler=data_handler,
+                             streaming=True)
+        recorder.scan_data = scan_data
+        try:
+            scan_data.start()
+            for i in range(nb_records):
+                scan_data.addData(dict(label="ch1", index=[i],
+                                       value=[float(i)]))
+            scan_data.end()
+            for nb_released, nb_written in recorder.released:
+                self.assertLessEqual(nb_released, nb_written)
+            records = scan_data.records
+            self.assertEqual(records.nb_released, nb_records - 1)
+            self.assertEqual(len(recorder.data), nb_records)
+            for i, record in enumerate(records):
+                self.assertEqual(record.data, recorder.data[i])
+        finally:
+            scan_data.records.close()
+
+    def tearDown(self):
+        self.scan_data.records.close()
+        unittest.TestCase.tearDown(self)
+
+
+class _BatchesRecorder(_RecordsRecorder):
+    """Recorder which keeps the sizes of the received batches of records"""
+
+    def __init__(self, **pars):
+        _RecordsRecorder.__init__(self, **pars)
+        self.batches = []
+
+    def writeRecords(self, records):
+        self.batches.append(len(records))
+        _RecordsRecorder.writeRecords(self, records)
+
+
+class RecordCompletionTestCase(unittest.TestCase):
+    """Use ScanData and verify that the completed records are passed
+    to the recorders in batches and in order.
+    """
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.recorder = _BatchesRecorder()
+        data_handler = DataHandler()
+        data_handler.addRecorder(self.recorder)
+        env = createScanDataEnvironment(["ch1", "ch2", "ch3"])
+        self.scan_data = ScanData(environment=env,
+                                  data_handler=data_handler)
+
+    def _addData(self, label, start, stop):
+        idx = list(range(start, stop))
+        self.scan_data.addData(dict(label=label, index=idx,
+                                    value=[float(i) for i in idx]))
+
+    def test_completion(self):
+        self.scan_data.start()
+        self._addData("ch1", 0, 10)
+        self._addData("ch2", 0, 6)
+        self.assertEqual(self.recorder.batches, [])
+        self._addData("ch3", 0, 4)
+        self.assertEqual(self.recorder.batches, [4])
+        self._addData("ch3", 4, 10)
+        self.assertEqual(self.recorder.batches, [4, 2])
+        self._addData("ch2", 6, 8)
+        self._addData("ch1", 10, 12)
+        self.assertEqual(self.recorder.batches, [4, 2, 2])
+        self.assertFalse(self.scan_data.isRecordCompleted(8))
+        self.scan_data.end()
+        # the uncompleted records are passed at the end in one batch
+        self.assertEqual(self.recorder.batches, [4, 2, 2, 4])
+        self.assertEqual(len(self.recorder.data), 12)
+        for i, data in enumerate(self.recorder.data):
+            self.assertEqual(data["point_nb"], i)
+            self.assertEqual(data["ch1"], i)
+        self.assertTrue(math.isnan(self.recorder.data[10]["ch3"]))
+
+    def tearDown(self):
+        unittest.TestCase.tearDown(self)
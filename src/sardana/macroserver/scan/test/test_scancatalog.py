@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""Unit tests for scancatalog module"""
+
+import os
+import shutil
+import tempfile
+
+from taurus.external import unittest
+
+from sardana.macroserver.scan.scancatalog import ScanCatalog
+
+
+def _create_scan(serialno, title, startts, channels=("ct01",),
+                 saved=True):
+    scan = dict(serialno=serialno, title=title, startts=startts,
+                endts=startts + 1, channels=list(channels), ScanDir=None,
+                ScanFile=None)
+    if saved:
+        scan.update(ScanDir="/tmp", ScanFile=["scan.h5"])
+    return scan
+
+
+class ScanCatalogTestCase(unittest.TestCase):
+    """Test the lookups, persistence and crash recovery of the scan
+    catalog"""
+
+    def setUp(self):
+        self.dir_name = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.dir_name, "env.scans")
+        self.catalog = ScanCatalog(self.file_name)
+        self.catalog.append(_create_scan(1, "ascan mot01 0 1 10 0.1", 100))
+        self.catalog.append(_create_scan(2, "dscan mot02 -1 1 10 0.1", 200,
+                                         channels=("ct01", "ct02")))
+        self.catalog.append(_create_scan(3, "ascan mot02 0 1 10 0.1", 300,
+                                         saved=False))
+        self.catalog.append(_create_scan(4, "timescan 10 0.1", 400,
+                                         channels=("ct02",)))
+
+    def tearDown(self):
+        self.catalog.close()
+        shutil.rmtree(self.dir_name)
+
+    def _serialnos(self, scans):
+        return [scan["serialno"] for scan in scans]
+
+    def test_find(self):
+        catalog = self.catalog
+        self.assertEqual(catalog.get(2)["title"], "dscan mot02 -1 1 10 0.1")
+        self.assertIsNone(catalog.get(5))
+        self.assertEqual(self._serialnos(catalog.find()), [4, 3, 2, 1])
+        self.assertEqual(self._serialnos(catalog.find(limit=2)), [4, 3])
+        self.assertEqual(self._serialnos(catalog.find(start=150, end=300)),
+                         [3, 2])
+        self.assertEqual(self._serialnos(catalog.find(title="ascan")),
+                         [3, 1])
+        self.assertEqual(self._serialnos(catalog.find(title="ascan mot02")),
+                         [3])
+        self.assertEqual(self._serialnos(catalog.find(title="a")), [3, 1])
+        self.assertEqual(self._serialnos(catalog.find(channel="ct02")),
+                         [4, 2])
+        self.assertEqual(self._serialnos(catalog.find(saved=True, limit=1)),
+                         [4])
+        self.assertEqual(self._serialnos(catalog.find(saved=False)), [3])
+        self.assertEqual(
+            self._serialnos(catalog.find(channel="ct01", start=150)), [3, 2])
+
+    def test_reopen(self):
+        self.catalog.close()
+        # simulate a crash in the middle of appending a scan
+        with open(self.file_name, "ab") as f:
+            f.write(b'{"serialno": 5, "ti')
+        self.catalog = catalog = ScanCatalog(self.file_name)
+        self.assertEqual(len(catalog), 4)
+        catalog.append(_create_scan(5, "ascan mot01 0 1 10 0.1", 500))
+        self.assertEqual(self._serialnos(catalog.find(title="ascan")),
+                         [5, 3, 1])
+        self.assertEqual(catalog.get(5)["ScanFile"], ["scan.h5"])
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""Unit tests for msenvjournal module"""
+
+import os
+import shutil
+import tempfile
+
+from taurus.external import unittest
+
+from sardana.macroserver.msenvjournal import EnvironmentJournal
+
+
+class EnvironmentJournalTestCase(unittest.TestCase):
+    """Test the persistence, crash recovery and compaction of the
+    environment journal"""
+
+    def setUp(self):
+        self.dir_name = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.dir_name, "env.journal")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_name)
+
+    def test_persistence(self):
+        journal = EnvironmentJournal(self.file_name)
+        journal["ScanID"] = 1
+        journal["ScanDir"] = "/tmp"
+        journal["ScanID"] = 2
+        del journal["ScanDir"]
+        journal.close()
+        journal = EnvironmentJournal(self.file_name)
+        self.assertEqual(dict(journal), {"ScanID": 2})
+        self.assertEqual(journal.records, 4)
+        journal.close()
+
+    def test_torn_record(self):
+        journal = EnvironmentJournal(self.file_name)
+        journal["ScanID"] = 1
+        journal["ScanFile"] = ["file.h5"]
+        journal.close()
+        size = os.path.getsize(self.file_name)
+        # simulate a crash in the middle of writing the last record
+        with open(self.file_name, "r+b") as f:
+            f.truncate(size - 3)
+        journal = EnvironmentJournal(self.file_name)
+        self.assertEqual(dict(journal), {"ScanID": 1})
+        journal["ScanFile"] = ["other.h5"]
+        journal.close()
+        journal = EnvironmentJournal(self.file_name)
+        self.assertEqual(dict(journal),
+                         {"ScanID": 1, "ScanFile": ["other.h5"]})
+        journal.close()
+
+    def test_compaction(self):
+        journal = EnvironmentJournal(self.file_name)
+        nb_records = journal.COMPACT_MIN_RECORDS + 1
+        for i in range(nb_records):
+            journal["ScanID"] = i
+        self.assertEqual(journal.records, nb_records)
+        journal.sync()
+        self.assertEqual(journal.records, 1)
+        journal.close()
+        journal = EnvironmentJournal(self.file_name)
+        self.assertEqual(dict(journal), {"ScanID": nb_records - 1})
+        journal.close()
+
+    def test_not_a_journal(self):
+        with open(self.file_name, "wb") as f:
+            f.write(b"garbage")
+        self.assertRaises(ValueError, EnvironmentJournal, self.file_name)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""Unit tests for msmacroindex module"""
+
+import os
+import shutil
+import tempfile
+
+from taurus.external import unittest
+
+from sardana.sardanametaindex import NotIndexable, MetaIndex
+from sardana.macroserver.msparameter import Type, Optional, ParamRepeat
+from sardana.macroserver.msmacroindex import scan_macro_lib, \
+    encode_definition, decode_definition
+
+MACRO_LIB = b'''"""macro library doc"""
+
+import copy
+
+from sardana.macroserver.macro import Macro, macro, Type, Optional
+
+
+class _base(object):
+
+    hints = {"scan": "base", "allowsHooks": ("pre-scan",)}
+
+
+class mymacro(_base, Macro):
+    """mymacro doc"""
+
+    param_def = [["motor", Type.Moveable, None, "motor"],
+                 ["pos", Type.Float, Optional, "position"],
+                 ["channels", [["channel", Type.String, None, "channel"],
+                               {"min": 0}], None, "channels"]]
+
+    def run(self, motor, pos, channels):
+        pass
+
+
+class myrelmacro(mymacro):
+
+    hints = copy.deepcopy(_base.hints)
+    hints["scan"] = "rel"
+
+
+@macro([["value", Type.Integer, -1, "value"]])
+def myfunc(self, value):
+    """myfunc doc"""
+    pass
+
+
+@macro()
+def myvarfunc(self, *values):
+    pass
+
+
+@macro()
+def not_a_macro(*args, **kwargs):
+    pass
+
+
+def helper():
+    pass
+'''
+
+
+class MacroLibScannerTestCase(unittest.TestCase):
+    """Test the static extraction of the macros metadata"""
+
+    def setUp(self):
+        self.added_types = []
+        for type_name in ("Moveable", "Float", "String", "Integer", "Any"):
+            if not hasattr(Type, type_name):
+                Type.addType(type_name)
+                self.added_types.append(type_name)
+
+    def tearDown(self):
+        for type_name in self.added_types:
+            Type.removeType(type_name)
+
+    def _scan(self, source):
+        info = scan_macro_lib(source, "mylib.py")
+        return info, dict((m["name"], m) for m in info["macros"])
+
+    def test_scan(self):
+        info, macros = self._scan(MACRO_LIB)
+        self.assertEqual(info["description"], "macro library doc")
+        self.assertEqual(sorted(macros),
+                         ["myfunc", "mymacro", "myrelmacro", "myvarfunc"])
+        mymacro = macros["mymacro"]
+        self.assertEqual(mymacro["type"], "class")
+        self.assertEqual(mymacro["description"], "mymacro doc")
+        param_def = decode_definition(mymacro["param_def"])
+        self.assertIs(param_def[1][2], Optional)
+        self.assertEqual(param_def[2][1][1], {"min": 0})
+        self.assertEqual(mymacro["result_def"], [])
+        self.assertEqual(mymacro["hints"]["scan"], "base")
+        myrelmacro = macros["myrelmacro"]
+        self.assertEqual(myrelmacro["param_def"], mymacro["param_def"])
+        self.assertEqual(myrelmacro["hints"],
+                         {"scan": "rel", "allowsHooks": ["pre-scan"]})
+        myfunc = macros["myfunc"]
+        self.assertEqual(myfunc["type"], "function")
+        self.assertEqual(myfunc["param_def"],
+                         [["value", "Integer", -1, "value"]])
+        self.assertIsNone(myfunc["hints"])
+        myvarfunc = macros["myvarfunc"]
+        self.assertEqual(myvarfunc["param_def"],
+                         [["values", [["values", "Any", None,
+                                       "values parameter"]],
+                           None, "list of values"]])
+
+    def _assert_not_indexable(self, source):
+        self.assertRaises(NotIndexable, scan_macro_lib, source)
+
+    def test_conditional_definition(self):
+        self._assert_not_indexable(MACRO_LIB + b'''
+try:
+    import numpy
+except ImportError:
+    class mymacro2(Macro):
+        pass
+''')
+
+    def test_alias(self):
+        self._assert_not_indexable(MACRO_LIB + b"mymacro2 = mymacro\n")
+
+    def test_modified_attribute(self):
+        self._assert_not_indexable(MACRO_LIB +
+                                   b"_base.hints['scan'] = 'other'\n")
+
+    def test_unknown_base(self):
+        self._assert_not_indexable(MACRO_LIB + b'''
+from mymodule import MyBase
+
+
+class mymacro2(MyBase):
+    pass
+''')
+
+    def test_non_static_definition(self):
+        self._assert_not_indexable(MACRO_LIB + b'''
+
+class mymacro2(Macro):
+
+    param_def = [["value", Type.Integer, get_default(), "value"]]
+''')
+
+    def test_function_defaults(self):
+        self._assert_not_indexable(MACRO_LIB + b'''
+
+@macro()
+def myfunc2(self, value=1):
+    pass
+''')
+
+    def test_syntax_error(self):
+        self._assert_not_indexable(MACRO_LIB + b"def myfunc2(self:\n")
+
+    def test_encode_definition(self):
+        param_def = [["motors", ParamRepeat(["motor", "Moveable", None,
+                                             "motor"], min=2),
+                      None, "motors"],
+                     ["pos", "Float", Optional, "position"]]
+        decoded = decode_definition(encode_definition(param_def))
+        self.assertIsInstance(decoded[0][1], ParamRepeat)
+        self.assertEqual(decoded[0][1].obj(), param_def[0][1].obj())
+        self.assertIs(decoded[1][2], Optional)
+
+
+class MetaIndexTestCase(unittest.TestCase):
+    """Test the caching of the metadata in the index"""
+
+    def setUp(self):
+        self.dir_name = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.dir_name, "mylib.py")
+        self.index_file_name = os.path.join(self.dir_name, "index")
+        self.scanned = []
+        self._write(b"a = 1\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_name)
+
+    def _write(self, source):
+        with open(self.file_name, "wb") as f:
+            f.write(source)
+
+    def _scanner(self, source, file_name):
+        self.scanned.append(file_name)
+        if b"import" in source:
+            raise NotIndexable("import")
+        return dict(size=len(source))
+
+    def _get_index(self, version="1"):
+        return MetaIndex("TestIndex", self.index_file_name, self._scanner,
+                         version)
+
+    def test_cache(self):
+        index = self._get_index()
+        self.assertEqual(index.get(self.file_name), dict(size=6))
+        self.assertEqual(index.get(self.file_name), dict(size=6))
+        index.save()
+        index = self._get_index()
+        self.assertEqual(index.get(self.file_name), dict(size=6))
+        self.assertEqual(len(self.scanned), 1)
+
+    def test_changed_file(self):
+        index = self._get_index()
+        index.get(self.file_name)
+        index.save()
+        self._write(b"a = 12\n")
+        index = self._get_index()
+        self.assertEqual(index.get(self.file_name), dict(size=7))
+        self._write(b"import os\n")
+        self.assertIsNone(index.get(self.file_name))
+        self.assertEqual(len(self.scanned), 3)
+
+    def test_touched_file(self):
+        index = self._get_index()
+        index.get(self.file_name)
+        stat = os.stat(self.file_name)
+        os.utime(self.file_name, (stat.st_atime, stat.st_mtime + 10))
+        self.assertEqual(index.get(self.file_name), dict(size=6))
+        self.assertEqual(len(self.scanned), 1)
+
+    def test_version(self):
+        index = self._get_index()
+        index.get(self.file_name)
+        index.save()
+        index = self._get_index(version="2")
+        index.get(self.file_name)
+        self.assertEqual(len(self.scanned), 2)
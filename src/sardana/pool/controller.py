@@ -25,8 +25,8 @@
 
 """This module contains the definition of the Controller base classes"""
 
-__all__ = ["DataAccess", "SardanaValue", "Type", "Access", "Description",
-           "DefaultValue", "FGet", "FSet",
+__all__ = ["DataAccess", "SardanaValue", "SardanaValueChunk", "Type",
+           "Access", "Description", "DefaultValue", "FGet", "FSet",
            "Memorized", "MemorizedNoInit", "NotMemorized", "MaxDimSize",
            "Controller", "Readable", "Startable", "Stopable", "Loadable",
            "Referable", "Synchronizer",
@@ -43,7 +43,7 @@ from taurus.core.taurushelper import getLogLevel
 from taurus.core.util.log import Logger
 
 from sardana import DataAccess
-from sardana.sardanavalue import SardanaValue
+from sardana.sardanavalue import SardanaValue, SardanaValueChunk
 from sardana.pool.pooldefs import ControllerAPI, AcqSynch, AcqMode
 
 
@@ -666,6 +666,19 @@ class Loadable(object):
     #: axis of the default timer
     default_timer = None
 
+    #: whether the loaded integration time / monitor count, repetitions
+    #: and latency time are kept by the controller across the starts of
+    #: the same preparation (see :meth:`PrepareOne`). If True, and the
+    #: acquisition parameters did not change, the load methods are
+    #: called only for the first start after the preparation.
+    #:
+    #: .. note::
+    #:     The keep_loaded class member has been included in Sardana
+    #:     on a provisional basis. Backwards incompatible changes
+    #:     (up to and including removal of the member) may occur if
+    #:     deemed necessary by the core developers.
+    keep_loaded = False
+
     def PrepareOne(self, axis, value, repetitions, latency, nb_starts):
         """**Controller API**. Override if necessary.
         Called to prepare the master channel axis with the measurement
@@ -715,9 +728,36 @@ class Loadable(object):
         :param float value: integration time /monitor value
         :param int repetitions: number of repetitions
         :param float latency: latency time
-        :param float value: integration time /monitor value"""
+        :param float value: integration time /monitor value
+        :return: optionally, the estimated duration of the acquisition
+            (in seconds) which is used to schedule the acquisition loop
+            readouts
+        :rtype: :obj:`float` or None"""
         raise NotImplementedError("LoadOne must be defined in the controller")
 
+    def WaitAll(self, timeout):
+        """**Controller API**. Override if necessary.
+        Called by the acquisition loop instead of sleeping between the
+        state readouts. Controllers which are notified by the hardware
+        about the end of the acquisition or about new data may implement
+        it in order to wake up the acquisition loop as soon as possible.
+        It is called without the controller lock.
+        Default implementation returns None which means that waiting is not
+        supported.
+
+        .. note::
+            The WaitAll method has been included in Sardana
+            on a provisional basis. Backwards incompatible changes
+            (up to and including removal of the method) may occur if
+            deemed necessary by the core developers.
+
+        :param float timeout: maximum time to wait (in seconds)
+        :return: True if the acquisition has finished or new data are
+            available, False if the timeout has elapsed or None if waiting
+            is not supported
+        :rtype: :obj:`bool` or None"""
+        return None
+
 
 class Referable(object):
     """A Referable interface. A controller for which it's axis can
@@ -1217,7 +1257,10 @@ class PseudoMotorController(PseudoController):
     - optional:
         - write :meth:`~PseudoMotorController.CalcAllPseudo` and
           :meth:`~PseudoMotorController.CalcAllPhysical` if great performance
-          gain can be achived"""
+          gain can be achived
+        - write :meth:`~PseudoMotorController.CalcAllPseudoArray` and
+          :meth:`~PseudoMotorController.CalcAllPhysicalArray` if the
+          calculation of many points at once can be vectorized"""
 
     #: a sequence of strings describing the role of each pseudo motor axis in
     #: this controller
@@ -1286,6 +1329,64 @@ class PseudoMotorController(PseudoController):
             ret.append(pos)
         return ret
 
+    def CalcAllPseudoArray(self, physical_pos, curr_pseudo_pos):
+        """**Pseudo Motor Controller API**. Override if necessary.
+           Calculates the positions of all pseudo motors that belong to the
+           pseudo motor system for many sets of physical motor positions at
+           once (e.g. all the points of a trajectory). Controllers which can
+           calculate the positions in a vectorized way (e.g. with NumPy) may
+           implement it in order to avoid calling
+           :meth:`~PseudoMotorController.CalcAllPseudo` for every point.
+           Default implementation does a loop calling
+           :meth:`~PseudoMotorController.CalcAllPseudo` for each point.
+
+           .. note::
+               The CalcAllPseudoArray method has been included in Sardana
+               on a provisional basis. Backwards incompatible changes
+               (up to and including removal of the method) may occur if
+               deemed necessary by the core developers.
+
+           :param physical_pos: a 2D array of physical motor positions (one
+                                row per point, one column per motor role)
+           :type physical_pos: :class:`numpy.ndarray`
+           :param sequence<float> curr_pseudo_pos: a sequence containing the
+                                                   current pseudo motor
+                                                   positions
+           :return: a 2D array of pseudo motor positions (one row per point,
+                    one column per pseudo motor role)
+           :rtype: :class:`numpy.ndarray` or sequence<sequence<float>>"""
+        f = self.CalcAllPseudo
+        return [f(point, curr_pseudo_pos) for point in physical_pos]
+
+    def CalcAllPhysicalArray(self, pseudo_pos, curr_physical_pos):
+        """**Pseudo Motor Controller API**. Override if necessary.
+           Calculates the positions of all motors that belong to the pseudo
+           motor system for many sets of pseudo motor positions at once
+           (e.g. all the points of a trajectory). Controllers which can
+           calculate the positions in a vectorized way (e.g. with NumPy) may
+           implement it in order to avoid calling
+           :meth:`~PseudoMotorController.CalcAllPhysical` for every point.
+           Default implementation does a loop calling
+           :meth:`~PseudoMotorController.CalcAllPhysical` for each point.
+
+           .. note::
+               The CalcAllPhysicalArray method has been included in Sardana
+               on a provisional basis. Backwards incompatible changes
+               (up to and including removal of the method) may occur if
+               deemed necessary by the core developers.
+
+           :param pseudo_pos: a 2D array of pseudo motor positions (one row
+                              per point, one column per pseudo motor role)
+           :type pseudo_pos: :class:`numpy.ndarray`
+           :param sequence<float> curr_physical_pos: a sequence containing the
+                                                     current physical motor
+                                                     positions
+           :return: a 2D array of motor positions (one row per point, one
+                    column per motor role)
+           :rtype: :class:`numpy.ndarray` or sequence<sequence<float>>"""
+        f = self.CalcAllPhysical
+        return [f(point, curr_physical_pos) for point in pseudo_pos]
+
     def CalcPseudo(self, axis, physical_pos, curr_pseudo_pos):
         """**Pseudo Motor Controller API**. Override is **MANDATORY**.
            Calculate pseudo motor position given the physical motor positions
@@ -1517,6 +1618,33 @@ class PseudoCounterController(Controller):
         f, n = self.Calc, len(self.pseudo_counter_roles)
         return [f(i + 1, values) for i in range(n)]
 
+    def CalcBuffer(self, axis, values):
+        """**Pseudo Counter Controller API**. Override if necessary.
+           Calculate many pseudo counter values at once (e.g. a whole
+           value buffer chunk of a continuous acquisition) given the arrays
+           of the counter values. Controllers which can calculate the
+           values in a vectorized way (e.g. with NumPy) may implement it in
+           order to avoid calling :meth:`~PseudoCounterController.Calc`
+           for every single value.
+           Default implementation returns None which means that it is not
+           supported.
+
+           .. note::
+               The CalcBuffer method has been included in Sardana
+               on a provisional basis. Backwards incompatible changes
+               (up to and including removal of the method) may occur if
+               deemed necessary by the core developers.
+
+           :param int axis: the pseudo counter role axis
+           :param values: a sequence containing arrays of the values of
+                          underlying elements (one array per element, all
+                          of them aligned by index)
+           :type values: sequence<:class:`numpy.ndarray`>
+           :return: an array of pseudo counter values corresponding to the
+                    given axis pseudo counter role or None if not supported
+           :rtype: :class:`numpy.ndarray` or None"""
+        return None
+
 
 class IORegisterController(Controller, Readable):
     """Base class for a IORegister controller. Inherit from this class to
@@ -32,14 +32,18 @@ __all__ = ["Pool"]
 
 __docformat__ = 'restructuredtext'
 
+import re
 import os.path
+import contextlib
+import collections
 import logging.handlers
 
 from taurus.core.tango.tangovalidator import TangoAttributeNameValidator
 from taurus.core.util.containers import CaselessDict
 
 from sardana import InvalidId, ElementType, TYPE_ACQUIRABLE_ELEMENTS, \
-    TYPE_PSEUDO_ELEMENTS, TYPE_PHYSICAL_ELEMENTS, TYPE_MOVEABLE_ELEMENTS
+    TYPE_PSEUDO_ELEMENTS, TYPE_PHYSICAL_ELEMENTS, TYPE_MOVEABLE_ELEMENTS, \
+    sardanacustomsettings
 from sardana.sardanamanager import SardanaElementManager, SardanaIDManager
 from sardana.sardanamodulemanager import ModuleManager
 from sardana.sardanaevent import EventType
@@ -106,6 +110,12 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
     #: Default value representing the sleep time for each motion loop
     Default_MotionLoop_SleepTime = 0.01
 
+    #: Default value representing the maximum sleep time for each motion
+    #: loop (the sleep time is adapted between the
+    #: Default_MotionLoop_SleepTime and this value based on the predicted
+    #: end of the motion)
+    Default_MotionLoop_MaxSleepTime = 0.1
+
     #: Default value representing the number of state reads per value
     #: read during a motion loop
     Default_AcqLoop_StatesPerValue = 10
@@ -113,14 +123,22 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
     #: Default value representing the sleep time for each acquisition loop
     Default_AcqLoop_SleepTime = 0.01
 
+    #: Default value representing the maximum sleep time for each
+    #: acquisition loop (the sleep time is adapted between the
+    #: Default_AcqLoop_SleepTime and this value)
+    Default_AcqLoop_MaxSleepTime = 0.1
+
     Default_DriftCorrection = True
 
     def __init__(self, full_name, name=None):
         self._path_id = None
         self._motion_loop_states_per_position = self.Default_MotionLoop_StatesPerPosition
         self._motion_loop_sleep_time = self.Default_MotionLoop_SleepTime
+        self._motion_loop_max_sleep_time = \
+            self.Default_MotionLoop_MaxSleepTime
         self._acq_loop_states_per_value = self.Default_AcqLoop_StatesPerValue
         self._acq_loop_sleep_time = self.Default_AcqLoop_SleepTime
+        self._acq_loop_max_sleep_time = self.Default_AcqLoop_MaxSleepTime
         self._drift_correction = self.Default_DriftCorrection
         self._remote_log_handler = None
 
@@ -133,6 +151,10 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
         #    channel
         self._extra_acquisition_element_names = CaselessDict()
 
+        # element events collected by batch_element_events (None when not
+        # batching)
+        self._element_events = None
+
         PoolContainer.__init__(self)
         PoolObject.__init__(self, full_name=full_name, name=name, id=InvalidId,
                             pool=self, elem_type=ElementType.Pool)
@@ -220,6 +242,17 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
                                       set_motion_loop_sleep_time,
                                       doc="motion sleep time (s)")
 
+    def set_motion_loop_max_sleep_time(self, motion_loop_max_sleep_time):
+        self._motion_loop_max_sleep_time = motion_loop_max_sleep_time
+
+    def get_motion_loop_max_sleep_time(self):
+        return self._motion_loop_max_sleep_time
+
+    motion_loop_max_sleep_time = property(get_motion_loop_max_sleep_time,
+                                          set_motion_loop_max_sleep_time,
+                                          doc="motion maximum sleep time "
+                                              "(s)")
+
     def set_motion_loop_states_per_position(self, motion_loop_states_per_position):
         self._motion_loop_states_per_position = motion_loop_states_per_position
 
@@ -241,6 +274,17 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
                                    set_acq_loop_sleep_time,
                                    doc="acquisition sleep time (s)")
 
+    def set_acq_loop_max_sleep_time(self, acq_loop_max_sleep_time):
+        self._acq_loop_max_sleep_time = acq_loop_max_sleep_time
+
+    def get_acq_loop_max_sleep_time(self):
+        return self._acq_loop_max_sleep_time
+
+    acq_loop_max_sleep_time = property(get_acq_loop_max_sleep_time,
+                                       set_acq_loop_max_sleep_time,
+                                       doc="acquisition maximum sleep time "
+                                           "(s)")
+
     def set_acq_loop_states_per_value(self, acq_loop_states_per_value):
         self._acq_loop_states_per_value = acq_loop_states_per_value
 
@@ -270,6 +314,17 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
     def ctrl_manager(self):
         return ControllerManager()
 
+    @property
+    def controller_index_file(self):
+        """The controller class index file name (see the
+        POOL_CONTROLLER_INDEX_FILE custom setting) or None if the controller
+        libraries are not loaded lazily"""
+        index_file = getattr(sardanacustomsettings,
+                             "POOL_CONTROLLER_INDEX_FILE", None)
+        if index_file is None:
+            return None
+        return index_file.format(pool=re.sub(r"\W", "_", self.name))
+
     def set_python_path(self, path):
         mod_man = ModuleManager()
         if self._path_id is not None:
@@ -295,7 +350,19 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
         return self.ctrl_manager.getControllerMetaClass(name)
 
     def get_controller_classes_info(self, names):
-        return self.ctrl_manager.getControllerMetaClasses(names)
+        ctrl_classes = self.ctrl_manager.getControllerMetaClasses(names)
+        # the controller classes created from the controller class index are
+        # described with the information of their (loaded) python class
+        for ctrl_class in ctrl_classes.values():
+            if ctrl_class is None:
+                continue
+            try:
+                ctrl_class.lib.load()
+            except Exception:
+                self.warning("Failed to load controller library %s",
+                             ctrl_class.module_name)
+                self.debug("Details:", exc_info=1)
+        return ctrl_classes
 
     def get_controller_libs_summary_info(self):
         libs = self.get_controller_libs()
@@ -348,21 +415,74 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
         name = self.full_name
         return [obj.serialize(pool=name) for obj in objs]
 
+    def get_acquisition_element_info(self, element):
+        acq_channel = element.get_default_acquisition_channel()
+        full_name = "{0}/{1}".format(element.full_name, acq_channel)
+        return dict(name=element.name, full_name=full_name, origin='local')
+
+    def get_extra_acquisition_elements_info(self):
+        return list(self._extra_acquisition_element_names.values())
+
     def get_acquisition_elements_info(self):
         ret = []
         for _, element in list(self.get_element_name_map().items()):
             if element.get_type() not in TYPE_ACQUIRABLE_ELEMENTS:
                 continue
-            acq_channel = element.get_default_acquisition_channel()
-            full_name = "{0}/{1}".format(element.full_name, acq_channel)
-            info = dict(name=element.name, full_name=full_name, origin='local')
-            ret.append(info)
-        ret.extend(list(self._extra_acquisition_element_names.values()))
+            ret.append(self.get_acquisition_element_info(element))
+        ret.extend(self.get_extra_acquisition_elements_info())
         return ret
 
     def get_acquisition_elements_str_info(self):
         return list(map(self.str_object, self.get_acquisition_elements_info()))
 
+    def _fire_element_event(self, evt_name, elem):
+        """Fires the ElementCreated, ElementChanged or ElementDeleted event
+        or, within :meth:`batch_element_events`, collects it"""
+        events = self._element_events
+        if events is None:
+            self.fire_event(EventType(evt_name), elem)
+            return
+        key = id(elem)
+        if evt_name == "ElementCreated":
+            events["new"][key] = elem
+        elif evt_name == "ElementChanged":
+            if key not in events["new"]:
+                events["change"][key] = elem
+        # an element created and deleted (e.g. rolled back) within the same
+        # batch is not reported at all
+        elif events["new"].pop(key, None) is None:
+            events["change"].pop(key, None)
+            events["del"][key] = elem
+
+    @contextlib.contextmanager
+    def batch_element_events(self):
+        """Context manager which collects the element created, changed and
+        deleted events and, at the exit, fires them all together in a single
+        ElementsChanged event (the same as :meth:`reload_controller_lib`).
+        Nested batches are merged into the outermost one.
+
+        .. note::
+            The batch_element_events method has been included in Sardana
+            on a provisional basis. Backwards incompatible changes
+            (up to and including removal of the method) may occur if
+            deemed necessary by the core developers.
+        """
+        if self._element_events is not None:
+            yield
+            return
+        # dict<str, OrderedDict<int, element>> (keys are the element ids)
+        events = {"new": collections.OrderedDict(),
+                  "change": collections.OrderedDict(),
+                  "del": collections.OrderedDict()}
+        self._element_events = events
+        try:
+            yield
+        finally:
+            self._element_events = None
+            evt = {k: list(v.values()) for k, v in events.items()}
+            if any(evt.values()):
+                self.fire_event(EventType("ElementsChanged"), evt)
+
     def create_controller(self, **kwargs):
         ctrl_type = kwargs['type']
         lib = kwargs['library']
@@ -415,7 +535,7 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
 
         ctrl = klass(**kwargs)
         ret = self.add_element(ctrl)
-        self.fire_event(EventType("ElementCreated"), ctrl)
+        self._fire_element_event("ElementCreated", ctrl)
         return ret
 
     def create_element(self, **kwargs):
@@ -465,7 +585,7 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
         elem = klass(**kwargs)
         ctrl.add_element(elem)
         ret = self.add_element(elem)
-        self.fire_event(EventType("ElementCreated"), elem)
+        self._fire_element_event("ElementCreated", elem)
         return ret
 
     def create_motor_group(self, **kwargs):
@@ -496,7 +616,7 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
         elem = klass(**kwargs)
 
         ret = self.add_element(elem)
-        self.fire_event(EventType("ElementCreated"), elem)
+        self._fire_element_event("ElementCreated", elem)
         return ret
 
     def create_measurement_group(self, **kwargs):
@@ -533,7 +653,7 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
         elem = klass(**kwargs)
 
         ret = self.add_element(elem)
-        self.fire_event(EventType("ElementCreated"), elem)
+        self._fire_element_event("ElementCreated", elem)
         return ret
 
     def rename_element(self, old_name, new_name):
@@ -541,7 +661,7 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
         elem.controller.rename_element(old_name, new_name)
         PoolContainer.rename_element(self, old_name, new_name)
         elem = self.get_element_by_name(new_name)
-        self.fire_event(EventType("ElementChanged"), elem)
+        self._fire_element_event("ElementChanged", elem)
 
     def delete_element(self, name):
         try:
@@ -575,7 +695,7 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
 
         self.remove_element(elem)
 
-        self.fire_event(EventType("ElementDeleted"), elem)
+        self._fire_element_event("ElementDeleted", elem)
 
     def create_instrument(self, full_name, klass_name, id=None):
         is_root = full_name.count('/') == 1
@@ -608,7 +728,7 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
         if parent:
             parent.add_instrument(elem)
         ret = self.add_element(elem)
-        self.fire_event(EventType("ElementCreated"), elem)
+        self._fire_element_event("ElementCreated", elem)
         return ret
 
     def stop(self):
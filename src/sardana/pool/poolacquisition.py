@@ -29,7 +29,7 @@ acquisition"""
 __all__ = ["get_acq_ctrls", "AcquisitionState", "AcquisitionMap",
            "PoolCTAcquisition", "Pool0DAcquisition", "PoolIORAcquisition",
            "PoolAcquisitionHardware", "PoolAcquisitionSoftware",
-           "PoolAcquisitionSoftwareStart"]
+           "PoolAcquisitionSoftwareStart", "AcquisitionLoopScheduler"]
 
 __docformat__ = 'restructuredtext'
 
@@ -42,6 +42,7 @@ from taurus.core.util.log import DebugIt
 from taurus.core.util.enumeration import Enumeration
 
 from sardana import SardanaValue, State, ElementType, TYPE_TIMERABLE_ELEMENTS
+from sardana.sardanautils import is_number
 from sardana.sardanathreadpool import get_thread_pool
 from sardana.pool import AcqSynch, AcqMode
 from sardana.pool.poolaction import ActionContext, PoolAction
@@ -72,6 +73,139 @@ def is_value_error(value):
     return False
 
 
+def has_new_values(value):
+    """Check whether a value returned by the acquisition loop readout
+    brings new data (non-empty chunk)."""
+    if isinstance(value, SardanaValue):
+        return not value.error
+    try:
+        return len(value) > 0
+    except TypeError:
+        return True
+
+
+class AcquisitionLoopScheduler(object):
+    """Scheduler of the state and value readouts of the acquisition loops.
+
+    Instead of sleeping a fixed nap between the state readouts, the
+    scheduler computes the next nap:
+
+    - while the acquisition is expected to be still running (based on the
+      expected duration) it sleeps half of the remaining time (but not more
+      than the maximum nap) so the expected end is approached with
+      increasing density of readouts
+    - after the expected end (or if it is unknown) it starts with the
+      minimum nap and backs off exponentially (up to the maximum nap) while
+      the acquisition is idle i.e. no new values arrive
+
+    Values are read at most every *nb_states_per_value* minimum naps.
+
+    If a controller implements the
+    :meth:`~sardana.pool.controller.Loadable.WaitAll` hook the scheduler
+    waits on it instead of sleeping so the controller can wake up the loop
+    as soon as the acquisition has finished or new data are available.
+
+    .. note::
+        The AcquisitionLoopScheduler class has been included in Sardana
+        on a provisional basis. Backwards incompatible changes
+        (up to and including removal of the class) may occur if
+        deemed necessary by the core developers.
+    """
+
+    def __init__(self, min_nap, max_nap, nb_states_per_value,
+                 expected_duration=None, waiter=None, backoff=2.):
+        """Construct AcquisitionLoopScheduler object
+
+        :param min_nap: minimum sleep time between state readouts (s)
+        :type min_nap: :obj:`float`
+        :param max_nap: maximum sleep time between state readouts (s)
+        :type max_nap: :obj:`float`
+        :param nb_states_per_value: number of minimum naps between value
+            readouts
+        :type nb_states_per_value: :obj:`int`
+        :param expected_duration: expected duration of the acquisition (s)
+            [default: None, meaning unknown]
+        :type expected_duration: :obj:`float`
+        :param waiter: callable accepting timeout and returning True if
+            the hardware notified a change, False if timeout elapsed or None
+            if waiting is not supported [default: None, meaning just sleep]
+        :type waiter: callable
+        :param backoff: nap multiplier applied while idle
+        :type backoff: :obj:`float`
+        """
+        self.min_nap = min_nap
+        self.max_nap = max(max_nap, min_nap)
+        self.value_period = min_nap * nb_states_per_value
+        self.expected_duration = expected_duration
+        self.waiter = waiter
+        self.backoff = backoff
+        self.start()
+
+    def start(self):
+        """Mark the start of the acquisition."""
+        self._start_time = time.time()
+        self._last_value_time = None
+        self._idle_nap = self.min_nap
+
+    def is_value_due(self):
+        """Check whether the values should be read in this iteration.
+
+        :return: True if the values should be read
+        :rtype: :obj:`bool`
+        """
+        now = time.time()
+        last = self._last_value_time
+        if last is None or now - last >= self.value_period:
+            self._last_value_time = now
+            return True
+        return False
+
+    def get_nap(self, active=False):
+        """Compute the time to wait before the next iteration.
+
+        :param active: whether the last iteration brought new values
+        :type active: :obj:`bool`
+        :return: nap time (s)
+        :rtype: :obj:`float`
+        """
+        min_nap, max_nap = self.min_nap, self.max_nap
+        if active:
+            self._idle_nap = min_nap
+        if self.expected_duration is not None:
+            remaining = self._start_time + self.expected_duration - \
+                time.time()
+            if remaining > min_nap:
+                return min(remaining / 2., max_nap)
+        nap = self._idle_nap
+        self._idle_nap = min(nap * self.backoff, max_nap)
+        return nap
+
+    def wait(self, active=False):
+        """Wait until the next iteration.
+
+        :param active: whether the last iteration brought new values
+        :type active: :obj:`bool`
+        :return: True if the wait was interrupted by the controller
+        :rtype: :obj:`bool`
+        """
+        nap = self.get_nap(active)
+        waiter = self.waiter
+        if waiter is not None:
+            woken = waiter(nap)
+            if woken is None:
+                # hook not implemented by the controller
+                self.waiter = None
+            elif woken:
+                # new data are available - read them now
+                self._last_value_time = None
+                self._idle_nap = self.min_nap
+                return True
+            else:
+                return False
+        time.sleep(nap)
+        return False
+
+
 def get_acq_ctrls(ctrls):
     """Converts configuration controllers into acquisition controllers.
 
@@ -488,6 +622,7 @@ class PoolAcquisition(PoolAction):
         for ctrl in ctrls:
             axis = ctrl.master.axis
             pool_ctrl = ctrl.element
+            pool_ctrl.set_loaded_parameters(None)
             pool_ctrl.ctrl.PrepareOne(axis, value, repetitions, latency,
                                       nb_starts)
 
@@ -655,6 +790,9 @@ class PoolAcquisitionBase(PoolAction):
         self._index = None
         self._nb_states_per_value = None
         self._acq_sleep_time = None
+        self._acq_max_sleep_time = None
+        self._expected_duration = None
+        self._waiter = None
         self._pool_ctrl_dict_loop = None
         self._pool_ctrl_dict_ref = None
         self._pool_ctrl_dict_value = None
@@ -797,6 +935,16 @@ class PoolAcquisitionBase(PoolAction):
         if self._nb_states_per_value is None:
             self._nb_states_per_value = pool.acq_loop_states_per_value
 
+        self._acq_max_sleep_time = pool.acq_loop_max_sleep_time
+        self._expected_duration = self._estimate_duration(ctrls, value,
+                                                          repetitions,
+                                                          latency)
+        # optional controller hook can only be used if there is just
+        # one controller to wait on
+        self._waiter = None
+        if len(ctrls) == 1:
+            self._waiter = getattr(ctrls[0].element.ctrl, "WaitAll", None)
+
         # make sure the controller which has the master channel is the last to
         # be called
         if master is not None:
@@ -838,7 +986,10 @@ class PoolAcquisitionBase(PoolAction):
                        (pool_ctrl.name, axis))
                 raise Exception(msg)
             try:
-                ctrl.LoadOne(axis, value, repetitions, latency)
+                estimate = ctrl.LoadOne(axis, value, repetitions, latency)
+                if is_number(estimate):
+                    self._expected_duration = max(
+                        estimate, self._expected_duration or 0)
             except TypeError:
                 try:
                     ctrl.LoadOne(axis, value, repetitions)
@@ -858,7 +1009,15 @@ class PoolAcquisitionBase(PoolAction):
             # PreLoadAll, PreLoadOne, LoadOne and LoadAll
             for ctrl in ctrls:
                 # TODO find solution for master now sardana only use timer
+                pool_ctrl = ctrl.element
+                parameters = ctrl.timer.axis, value, repetitions, latency
+                # skip load if the controller keeps the same parameters
+                # loaded from the previous start of this preparation
+                if pool_ctrl.is_loaded(parameters):
+                    continue
+                pool_ctrl.set_loaded_parameters(None)
                 load(ctrl.timer, value, repetitions, latency)
+                pool_ctrl.set_loaded_parameters(parameters)
 
             # TODO: remove when the action allows to use tango attributes
             try:
@@ -916,6 +1075,34 @@ class PoolAcquisitionBase(PoolAction):
                     msg = ("%s.StartAll() failed" % ctrl.name)
                     raise Exception(msg)
 
+    @staticmethod
+    def _estimate_duration(ctrls, value, repetitions, latency):
+        """Estimate duration of the acquisition based on the integration time
+        and the number of repetitions. Acquisitions in the monitor mode can
+        not be estimated.
+        """
+        for ctrl in ctrls:
+            master = getattr(ctrl, "master", None)
+            if master is None:
+                continue
+            # master is an AcqConfigurationItem while timer is the
+            # ChannelConfiguration itself - compare the configurations
+            master = getattr(master, "configuration", master)
+            timer = getattr(ctrl, "timer", None)
+            timer = getattr(timer, "configuration", timer)
+            if master is not timer:
+                return None
+        if not is_number(value):
+            return None
+        return value * repetitions + latency * (repetitions - 1)
+
+    def _create_loop_scheduler(self):
+        return AcquisitionLoopScheduler(self._acq_sleep_time,
+                                        self._acq_max_sleep_time,
+                                        self._nb_states_per_value,
+                                        self._expected_duration,
+                                        self._waiter)
+
     def _set_pool_ctrl_dict_loop(self, ctrls):
         ctrl_channels = {}
         for ctrl in ctrls:
@@ -997,23 +1184,20 @@ class PoolAcquisitionHardware(PoolAcquisitionBase):
 
     @DebugIt()
     def action_loop(self):
-        i = 0
-
         states, values, value_refs = {}, {}, {}
         for channel in self._channels:
             element = channel.element
             states[element] = None
 
-        nap = self._acq_sleep_time
-        nb_states_per_value = self._nb_states_per_value
+        scheduler = self._create_loop_scheduler()
 
         while True:
             self.read_state_info(ret=states)
             if not self.in_acquisition(states):
                 break
 
-            # read value every n times
-            if not i % nb_states_per_value:
+            active = False
+            if scheduler.is_value_due():
                 self.read_value(ret=values)
                 for acquirable, value in list(values.items()):
                     if is_value_error(value):
@@ -1024,10 +1208,10 @@ class PoolAcquisitionHardware(PoolAcquisitionBase):
                         self.debug(msg)
                         acquirable.put_value(value)
                     else:
+                        active |= has_new_values(value)
                         acquirable.extend_value_buffer(value)
 
-            time.sleep(nap)
-            i += 1
+            scheduler.wait(active)
 
         with ActionContext(self):
             self.raw_read_state_info(ret=states)
@@ -1113,23 +1297,19 @@ class PoolAcquisitionSoftware(PoolAcquisitionBase):
             element = channel.element
             states[element] = None
 
-        nap = self._acq_sleep_time
-        nb_states_per_value = self._nb_states_per_value
+        scheduler = self._create_loop_scheduler()
 
-        i = 0
         while True:
             self.read_state_info(ret=states)
             if not self.in_acquisition(states):
                 break
 
-            # read value every n times
-            if not i % nb_states_per_value:
+            if scheduler.is_value_due():
                 self.read_value_loop(ret=values)
                 for acquirable, value in list(values.items()):
                     acquirable.put_value(value)
 
-            time.sleep(nap)
-            i += 1
+            scheduler.wait()
 
         for slave in self._slaves:
             try:
@@ -1203,23 +1383,20 @@ class PoolAcquisitionSoftwareStart(PoolAcquisitionBase):
 
     @DebugIt()
     def action_loop(self):
-        i = 0
-
         states, values, value_refs = {}, {}, {}
         for channel in self._channels:
             element = channel.element
             states[element] = None
 
-        nap = self._acq_sleep_time
-        nb_states_per_value = self._nb_states_per_value
+        scheduler = self._create_loop_scheduler()
 
         while True:
             self.read_state_info(ret=states)
             if not self.in_acquisition(states):
                 break
 
-            # read value every n times
-            if not i % nb_states_per_value:
+            active = False
+            if scheduler.is_value_due():
                 self.read_value(ret=values)
                 for acquirable, value in list(values.items()):
                     if is_value_error(value):
@@ -1230,6 +1407,7 @@ class PoolAcquisitionSoftwareStart(PoolAcquisitionBase):
                         self.debug(msg)
                         acquirable.put_value(value)
                     else:
+                        active |= has_new_values(value)
                         acquirable.extend_value_buffer(value)
                 self.read_value_ref(ret=value_refs)
                 for acquirable, value_ref in list(value_refs.items()):
@@ -1241,9 +1419,9 @@ class PoolAcquisitionSoftwareStart(PoolAcquisitionBase):
                         self.debug(msg)
                         acquirable.put_value_ref(value)
                     else:
+                        active |= has_new_values(value_ref)
                         acquirable.extend_value_ref_buffer(value_ref)
-            time.sleep(nap)
-            i += 1
+            scheduler.wait(active)
 
         with ActionContext(self):
             self.raw_read_state_info(ret=states)
@@ -1314,15 +1492,12 @@ class PoolCTAcquisition(PoolAcquisitionBase):
 
     @DebugIt()
     def action_loop(self):
-        i = 0
-
         states, values = {}, {}
         for element in self._channels:
             states[element] = None
             # values[element] = None
 
-        nap = self._acq_sleep_time
-        nb_states_per_value = self._nb_states_per_value
+        scheduler = self._create_loop_scheduler()
 
         # read values to send a first event when starting to acquire
         with ActionContext(self):
@@ -1335,14 +1510,12 @@ class PoolCTAcquisition(PoolAcquisitionBase):
             if not self.in_acquisition(states):
                 break
 
-            # read value every n times
-            if not i % nb_states_per_value:
+            if scheduler.is_value_due():
                 self.read_value_loop(ret=values)
                 for acquirable, value in list(values.items()):
                     acquirable.put_value(value)
 
-            time.sleep(nap)
-            i += 1
+            scheduler.wait()
 
         for slave in self._slaves:
             try:
@@ -30,8 +30,10 @@ __all__ = ["Value", "PoolBaseChannel"]
 
 __docformat__ = 'restructuredtext'
 
+from sardana import sardanacustomsettings
 from sardana.sardanaattribute import SardanaAttribute
-from sardana.sardanabuffer import SardanaBuffer
+from sardana.sardanabuffer import SardanaBuffer, SardanaArrayBuffer
+from sardana.sardanavalue import SardanaValueChunk
 from sardana.pool.poolelement import PoolElement
 from sardana.pool.poolacquisition import PoolAcquisitionSoftware,\
     get_timerable_items
@@ -40,7 +42,7 @@ from sardana.pool.poolmeasurementgroup import ChannelConfiguration,\
 from sardana.sardanaevent import EventType
 from sardana.pool import AcqSynch, AcqMode
 
-class ValueBuffer(SardanaBuffer):
+class ValueBufferMixin(object):
 
     def is_value_required(self, idx):
         """Check whether any of pseudo elements still still requires
@@ -57,6 +59,43 @@ class ValueBuffer(SardanaBuffer):
         return False
 
 
+class ValueBuffer(ValueBufferMixin, SardanaBuffer):
+    pass
+
+
+class ArrayValueBuffer(ValueBufferMixin, SardanaArrayBuffer):
+    """Value buffer storing the values in NumPy arrays.
+
+    .. note::
+        The ArrayValueBuffer class has been included in Sardana on a
+        provisional basis. Backwards incompatible changes (up to and including
+        removal of the class) may occur if deemed necessary by the core
+        developers.
+    """
+
+    def __init__(self, obj=None, name="ValueBuffer", **kwargs):
+        # events are identified by the buffer name
+        super(ArrayValueBuffer, self).__init__(obj=obj, name=name, **kwargs)
+
+
+def get_value_buffer_class(element_class):
+    """Return the value buffer class to be used by the given element class
+    according to the ``POOL_VALUE_BUFFER_BACKEND`` custom setting.
+
+    :param element_class: experimental channel class
+    :type element_class: class
+    :return: value buffer class
+    :rtype: class
+    """
+    backend = getattr(sardanacustomsettings, "POOL_VALUE_BUFFER_BACKEND",
+                      "dict")
+    if backend == "array":
+        return element_class.ArrayValueBufferClass
+    elif backend == "dict":
+        return element_class.ValueBufferClass
+    raise ValueError("unknown value buffer backend: %s" % backend)
+
+
 class Value(SardanaAttribute):
 
     def __init__(self, *args, **kwargs):
@@ -99,6 +138,7 @@ class PoolBaseChannel(PoolElement):
 
     ValueAttributeClass = Value
     ValueBufferClass = ValueBuffer
+    ArrayValueBufferClass = ArrayValueBuffer
     ValueRefAttributeClass = ValueRef
     ValueRefBufferClass = ValueRefBuffer
     AcquisitionClass = PoolAcquisitionSoftware
@@ -106,8 +146,9 @@ class PoolBaseChannel(PoolElement):
     def __init__(self, **kwargs):
         PoolElement.__init__(self, **kwargs)
         self._value = self.ValueAttributeClass(self, listeners=self.on_change)
-        self._value_buffer = self.ValueBufferClass(self,
-                                                   listeners=self.on_change)
+        value_buffer_class = get_value_buffer_class(self.__class__)
+        self._value_buffer = value_buffer_class(self,
+                                                listeners=self.on_change)
         self._value_ref = self.ValueRefAttributeClass(
             self, listeners=self.on_change)
         self._value_ref_buffer = self.ValueRefBufferClass(
@@ -307,7 +348,9 @@ class PoolBaseChannel(PoolElement):
         :param values:
             values to be added to the buffer
         :type values:
-            :class:`~sardana.sardanavalue.SardanaValue`
+            seq<:class:`~sardana.sardanavalue.SardanaValue`> or
+            :class:`~sardana.sardanavalue.SardanaValueChunk` or
+            :class:`numpy.ndarray`
         :param propagate:
             0 for not propagating, 1 to propagate, 2 propagate with priority
         :type propagate: int
@@ -318,8 +361,12 @@ class PoolBaseChannel(PoolElement):
         val_buffer = self._value_buffer
         val_buffer.extend(values, idx)
         # update value attribute
+        if isinstance(values, SardanaValueChunk):
+            last_value = values.get_last_value_obj()
+        else:
+            last_value = values[-1]
         val_attr = self._value
-        val_attr.set_value(values[-1], propagate=propagate)
+        val_attr.set_value(last_value, propagate=propagate)
         return val_buffer
 
     def append_value_buffer(self, value, idx=None, propagate=1):
@@ -755,5 +802,6 @@ class PoolTimerableChannel(PoolBaseChannel):
         nb_starts = 1
         self.controller.set_ctrl_par("synchronization",
                                      AcqSynch.SoftwareTrigger)
+        self.controller.set_loaded_parameters(None)
         self.controller.ctrl.PrepareOne(axis, self.integration_time,
                                         repetitions, latency, nb_starts)
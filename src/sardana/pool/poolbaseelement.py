@@ -33,10 +33,9 @@ __docformat__ = 'restructuredtext'
 import weakref
 import threading
 
-from taurus.core.util.lock import TaurusLock
-
 from sardana import State
 from sardana.sardanaevent import EventType
+from sardana.sardanalock import SardanaLock
 from sardana.pool.poolobject import PoolObject
 
 
@@ -61,7 +60,8 @@ class PoolBaseElement(PoolObject):
         lock_name = kwargs['name'] + "Lock"
 
         # A lock for high level operations: monitoring, motion or acquisition
-        self._lock = TaurusLock(name=lock_name, lock=threading.RLock())
+        self._lock = SardanaLock(name=lock_name, lock=threading.RLock(),
+                                 profile=True)
 
         # The operation context in which the element is involved
         self._operation = None
@@ -32,17 +32,20 @@ __all__ = ["PoolController", "PoolPseudoMotorController",
 __docformat__ = 'restructuredtext'
 
 import sys
+import time
 import weakref
 import io
 import traceback
 import functools
 
+import numpy
+
 from taurus.core.util.containers import CaselessDict
 
 from sardana import State, ElementType, TYPE_TIMERABLE_ELEMENTS,\
     TYPE_PSEUDO_ELEMENTS
 from sardana.sardanaevent import EventType
-from sardana.sardanavalue import SardanaValue
+from sardana.sardanavalue import SardanaValue, SardanaValueChunk
 from sardana.sardanautils import is_non_str_seq, is_number
 
 from sardana.pool.poolextension import translate_ctrl_value
@@ -293,6 +296,7 @@ class PoolController(PoolBaseController):
         self._lib_name = kwargs.pop('library')
         self._class_name = kwargs.pop('klass')
         self._properties = kwargs.pop('properties')
+        self._loaded_parameters = None
         super(PoolController, self).__init__(**kwargs)
         self.re_init()
 
@@ -616,7 +620,21 @@ class PoolController(PoolBaseController):
         :rtype: dict<PoolElement, state info>"""
         return self.raw_read_axis_states(axes=axes)
 
-    def _read_axis_value(self, element):
+    def _read_axis_value(self, element, timestamp=None):
+
+        # number of dimensions of an array holding a chunk of values
+        chunk_ndim = {ElementType.CTExpChannel: 1,
+                      ElementType.OneDExpChannel: 2,
+                      ElementType.TwoDExpChannel: 3}
+
+        def is_array_chunk(type_, obj):
+            if not isinstance(obj, numpy.ndarray):
+                return False
+            ndim = chunk_ndim.get(type_)
+            if ndim is None:
+                return False
+            # empty array is also considered as chunk
+            return obj.ndim == ndim or obj.size == 0
 
         def is_chunk(type_, obj):
             if not is_non_str_seq(obj):
@@ -642,12 +660,19 @@ class PoolController(PoolBaseController):
                       'got None instead' % (self.name, element.name, axis)
                 raise ValueError(msg)
 
-            if is_chunk(type_, ctrl_value):
-                value = [translate_ctrl_value(v) for v in ctrl_value]
+            if isinstance(ctrl_value, SardanaValueChunk):
+                value = ctrl_value
+            elif is_array_chunk(type_, ctrl_value):
+                # bulk path - the whole chunk shares the readout timestamp
+                value = SardanaValueChunk(ctrl_value, timestamp=timestamp)
+            elif is_chunk(type_, ctrl_value):
+                value = [translate_ctrl_value(v, timestamp)
+                         for v in ctrl_value]
             else:
-                value = translate_ctrl_value(ctrl_value)
+                value = translate_ctrl_value(ctrl_value, timestamp)
         except:
-            value = SardanaValue(exc_info=sys.exc_info())
+            value = SardanaValue(exc_info=sys.exc_info(),
+                                 timestamp=timestamp)
         return value
 
     def raw_read_axis_values(self, axes=None, ctrl_values=None):
@@ -673,14 +698,18 @@ class PoolController(PoolBaseController):
             ctrl.ReadAll()
         except:
             exc_info = sys.exc_info()
+            timestamp = time.time()
             for axis in axes:
                 element = self.get_element(axis=axis)
-                ctrl_values[element] = SardanaValue(exc_info=exc_info)
+                ctrl_values[element] = SardanaValue(exc_info=exc_info,
+                                                    timestamp=timestamp)
             return ctrl_values
 
+        # all the values of the same readout share the timestamp
+        timestamp = time.time()
         for axis in axes:
             element = self.get_element(axis=axis)
-            ctrl_values[element] = self._read_axis_value(element)
+            ctrl_values[element] = self._read_axis_value(element, timestamp)
 
         return ctrl_values
 
@@ -698,7 +727,7 @@ class PoolController(PoolBaseController):
         """
         return self.raw_read_axis_values(axes=axes)
 
-    def _read_axis_value_refs(self, element):
+    def _read_axis_value_refs(self, element, timestamp=None):
 
         def is_chunk(obj):
             if is_non_str_seq(obj):
@@ -715,11 +744,13 @@ class PoolController(PoolBaseController):
                 raise ValueError(msg)
 
             if is_chunk(ctrl_value):
-                value = [translate_ctrl_value(v) for v in ctrl_value]
+                value = [translate_ctrl_value(v, timestamp)
+                         for v in ctrl_value]
             else:
-                value = translate_ctrl_value(ctrl_value)
+                value = translate_ctrl_value(ctrl_value, timestamp)
         except Exception:
-            value = SardanaValue(exc_info=sys.exc_info())
+            value = SardanaValue(exc_info=sys.exc_info(),
+                                 timestamp=timestamp)
         return value
 
     def raw_read_axis_value_refs(self, axes=None, ctrl_values=None):
@@ -748,9 +779,11 @@ class PoolController(PoolBaseController):
         if ctrl_values is None:
             ctrl_values = {}
 
+        timestamp = time.time()
         for axis in axes:
             element = self.get_element(axis=axis)
-            ctrl_values[element] = self._read_axis_value_refs(element)
+            ctrl_values[element] = self._read_axis_value_refs(element,
+                                                              timestamp)
 
         return ctrl_values
 
@@ -1026,6 +1059,32 @@ class PoolController(PoolBaseController):
         except AttributeError:
             return None
 
+    def set_loaded_parameters(self, parameters):
+        """Set acquisition parameters which were loaded to the controller
+        (plug-in) or :obj:`None` to invalidate them e.g. on preparation.
+
+        :param parameters: master axis, integration time / monitor count,
+            repetitions and latency time
+        :type parameters: :obj:`tuple` or :obj:`None`
+        """
+        self._loaded_parameters = parameters
+
+    def is_loaded(self, parameters):
+        """Check if the given acquisition parameters are still loaded in the
+        controller (plug-in) so the load can be skipped. It is only the case
+        for controllers which keep the loaded parameters across the starts
+        (see :attr:`~sardana.pool.controller.Loadable.keep_loaded`).
+
+        :param parameters: master axis, integration time / monitor count,
+            repetitions and latency time
+        :type parameters: :obj:`tuple`
+        :return: True if the parameters are loaded
+        :rtype: :obj:`bool`
+        """
+        if not getattr(self.ctrl, "keep_loaded", False):
+            return False
+        return self._loaded_parameters == parameters
+
     # END SPECIFIC TO IOR CONTROLLER -----------------------------------------
 
 
@@ -1087,6 +1146,54 @@ class PoolPseudoMotorController(PoolController):
             value = SardanaValue(exc_info=sys.exc_info())
         return value
 
+    @check_ctrl
+    def calc_all_pseudo_array(self, physical_pos, curr_pseudo_pos):
+        """Calculate the pseudo motor positions for many points at once
+        (see :meth:`~sardana.pool.controller.PseudoMotorController.CalcAllPseudoArray`).
+
+        :return: a 2D array of pseudo motor positions (one row per point)
+        :rtype: :class:`~sardana.sardanavalue.SardanaValue`"""
+        ctrl = self.ctrl
+        try:
+            physical_pos = numpy.asarray(physical_pos, dtype=numpy.float64)
+            ctrl_value = ctrl.CalcAllPseudoArray(physical_pos,
+                                                 curr_pseudo_pos)
+            if ctrl_value is None:
+                msg = '%s.CalcAllPseudoArray() return error: Expected ' \
+                      'value, got None instead' % (self.name,)
+                raise ValueError(msg)
+            value = translate_ctrl_value(ctrl_value)
+            if not value.error:
+                value.value = numpy.asarray(value.value,
+                                            dtype=numpy.float64)
+        except:
+            value = SardanaValue(exc_info=sys.exc_info())
+        return value
+
+    @check_ctrl
+    def calc_all_physical_array(self, pseudo_pos, curr_physical_pos):
+        """Calculate the motor positions for many points at once
+        (see :meth:`~sardana.pool.controller.PseudoMotorController.CalcAllPhysicalArray`).
+
+        :return: a 2D array of motor positions (one row per point)
+        :rtype: :class:`~sardana.sardanavalue.SardanaValue`"""
+        ctrl = self.ctrl
+        try:
+            pseudo_pos = numpy.asarray(pseudo_pos, dtype=numpy.float64)
+            ctrl_value = ctrl.CalcAllPhysicalArray(pseudo_pos,
+                                                   curr_physical_pos)
+            if ctrl_value is None:
+                msg = '%s.CalcAllPhysicalArray() return error: Expected ' \
+                      'value, got None instead' % (self.name,)
+                raise ValueError(msg)
+            value = translate_ctrl_value(ctrl_value)
+            if not value.error:
+                value.value = numpy.asarray(value.value,
+                                            dtype=numpy.float64)
+        except:
+            value = SardanaValue(exc_info=sys.exc_info())
+        return value
+
     @check_ctrl
     def calc_pseudo(self, axis, physical_pos, curr_pseudo_pos):
         ctrl = self.ctrl
@@ -1147,6 +1254,27 @@ class PoolPseudoCounterController(PoolController):
             value = SardanaValue(exc_info=sys.exc_info())
         return value
 
+    @check_ctrl
+    def calc_buffer(self, axis, values):
+        """Calculate many pseudo counter values at once
+        (see :meth:`~sardana.pool.controller.PseudoCounterController.CalcBuffer`).
+
+        :return: the pseudo counter values or None if the controller does
+            not support it
+        :rtype: :class:`~sardana.sardanavalue.SardanaValue` or None"""
+        ctrl = self.ctrl
+        calc_buffer = getattr(ctrl, "CalcBuffer", None)
+        if calc_buffer is None:
+            return None
+        try:
+            ctrl_value = calc_buffer(axis, values)
+            if ctrl_value is None:
+                return None
+            value = translate_ctrl_value(ctrl_value)
+        except:
+            value = SardanaValue(exc_info=sys.exc_info())
+        return value
+
     def calc_all(self, values):
         ctrl = self.ctrl
         try:
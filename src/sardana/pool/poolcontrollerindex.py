@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""This module contains the static scanner of the controller libraries and
+the encoding of the controller classes metadata used to index them (see
+:class:`~sardana.sardanametaindex.MetaIndex`) and create them without
+importing the controller libraries"""
+
+__all__ = ["SCANNER_VERSION", "ControllerLibScanner", "scan_controller_lib",
+           "encode_metadata", "decode_metadata"]
+
+__docformat__ = 'restructuredtext'
+
+import ast
+
+from sardana import Release
+from sardana.sardanametaindex import NotIndexable, ModuleScanner
+from sardana.pool.poolmetacontroller import DataInfo
+
+#: version of the controller library scanner (changing it invalidates the
+#: index)
+SCANNER_VERSION = "%s.1" % Release.version
+
+# constructor arguments of DataInfo
+_DATA_INFO_ARGS = ("name", "dtype", "dformat", "access", "description",
+                   "default_value", "memorized", "fget", "fset",
+                   "maxdimsize")
+
+
+def encode_metadata(obj):
+    """Encodes the controller class metadata (see
+    :meth:`~sardana.pool.poolmetacontroller.ControllerClass.get_metadata`)
+    into a JSON serializable object
+
+    :raises: NotIndexable if the metadata can not be encoded"""
+    if isinstance(obj, DataInfo):
+        return {"__DataInfo__": {name: encode_metadata(getattr(obj, name))
+                                 for name in _DATA_INFO_ARGS}}
+    if obj is None or isinstance(obj, (str, bool, int, float)):
+        return obj
+    if isinstance(obj, tuple):
+        return {"__tuple__": [encode_metadata(item) for item in obj]}
+    if isinstance(obj, list):
+        return [encode_metadata(item) for item in obj]
+    if isinstance(obj, dict):
+        ret = {}
+        for key, value in obj.items():
+            if not isinstance(key, str) or key.startswith("__"):
+                raise NotIndexable("unsupported key %r" % (key,))
+            ret[key] = encode_metadata(value)
+        return ret
+    raise NotIndexable("unsupported value %r" % (obj,))
+
+
+def decode_metadata(obj):
+    """Decodes the controller class metadata encoded with
+    :func:`encode_metadata`"""
+    if isinstance(obj, list):
+        return [decode_metadata(item) for item in obj]
+    if isinstance(obj, dict):
+        if "__DataInfo__" in obj:
+            kwargs = decode_metadata(obj["__DataInfo__"])
+            return DataInfo(kwargs.pop("name"), kwargs.pop("dtype"), **kwargs)
+        if "__tuple__" in obj:
+            return tuple(decode_metadata(obj["__tuple__"]))
+        return {key: decode_metadata(value) for key, value in obj.items()}
+    return obj
+
+
+class ControllerLibScanner(ModuleScanner):
+    """Static scanner of a controller library: it finds the top-level classes
+    which are unconditionally defined (only once) in the library.
+
+    The controller classes metadata can not be reliably extracted without
+    importing the library (it may be computed at import time), so it is
+    obtained from a one-time import and only cached for the controller
+    classes found by this scanner.
+
+    .. note::
+        The ControllerLibScanner class has been included in Sardana
+        on a provisional basis. Backwards incompatible changes
+        (up to and including removal of the class) may occur if
+        deemed necessary by the core developers.
+    """
+
+    trusted_modules = ("sardana.pool.controller",)
+
+    def scan(self):
+        """Returns the library static metadata: the names of the classes
+        unconditionally defined in the library
+
+        :return: the library static metadata
+        :rtype: dict
+        :raises: NotIndexable if the library can not be scanned"""
+        classes = []
+        for stmt in self.tree.body:
+            if not isinstance(stmt, ast.ClassDef):
+                continue
+            try:
+                self.resolve_name(stmt.name)
+            except NotIndexable:
+                continue
+            classes.append(stmt.name)
+        return dict(classes=sorted(classes))
+
+
+def scan_controller_lib(source, file_name="<unknown>"):
+    """Returns the static metadata of the controller library (see
+    :meth:`ControllerLibScanner.scan`)
+
+    :param source: the controller library source
+    :type source: :obj:`str` or :obj:`bytes`
+    :param file_name: the controller library file name
+    :type file_name: :obj:`str`
+    :return: the controller library static metadata
+    :rtype: dict
+    :raises: NotIndexable if the library can not be scanned"""
+    return ControllerLibScanner(source, file_name).scan()
@@ -36,6 +36,7 @@ import sys
 import copy
 import types
 import inspect
+import threading
 
 try:
     from collections import OrderedDict
@@ -48,9 +49,12 @@ from taurus.core.util.log import Logger
 from taurus.core.util.singleton import Singleton
 
 from sardana.sardanamodulemanager import ModuleManager
+from sardana.sardanametaindex import NotIndexable, MetaIndex
 from sardana.pool import controller
-from sardana.pool.poolexception import UnknownController
+from sardana.pool.poolexception import PoolException, UnknownController
 from sardana.pool.poolmetacontroller import ControllerLibrary, ControllerClass
+from sardana.pool.poolcontrollerindex import SCANNER_VERSION, \
+    scan_controller_lib, encode_metadata, decode_metadata
 
 CONTROLLER_TEMPLATE = '''
 
@@ -113,6 +117,10 @@ class ControllerManager(Singleton, Logger):
             l.append(klass)
         self._base_classes = l
 
+        # serializes the loading of the controller libraries created from
+        # the controller class index
+        self._load_lock = threading.RLock()
+
         self._state = ManagerState.INITED
 
     def cleanUp(self):
@@ -162,15 +170,35 @@ class ControllerManager(Singleton, Logger):
 
         self._controller_path = p
 
+        index = None
+        index_file = getattr(self.get_pool(), "controller_index_file", None)
+        if index_file is not None:
+            index = MetaIndex("ControllerLibIndex", index_file,
+                              scan_controller_lib, SCANNER_VERSION)
         controller_file_names = self._findControllerLibNames()
 
         for mod_name, file_name in controller_file_names.items():
             dir_name = os.path.dirname(file_name)
             path = [dir_name]
             try:
-                self.reloadControllerLib(mod_name, path, reload=reload)
+                lib_info = None
+                if index is not None:
+                    lib_info = self._getIndexedControllerLibInfo(file_name,
+                                                                 index)
+                if lib_info is not None:
+                    controller_lib = self._addIndexedControllerLib(
+                        mod_name, file_name, lib_info)
+                    if controller_lib is not None:
+                        continue
+                controller_lib = self.reloadControllerLib(mod_name, path,
+                                                          reload=reload)
+                if lib_info is not None:
+                    self._indexControllerLib(controller_lib, file_name,
+                                             lib_info, index)
             except Exception:
                 pass
+        if index is not None:
+            index.save()
 
     def getControllerPath(self):
         """Returns the current sequence of absolute paths used to look for
@@ -450,6 +478,159 @@ class ControllerManager(Singleton, Logger):
 
         return controller_lib
 
+    def _getIndexedControllerLibInfo(self, file_name, index):
+        """Returns the controller library metadata from the controller class
+        index (see :mod:`~sardana.pool.poolcontrollerindex`) or None if the
+        library is not indexable"""
+        try:
+            return index.get(file_name)
+        except Exception:
+            self.debug("Failed to index controller library %s", file_name,
+                       exc_info=1)
+            return None
+
+    def _getControllerLibDependencies(self, controller_lib):
+        """Returns the files (other than the library itself) where the base
+        classes of the library controller classes are defined together with
+        their modification time"""
+        dependencies = {}
+        lib_file_name = os.path.normcase(controller_lib.file_path)
+        for controller_class in controller_lib.get_controllers():
+            for klass in controller_class.klass.__mro__:
+                try:
+                    file_name = inspect.getabsfile(klass)
+                except TypeError:
+                    # builtin classes
+                    continue
+                if os.path.normcase(file_name) == lib_file_name:
+                    continue
+                dependencies[file_name] = os.stat(file_name).st_mtime
+        return dependencies
+
+    def _indexControllerLib(self, controller_lib, file_name, lib_info, index):
+        """Completes the controller library static metadata with the
+        metadata of its controller classes once the library is imported.
+        Only the libraries whose controller classes are unconditionally
+        defined in the library are indexed."""
+        if controller_lib is None or controller_lib.has_errors():
+            return
+        # all the controller classes defined in the library must have been
+        # added (see addController)
+        abs_file = os.path.normcase(controller_lib.file_path)
+        for _, klass in inspect.getmembers(controller_lib.module,
+                                           inspect.isclass):
+            if issubclass(klass, controller.Controller) and \
+                    not controller_lib.has_controller(klass.__name__) and \
+                    os.path.normcase(inspect.getabsfile(klass)) == abs_file:
+                return
+        classes = set(lib_info['classes'])
+        controllers = []
+        try:
+            for controller_class in controller_lib.get_controllers():
+                if controller_class.name not in classes:
+                    self.debug("Controller %s is not indexable",
+                               controller_class.name)
+                    return
+                controllers.append(
+                    encode_metadata(controller_class.get_metadata()))
+            dependencies = self._getControllerLibDependencies(controller_lib)
+        except (NotIndexable, OSError) as e:
+            self.debug("Controller library %s is not indexable: %s",
+                       controller_lib.name, e)
+            return
+        lib_info = dict(lib_info, description=controller_lib.description,
+                        controllers=controllers, dependencies=dependencies)
+        index.update(file_name, lib_info)
+
+    def _addIndexedControllerLib(self, module_name, file_name, lib_info):
+        """Adds the controller library from its metadata (see
+        :mod:`~sardana.pool.poolcontrollerindex`) without importing it. The
+        library is imported on the first use of its code e.g. the first
+        instantiation of one of its controllers (see
+        :meth:`_loadControllerLib`).
+
+        :param module_name: controller library name (=python module name)
+        :param file_name: controller library absolute file name
+        :param lib_info: the controller library metadata
+        :return: the ControllerLibrary object or None if the library must be
+                 imported (not yet indexed or changed since it was indexed)"""
+        if 'controllers' not in lib_info:
+            return None
+        for dependency, mtime in lib_info['dependencies'].items():
+            try:
+                if os.stat(dependency).st_mtime == mtime:
+                    continue
+            except OSError:
+                pass
+            self.debug("%s changed since controller library %s was indexed",
+                       dependency, module_name)
+            return None
+        controller_lib = ControllerLibrary(name=module_name,
+                                           file_path=file_name,
+                                           description=lib_info['description'],
+                                           loader=self._loadControllerLib,
+                                           pool=self.get_pool())
+        controller_classes = []
+        try:
+            for metadata in lib_info['controllers']:
+                metadata = decode_metadata(metadata)
+                controller_class = ControllerClass(
+                    pool=self.get_pool(), lib=controller_lib, klass=None,
+                    name=metadata['name'],
+                    description=metadata['description'], metadata=metadata)
+                controller_classes.append(controller_class)
+        except Exception:
+            self.debug("Failed to add controller library %s from its index",
+                       module_name, exc_info=1)
+            return None
+
+        # if there was previous Controller Lib info remove it
+        self._modules.pop(module_name, None)
+
+        for controller_class in controller_classes:
+            self.debug("Adding indexed controller %s", controller_class.name)
+            controller_lib.add_controller(controller_class)
+            self._controller_dict[controller_class.name] = controller_class
+        if controller_classes:
+            self._modules[module_name] = controller_lib
+        return controller_lib
+
+    def _loadControllerLib(self, controller_lib):
+        """Imports the controller library added from its metadata (see
+        :meth:`_addIndexedControllerLib`) and sets the python class of its
+        controller classes.
+
+        :raises:
+            PoolException in case the controller library can not be imported
+            or its controller classes changed since it was indexed"""
+        with self._load_lock:
+            if controller_lib.is_loaded():
+                return
+            module_name = controller_lib.name
+            m = ModuleManager().reloadModule(module_name,
+                                             [controller_lib.path],
+                                             reload=False)
+            if m is None:
+                raise PoolException("Error loading controller library '%s'"
+                                    % module_name)
+            abs_file = os.path.normcase(controller_lib.file_path)
+            klasses = []
+            for controller_class in controller_lib.get_controllers():
+                klass = getattr(m, controller_class.name, None)
+                if not inspect.isclass(klass) or \
+                        not issubclass(klass, controller.Controller) or \
+                        os.path.normcase(inspect.getabsfile(klass)) != \
+                        abs_file:
+                    raise PoolException("Controller %s changed since the "
+                                        "controller library '%s' was indexed."
+                                        " Use ReloadControllerLib to reload "
+                                        "it" % (controller_class.name,
+                                                module_name))
+                klasses.append((controller_class, klass))
+            for controller_class, klass in klasses:
+                controller_class.set_code_object(klass)
+            controller_lib.set_module(m)
+
     def addController(self, controller_lib, klass):
         """Adds a new controller class"""
         controller_name = klass.__name__
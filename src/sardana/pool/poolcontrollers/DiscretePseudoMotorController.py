@@ -32,6 +32,8 @@ __docformat__ = 'restructuredtext'
 
 import json
 
+import numpy
+
 from sardana import DataAccess
 from sardana.pool.controller import PseudoMotorController
 from sardana.pool.controller import Type, Access, Description
@@ -89,6 +91,13 @@ class DiscretePseudoMotorController(PseudoMotorController):
         self._positions_cfg = None
         self._labels_cfg = None
 
+    def _get_mapping(self):
+        if self._configuration is not None:
+            return (self._positions_cfg, self._calibration_cfg,
+                    self._labels_cfg)
+        # TODO: Remove when we drop support to Labels and Calibration
+        return self._positions, self._calibration, self._labels
+
     def GetAxisAttributes(self, axis):
         axis_attrs = PseudoMotorController.GetAxisAttributes(self, axis)
         axis_attrs = dict(axis_attrs)
@@ -96,15 +105,7 @@ class DiscretePseudoMotorController(PseudoMotorController):
         return axis_attrs
 
     def CalcPseudo(self, axis, physical_pos, curr_pseudo_pos):
-        if self._configuration is not None:
-            positions = self._positions_cfg
-            calibration = self._calibration_cfg
-            labels = self._labels_cfg
-        else:
-            # TODO: Remove when we drop support to Labels and Calibration
-            positions = self._positions
-            calibration = self._calibration
-            labels = self._labels
+        positions, calibration, labels = self._get_mapping()
 
         llabels = len(labels)
         lcalibration = len(calibration)
@@ -135,16 +136,7 @@ class DiscretePseudoMotorController(PseudoMotorController):
             raise Exception("Bad configuration on axis attributes.")
 
     def CalcPhysical(self, axis, pseudo_pos, curr_physical_pos):
-
-        if self._configuration is not None:
-            positions = self._positions_cfg
-            calibration = self._calibration_cfg
-            labels = self._labels_cfg
-        else:
-            # TODO: Remove when we drop support to Labels and Calibration
-            positions = self._positions
-            calibration = self._calibration
-            labels = self._labels
+        positions, calibration, labels = self._get_mapping()
 
         # If Labels is well defined, the write value must be one this struct
         llabels = len(labels)
@@ -176,6 +168,54 @@ class DiscretePseudoMotorController(PseudoMotorController):
             self._log.debug("calibrated_position = %s", calibrated_position)
             return calibrated_position
 
+    def CalcAllPseudoArray(self, physical_pos, curr_pseudo_pos):
+        positions, calibration, labels = self._get_mapping()
+        llabels = len(labels)
+        lcalibration = len(calibration)
+
+        value = numpy.asarray(physical_pos, dtype=float)[:, 0]
+        # see CalcPseudo for the meaning of each case
+        if llabels == 0:
+            ret = numpy.trunc(value)
+        elif lcalibration == 0:
+            ret = numpy.trunc(value)
+            if not numpy.isin(ret, positions).all():
+                raise Exception("Invalid position.")
+        elif llabels == lcalibration:
+            calibration = numpy.asarray(calibration, dtype=float)
+            inside = ((value[:, numpy.newaxis] >= calibration[:, 0])
+                      & (value[:, numpy.newaxis] <= calibration[:, 2]))
+            if not inside.any(axis=1).all():
+                raise Exception("Invalid position.")
+            # argmax gives the first fussy area which contains the value
+            ret = numpy.asarray(positions, dtype=float)[inside.argmax(axis=1)]
+        else:
+            raise Exception("Bad configuration on axis attributes.")
+        return ret[:, numpy.newaxis]
+
+    def CalcAllPhysicalArray(self, pseudo_pos, curr_physical_pos):
+        positions, calibration, labels = self._get_mapping()
+        llabels = len(labels)
+        lcalibration = len(calibration)
+
+        value = numpy.asarray(pseudo_pos, dtype=float)[:, 0]
+        # see CalcPhysical for the meaning of each case
+        if llabels == 0:
+            return value[:, numpy.newaxis]
+        match = value[:, numpy.newaxis] == numpy.asarray(positions,
+                                                         dtype=float)
+        if not match.any(axis=1).all():
+            raise Exception("Invalid position.")
+        if lcalibration == 0:
+            ret = value
+        elif llabels == lcalibration:
+            calibration = numpy.asarray(calibration, dtype=float)
+            # central element of the calibration of each destination
+            ret = calibration[match.argmax(axis=1), 1]
+        else:
+            raise Exception("Bad configuration on axis attributes.")
+        return ret[:, numpy.newaxis]
+
     # TODO: Remove when we drop support to Labels and Calibration
     def getLabels(self, axis):
         if self._configuration is not None:
@@ -50,6 +50,7 @@ class DummyCounterTimerController(CounterTimerController):
 
     default_timer = 1
     default_latency_time = 0.0
+    keep_loaded = True
 
     ctrl_attributes = {
         "Synchronizer": {
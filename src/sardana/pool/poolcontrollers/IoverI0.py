@@ -28,6 +28,8 @@ __all__ = ["IoverI0"]
 
 __docformat__ = 'restructuredtext'
 
+import numpy
+
 from sardana.pool.controller import PseudoCounterController
 
 
@@ -48,3 +50,10 @@ class IoverI0(PseudoCounterController):
         except ZeroDivisionError:
             pass
         return i
+
+    def CalcBuffer(self, axis, counter_values):
+        i, i0 = counter_values
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            ratio = numpy.true_divide(i, i0)
+        # as in Calc, I is returned when I0 is zero
+        return numpy.where(i0 == 0, i, ratio)
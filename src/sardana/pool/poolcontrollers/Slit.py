@@ -28,6 +28,8 @@ __all__ = ["Slit"]
 
 __docformat__ = 'restructuredtext'
 
+import numpy
+
 from sardana import DataAccess
 from sardana.pool.controller import PseudoMotorController
 from sardana.pool.controller import DefaultValue, Description, Access, Type
@@ -90,6 +92,22 @@ class Slit(PseudoMotorController):
     #    return (self.sign * (pseudo_pos[1] + half_gap),
     #            self.sign * (half_gap - pseudo_pos[1]))
 
+    def CalcAllPseudoArray(self, physical_pos, curr_pseudo_pos):
+        """Calculates the positions of all pseudo motors for many sets of
+           physical motor positions at once."""
+        physical_pos = numpy.asarray(physical_pos, dtype=float)
+        top, bottom = physical_pos[:, 0], physical_pos[:, 1]
+        gap = top + bottom
+        return self.sign * numpy.column_stack((gap, top - gap / 2))
+
+    def CalcAllPhysicalArray(self, pseudo_pos, curr_physical_pos):
+        """Calculates the positions of all motors for many sets of pseudo
+           motor positions at once."""
+        pseudo_pos = numpy.asarray(pseudo_pos, dtype=float)
+        half_gap, offset = pseudo_pos[:, 0] / 2, pseudo_pos[:, 1]
+        return self.sign * numpy.column_stack((offset + half_gap,
+                                               half_gap - offset))
+
     def SetAxisExtraPar(self, axis, parameter, value):
         self._example[axis] = value
 
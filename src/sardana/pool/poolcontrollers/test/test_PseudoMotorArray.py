@@ -0,0 +1,85 @@
+import json
+
+import numpy
+
+from taurus.test.base import insertTest
+from taurus.external import unittest
+
+from sardana.pool.poolcontrollers.Slit import Slit
+from sardana.pool.poolcontrollers.DiscretePseudoMotorController import \
+    DiscretePseudoMotorController
+
+configuration_labels = {"IN": {"pos": 0}, "OUT": {"pos": 1},
+                        "PARK": {"pos": 2}}
+
+configuration_calibration = {
+    "IN": {"pos": 0, "min": -1, "set": 0, "max": 1},
+    "OUT": {"pos": 1, "min": 1, "set": 2, "max": 3},
+    "PARK": {"pos": 5, "min": 3.5, "set": 4, "max": 4.5}}
+
+
+class SlitArrayTestCase(unittest.TestCase):
+    """Test that the vectorized Slit calculations are equivalent to the
+    point by point ones."""
+
+    def setUp(self):
+        self.ctrl = Slit("slit", {"sign": -1})
+
+    def test_calc_all_physical_array(self):
+        pseudo_pos = numpy.random.uniform(-5, 5, (100, 2))
+        expected = [self.ctrl.CalcAllPhysical(pos, None)
+                    for pos in pseudo_pos]
+        physical_pos = self.ctrl.CalcAllPhysicalArray(pseudo_pos, None)
+        numpy.testing.assert_allclose(physical_pos, expected)
+
+    def test_calc_all_pseudo_array(self):
+        physical_pos = numpy.random.uniform(-5, 5, (100, 2))
+        expected = [self.ctrl.CalcAllPseudo(pos, None)
+                    for pos in physical_pos]
+        pseudo_pos = self.ctrl.CalcAllPseudoArray(physical_pos, None)
+        numpy.testing.assert_allclose(pseudo_pos, expected)
+
+
+@insertTest(helper_name="calc_array", configuration=None)
+@insertTest(helper_name="calc_array", configuration=configuration_labels)
+@insertTest(helper_name="calc_array", configuration=configuration_calibration)
+@insertTest(helper_name="invalid_position",
+            configuration=configuration_labels, physical=[[3.2]],
+            pseudo=[[3]])
+@insertTest(helper_name="invalid_position",
+            configuration=configuration_calibration, physical=[[3.2]],
+            pseudo=[[3]])
+class DiscretePseudoMotorArrayTestCase(unittest.TestCase):
+    """Test that the vectorized DiscretePseudoMotorController calculations
+    are equivalent to the point by point ones."""
+
+    def setUp(self):
+        self.ctrl = DiscretePseudoMotorController("discrete", {})
+
+    def _configure(self, configuration):
+        if configuration is not None:
+            self.ctrl.setConfiguration(1, json.dumps(configuration))
+
+    def calc_array(self, configuration):
+        self._configure(configuration)
+        if configuration is None:
+            physical_pos = numpy.random.uniform(-3, 3, (50, 1))
+            pseudo_pos = physical_pos
+        else:
+            positions = [v["pos"] for v in configuration.values()]
+            pseudo_pos = numpy.random.choice(positions, (50, 1))
+            physical_pos = self.ctrl.CalcAllPhysicalArray(pseudo_pos, None)
+        expected = [self.ctrl.CalcAllPhysical(pos, None)
+                    for pos in pseudo_pos]
+        numpy.testing.assert_allclose(physical_pos, expected)
+        expected = [self.ctrl.CalcAllPseudo(pos, None)
+                    for pos in physical_pos]
+        numpy.testing.assert_allclose(
+            self.ctrl.CalcAllPseudoArray(physical_pos, None), expected)
+
+    def invalid_position(self, configuration, physical, pseudo):
+        self._configure(configuration)
+        self.assertRaises(Exception, self.ctrl.CalcAllPseudoArray,
+                          physical, None)
+        self.assertRaises(Exception, self.ctrl.CalcAllPhysicalArray,
+                          pseudo, None)
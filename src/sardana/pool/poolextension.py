@@ -76,7 +76,17 @@ def register_controller_state_translator(klass, *args, **kwargs):
     __CTRL_STATE_TRANSLATORS[klass] = klass(*args, **kwargs)
 
 
-def translate_ctrl_value(value):
+def translate_ctrl_value(value, timestamp=None):
+    """Translate a value returned by a controller into a
+    :class:`~sardana.sardanavalue.SardanaValue`.
+
+    :param value: value returned by the controller
+    :param timestamp: timestamp of the readout (e.g. shared by all the values
+        of the same readout) [default: None, meaning create a 'now'
+        timestamp]
+    :type timestamp: float or None
+    :return: the translated value
+    :rtype: :class:`~sardana.sardanavalue.SardanaValue`"""
     if isinstance(value, SardanaValue):
         return value
 
@@ -87,4 +97,4 @@ def translate_ctrl_value(value):
             continue
 
     # Fallback translator
-    return SardanaValue(value=value)
+    return SardanaValue(value=value, timestamp=timestamp)
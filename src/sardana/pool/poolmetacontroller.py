@@ -253,17 +253,80 @@ class ControllerClass(SardanaClass):
            - name - class name
            - klass - python class object
            - lib - ControllerLibrary object representing the module where the
-             controller is."""
+             controller is.
+
+       A controller class created only from its metadata (see
+       :meth:`get_metadata`) gets its python class when its library is
+       loaded e.g. on the first instantiation of the controller."""
+
+    # dict with the gender, model and organization of the controller class
+    # metadata (None if they are taken from the python class)
+    _metadata = None
 
     def __init__(self, **kwargs):
         kwargs['manager'] = kwargs.pop('pool')
         kwargs['elem_type'] = ElementType.ControllerClass
+        metadata = kwargs.pop('metadata', None)
         SardanaClass.__init__(self, **kwargs)
-
+        if metadata is None:
+            self._build_info(self.klass)
+        else:
+            self._set_metadata(metadata)
+
+    def set_code_object(self, code_obj):
+        SardanaClass.set_code_object(self, code_obj)
+        if self._metadata is not None:
+            self._metadata = None
+            self._build_info(code_obj)
+
+    def get_metadata(self):
+        """Returns the controller class metadata: the information built from
+        the python class which allows to create the controller class without
+        it (see :mod:`~sardana.pool.poolcontrollerindex`)
+
+        :return: the controller class metadata
+        :rtype: dict"""
+        properties_descriptions = self.ctrl_properties_descriptions
+        return dict(name=self.name, description=self.description,
+                    gender=self.gender, model=self.model,
+                    organization=self.organization,
+                    ctrl_features=self.ctrl_features,
+                    ctrl_properties=list(self.ctrl_properties.values()),
+                    ctrl_properties_descriptions=properties_descriptions,
+                    ctrl_attributes=list(self.ctrl_attributes.values()),
+                    axis_attributes=list(self.axis_attributes.values()),
+                    type_names=self.type_names, dict_extra=self.dict_extra,
+                    api_version=self.api_version)
+
+    def _set_metadata(self, metadata):
+        self._metadata = dict(gender=metadata['gender'],
+                              model=metadata['model'],
+                              organization=metadata['organization'])
+        self.ctrl_features = metadata['ctrl_features']
+        self.ctrl_properties = CaselessDict()
+        for info in metadata['ctrl_properties']:
+            self.ctrl_properties[info.name] = info
+        self.ctrl_properties_descriptions = \
+            metadata['ctrl_properties_descriptions']
+        self.ctrl_attributes = CaselessDict()
+        for info in metadata['ctrl_attributes']:
+            self.ctrl_attributes[info.name] = info
+        self.axis_attributes = CaselessDict()
+        for info in metadata['axis_attributes']:
+            self.axis_attributes[info.name] = info
+        self.type_names = metadata['type_names']
+        self.types = [ElementType[name] for name in self.type_names]
+        self.dict_extra = dict_extra = metadata['dict_extra']
+        for name in ('motor_roles', 'pseudo_motor_roles', 'counter_roles',
+                     'pseudo_counter_roles'):
+            if name in dict_extra:
+                setattr(self, name, dict_extra[name])
+        self.api_version = metadata['api_version']
+
+    def _build_info(self, klass):
         self.types = []
         self.dict_extra = {}
         self.api_version = 1
-        klass = self.klass
         # Generic controller information
         self.ctrl_features = tuple(klass.ctrl_features)
 
@@ -301,7 +364,7 @@ class ControllerClass(SardanaClass):
         for k, v in list(klass.axis_attributes.items()):
             axis_attrs[k] = DataInfo.toDataInfo(k, v)
 
-        self.types = types = self.__build_types()
+        self.types = types = self.__build_types(klass)
         self.type_names = list(map(ElementType.whatis, types))
 
         if ElementType.PseudoMotor in types:
@@ -336,9 +399,8 @@ class ControllerClass(SardanaClass):
             return self.gender < o.gender
         return self.name < o.name
 
-    def __build_types(self):
+    def __build_types(self, klass):
         types = []
-        klass = self.klass
         for _type, type_data in list(TYPE_MAP_OBJ.items()):
             if _type not in TYPE_ELEMENTS:
                 continue
@@ -368,12 +430,18 @@ class ControllerClass(SardanaClass):
 
     @property
     def gender(self):
+        if self._metadata is not None:
+            return self._metadata['gender']
         return self.klass.gender
 
     @property
     def model(self):
+        if self._metadata is not None:
+            return self._metadata['model']
         return self.klass.model
 
     @property
     def organization(self):
+        if self._metadata is not None:
+            return self._metadata['organization']
         return self.klass.organization
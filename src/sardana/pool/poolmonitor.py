@@ -33,30 +33,102 @@ import time
 import threading
 
 from taurus.core.util.log import Logger
+from taurus.core.util.threadpool import ThreadPool
 
 from sardana import ElementType, TYPE_PSEUDO_ELEMENTS
 
 from sardana.pool.poolobject import PoolObject
 
 
+class ControllerSchedule(object):
+    """State refresh schedule of a single controller.
+
+    The refresh period adapts to the controller: it shrinks (down to
+    *min_period*) while the state of its elements keeps changing and it
+    relaxes back (up to *max_period*) while the state is stable. Controllers
+    which fail to be read are refreshed every *max_period* and slow
+    controllers are never refreshed more often than
+    :attr:`~ControllerSchedule.SLOW_FACTOR` times their read time."""
+
+    #: the minimum refresh period is this factor times the read time
+    SLOW_FACTOR = 10.0
+
+    #: the period is multiplied by this factor when the state is stable
+    RELAX_FACTOR = 1.5
+
+    def __init__(self, ctrl_id, min_period, max_period, next_time):
+        self.ctrl_id = ctrl_id
+        self.min_period = min_period
+        self.max_period = max_period
+        self.period = max_period
+        self.next_time = next_time
+        self.read_time = None
+        self.start_time = None
+        self.busy = False
+        self.timed_out = False
+
+    def start(self, start_time):
+        self.busy = True
+        self.start_time = start_time
+
+    def finish(self, finish_time, changed=False, failed=False):
+        """Calculates the next refresh time of the controller
+
+        :param finish_time: the time when the state read finished
+        :type finish_time: float
+        :param changed: whether the state of any element has changed
+        :type changed: bool
+        :param failed: whether the state read failed
+        :type failed: bool"""
+        read_time = finish_time - self.start_time
+        if self.read_time is None:
+            self.read_time = read_time
+        else:
+            self.read_time = 0.7 * self.read_time + 0.3 * read_time
+        if failed:
+            period = self.max_period
+        elif changed:
+            period = max(self.min_period, self.period / 2)
+        else:
+            period = min(self.max_period, self.period * self.RELAX_FACTOR)
+        self.period = period
+        period = max(period, self.SLOW_FACTOR * self.read_time)
+        self.next_time = finish_time + period
+        self.busy = False
+        self.timed_out = False
+
+
 class PoolMonitor(Logger, threading.Thread):
+    """Refreshes the state of the idle pool elements.
+
+    The state of the elements of each controller is read in a pool of
+    threads so a slow controller does not delay the others. Each controller
+    has its own adaptive refresh period (see :class:`ControllerSchedule`)
+    between *min_sleep* and *period* seconds and the due controllers are
+    read in deadline order."""
 
     MIN_THREADS = 1
     MAX_THREADS = 10
 
     def __init__(self, pool, name='PoolMonitor', period=5.0, min_sleep=1.0,
-                 auto_start=True):
+                 timeout=3.0, auto_start=True):
         Logger.__init__(self, name)
         threading.Thread.__init__(self, name=name)
         self.daemon = True
         self._period = period
         self._min_sleep = min_sleep
+        self._timeout = timeout
         self._pool = pool
-        self._stop = False
+        self._stopped = False
         self._pause = threading.Event()
+        self._wake = threading.Event()
+        # created on the first state read (see :meth:`monitor`)
         self._thread_pool = None
         self._ctrl_ids = []
         self._elem_ids = []
+        self._ctrl_elem_ids = {}
+        self._schedules = {}
+        self._schedules_lock = threading.Lock()
         pool.add_listener(self.on_pool_changed)
         if not auto_start:
             self.pause()
@@ -70,74 +142,103 @@ class PoolMonitor(Logger, threading.Thread):
             pool_ctrls.sort(key=PoolObject.get_id)
             ctrl_ids = []
             elem_ids = []
+            ctrl_elem_ids = {}
             for pool_ctrl in pool_ctrls:
                 if not pool_ctrl.is_online():
                     continue
                 types = set(pool_ctrl.get_ctrl_types())
                 if types.isdisjoint(TYPE_PSEUDO_ELEMENTS):
                     ctrl_ids.append(pool_ctrl.id)
-                    elem_ids.extend(list(pool_ctrl.get_element_ids().keys()))
+                    ids = sorted(pool_ctrl.get_element_ids().keys())
+                    ctrl_elem_ids[pool_ctrl.id] = ids
+                    elem_ids.extend(ids)
             elem_ids.sort()
-            self._elem_ids = elem_ids
-            self._ctrl_ids = ctrl_ids
+            next_time = time.time() + self._period
+            with self._schedules_lock:
+                schedules = {}
+                for ctrl_id in ctrl_ids:
+                    schedule = self._schedules.get(ctrl_id)
+                    if schedule is None:
+                        schedule = ControllerSchedule(ctrl_id,
+                                                      self._min_sleep,
+                                                      self._period,
+                                                      next_time)
+                    schedules[ctrl_id] = schedule
+                self._schedules = schedules
+                self._ctrl_elem_ids = ctrl_elem_ids
+                self._elem_ids = elem_ids
+                self._ctrl_ids = ctrl_ids
 
     def update_state_info(self):
-        """Update state information of every element."""
+        """Update state information of every element. The state read of
+        every controller is scheduled to happen immediately."""
+        with self._schedules_lock:
+            for schedule in list(self._schedules.values()):
+                schedule.next_time = 0
+        self._wake.set()
+
+    def _update_schedule(self, schedule):
+        """Thread pool job which updates the state information of the
+        elements of one controller"""
+        changed, failed = False, False
+        try:
+            pool_ctrl = self._pool.get_element_by_id(schedule.ctrl_id)
+            changed = self._update_ctrl(pool_ctrl)
+        except Exception:
+            failed = True
+            self.debug("Failed to update state of controller %d",
+                       schedule.ctrl_id, exc_info=1)
+        finally:
+            with self._schedules_lock:
+                if schedule.timed_out:
+                    self.info("Controller %d state read finished after "
+                              "%.3f s", schedule.ctrl_id,
+                              time.time() - schedule.start_time)
+                schedule.finish(time.time(), changed=changed,
+                                failed=failed or schedule.timed_out)
+            self._wake.set()
+
+    def _update_ctrl(self, pool_ctrl):
+        """Update state information of the elements of the given controller
+        unless any of them is involved in an operation.
 
+        :return: whether the state of any element has changed
+        :rtype: bool"""
         pool = self._pool
-        elems, ctrls, ctrl_items = [], [], {}
+        elems = []
         try:
-            blocked_ctrls = set()
-            for elem_id in self._elem_ids:
+            for elem_id in self._ctrl_elem_ids.get(pool_ctrl.id, ()):
                 elem = pool.get_element_by_id(elem_id)
-                ctrl = elem.controller
-                if elem.is_in_operation():
-                    blocked_ctrls.add(ctrl)
-                    continue
-                if ctrl in blocked_ctrls:
-                    continue
-                ret = elem.lock(blocking=False)
-                if ret:
-                    elems.append(elem)
-                    ctrl_elems = ctrl_items.get(ctrl)
-                    if ctrl_elems is None:
-                        ctrl_items[ctrl] = ctrl_elems = []
-                    ctrl_elems.append(elem)
-                else:
-                    blocked_ctrls.add(ctrl)
-
-            for ctrl, ctrl_elems in list(ctrl_items.items()):
-                ret = ctrl.lock(blocking=False)
-                if ret:
-                    ctrls.append(ctrl)
-                else:
-                    for elem in reversed(ctrl_elems):
-                        elem.unlock()
-                        elems.remove(elem)
-
-            self._update_state_info_serial(ctrl_items)
+                if elem.is_in_operation() or not elem.lock(blocking=False):
+                    return False
+                elems.append(elem)
+            if not len(elems) or not pool_ctrl.lock(blocking=False):
+                return False
+            try:
+                return self._update_ctrl_state_info(pool_ctrl, elems)
+            finally:
+                pool_ctrl.unlock()
         finally:
-            for ctrl in reversed(ctrls):
-                ctrl.unlock()
             for elem in reversed(elems):
                 elem.unlock()
 
-    def _update_state_info_serial(self, pool_ctrls):
-        for pool_ctrl, elems in list(pool_ctrls.items()):
-            self._update_ctrl_state_info(pool_ctrl, elems)
-
     def _update_ctrl_state_info(self, pool_ctrl, elems):
         axes = [elem.axis for elem in elems]
         state_infos, exc_info = pool_ctrl.raw_read_axis_states(axes)
         if len(exc_info):
             self.info("STATE ERROR %s", exc_info)
+        changed = False
         for elem, state_info in list(state_infos.items()):
             state_info = elem._from_ctrl_state_info(state_info)
+            old_state = elem.inspect_state()
             elem.set_state_info(state_info)
+            changed |= elem.inspect_state() != old_state
+        return changed
 
     def stop(self):
+        self._stopped = True
         self.resume()
-        self._stop = True
+        self._wake.set()
 
     def pause(self):
         self._pause.clear()
@@ -146,19 +247,69 @@ class PoolMonitor(Logger, threading.Thread):
         self._pause.set()
 
     def monitor(self):
-        ret = self.update_state_info()
+        """Start the state read of the controllers whose refresh is due
+        (the most overdue ones first) without exceeding the maximum number
+        of concurrent reads.
+
+        :return: time to wait until the next refresh is due
+        :rtype: float"""
+        now = time.time()
+        with self._schedules_lock:
+            schedules = list(self._schedules.values())
+            busy = 0
+            for schedule in schedules:
+                if not schedule.busy:
+                    continue
+                busy += 1
+                if not schedule.timed_out and \
+                        now - schedule.start_time > self._timeout:
+                    schedule.timed_out = True
+                    self.warning("Controller %d state read takes more than "
+                                 "%.1f s", schedule.ctrl_id, self._timeout)
+            max_threads = min(self.MAX_THREADS,
+                              max(self.MIN_THREADS, len(schedules)))
+            idle = [schedule for schedule in schedules if not schedule.busy]
+            idle.sort(key=lambda schedule: schedule.next_time)
+            due = []
+            for schedule in idle:
+                if schedule.next_time > now or busy >= max_threads:
+                    break
+                schedule.start(now)
+                due.append(schedule)
+                busy += 1
+            if busy >= max_threads:
+                # wait for a read to finish
+                nap_time = self._timeout
+            elif len(idle) > len(due):
+                nap_time = idle[len(due)].next_time - now
+            else:
+                nap_time = self._period
+        if len(due) > 0:
+            thread_pool = self._get_thread_pool(max_threads)
+            for schedule in due:
+                thread_pool.add(self._update_schedule, None, schedule)
+        return max(0, min(nap_time, self._timeout))
+
+    def _get_thread_pool(self, size):
+        """Return the thread pool reading the controllers state with at
+        least the given number of threads (it is created on the first call
+        and grows with the number of controllers)"""
+        thread_pool = self._thread_pool
+        if thread_pool is None:
+            thread_pool = ThreadPool(name=self.name + "TP", Psize=size)
+            self._thread_pool = thread_pool
+        elif thread_pool.size < size:
+            thread_pool.size = size
+        return thread_pool
 
     def run(self):
-        nap_time = period = self._period
-        i, startup = 0, time.time()
         while True:
-            if self._stop:
-                break
-            time.sleep(nap_time)
             self._pause.wait()
-            self.monitor()
-            finish = time.time()
-            nap_time = -1
-            while nap_time < 0:
-                i += 1
-                nap_time = (startup + i * self._period) - finish
+            if self._stopped:
+                break
+            self._wake.clear()
+            nap_time = self.monitor()
+            self._wake.wait(nap_time)
+        thread_pool, self._thread_pool = self._thread_pool, None
+        if thread_pool is not None:
+            thread_pool.join()
@@ -26,7 +26,9 @@
 """This module is part of the Python Pool libray. It defines the class for a
 motion"""
 
-__all__ = ["MotionState", "MotionMap", "PoolMotion", "PoolMotionItem"]
+__all__ = ["MotionState", "MotionMap", "PoolMotion", "PoolMotionItem",
+           "MotionLoopScheduler", "predict_motion_duration",
+           "check_position_limits"]
 
 __docformat__ = 'restructuredtext'
 
@@ -36,6 +38,8 @@ from taurus.core.util.log import DebugIt
 from taurus.core.util.enumeration import Enumeration
 
 from sardana import State
+from sardana.util.motion import Motor as VMotor
+from sardana.util.motion import MotionPath
 from sardana.pool.poolaction import ActionContext, PoolActionItem, PoolAction
 
 #: enumeration representing possible motion states
@@ -163,6 +167,176 @@ class PoolMotionItem(PoolActionItem):
         self.old_motion_state, self.motion_state = ms, new_ms
         return ms, new_ms
 
+
+def predict_motion_duration(moveable, dial_position):
+    """Predict how long the motion of the moveable to the given dial position
+    will take based on the trapezoidal velocity profile
+    (:class:`~sardana.util.motion.Motor`) defined by the base rate, velocity,
+    acceleration and deceleration of the moveable.
+
+    The current dial position is taken from the cache so no hardware access
+    is done, apart from the first read of the motion parameters.
+
+    :param moveable: moveable element (motor)
+    :type moveable: :class:`~sardana.pool.poolmotor.PoolMotor`
+    :param dial_position: final dial position
+    :type dial_position: :obj:`float`
+    :return: predicted motion duration (s) or None if it can not be
+        predicted (e.g. the moveable does not have the motion parameters
+        or the current position is unknown)
+    :rtype: :obj:`float` or None
+    """
+    try:
+        current = moveable.get_dial_position_attribute().value
+        if current is None:
+            return None
+        motor = VMotor(min_vel=moveable.get_base_rate(propagate=0),
+                       max_vel=moveable.get_velocity(propagate=0),
+                       accel_time=moveable.get_acceleration(propagate=0),
+                       decel_time=moveable.get_deceleration(propagate=0))
+        duration = MotionPath(motor, current, dial_position).duration
+    except Exception:
+        return None
+    if duration < 0 or duration == float("inf") or duration != duration:
+        return None
+    return duration
+
+
+def check_position_limits(moveable, position):
+    """Check the position against the cached position limits of the moveable
+    (see :meth:`~sardana.pool.poolmotor.PoolMotor.get_position_limits`).
+    No hardware or network access is done.
+
+    :param moveable: moveable element (motor or pseudo motor)
+    :type moveable: :class:`~sardana.pool.poolmotor.PoolMotor` or
+        :class:`~sardana.pool.poolpseudomotor.PoolPseudoMotor`
+    :param position: requested user position
+    :type position: :obj:`float`
+    :raises: RuntimeError if the position is out of the limits
+    """
+    low, high = moveable.get_position_limits()
+    if high is not None:
+        if float(position) > high:
+            msg = "requested movement of %s is above its upper limit"\
+                % moveable.name
+            raise RuntimeError(msg)
+    if low is not None:
+        if float(position) < low:
+            msg = "requested movement of %s is below its lower limit"\
+                % moveable.name
+            raise RuntimeError(msg)
+
+
+class MotionLoopScheduler(object):
+    """Scheduler of the state and position readouts of the motion loop.
+
+    The end of the motion is predicted from the motion profile of each
+    moveable (see :func:`predict_motion_duration`). While the motion is
+    far from the predicted end (e.g. the constant velocity phase) the state
+    is polled sparsely (every half of the remaining time, but not less than
+    the minimum nap and not more than the maximum nap). Close to the
+    predicted end, and after it, the state is polled every minimum nap.
+    If the end can not be predicted the state is polled every minimum nap.
+
+    Positions are read at most every *nb_states_per_position* minimum naps.
+
+    When the moveables stop the scheduler calculates the prediction errors
+    (actual minus predicted end of the motion).
+
+    .. note::
+        The MotionLoopScheduler class has been included in Sardana
+        on a provisional basis. Backwards incompatible changes
+        (up to and including removal of the class) may occur if
+        deemed necessary by the core developers.
+    """
+
+    def __init__(self, min_nap, max_nap, nb_states_per_position,
+                 durations=None):
+        """Construct MotionLoopScheduler object
+
+        :param min_nap: minimum sleep time between state readouts (s)
+        :type min_nap: :obj:`float`
+        :param max_nap: maximum sleep time between state readouts (s)
+        :type max_nap: :obj:`float`
+        :param nb_states_per_position: number of minimum naps between
+            position readouts
+        :type nb_states_per_position: :obj:`int`
+        :param durations: predicted motion durations (s) per moveable
+            (None values mean unknown duration)
+        :type durations: dict<moveable, float>
+        """
+        self.min_nap = min_nap
+        self.max_nap = max(max_nap, min_nap)
+        self.position_period = min_nap * nb_states_per_position
+        if durations is None:
+            durations = {}
+        self.durations = durations
+        self.prediction_errors = {}
+        self.start()
+
+    def start(self, start_time=None):
+        """Mark the start of the motion.
+
+        :param start_time: motion start timestamp [default: now]
+        :type start_time: :obj:`float`
+        """
+        if start_time is None:
+            start_time = time.time()
+        self.start_time = start_time
+        self._last_position_time = None
+        durations = list(self.durations.values())
+        if len(durations) == 0 or None in durations:
+            self.predicted_end = None
+        else:
+            self.predicted_end = start_time + max(durations)
+
+    def is_position_due(self):
+        """Check whether the positions should be read in this iteration.
+
+        :return: True if the positions should be read
+        :rtype: :obj:`bool`
+        """
+        now = time.time()
+        last = self._last_position_time
+        if last is None or now - last >= self.position_period:
+            self._last_position_time = now
+            return True
+        return False
+
+    def get_nap(self):
+        """Compute the time to wait before the next iteration.
+
+        :return: nap time (s)
+        :rtype: :obj:`float`
+        """
+        min_nap = self.min_nap
+        if self.predicted_end is None:
+            return min_nap
+        remaining = self.predicted_end - time.time()
+        return min(max(remaining / 2., min_nap), self.max_nap)
+
+    def wait(self):
+        """Wait until the next iteration."""
+        time.sleep(self.get_nap())
+
+    def stopped(self, moveable, timestamp):
+        """Inform the scheduler that the moveable has stopped.
+
+        :param moveable: moveable which stopped
+        :param timestamp: time when the stop was detected
+        :type timestamp: :obj:`float`
+        :return: prediction error (s) or None if the motion duration
+            was not predicted
+        :rtype: :obj:`float` or None
+        """
+        duration = self.durations.get(moveable)
+        if duration is None:
+            return None
+        error = timestamp - (self.start_time + duration)
+        self.prediction_errors[moveable] = error
+        return error
+
+
 _NON_ERROR_STATES = State.On, State.Moving, State.Running
 
 
@@ -173,7 +347,9 @@ class PoolMotion(PoolAction):
         PoolAction.__init__(self, main_element, name)
         self._motion_info = None
         self._motion_sleep_time = None
+        self._motion_max_sleep_time = None
         self._nb_states_per_position = None
+        self._motion_scheduler = None
 
     def _recover_start_error(self, ctrl, meth_name, read_state=False):
         self.error("%s throws exception on %s. Stopping...", ctrl, meth_name)
@@ -260,12 +436,22 @@ class PoolMotion(PoolAction):
         self._nb_states_per_position = \
             kwargs.pop("nb_states_per_position",
                        pool.motion_loop_states_per_position)
+        self._motion_max_sleep_time = \
+            kwargs.pop("motion_max_sleep_time",
+                       pool.motion_loop_max_sleep_time)
 
         self._motion_info = motion_info = {}
+        durations = {}
         for moveable, motion_data in list(items.items()):
             it = moveable.instability_time
-            motion_info[moveable] = PoolMotionItem(moveable, *motion_data,
-                                                   instability_time=it)
+            motion_item = PoolMotionItem(moveable, *motion_data,
+                                         instability_time=it)
+            motion_info[moveable] = motion_item
+            durations[moveable] = predict_motion_duration(
+                moveable, motion_item.dial_position)
+        self._motion_scheduler = MotionLoopScheduler(
+            self._motion_sleep_time, self._motion_max_sleep_time,
+            self._nb_states_per_position, durations)
 
         pool_ctrls = self.get_pool_controller_list()
         moveables = self.get_elements()
@@ -275,6 +461,19 @@ class PoolMotion(PoolAction):
             self.pre_start_one(moveables, items)
             self.start_one(moveables, motion_info)
             self.start_all(pool_ctrls, moveables, motion_info)
+        self._motion_scheduler.start()
+
+    def get_prediction_errors(self):
+        """Returns the motion end prediction errors (actual minus predicted
+        end of the motion in seconds) of the last motion.
+
+        :return: prediction errors per moveable (only for the moveables which
+            motion duration could be predicted)
+        :rtype: dict<moveable, float>"""
+        scheduler = self._motion_scheduler
+        if scheduler is None:
+            return {}
+        return dict(scheduler.prediction_errors)
 
     def backlash_item(self, motion_item):
         moveable = motion_item.moveable
@@ -289,14 +488,12 @@ class PoolMotion(PoolAction):
 
     @DebugIt()
     def action_loop(self):
-        i = 0
         states, positions = {}, {}
         for k in self.get_elements():
             states[k] = None
             positions[k] = None
 
-        nap = self._motion_sleep_time
-        nb_states_per_pos = self._nb_states_per_position
+        scheduler = self._motion_scheduler
         motion_info = self._motion_info
         emergency_stop = set()
 
@@ -378,7 +575,13 @@ class PoolMotion(PoolAction):
                     # sent before starting the backlash motion
                     moveable.get_position(cache=False, propagate=2)
                 elif stopped_now:
-                    moveable.debug("Stopped")
+                    error = scheduler.stopped(moveable,
+                                              motion_item.stop_time)
+                    if error is None:
+                        moveable.debug("Stopped")
+                    else:
+                        moveable.debug("Stopped (motion end prediction "
+                                       "error: %.3f s)", error)
 
                     # try to read a last position to force an event
                     moveable.get_position(cache=False, propagate=2)
@@ -434,8 +637,7 @@ class PoolMotion(PoolAction):
                                                     propagate=2)
                 break
 
-            # read position every n times
-            if not i % nb_states_per_pos:
+            if scheduler.is_position_due():
                 self.read_dial_position(ret=positions)
                 # send position
                 for moveable, position_value in list(positions.items()):
@@ -443,8 +645,7 @@ class PoolMotion(PoolAction):
                         self.error("Loop read position error for %s" %
                                    moveable.name)
                     moveable.put_dial_position(position_value)
-            i += 1
-            time.sleep(nap)
+            scheduler.wait()
 
     def _state_error_occured(self, d):
         for _, (state_info, exc_info) in list(d.items()):
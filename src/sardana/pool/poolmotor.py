@@ -227,6 +227,7 @@ class PoolMotor(PoolElement):
         self._velocity = None
         self._base_rate = None
         self._instability_time = None
+        self._position_limits = None, None
         self._in_start_move = False
         motion_name = "%s.Motion" % self._name
         self.set_action_cache(PoolMotion(self, motion_name))
@@ -355,6 +356,27 @@ class PoolMotor(PoolElement):
     limit_switches = property(get_limit_switches, set_limit_switches,
                               doc="motor limit switches")
 
+    # -------------------------------------------------------------------------
+    # position limits
+    # -------------------------------------------------------------------------
+
+    def get_position_limits(self):
+        """Returns the cached position limits (updated by the position
+        attribute configuration changes). None means no limit.
+
+        :return: lower and upper position limits
+        :rtype: (:obj:`float`, :obj:`float`)"""
+        return self._position_limits
+
+    def set_position_limits(self, position_limits, propagate=1):
+        self._position_limits = tuple(position_limits)
+        if propagate > 0:
+            self.fire_event(EventType("position_limits", priority=propagate),
+                            self._position_limits)
+
+    position_limits = property(get_position_limits, set_position_limits,
+                               doc="motor position limits")
+
     # -------------------------------------------------------------------------
     # instability time
     # -------------------------------------------------------------------------
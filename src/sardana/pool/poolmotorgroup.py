@@ -36,9 +36,7 @@ import collections
 from sardana import ElementType
 from sardana.sardanaattribute import SardanaAttribute
 from sardana.pool.poolgroupelement import PoolGroupElement
-from sardana.pool.poolmotion import PoolMotion
-
-from PyTango import AttributeProxy
+from sardana.pool.poolmotion import PoolMotion, check_position_limits
 
 
 class Position(SardanaAttribute):
@@ -254,28 +252,7 @@ class PoolMotorGroup(PoolGroupElement):
         calculated = {}
         for new_position, element in zip(new_positions, user_elements):
             calculated[element] = new_position
-
-            # TODO: get the configuration for an specific sardana class and
-            # get rid of AttributeProxy.
-            config = AttributeProxy(element.name + '/position').get_config()
-            try:
-                high = float(config.max_value)
-            except ValueError:
-                high = None
-            try:
-                low = float(config.min_value)
-            except ValueError:
-                low = None
-            if high is not None:
-                if float(new_position) > high:
-                    msg = "requested movement of %s is above its upper limit"\
-                        % element.name
-                    raise RuntimeError(msg)
-            if low is not None:
-                if float(new_position) < low:
-                    msg = "requested movement of %s is below its lower limit"\
-                        % element.name
-                    raise RuntimeError(msg)
+            check_position_limits(element, new_position)
 
         for new_position, element in zip(new_positions, user_elements):
             element.calculate_motion(new_position, items=items,
@@ -291,10 +268,14 @@ class PoolMotorGroup(PoolGroupElement):
 
     def _start_move(self, new_positions):
         self._aborted = False
+        t0 = time.time()
         items = self.calculate_motion(new_positions)
-        timestamp = time.time()
+        timestamp = t1 = time.time()
         for item, position_info in list(items.items()):
             item.set_write_position(position_info[0], timestamp=timestamp,
                                     propagate=0)
         if not self._simulation_mode:
             self.motion.run(items=items)
+        t2 = time.time()
+        self.debug("start move: calculate motion %.3f ms, start motion "
+                   "%.3f ms", (t1 - t0) * 1E3, (t2 - t1) * 1E3)
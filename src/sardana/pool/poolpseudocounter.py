@@ -33,6 +33,8 @@ __docformat__ = 'restructuredtext'
 import sys
 import time
 
+import numpy
+
 from sardana import State, ElementType, TYPE_PHYSICAL_ELEMENTS
 from sardana.sardanaattribute import SardanaAttribute
 from sardana.sardanabuffer import EarlyValueException, LateValueException
@@ -41,19 +43,24 @@ from sardana.sardanavalue import SardanaValue
 from sardana.pool.poolexception import PoolException
 from sardana.pool.poolbasechannel import PoolBaseChannel
 from sardana.pool.poolbasechannel import ValueBuffer as ValueBuffer_
+from sardana.pool.poolbasechannel import \
+    ArrayValueBuffer as ArrayValueBuffer_
 from sardana.pool.poolbasegroup import PoolBaseGroup
 from sardana.pool.poolacquisition import PoolCTAcquisition
 
 
-class ValueBuffer(ValueBuffer_):
+class ValueBufferMixin(object):
 
     def __init__(self, *args, **kwargs):
-        super(ValueBuffer, self).__init__(*args, **kwargs)
+        super(ValueBufferMixin, self).__init__(*args, **kwargs)
         for value_buf in self.obj.get_physical_value_buffer_iterator():
             value_buf.add_listener(self.on_change)
 
     def on_change(self, evt_src, evt_type, evt_value):
-        for idx in evt_value.keys():
+        idxs = list(evt_value.keys())
+        if len(idxs) > 1:
+            idxs = self.calc_buffer(idxs)
+        for idx in idxs:
             physical_values = []
             for value_buf in self.obj.get_physical_value_buffer_iterator():
                 try:
@@ -70,11 +77,57 @@ class ValueBuffer(ValueBuffer_):
                 self.append(value, idx)
                 self.remove_physical_values(idx)
 
+    def calc_buffer(self, idxs):
+        """Calculate at once the values of the leading consecutive indexes
+        available in all the physical buffers (if the controller supports
+        it - see
+        :meth:`~sardana.pool.controller.PseudoCounterController.CalcBuffer`).
+
+        :param idxs: indexes to calculate (in increasing order)
+        :type idxs: list<int>
+        :return: indexes which were not calculated
+        :rtype: list<int>
+        """
+        nb_idxs = len(idxs)
+        # only consecutive indexes can be appended in one chunk
+        if idxs[-1] - idxs[0] != nb_idxs - 1:
+            return idxs
+        physical_values = []
+        for value_buf in self.obj.get_physical_value_buffer_iterator():
+            values = value_buf.get_values(idxs[:nb_idxs])
+            nb_idxs = len(values)
+            if nb_idxs == 0:
+                return idxs
+            physical_values.append(values)
+        physical_values = [numpy.asarray(values[:nb_idxs])
+                           for values in physical_values]
+        result = self.obj.calc_buffer(physical_values)
+        # not supported or failed - calculate value by value (errors
+        # are reported per value)
+        if result is None or result.error:
+            return idxs
+        values = numpy.asarray(result.value)
+        if len(values) != nb_idxs:
+            return idxs
+        self.extend(values, idxs[0])
+        for idx in idxs[:nb_idxs]:
+            self.remove_physical_values(idx)
+        return idxs[nb_idxs:]
+
     def remove_physical_values(self, idx, force=False):
         for value_buf in self.obj.get_physical_value_buffer_iterator():
             if force or not value_buf.is_value_required(idx):
                 value_buf.remove(idx)
 
+
+class ValueBuffer(ValueBufferMixin, ValueBuffer_):
+    pass
+
+
+class ArrayValueBuffer(ValueBufferMixin, ArrayValueBuffer_):
+    pass
+
+
 class Value(SardanaAttribute):
 
     def __init__(self, *args, **kwargs):
@@ -218,6 +271,7 @@ class PoolPseudoCounter(PoolBaseGroup, PoolBaseChannel):
 
     ValueAttributeClass = Value
     ValueBufferClass = ValueBuffer
+    ArrayValueBufferClass = ArrayValueBuffer
     AcquisitionClass = None
 
     def __init__(self, **kwargs):
@@ -294,6 +348,14 @@ class PoolPseudoCounter(PoolBaseGroup, PoolBaseChannel):
     def calc_all(self, physical_values=None):
         return self.get_value_attribute().calc_all(physical_values=physical_values)
 
+    def calc_buffer(self, physical_values):
+        """Calculate many values at once from the arrays of the physical
+        values.
+
+        :return: the values or None if the controller does not support it
+        :rtype: :class:`~sardana.sardanavalue.SardanaValue` or None"""
+        return self.controller.calc_buffer(self.axis, physical_values)
+
     def get_low_level_physical_value_attribute_iterator(self):
         return self.get_physical_elements_attribute_iterator()
 
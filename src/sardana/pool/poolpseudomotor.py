@@ -34,19 +34,20 @@ import sys
 import time
 import collections
 
+import numpy
+
 from sardana import State, ElementType, TYPE_PHYSICAL_ELEMENTS
 from sardana.sardanavalue import SardanaValue
 from sardana.sardanaattribute import SardanaAttribute
 from sardana.sardanaexception import SardanaException
+from sardana.sardanaevent import EventType
 
 from sardana.pool.poolbaseelement import PoolBaseElement
 from sardana.pool.poolelement import PoolElement
 from sardana.pool.poolbasegroup import PoolBaseGroup
-from sardana.pool.poolmotion import PoolMotion
+from sardana.pool.poolmotion import PoolMotion, check_position_limits
 from sardana.pool.poolexception import PoolException
 
-from PyTango import AttributeProxy
-
 class Position(SardanaAttribute):
 
     def __init__(self, *args, **kwargs):
@@ -213,6 +214,48 @@ class Position(SardanaAttribute):
             result = SardanaValue(exc_info=sys.exc_info())
         return result
 
+    def calc_all_pseudo_array(self, physical_positions):
+        try:
+            obj = self.obj
+            physical_positions = numpy.asarray(physical_positions,
+                                               dtype=numpy.float64)
+            l_p, l_u = physical_positions.shape[-1], len(
+                obj.get_user_elements())
+            if physical_positions.ndim != 2 or l_p != l_u:
+                raise IndexError("CalcAllPseudoArray(): must give %d "
+                                 "physical positions per point" % l_u)
+            result = obj.controller.calc_all_pseudo_array(physical_positions,
+                                                          None)
+        except SardanaException as se:
+            result = SardanaValue(exc_info=se.exc_info)
+        except:
+            result = SardanaValue(exc_info=sys.exc_info())
+        return result
+
+    def calc_physical_array(self, new_positions):
+        try:
+            obj = self.obj
+            curr_physical_positions = self.get_physical_positions()
+            new_positions = numpy.asarray(new_positions, dtype=numpy.float64)
+            if new_positions.ndim == 1:
+                # positions of this pseudo motor only: the sibling pseudo
+                # motors stay at their current write positions
+                positions = obj.get_siblings_positions()
+                pseudo_positions = numpy.empty((len(new_positions),
+                                                len(positions) + 1))
+                for pseudo, position in list(positions.items()):
+                    pseudo_positions[:, pseudo.axis - 1] = position
+                pseudo_positions[:, obj.axis - 1] = new_positions
+            else:
+                pseudo_positions = new_positions
+            result = obj.controller.calc_all_physical_array(
+                pseudo_positions, curr_physical_positions)
+        except SardanaException as se:
+            result = SardanaValue(exc_info=se.exc_info)
+        except:
+            result = SardanaValue(exc_info=sys.exc_info())
+        return result
+
     def on_change(self, evt_src, evt_type, evt_value):
         self.fire_read_event(propagate=evt_type.priority)
 
@@ -240,6 +283,7 @@ class PoolPseudoMotor(PoolBaseGroup, PoolElement):
         self._siblings = None
         self._in_start_move = False
         self._drift_correction = kwargs.pop('drift_correction', None)
+        self._position_limits = None, None
         user_elements = kwargs.pop('user_elements')
         kwargs['elem_type'] = ElementType.PseudoMotor
         PoolElement.__init__(self, **kwargs)
@@ -343,6 +387,28 @@ class PoolPseudoMotor(PoolBaseGroup, PoolElement):
     def calc_all_pseudo(self, physical_positions=None):
         return self.get_position_attribute().calc_all_pseudo(physical_positions=physical_positions)
 
+    def calc_all_pseudo_array(self, physical_positions):
+        """Calculate the pseudo motor positions for many points at once.
+
+        :param physical_positions: 2D array of physical positions (one row
+                                   per point)
+        :return: the 2D array of pseudo positions (one row per point)
+        :rtype: :class:`~sardana.sardanavalue.SardanaValue`"""
+        return self.get_position_attribute().calc_all_pseudo_array(
+            physical_positions)
+
+    def calc_physical_array(self, new_positions):
+        """Calculate the physical motor positions for many points at once.
+
+        :param new_positions: 1D array of positions of this pseudo motor
+                              (sibling pseudo motors stay at their current
+                              write positions) or 2D array of positions of
+                              all the pseudo motors (one row per point)
+        :return: the 2D array of physical positions (one row per point)
+        :rtype: :class:`~sardana.sardanavalue.SardanaValue`"""
+        return self.get_position_attribute().calc_physical_array(
+            new_positions)
+
     def get_position_attribute(self):
         return self._position
 
@@ -516,6 +582,27 @@ class PoolPseudoMotor(PoolBaseGroup, PoolElement):
 
     motion = property(get_motion, doc="motion object")
 
+    # ------------------------------------------------------------------------
+    # position limits
+    # ------------------------------------------------------------------------
+
+    def get_position_limits(self):
+        """Returns the cached position limits (updated by the position
+        attribute configuration changes). None means no limit.
+
+        :return: lower and upper position limits
+        :rtype: (:obj:`float`, :obj:`float`)"""
+        return self._position_limits
+
+    def set_position_limits(self, position_limits, propagate=1):
+        self._position_limits = tuple(position_limits)
+        if propagate > 0:
+            self.fire_event(EventType("position_limits", priority=propagate),
+                            self._position_limits)
+
+    position_limits = property(get_position_limits, set_position_limits,
+                               doc="pseudo motor position limits")
+
     # ------------------------------------------------------------------------
     # motion calculation
     # ------------------------------------------------------------------------
@@ -556,28 +643,7 @@ class PoolPseudoMotor(PoolBaseGroup, PoolElement):
             if new_position is None:
                 raise PoolException("Cannot calculate motion: %s reports "
                                     "position to be None" % element.name)
-            # TODO: get the configuration for an specific sardana class and
-            # get rid of AttributeProxy - see sardana-org/sardana#663
-            config = AttributeProxy(element.name + '/position').get_config()
-            try:
-                high = float(config.max_value)
-            except ValueError:
-                high = None
-            try:
-                low = float(config.min_value)
-            except ValueError:
-                low = None
-            if high is not None:
-                if float(new_position) > high:
-                    msg = "requested movement of %s is above its upper limit"\
-                        % element.name
-                    raise RuntimeError(msg)
-            if low is not None:
-                if float(new_position) < low:
-                    msg = "requested movement of %s is below its lower limit"\
-                        % element.name
-                    raise RuntimeError(msg)
-
+            check_position_limits(element, new_position)
             element.calculate_motion(new_position, items=items,
                                      calculated=calculated)
         return items
@@ -592,13 +658,17 @@ class PoolPseudoMotor(PoolBaseGroup, PoolElement):
     def _start_move(self, new_position):
         self._aborted = False
         self._stopped = False
+        t0 = time.time()
         items = self.calculate_motion(new_position)
-        timestamp = time.time()
+        timestamp = t1 = time.time()
         for item, position_info in list(items.items()):
             item.set_write_position(position_info[0], timestamp=timestamp,
                                     propagate=1)
         if not self._simulation_mode:
             self.motion.run(items=items)
+        t2 = time.time()
+        self.debug("start move: calculate motion %.3f ms, start motion "
+                   "%.3f ms", (t1 - t0) * 1E3, (t2 - t1) * 1E3)
 
     # ------------------------------------------------------------------------
     # stop
@@ -32,11 +32,12 @@ __all__ = ["PoolSynchronization", "SynchronizationDescription", "TGChannel"]
 import time
 from functools import partial
 from taurus.core.util.log import DebugIt
-from sardana import State
+from sardana import State, sardanacustomsettings
 from sardana.sardanathreadpool import get_thread_pool
 from sardana.pool.pooldefs import SynchDomain, SynchParam
 from sardana.pool.poolaction import ActionContext, PoolActionItem, PoolAction
 from sardana.util.funcgenerator import FunctionGenerator
+from sardana.util.motion import Motor
 
 # The purpose of this class was inspired on the CTAcquisition concept
 
@@ -133,6 +134,21 @@ class PoolSynchronization(PoolAction):
     def add_listener(self, listener):
         self._listener = listener
 
+    def _get_motion_profile(self, moveable):
+        """Returns the trapezoidal motion profile of the moveable or None if
+        not available (e.g. pseudo motors)"""
+        if not hasattr(moveable, "get_velocity"):
+            return None
+        try:
+            return Motor(min_vel=moveable.get_base_rate(),
+                         max_vel=moveable.get_velocity(),
+                         accel_time=moveable.get_acceleration(),
+                         decel_time=moveable.get_deceleration())
+        except Exception:
+            self.debug("Failed to get %s motion profile", moveable.name,
+                       exc_info=1)
+            return None
+
     def start_action(self, ctrls, synchronization, moveable=None,
                      sw_synch_initial_domain=None, *args, **kwargs):
         """Start synchronization action.
@@ -185,6 +201,11 @@ class PoolSynchronization(PoolAction):
             # subscribing to the position change events to generate events
             # in position domain
             if moveable is not None:
+                prediction = getattr(sardanacustomsettings,
+                                     "SW_SYNCH_POSITION_PREDICTION", False)
+                self._synch_soft.position_prediction = prediction
+                estimator = self._synch_soft.position_estimator
+                estimator.motor = self._get_motion_profile(moveable)
                 position = moveable.get_position_attribute()
                 position.add_listener(self._synch_soft)
                 remove_pos_listener = partial(position.remove_listener,
@@ -273,3 +294,17 @@ class PoolSynchronization(PoolAction):
                 if not self._synch_soft.is_started():
                     break
                 time.sleep(0.01)
+            self._report_synch_soft()
+
+    def _report_synch_soft(self):
+        """Reports the software synchronizer errors with respect to the
+        ideal (position domain only)"""
+        stats = self._synch_soft.get_statistics()
+        if "active_error_mean" not in stats:
+            return
+        self.info("Software synchronization: %d events (%d missed), "
+                  "error with respect to the ideal: mean %.3f ms, "
+                  "std %.3f ms, max %.3f ms", stats["events"],
+                  stats["missed"], stats["active_error_mean"] * 1e3,
+                  stats["active_error_std"] * 1e3,
+                  stats["active_error_max"] * 1e3)
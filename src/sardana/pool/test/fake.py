@@ -32,8 +32,10 @@ class FakePool(object):
     ''' Fake class to simulate the behavior of the Pool class
     '''
     acq_loop_sleep_time = 0.1
+    acq_loop_max_sleep_time = 0.1
     acq_loop_states_per_value = 10
     motion_loop_sleep_time = 0.1
+    motion_loop_max_sleep_time = 0.1
     motion_loop_states_per_position = 10
     drift_correction = True
 
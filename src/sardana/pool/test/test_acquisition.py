@@ -36,7 +36,8 @@ from sardana.pool.pooldefs import SynchDomain, SynchParam
 from sardana.pool.poolsynchronization import PoolSynchronization
 from sardana.pool.poolacquisition import PoolAcquisitionHardware, \
     PoolAcquisitionSoftware, PoolAcquisitionSoftwareStart, \
-    get_acq_ctrls, get_timerable_ctrls
+    PoolAcquisitionBase, AcquisitionLoopScheduler, get_acq_ctrls, \
+    get_timerable_ctrls
 from sardana.sardanathreadpool import get_thread_pool
 from sardana.pool.test import createControllerConfiguration, \
     createTimerableControllerConfiguration, BasePoolTestCase, FakeElement, \
@@ -724,3 +725,90 @@ class Acquisition2DHardwareGateRefTestCase(BaseAcquisitionHardwareTestCase,
         self.channel.value_ref_enabled = True
         axis = self.channel.axis
         self.channel_ctrl.set_axis_par(axis, "value_ref_enabled", True)
+
+
+class EstimateDurationTestCase(BasePoolTestCase, TestCase):
+    """Unit tests of the acquisition duration estimation."""
+
+    def setUp(self):
+        TestCase.setUp(self)
+        BasePoolTestCase.setUp(self)
+        ct_1_1 = self.cts['_test_ct_1_1']
+        ct_1_2 = self.cts['_test_ct_1_2']
+        ct_ctrl_1 = ct_1_1.get_controller()
+        self.conf_ctrl = createTimerableControllerConfiguration(
+            ct_ctrl_1, [ct_1_1, ct_1_2])
+
+    def test_timer(self):
+        ctrls = get_timerable_ctrls([self.conf_ctrl], acq_mode=AcqMode.Timer)
+        duration = PoolAcquisitionBase._estimate_duration(ctrls, 0.1, 10,
+                                                          0.01)
+        self.assertAlmostEqual(duration, 1.09)
+
+    def test_monitor(self):
+        channels = self.conf_ctrl.get_channels(enabled=True)
+        self.conf_ctrl.monitor = channels[1]
+        ctrls = get_timerable_ctrls([self.conf_ctrl],
+                                    acq_mode=AcqMode.Monitor)
+        duration = PoolAcquisitionBase._estimate_duration(ctrls, 100, 10,
+                                                          0.01)
+        self.assertIsNone(duration)
+
+    def tearDown(self):
+        BasePoolTestCase.tearDown(self)
+        TestCase.tearDown(self)
+
+
+class AcquisitionLoopSchedulerTestCase(TestCase):
+    """Unit tests of the AcquisitionLoopScheduler."""
+
+    def test_value_due(self):
+        scheduler = AcquisitionLoopScheduler(0.01, 0.1, 5)
+        self.assertTrue(scheduler.is_value_due())
+        self.assertFalse(scheduler.is_value_due())
+        time.sleep(0.05)
+        self.assertTrue(scheduler.is_value_due())
+
+    def test_backoff(self):
+        scheduler = AcquisitionLoopScheduler(0.01, 0.05, 1)
+        naps = [scheduler.get_nap() for _ in range(5)]
+        self.assertEqual(naps, [0.01, 0.02, 0.04, 0.05, 0.05])
+        # new values reset the backoff
+        self.assertEqual(scheduler.get_nap(active=True), 0.01)
+
+    def test_expected_duration(self):
+        scheduler = AcquisitionLoopScheduler(0.01, 1, 1,
+                                             expected_duration=1)
+        nap = scheduler.get_nap()
+        self.assertGreater(nap, 0.4)
+        self.assertLessEqual(nap, 0.5)
+        scheduler = AcquisitionLoopScheduler(0.01, 0.1, 1,
+                                             expected_duration=1)
+        self.assertEqual(scheduler.get_nap(), 0.1)
+
+    def test_waiter(self):
+        calls = []
+
+        def waiter(timeout):
+            calls.append(timeout)
+            return True
+
+        scheduler = AcquisitionLoopScheduler(0.01, 0.1, 10, waiter=waiter)
+        self.assertTrue(scheduler.is_value_due())
+        self.assertFalse(scheduler.is_value_due())
+        self.assertTrue(scheduler.wait())
+        self.assertEqual(calls, [0.01])
+        # woken up by the controller - values must be read immediately
+        self.assertTrue(scheduler.is_value_due())
+
+    def test_waiter_not_supported(self):
+        calls = []
+
+        def waiter(timeout):
+            calls.append(timeout)
+            return None
+
+        scheduler = AcquisitionLoopScheduler(0.01, 0.1, 1, waiter=waiter)
+        self.assertFalse(scheduler.wait())
+        self.assertFalse(scheduler.wait())
+        self.assertEqual(len(calls), 1)
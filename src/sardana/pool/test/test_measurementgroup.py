@@ -246,6 +246,67 @@ class BaseAcquisition(object):
         # time.sleep(3)
         self.acq_asserts(channel_names, repetitions)
 
+    def meas_multiple_starts(self, config, synchronization, nb_starts):
+        """Prepare measurement group once and start it multiple times,
+        e.g. as in a step scan. Controllers which keep the loaded parameters
+        must be loaded only once.
+        """
+        channel_names = self.prepare_meas(config)
+        self.pmg.set_synchronization(synchronization)
+        self.pmg.set_nb_starts(nb_starts)
+        loads = []
+        for pool_ctrl in self.pmg.acquisition.get_pool_controllers():
+            ctrl = pool_ctrl.ctrl
+            self.assertTrue(ctrl.keep_loaded)
+
+            def load_one(axis, *args, **kwargs):
+                loads.append(axis)
+                return type(ctrl).LoadOne(ctrl, axis, *args, **kwargs)
+            ctrl.LoadOne = load_one
+        self.pmg.prepare()
+        repetitions = 0
+        for group in synchronization:
+            repetitions += group[SynchParam.Repeats]
+        for _ in range(nb_starts):
+            self.prepare_attribute_listener()
+            self.acquire()
+            self.acq_asserts(channel_names, repetitions)
+            self.remove_attribute_listener()
+        self.assertEqual(len(loads), 1)
+
+    def meas_standalone_after_group(self, config, synchronization):
+        """Acquire with the measurement group and then with one of its
+        channels alone (with the same parameters). The channel acquisition
+        prepares the controller again so it must be loaded again.
+        """
+        channel_names = self.prepare_meas(config)
+        self.pmg.set_synchronization(synchronization)
+        loads = []
+        pool_ctrls = self.pmg.acquisition.get_pool_controllers()
+        for pool_ctrl in pool_ctrls:
+            ctrl = pool_ctrl.ctrl
+
+            def load_one(axis, *args, **kwargs):
+                loads.append(axis)
+                return type(ctrl).LoadOne(ctrl, axis, *args, **kwargs)
+            ctrl.LoadOne = load_one
+        repetitions = 0
+        for group in synchronization:
+            repetitions += group[SynchParam.Repeats]
+        self.prepare_attribute_listener()
+        self.acquire()
+        self.acq_asserts(channel_names, repetitions)
+        self.remove_attribute_listener()
+        nb_loads = len(loads)
+        channel = self.cts[channel_names[0]]
+        channel.timer = "__self"
+        integ_time = synchronization[0][SynchParam.Active][SynchDomain.Time]
+        channel.integration_time = integ_time
+        channel.start_acquisition()
+        while channel.acquisition.is_running():
+            time.sleep(.1)
+        self.assertEqual(len(loads), nb_loads + 1)
+
     def tearDown(self):
         self.attr_listener = None
         self.pmg = None
@@ -345,12 +406,25 @@ config_14 = [[('_test_ct_1_1', 'software', AcqSynchType.Start),
              [('_test_ct_2_1', '_test_tg_1_1', AcqSynchType.Start),
               ('_test_ct_2_2', '_test_tg_1_1', AcqSynchType.Start)]]
 
+doc_16 = 'Acquisition prepared once and started multiple times'
+
+doc_17 = 'Channel acquisition after the measurement group acquisition'
+
+synchronization5 = [{SynchParam.Delay: {SynchDomain.Time: 0},
+                     SynchParam.Active: {SynchDomain.Time: .01},
+                     SynchParam.Total: {SynchDomain.Time: .02},
+                     SynchParam.Repeats: 1}]
+
 doc_15 = 'Acquisition using with 1 2D channel using software synchronization'
 
 config_15 = [[('_test_2d_1_1', 'software', AcqSynchType.Trigger)]]
 
 
 # TODO: listener is not ready to handle 2D
+@insertTest(helper_name='meas_standalone_after_group', test_method_doc=doc_17,
+            config=config_6, synchronization=synchronization5)
+@insertTest(helper_name='meas_multiple_starts', test_method_doc=doc_16,
+            config=config_6, synchronization=synchronization5, nb_starts=3)
 # @insertTest(helper_name='meas_cont_acquisition', test_method_doc=doc_15,
 #             config=config_15, synchronization=synchronization1)
 @insertTest(helper_name='meas_cont_acquisition', test_method_doc=doc_14,
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""Unit tests for pool module"""
+
+from taurus.external import unittest
+
+from sardana.pool.pool import Pool
+
+
+class PoolElementEventsTestCase(unittest.TestCase):
+    """Unittest of the batch of element events of the Pool"""
+
+    def setUp(self):
+        self.pool = Pool("test/pool/batch", name="test_pool_batch")
+        self.events = []
+        self.pool.add_listener(self.on_pool_changed)
+
+    def tearDown(self):
+        self.pool.remove_listener(self.on_pool_changed)
+
+    def on_pool_changed(self, evt_src, evt_type, evt_value):
+        self.events.append((evt_type.name, evt_value))
+
+    def test_no_batch(self):
+        """Each element event is fired immediately out of a batch"""
+        elem = object()
+        self.pool._fire_element_event("ElementCreated", elem)
+        self.assertEqual(self.events, [("ElementCreated", elem)])
+
+    def test_batch(self):
+        """The element events of a batch are fired in a single
+        ElementsChanged event at its end"""
+        elems = [object() for _ in range(4)]
+        old_elem = object()
+        with self.pool.batch_element_events():
+            for elem in elems:
+                self.pool._fire_element_event("ElementCreated", elem)
+            self.pool._fire_element_event("ElementChanged", elems[0])
+            self.pool._fire_element_event("ElementChanged", old_elem)
+            self.pool._fire_element_event("ElementDeleted", elems[1])
+            with self.pool.batch_element_events():
+                self.pool._fire_element_event("ElementDeleted", old_elem)
+            self.assertEqual(self.events, [])
+        expected = {"new": [elems[0], elems[2], elems[3]], "change": [],
+                    "del": [old_elem]}
+        self.assertEqual(self.events, [("ElementsChanged", expected)])
+
+    def test_empty_batch(self):
+        """An empty batch does not fire any event"""
+        with self.pool.batch_element_events():
+            pass
+        self.assertEqual(self.events, [])
@@ -23,8 +23,12 @@
 ##
 ##############################################################################
 
+import numpy
+
 from taurus.external import unittest
+from sardana.sardanavalue import SardanaValueChunk
 from sardana.pool.test import (FakePool, createPoolController,
+                               createPoolCounterTimer, dummyCounterTimerConf01,
                                dummyPoolCTCtrlConf01)
 from sardana.pool.poolcontroller import PoolController
 
@@ -44,6 +48,23 @@ class PoolControllerTestCase(unittest.TestCase):
               'PoolController instance'
         self.assertIsInstance(self.pc, PoolController, msg)
 
+    def test_read_array_chunk(self):
+        """Verify that a chunk returned as numpy array by ReadOne is passed
+        as SardanaValueChunk without per value translation"""
+        pct = createPoolCounterTimer(self.pc.pool, self.pc,
+                                     dummyCounterTimerConf01)
+        self.pc.add_element(pct)
+        chunk = numpy.arange(5, dtype=float)
+        self.pc.ctrl.ReadOne = lambda axis: chunk
+        value = self.pc.read_axis_values()[pct]
+        self.assertIsInstance(value, SardanaValueChunk)
+        self.assertIs(value.value, chunk)
+        self.assertEqual(value.keys(), [0, 1, 2, 3, 4])
+        chunk = SardanaValueChunk(chunk, timestamp=chunk)
+        self.pc.ctrl.ReadOne = lambda axis: chunk
+        value = self.pc.read_axis_values()[pct]
+        self.assertIs(value, chunk)
+
     def tearDown(self):
         unittest.TestCase.tearDown(self)
         self.pc = None
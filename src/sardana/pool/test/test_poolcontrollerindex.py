@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""Unit tests for poolcontrollerindex module"""
+
+import os
+import sys
+import shutil
+import tempfile
+
+from taurus.external import unittest
+
+from sardana.sardanamodulemanager import ModuleManager
+from sardana.pool.test import FakePool
+from sardana.pool.poolcontrollerindex import scan_controller_lib, \
+    encode_metadata, decode_metadata
+
+CTRL_LIB_NAME = "indexedctrllib"
+
+CTRL_LIB = '''"""controller library doc"""
+
+from sardana.pool.controller import MotorController, Type, Description, \\
+    DefaultValue, Access, DataAccess
+
+
+class IndexedMotorController(MotorController):
+    """IndexedMotorController doc"""
+
+    gender = "Simulation"
+    model = "Indexed"
+
+    ctrl_properties = {"Host": {Type: str, Description: "host",
+                                DefaultValue: "localhost"}}
+    ctrl_attributes = {"Mode": {Type: int, Access: DataAccess.ReadWrite}}
+    axis_attributes = {"Offsets": {Type: (float,),
+                                   Access: DataAccess.ReadOnly}}
+
+    def __init__(self, inst, props, *args, **kwargs):
+        MotorController.__init__(self, inst, props, *args, **kwargs)
+'''
+
+CONDITIONAL_CTRL = '''
+
+try:
+    import sdk_which_does_not_exist
+except ImportError:
+    class SDKMotorController(MotorController):
+        pass
+'''
+
+
+class ControllerLibScannerTestCase(unittest.TestCase):
+    """Unit tests of the controller library static scanner"""
+
+    def test_scan(self):
+        info = scan_controller_lib((CTRL_LIB + CONDITIONAL_CTRL).encode())
+        # SDKMotorController is conditionally defined
+        self.assertEqual(info, dict(classes=["IndexedMotorController"]))
+
+    def test_rebound(self):
+        source = b"class A(object):\n    pass\n\nA = dict\n"
+        self.assertEqual(scan_controller_lib(source), dict(classes=[]))
+
+
+class _IndexedPool(FakePool):
+
+    def __init__(self, poolpath, index_file):
+        self.controller_index_file = index_file
+        FakePool.__init__(self, poolpath)
+
+
+class ControllerIndexTestCase(unittest.TestCase):
+    """Unit tests of the controller libraries loaded from the controller
+    class index"""
+
+    def setUp(self):
+        self.dir_name = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.dir_name, CTRL_LIB_NAME + ".py")
+        self.index_file = os.path.join(self.dir_name, "ctrl.index")
+        with open(self.file_name, "w") as f:
+            f.write(CTRL_LIB)
+        self.pool = None
+
+    def tearDown(self):
+        self._cleanup()
+        shutil.rmtree(self.dir_name)
+
+    def _cleanup(self):
+        if self.pool is not None:
+            self.pool.cleanup()
+            self.pool = None
+        ModuleManager().unloadModule(CTRL_LIB_NAME)
+        sys.modules.pop(CTRL_LIB_NAME, None)
+
+    def _start_pool(self):
+        self._cleanup()
+        self.pool = _IndexedPool([self.dir_name], self.index_file)
+        return self.pool.ctrl_manager
+
+    def test_lazy_loading(self):
+        manager = self._start_pool()
+        ctrl_class = manager.getControllerMetaClass("IndexedMotorController")
+        self.assertTrue(ctrl_class.lib.is_loaded())
+        self.assertTrue(os.path.exists(self.index_file))
+        metadata = ctrl_class.get_metadata()
+        # the controller library is not imported anymore at startup
+        manager = self._start_pool()
+        lib = manager.getControllerLib(CTRL_LIB_NAME)
+        self.assertFalse(lib.is_loaded())
+        self.assertNotIn(CTRL_LIB_NAME, sys.modules)
+        self.assertEqual(lib.description, "controller library doc")
+        ctrl_class = manager.getControllerMetaClass("IndexedMotorController")
+        indexed_metadata = ctrl_class.get_metadata()
+        for name in ("ctrl_properties", "ctrl_attributes",
+                     "axis_attributes"):
+            infos = metadata.pop(name)
+            indexed_infos = indexed_metadata.pop(name)
+            self.assertEqual([info.toDict() for info in infos],
+                             [info.toDict() for info in indexed_infos])
+        self.assertEqual(metadata, indexed_metadata)
+        self.assertFalse(lib.is_loaded())
+        # the controller library is imported on the first use of the class
+        klass = ctrl_class.klass
+        self.assertTrue(lib.is_loaded())
+        self.assertIs(klass, sys.modules[CTRL_LIB_NAME].IndexedMotorController)
+        self.assertEqual(ctrl_class.gender, "Simulation")
+
+    def test_changed_lib(self):
+        self._start_pool()
+        with open(self.file_name, "a") as f:
+            f.write("\n\nclass OtherMotorController(IndexedMotorController):"
+                    "\n    pass\n")
+        manager = self._start_pool()
+        self.assertTrue(manager.getControllerLib(CTRL_LIB_NAME).is_loaded())
+        self.assertEqual(len(manager.getControllerLib(
+            CTRL_LIB_NAME).get_controllers()), 2)
+        manager = self._start_pool()
+        lib = manager.getControllerLib(CTRL_LIB_NAME)
+        self.assertFalse(lib.is_loaded())
+        self.assertEqual(len(lib.get_controllers()), 2)
+
+    def test_not_indexable_lib(self):
+        with open(self.file_name, "a") as f:
+            f.write(CONDITIONAL_CTRL)
+        self._start_pool()
+        manager = self._start_pool()
+        lib = manager.getControllerLib(CTRL_LIB_NAME)
+        self.assertTrue(lib.is_loaded())
+        self.assertTrue(lib.has_controller("SDKMotorController"))
+
+    def test_encode_metadata(self):
+        manager = self._start_pool()
+        ctrl_class = manager.getControllerMetaClass("IndexedMotorController")
+        metadata = ctrl_class.get_metadata()
+        decoded = decode_metadata(encode_metadata(metadata))
+        self.assertEqual(decoded["ctrl_features"], metadata["ctrl_features"])
+        self.assertEqual(decoded["dict_extra"], metadata["dict_extra"])
+        self.assertEqual(decoded["axis_attributes"][0].toDict(),
+                         metadata["axis_attributes"][0].toDict())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import time
+import threading
+
+from taurus.external import unittest
+
+from sardana.pool.poolmonitor import ControllerSchedule, PoolMonitor
+
+
+class ControllerScheduleTestCase(unittest.TestCase):
+    """Unittest of the adaptive refresh period of ControllerSchedule"""
+
+    def setUp(self):
+        self.schedule = ControllerSchedule(1, min_period=1., max_period=5.,
+                                           next_time=0)
+
+    def _refresh(self, read_time, changed=False, failed=False):
+        schedule = self.schedule
+        start = schedule.next_time
+        schedule.start(start)
+        schedule.finish(start + read_time, changed=changed, failed=failed)
+        return schedule.period
+
+    def test_changing(self):
+        """The period shrinks down to the minimum while the state changes and
+        relaxes back to the maximum when the state is stable"""
+        periods = [self._refresh(0.01, changed=True) for _ in range(4)]
+        self.assertEqual(periods, [2.5, 1.25, 1., 1.])
+        periods = [self._refresh(0.01) for _ in range(5)]
+        self.assertEqual(periods, [1.5, 2.25, 3.375, 5., 5.])
+        self.assertFalse(self.schedule.busy)
+
+    def test_failed(self):
+        """Failed controllers are refreshed with the maximum period"""
+        self._refresh(0.01, changed=True)
+        self.assertEqual(self._refresh(0.01, failed=True), 5.)
+
+    def test_slow(self):
+        """Slow controllers are refreshed less often"""
+        self._refresh(2.)
+        self.assertAlmostEqual(self.schedule.next_time, 22.)
+
+
+class _FakePool(object):
+
+    def add_listener(self, listener):
+        pass
+
+    def get_element_by_id(self, id):
+        raise KeyError(id)
+
+
+class PoolMonitorTestCase(unittest.TestCase):
+    """Unittest of the PoolMonitor threads"""
+
+    def test_threads(self):
+        """The state read threads are created only when needed and do not
+        outlive the monitor"""
+        nb_threads = threading.active_count()
+        monitor = PoolMonitor(_FakePool(), period=.1, min_sleep=.1)
+        monitor.resume()
+        time.sleep(.2)
+        self.assertEqual(threading.active_count(), nb_threads + 1)
+        monitor._schedules = {1: ControllerSchedule(1, min_period=.1,
+                                                    max_period=.1,
+                                                    next_time=0)}
+        monitor.update_state_info()
+        time.sleep(.2)
+        self.assertEqual(threading.active_count(), nb_threads + 2)
+        monitor.stop()
+        monitor.join(5)
+        self.assertFalse(monitor.is_alive())
+        time.sleep(.1)
+        self.assertEqual(threading.active_count(), nb_threads)
@@ -25,7 +25,10 @@
 
 from taurus.external import unittest
 
-from sardana.pool.poolmotion import PoolMotion
+import time
+
+from sardana.pool.poolmotion import PoolMotion, MotionLoopScheduler, \
+    predict_motion_duration, check_position_limits
 from sardana.sardanadefs import State
 from sardana.pool.test import (FakePool, createPoolController,
                                createPoolMotor, dummyPoolMotorCtrlConf01,
@@ -121,3 +124,106 @@ class PoolMotionTestCase(unittest.TestCase):
         self.cfg = None
         self.dummy_mot = None
         unittest.TestCase.tearDown(self)
+
+
+class _FakeAttribute(object):
+
+    def __init__(self, value):
+        self.value = value
+
+
+class _FakeMoveable(object):
+    """Moveable with the motion parameters (trapezoidal profile)"""
+
+    def __init__(self, position, base_rate, velocity, acceleration,
+                 deceleration):
+        self._dial_position = _FakeAttribute(position)
+        self._pars = base_rate, velocity, acceleration, deceleration
+
+    def get_dial_position_attribute(self):
+        return self._dial_position
+
+    def get_base_rate(self, propagate=1):
+        return self._pars[0]
+
+    def get_velocity(self, propagate=1):
+        return self._pars[1]
+
+    def get_acceleration(self, propagate=1):
+        return self._pars[2]
+
+    def get_deceleration(self, propagate=1):
+        return self._pars[3]
+
+
+class MotionLoopSchedulerTestCase(unittest.TestCase):
+    """Unittest of MotionLoopScheduler class and motion duration
+    prediction"""
+
+    def test_predict_duration(self):
+        moveable = _FakeMoveable(0, 0, 10, 1, 1)
+        # 1 (accel) + 19 (const. velocity) + 1 (decel)
+        self.assertAlmostEqual(predict_motion_duration(moveable, 200), 21)
+        # position unknown
+        moveable = _FakeMoveable(None, 0, 10, 1, 1)
+        self.assertIsNone(predict_motion_duration(moveable, 200))
+
+    def test_nap(self):
+        moveable = object()
+        scheduler = MotionLoopScheduler(0.01, 0.1, 10, {moveable: 1})
+        # far from the end - sparse polling
+        self.assertEqual(scheduler.get_nap(), 0.1)
+        scheduler.start(time.time() - 0.9)
+        nap = scheduler.get_nap()
+        self.assertGreater(nap, 0.01)
+        self.assertLessEqual(nap, 0.05)
+        # after the predicted end - dense polling
+        scheduler.start(time.time() - 2)
+        self.assertEqual(scheduler.get_nap(), 0.01)
+        # unknown end - dense polling
+        scheduler = MotionLoopScheduler(0.01, 0.1, 10, {moveable: None})
+        self.assertEqual(scheduler.get_nap(), 0.01)
+
+    def test_position_due(self):
+        scheduler = MotionLoopScheduler(0.01, 0.1, 3)
+        self.assertTrue(scheduler.is_position_due())
+        self.assertFalse(scheduler.is_position_due())
+        time.sleep(0.03)
+        self.assertTrue(scheduler.is_position_due())
+
+    def test_prediction_error(self):
+        moveable, other = object(), object()
+        scheduler = MotionLoopScheduler(0.01, 0.1, 10,
+                                        {moveable: 1, other: None})
+        scheduler.start(100)
+        self.assertAlmostEqual(scheduler.stopped(moveable, 101.5), 0.5)
+        self.assertIsNone(scheduler.stopped(other, 101.5))
+        self.assertEqual(list(scheduler.prediction_errors), [moveable])
+
+
+class PositionLimitsTestCase(unittest.TestCase):
+    """Unittest of the position limits cache of the motor"""
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        pool = FakePool()
+        dummy_mot_ctrl = createPoolController(pool, dummyPoolMotorCtrlConf01)
+        self.dummy_mot = createPoolMotor(pool, dummy_mot_ctrl,
+                                         dummyMotorConf01)
+
+    def test_check_position_limits(self):
+        # no limits by default
+        self.assertEqual(self.dummy_mot.get_position_limits(), (None, None))
+        check_position_limits(self.dummy_mot, 1E6)
+        self.dummy_mot.set_position_limits((-10, None))
+        check_position_limits(self.dummy_mot, 1E6)
+        self.assertRaises(RuntimeError, check_position_limits,
+                          self.dummy_mot, -11)
+        self.dummy_mot.set_position_limits((-10, 10))
+        check_position_limits(self.dummy_mot, 10)
+        self.assertRaises(RuntimeError, check_position_limits,
+                          self.dummy_mot, 10.1)
+
+    def tearDown(self):
+        self.dummy_mot = None
+        unittest.TestCase.tearDown(self)
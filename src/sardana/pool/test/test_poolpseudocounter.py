@@ -68,3 +68,21 @@ class PseudoCounterTestCase(BasePoolTestCase, TestCase):
         self.ct2.append_value_buffer(10., idx=9)
         self.assertEqual(len(pc_value_buffer.last_chunk), 1)
         self.assertEqual(pc_value_buffer.last_chunk[9].value, 1)
+
+    def test_pseudocounter_calc_buffer_chunk(self):
+        """Fill the value buffer of the counters with chunks and test that
+        the pseudo counter values are calculated in one chunk.
+        """
+        pc_value_buffer = self.pc.get_value_buffer()
+        self.ct1.extend_value_buffer([1., 2., 3., 4.])
+        self.ct2.extend_value_buffer([10., 0., 10.])
+        # only the values available in both buffers are calculated
+        last_chunk = pc_value_buffer.last_chunk
+        self.assertEqual(len(last_chunk), 3)
+        self.assertEqual(last_chunk[0].value, 0.1)
+        # I is returned when I0 is zero
+        self.assertEqual(last_chunk[1].value, 2.)
+        self.assertAlmostEqual(last_chunk[2].value, 0.3)
+        self.ct2.extend_value_buffer([10., 10.], idx=3)
+        self.assertEqual(len(pc_value_buffer.last_chunk), 1)
+        self.assertEqual(pc_value_buffer.last_chunk[3].value, 0.4)
@@ -28,17 +28,21 @@ for Sardana buffers"""
 
 
 
-__all__ = ["SardanaBuffer", "LateValueException", "EarlyValueException"]
+__all__ = ["SardanaBuffer", "SardanaArrayBuffer", "LateValueException",
+           "EarlyValueException"]
 
+import time
 import weakref
 
+import numpy
+
 try:
     from collections import OrderedDict
 except ImportError:
     # For Python < 2.7
     from ordereddict import OrderedDict
 
-from .sardanavalue import SardanaValue
+from .sardanavalue import SardanaValue, SardanaValueChunk
 from .sardanaevent import EventGenerator, EventType
 from .sardanaexception import SardanaException
 
@@ -117,6 +121,24 @@ class SardanaBuffer(EventGenerator):
         """
         return self.get_value_obj(idx).value
 
+    def get_values(self, idxs):
+        """Return values of the given indexes. Stops at the first index which
+        is not in the buffer.
+
+        :param idxs: indexes of the values to be returned
+        :type idxs: seq<int>
+        :return: the values corresponding to the leading indexes present in
+            the buffer
+        :rtype: seq<object>
+        """
+        values = []
+        for idx in idxs:
+            value_obj = self._buffer.get(idx)
+            if value_obj is None:
+                break
+            values.append(value_obj.value)
+        return values
+
     def get_value_obj(self, idx):
         """Return the value object of a given index.
 
@@ -162,7 +184,8 @@ class SardanaBuffer(EventGenerator):
         indexes.
 
         :param values: objects that extend the buffer
-        :type values: list<object>
+        :type values: list<object> or
+            :class:`~sardana.sardanavalue.SardanaValueChunk`
         :param initial_idx: at which index append the first object,
             the rest of them will be assigned the next consecutive indexes,
             None means assign at the end of the buffer
@@ -170,10 +193,16 @@ class SardanaBuffer(EventGenerator):
         """
         if initial_idx is None:
             initial_idx = self._next_idx
+        if isinstance(values, SardanaValueChunk):
+            values = values.values()
         self._last_chunk = OrderedDict()
+        timestamp = None
         for idx, value in enumerate(values, initial_idx):
             if not isinstance(value, SardanaValue):
-                value = SardanaValue(value)
+                # the whole chunk shares the timestamp
+                if timestamp is None:
+                    timestamp = time.time()
+                value = SardanaValue(value, timestamp=timestamp)
             self._last_chunk[idx] = value
             if self._persistent:
                 self._buffer[idx] = value
@@ -230,3 +259,271 @@ class SardanaBuffer(EventGenerator):
                         doc="index that will be automatically assigned to the "
                             "next value added to this buffer (if not "
                             "explicitly assigned by the user)")
+
+
+class SardanaArrayBuffer(SardanaBuffer):
+    """Buffer which stores values, indexes and timestamps in contiguous
+    NumPy arrays instead of one :class:`~sardana.sardanavalue.SardanaValue`
+    object per value.
+
+    Indexes must be added in increasing order (as it happens in the
+    acquisition). Chunks are handed out (:attr:`last_chunk`) as
+    :class:`~sardana.sardanavalue.SardanaValueChunk` objects holding views
+    of the stored arrays. The storage is never modified in place: when it
+    is full the values still present in the buffer are either compacted
+    into new arrays of the same capacity or, if more than half of the
+    capacity is in use, into new arrays of double capacity. Thanks to that
+    the previously handed out chunks stay valid.
+
+    .. note::
+        The SardanaArrayBuffer class has been included in Sardana
+        on a provisional basis. Backwards incompatible changes
+        (up to and including removal of the class) may occur if
+        deemed necessary by the core developers.
+    """
+
+    def __init__(self, obj=None, name=None, persistent=False, capacity=1024,
+                 **kwargs):
+        """Construct SardanaArrayBuffer object
+
+        :param obj: the object which owns this buffer
+        :type obj: obj
+        :param name: object name
+        :type name: :obj:`str`
+        :param persistent: whether values are kept in the buffer until
+            being explicitly removed (True) or just until firing the next event
+            (False)
+        :type persistent: bool
+        :param capacity: initial number of values that fit in the storage
+        :type capacity: int
+        """
+        super(SardanaArrayBuffer, self).__init__(obj=obj, name=name,
+                                                 persistent=persistent,
+                                                 **kwargs)
+        self._initial_capacity = max(int(capacity), 1)
+        self._reset_storage()
+
+    def __len__(self):
+        return self._count
+
+    def _reset_storage(self):
+        self._index = None
+        self._value = None
+        self._timestamp = None
+        self._valid = None
+        # live values are stored between head (inclusive) and
+        # tail (exclusive) positions
+        self._head = 0
+        self._tail = 0
+        self._count = 0
+
+    def _allocate(self, capacity, dtype, shape):
+        index = numpy.empty(capacity, dtype=numpy.int64)
+        value = numpy.empty((capacity,) + shape, dtype=dtype)
+        timestamp = numpy.empty(capacity, dtype=numpy.float64)
+        valid = numpy.zeros(capacity, dtype=bool)
+        head, tail = self._head, self._tail
+        live = tail - head
+        if live > 0:
+            index[:live] = self._index[head:tail]
+            value[:live] = self._value[head:tail]
+            timestamp[:live] = self._timestamp[head:tail]
+            valid[:live] = self._valid[head:tail]
+        self._index = index
+        self._value = value
+        self._timestamp = timestamp
+        self._valid = valid
+        self._head = 0
+        self._tail = live
+
+    def _reserve(self, chunk):
+        """Make sure that the storage can hold the chunk"""
+        value = chunk.value
+        shape = value.shape[1:]
+        if self._value is None:
+            capacity = self._initial_capacity
+            while capacity < len(chunk):
+                capacity *= 2
+            self._allocate(capacity, value.dtype, shape)
+            return
+        if self._value.shape[1:] != shape:
+            msg = "value shape %s does not match buffer shape %s" % (
+                shape, self._value.shape[1:])
+            raise ValueError(msg)
+        dtype = self._value.dtype
+        if not numpy.can_cast(value.dtype, dtype):
+            dtype = numpy.result_type(dtype, value.dtype)
+        capacity = len(self._index)
+        needed = self._tail + len(chunk)
+        if needed <= capacity and dtype == self._value.dtype:
+            return
+        live = self._tail - self._head
+        required = live + len(chunk)
+        if required > capacity // 2:
+            while capacity < 2 * required:
+                capacity *= 2
+        self._allocate(capacity, dtype, shape)
+
+    def _find(self, idx):
+        """Return storage position of the given index or None"""
+        if self._count == 0:
+            return None
+        head, tail = self._head, self._tail
+        pos = head + int(numpy.searchsorted(self._index[head:tail], idx))
+        if pos < tail and self._index[pos] == idx and self._valid[pos]:
+            return pos
+        return None
+
+    def _raise_missing(self, idx):
+        msg = "value with %s index is not in buffer" % idx
+        if self.next_idx > idx:
+            raise LateValueException(msg)
+        else:
+            raise EarlyValueException(msg)
+
+    def _to_chunk(self, values, initial_idx):
+        if isinstance(values, SardanaValueChunk):
+            value, timestamp = values.value, values.timestamp
+        elif isinstance(values, numpy.ndarray):
+            value, timestamp = values, None
+        else:
+            values = list(values)
+            if len(values) > 0 and isinstance(values[0], SardanaValue):
+                value = [v.value for v in values]
+                timestamp = [v.timestamp for v in values]
+            else:
+                value, timestamp = values, None
+        value = numpy.asarray(value)
+        index = numpy.arange(initial_idx, initial_idx + len(value),
+                             dtype=numpy.int64)
+        return SardanaValueChunk(value, timestamp=timestamp, index=index)
+
+    def _add_chunk(self, chunk):
+        if len(chunk) == 0:
+            return
+        # compare with the last stored index even if it was already removed
+        # (the storage is not reused, see the class docstring)
+        if self._tail > 0 and chunk.index[0] <= self._index[self._tail - 1]:
+            msg = "index %d is not greater than the last buffered index %d" % (
+                chunk.index[0], self._index[self._tail - 1])
+            raise ValueError(msg)
+        if self._persistent:
+            self._reserve(chunk)
+            start = self._tail
+            end = start + len(chunk)
+            self._index[start:end] = chunk.index
+            self._value[start:end] = chunk.value
+            self._timestamp[start:end] = chunk.timestamp
+            self._valid[start:end] = True
+            self._tail = end
+            self._count += len(chunk)
+            chunk = SardanaValueChunk(self._value[start:end],
+                                      timestamp=self._timestamp[start:end],
+                                      index=self._index[start:end])
+        self._last_chunk = chunk
+        self._next_idx = int(chunk.index[-1]) + 1
+        self.fire_add_event()
+
+    def get_value(self, idx):
+        """Return value of a given index.
+
+        :param idx: index of the value to be returned
+        :type idx: int
+        :return: the value corresponding to the idx
+        :rtype: object
+        """
+        pos = self._find(idx)
+        if pos is None:
+            self._raise_missing(idx)
+        return self._value[pos]
+
+    def get_values(self, idxs):
+        """Return values of the given indexes. Stops at the first index which
+        is not in the buffer.
+
+        :param idxs: indexes of the values to be returned
+        :type idxs: seq<int>
+        :return: the values corresponding to the leading indexes present in
+            the buffer
+        :rtype: :class:`numpy.ndarray`
+        """
+        idxs = numpy.asarray(idxs, dtype=numpy.int64)
+        if self._count == 0 or len(idxs) == 0:
+            return []
+        head, tail = self._head, self._tail
+        pos = head + numpy.searchsorted(self._index[head:tail], idxs)
+        pos = numpy.minimum(pos, tail - 1)
+        found = (self._index[pos] == idxs) & self._valid[pos]
+        if not found.all():
+            pos = pos[:int(numpy.argmin(found))]
+        return self._value[pos]
+
+    def get_value_obj(self, idx):
+        """Return the value object of a given index.
+
+        :param idx: index of the value to be returned
+        :type idx: int
+        :return: the value object corresponding to the idx
+        :rtype: SardanaValue
+        """
+        pos = self._find(idx)
+        if pos is None:
+            self._raise_missing(idx)
+        return SardanaValue(value=self._value[pos],
+                            timestamp=float(self._timestamp[pos]))
+
+    def append(self, value, idx=None):
+        """Append a single value at the end of the buffer with a given index.
+
+        :param value: value to be appended to the buffer
+        :type param: SardanaValue or any object
+        :param idx: at which index append the value, None means append at the
+            end of the buffer
+        :type idx: int
+        """
+        if idx is None:
+            idx = self._next_idx
+        self._add_chunk(self._to_chunk([value], idx))
+
+    def extend(self, values, initial_idx=None):
+        """Extend buffer with values assigning them consecutive indexes.
+
+        :param values: values that extend the buffer
+        :type values: :class:`~sardana.sardanavalue.SardanaValueChunk` or
+            :class:`numpy.ndarray` or list<object>
+        :param initial_idx: at which index append the first value,
+            the rest of them will be assigned the next consecutive indexes,
+            None means assign at the end of the buffer
+        :type initial_idx: int
+        """
+        if initial_idx is None:
+            initial_idx = self._next_idx
+        self._add_chunk(self._to_chunk(values, initial_idx))
+
+    def remove(self, idx):
+        """Remove value object of a given index.
+
+        :param idx: index of the value to be returned
+        :type idx: int
+        :return: the value object corresponding to the idx
+        :rtype: object
+        """
+        pos = self._find(idx)
+        if pos is None:
+            msg = "value with %s index is not in buffer" % idx
+            raise KeyError(msg)
+        value_obj = SardanaValue(value=self._value[pos],
+                                 timestamp=float(self._timestamp[pos]))
+        self._valid[pos] = False
+        self._count -= 1
+        if pos == self._head:
+            valid = self._valid
+            head, tail = self._head + 1, self._tail
+            while head < tail and not valid[head]:
+                head += 1
+            self._head = head
+        return value_obj
+
+    def clear(self):
+        self._next_idx = 0
+        self._reset_storage()
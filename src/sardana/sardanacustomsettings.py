@@ -56,6 +56,46 @@ SPOCK_INPUT_HANDLER = "CLI"
 #: value - recorder name
 SCAN_RECORDER_MAP = None
 
+#: Pass the records to each scan recorder by its own worker thread so slow
+#: recorders (e.g. writing to network file systems) do not stall the scan.
+#: The records are passed to the recorders in batches.
+SCAN_RECORDER_ASYNC = False
+
+#: Maximum number of pending writes per recorder when SCAN_RECORDER_ASYNC
+#: is enabled
+SCAN_RECORDER_QUEUE_SIZE = 100
+
+#: What to do when a recorder can not keep up with the scan and its queue
+#: is full (only when SCAN_RECORDER_ASYNC is enabled). Available options:
+#:
+#: - "block" (default) - wait until the recorder writes the pending records
+#: - "spool" - spool the records to a temporary file on disk
+#: - "coalesce" - coalesce the records in memory into a single batch
+SCAN_RECORDER_BACKPRESSURE = "block"
+
+#: Release the scan records from memory once they are consumed by the
+#: recorders. The released records are spooled to a temporary file so the
+#: macros can still access the whole scan data (slower).
+SCAN_DATA_STREAMING = False
+
+#: Number of records buffered in memory by the NXscan HDF5 recorder before
+#: writing them to the file in one go. 1 means that every record is
+#: written as soon as it arrives.
+H5_RECORDER_BUFFER_SIZE = 1
+
+#: Maximum time (in seconds) the NXscan HDF5 recorder keeps the records
+#: in its buffer (evaluated on every new record). None means no limit.
+H5_RECORDER_BUFFER_TIME = None
+
+#: Minimum time (in seconds) between two flushes of the NXscan HDF5 file
+#: during the scan. 0 means flush after every write.
+H5_RECORDER_FLUSH_PERIOD = 0
+
+#: Write the NXscan HDF5 files in the Single Writer Multiple Reader (SWMR)
+#: mode so the live readers can follow the file during the scan. Requires
+#: HDF5 >= 1.10.
+H5_RECORDER_SWMR = False
+
 #: Filter for macro logging: name of the class to be used as filter
 #: for the macro logging
 #:
@@ -70,13 +110,44 @@ LOG_MACRO_FILTER = "sardana.macroserver.msmacromanager.LogMacroFilter"
 # Maximum number of Taurus deprecation warnings allowed to be displayed.
 TAURUS_MAX_DEPRECATION_COUNTS = 0
 
-#: Type of encoding for ValueBuffer Tango attribute of experimental channels
+#: Type of encoding for ValueBuffer Tango attribute of experimental channels.
+#: Apart of the Taurus codecs e.g. "pickle" or "json" the binary "numpy" codec
+#: (see :mod:`sardana.util.codec`) may be used, optionally compressed e.g.
+#: "lz4_numpy" or "zstd_numpy" (requires lz4 or zstandard packages)
 VALUE_BUFFER_CODEC = "pickle"
 
 #: Type of encoding for ValueRefBuffer Tango attribute of experimental
 #: channels
 VALUE_REF_BUFFER_CODEC = "pickle"
 
+#: Storage backend for value buffers of the Pool experimental channels.
+#: Available options:
+#:
+#: - "dict" (default) - one SardanaValue object per value in an ordered dict
+#: - "array" - values, indexes and timestamps kept in contiguous NumPy arrays,
+#:   recommended for high acquisition rates
+POOL_VALUE_BUFFER_BACKEND = "dict"
+
+#: Number of worker threads pushing the asynchronous tango events of the
+#: sardana devices. The events of each device are always pushed in order.
+TANGO_EVENT_WORKERS = 4
+
+#: Maximum number of pending asynchronous tango events per worker. When it
+#: is reached, the non-priority events are kept aside (only the latest value
+#: of each attribute) until there is room.
+TANGO_EVENT_QUEUE_SIZE = 1000
+
+#: Profile the element and controller locks (wait time, hold time and owner
+#: threads) since the Pool startup. The profiling can also be enabled and
+#: disabled at runtime with the Pool SetLockProfiling command.
+LOCK_PROFILING = False
+
+#: Fire the software synchronization events in the position domain at the
+#: crossing times predicted from the position events and the motor motion
+#: profile instead of waiting for the position events (which are only
+#: emitted once every few motion loop iterations)
+SW_SYNCH_POSITION_PREDICTION = False
+
 #: Database backend for MacroServer environment implemented using shelve.
 #: Available options:
 #:
@@ -85,4 +156,36 @@ VALUE_REF_BUFFER_CODEC = "pickle"
 #:   additional package e.g. python3-gdbm on Debian. At the time of writing of
 #:   this documentation it is not available for conda.
 #: - "dumb" - worst performance but directly available with Python 3.
+#: - "journal" - not a shelve but a crash-safe append-only log (periodically
+#:   compacted) stored in <environment file>.journal. The first time, the
+#:   existing shelve environment (if any) is imported.
 MS_ENV_SHELVE_BACKEND = None
+
+#: Seconds the MacroServer environment changes are kept in memory before
+#: writing them, all together, to the environment database. They are also
+#: written at the end of each macro and when the MacroServer is shut down.
+#: None means write the changes of each setEnv/unsetEnv immediately.
+MS_ENV_WRITE_BEHIND = None
+
+#: The executed scans are stored in the MacroServer scan catalog
+#: (<environment file>.scans). Additionally keep mirroring the latest scans
+#: in the ScanHistory environment variable (used by older clients).
+MS_SCAN_HISTORY_MIRROR = True
+
+#: Load the macro libraries lazily: at startup (and on MacroPath change) the
+#: macros are created from their metadata extracted statically from the macro
+#: library sources and cached in the macro library index
+#: (<environment file>.macros). Each macro library is imported on the first
+#: execution of one of its macros. The libraries which can not be statically
+#: analyzed are imported at startup as usual.
+MS_LAZY_MACRO_LOADING = False
+
+#: Load the controller libraries lazily: at startup (and on PoolPath change)
+#: the controller classes are created from their metadata cached in the
+#: given controller class index file ("{pool}" is replaced by the pool name)
+#: e.g. "/tmp/{pool}.controllers". Each controller library is imported when
+#: one of its controllers is instantiated or its controller class info is
+#: requested. The libraries not yet indexed (or changed since they were
+#: indexed) are imported at startup as usual and then indexed.
+#: None (default) means import all the controller libraries at startup.
+POOL_CONTROLLER_INDEX_FILE = None
@@ -24,25 +24,49 @@
 ##############################################################################
 
 """This module is part of the Python Sardana libray. It defines a *slow* lock
-class that provides additional debugging information"""
+class that provides additional debugging information and a lock which can
+be profiled to find lock contention"""
 
-
-
-__all__ = ["SardanaLock"]
+__all__ = ["SardanaLock", "LockStats", "enable_lock_profiling",
+           "is_lock_profiling_enabled", "get_lock_stats", "reset_lock_stats",
+           "dump_lock_stats"]
 
 __docformat__ = 'restructuredtext'
 
+import os
+import json
+import time
 import logging
+import tempfile
 import threading
 
-_VERBOSE = True
+_VERBOSE = False
+
+_PROFILE = False
+
+# statistics of the profiled locks: lock name -> LockStats
+_STATS = {}
 
 
-def SardanaLock(verbose=None, name=None, lock=None):
+def SardanaLock(verbose=None, name=None, lock=None, profile=False):
+    """Returns a lock.
+
+    :param verbose: log every acquire and release (slow!)
+        [default: None, meaning use the module default]
+    :type verbose: bool
+    :param name: lock name
+    :type name: str
+    :param lock: the lock to be wrapped [default: None, meaning create a new
+        :class:`threading.Lock`]
+    :param profile: return a lock which can be profiled (see
+        :func:`enable_lock_profiling`)
+    :type profile: bool"""
     if verbose is None:
         verbose = _VERBOSE
     if verbose:
         return _SardanaLock(name=name, lock=lock)
+    if profile:
+        return _ProfiledLock(name=name, lock=lock)
     if lock is None:
         return threading.Lock()
     return lock
@@ -103,3 +127,173 @@ class _SardanaLock(object):
 
     def __exit__(self, t, v, tb):
         self.release()
+
+
+def enable_lock_profiling(enabled=True):
+    """Enable (or disable) the profiling of the locks created with
+    ``SardanaLock(profile=True)`` e.g. the element and controller locks.
+    The profiling is disabled by default.
+
+    .. note::
+        The lock profiling has been included in Sardana
+        on a provisional basis. Backwards incompatible changes
+        (up to and including removal of the feature) may occur if
+        deemed necessary by the core developers.
+
+    :param enabled: whether to enable or disable the profiling
+    :type enabled: bool"""
+    global _PROFILE
+    _PROFILE = enabled
+
+
+def is_lock_profiling_enabled():
+    """Returns whether the lock profiling is enabled
+
+    :return: whether the lock profiling is enabled
+    :rtype: bool"""
+    return _PROFILE
+
+
+def get_lock_stats():
+    """Returns the statistics of the profiled locks ordered by the total
+    wait time (the most contended locks first)
+
+    :return: the statistics of each lock
+    :rtype: list<dict>"""
+    stats = [lock_stats.to_dict() for lock_stats in list(_STATS.values())
+             if lock_stats.acquired or lock_stats.failed]
+    stats.sort(key=lambda lock_stats: lock_stats["wait_total"],
+               reverse=True)
+    return stats
+
+
+def reset_lock_stats():
+    """Resets the statistics of the profiled locks"""
+    for lock_stats in list(_STATS.values()):
+        lock_stats.reset()
+
+
+def dump_lock_stats(file_name=None):
+    """Dumps the statistics of the profiled locks to a JSON file
+
+    :param file_name: the file name [default: None, meaning a file in the
+        temporary directory named after the process id]
+    :type file_name: str
+    :return: the file name
+    :rtype: str"""
+    if not file_name:
+        file_name = os.path.join(tempfile.gettempdir(),
+                                 "sardana_locks_%d.json" % os.getpid())
+    data = dict(timestamp=time.time(), pid=os.getpid(),
+                bucket_unit="us", locks=get_lock_stats())
+    with open(file_name, "w") as f:
+        json.dump(data, f, indent=1)
+    return file_name
+
+
+class LockStats(object):
+    """Statistics of a named lock: number of acquisitions, number of failed
+    non-blocking acquisitions, histograms of the wait and hold times and
+    number of acquisitions per thread.
+
+    The histograms have logarithmic buckets: bucket *i* counts the times
+    between 2^(i-1) and 2^i microseconds (bucket 0 counts the times below
+    one microsecond).
+
+    The statistics are updated without any additional lock: the acquisition
+    statistics are updated while holding the profiled lock itself, only the
+    failed acquisitions counter may (rarely) lose an update."""
+
+    NB_BUCKETS = 32
+
+    def __init__(self, name):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self.acquired = 0
+        self.failed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.hold_total = 0.0
+        self.hold_max = 0.0
+        self.wait_hist = [0] * self.NB_BUCKETS
+        self.hold_hist = [0] * self.NB_BUCKETS
+        self.owners = {}
+
+    def _bucket(self, t):
+        return min(int(t * 1e6).bit_length(), self.NB_BUCKETS - 1)
+
+    def add_wait(self, wait, owner):
+        self.acquired += 1
+        self.wait_total += wait
+        if wait > self.wait_max:
+            self.wait_max = wait
+        self.wait_hist[self._bucket(wait)] += 1
+        owners = self.owners
+        owners[owner] = owners.get(owner, 0) + 1
+
+    def add_hold(self, hold):
+        self.hold_total += hold
+        if hold > self.hold_max:
+            self.hold_max = hold
+        self.hold_hist[self._bucket(hold)] += 1
+
+    def to_dict(self):
+        return dict(name=self.name, acquired=self.acquired,
+                    failed=self.failed, wait_total=self.wait_total,
+                    wait_max=self.wait_max, hold_total=self.hold_total,
+                    hold_max=self.hold_max, wait_hist=list(self.wait_hist),
+                    hold_hist=list(self.hold_hist),
+                    owners=dict(self.owners))
+
+
+class _ProfiledLock(object):
+    """A lock which records its statistics (see :class:`LockStats`) while
+    the lock profiling is enabled. Otherwise it just delegates to the wrapped
+    lock."""
+
+    def __init__(self, name=None, lock=None):
+        name = name or self.__class__.__name__
+        self.name = name
+        if lock is None:
+            lock = threading.Lock()
+        self.__block = lock
+        self.__stats = _STATS.setdefault(name, LockStats(name))
+        # acquisition depth (of reentrant locks) and start time of the
+        # current profiled hold
+        self.__depth = 0
+        self.__hold_start = None
+
+    def __repr__(self):
+        return "<%s>" % self.name
+
+    def acquire(self, blocking=1):
+        # once started, profile the hold until it is fully released
+        if not _PROFILE and not self.__depth:
+            return self.__block.acquire(blocking)
+        start = time.perf_counter()
+        rc = self.__block.acquire(blocking)
+        acquired = time.perf_counter()
+        if not rc:
+            self.__stats.failed += 1
+            return rc
+        self.__depth += 1
+        if self.__depth == 1:
+            self.__hold_start = acquired
+            self.__stats.add_wait(acquired - start,
+                                  threading.current_thread().name)
+        return rc
+
+    __enter__ = acquire
+
+    def release(self):
+        if self.__depth:
+            self.__depth -= 1
+            if not self.__depth:
+                self.__stats.add_hold(time.perf_counter() -
+                                      self.__hold_start)
+        self.__block.release()
+
+    def __exit__(self, t, v, tb):
+        self.release()
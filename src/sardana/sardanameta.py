@@ -97,7 +97,11 @@ class SardanaLibrary(SardanaBaseObject):
            - name - (=module name) module name (without file extension)
            - meta_classes - dict<str, SardanMetaClass>
            - exc_info - exception information if an error occurred when loading
-                        the module"""
+                        the module
+
+       A library created only from its metadata (without the module but with
+       a loader callable) loads the module on the first use of its code
+       (see :meth:`load`)."""
 
     description = '<Undocumented>'
 
@@ -105,6 +109,8 @@ class SardanaLibrary(SardanaBaseObject):
         self.module = module = kwargs.pop('module', None)
         self.file_path = file_path = kwargs.pop('file_path', None)
         self.exc_info = kwargs.pop('exc_info', None)
+        self._loader = kwargs.pop('loader', None)
+        description = kwargs.pop('description', None)
         if module is not None:
             file_path = os.path.abspath(module.__file__)
         self.file_path = file_path
@@ -123,6 +129,10 @@ class SardanaLibrary(SardanaBaseObject):
             if module.__doc__ is not None:
                 self.description = module.__doc__
             self._code = getsourcelines(module)[0]
+        elif self._loader is not None:
+            if description is not None:
+                self.description = description
+            self._code = None
         else:
             self.description = name + " in error!"
             self._code = None
@@ -150,11 +160,42 @@ class SardanaLibrary(SardanaBaseObject):
 
            :return: list of source code lines
            :rtype: list<str>"""
+        self.load()
         code = self._code
         if code is None:
             raise IOError('source code not available')
         return code
 
+    def is_loaded(self):
+        """Returns True if the python module of this library is loaded or
+        False if the library was created only from its metadata.
+
+        :return: True if the python module of this library is loaded
+        :rtype: bool"""
+        return self._loader is None
+
+    def load(self):
+        """Loads the python module of a library created only from its
+        metadata (does nothing if it is already loaded).
+
+        :raises: the loader exceptions e.g. if the module can not be
+                 imported"""
+        loader = self._loader
+        if loader is not None:
+            loader(self)
+
+    def set_module(self, module):
+        """Sets the python module of a library created only from its
+        metadata (called by the loader once the module is imported).
+
+        :param module: the python module
+        :type module: object"""
+        self.module = module
+        if module.__doc__ is not None:
+            self.description = module.__doc__
+        self._code = getsourcelines(module)[0]
+        self._loader = None
+
     def add_meta_class(self, meta_class):
         """Adds a new :class:~`sardana.sardanameta.SardanaClass` to this
         library.
@@ -303,6 +344,7 @@ class SardanaLibrary(SardanaBaseObject):
 
         :return: the python module
         :rtype: object"""
+        self.load()
         return self.module
 
     def get_description(self):
@@ -393,25 +435,46 @@ class SardanaLibrary(SardanaBaseObject):
 
 
 class SardanaCode(SardanaBaseObject):
-    """Object representing a python code (base for class and function)."""
+    """Object representing a python code (base for class and function).
+
+    A code created only from its metadata (without the code object but with
+    the name and the description) gets its code object when its library is
+    loaded (see :meth:`SardanaLibrary.load`)."""
 
     description = '<Undocumented>'
 
     def __init__(self, **kwargs):
         lib = kwargs.pop('lib')
         self._lib = weakref.ref(lib)
-        self._code_obj = kwargs.pop('code')
-        doc = self._code_obj.__doc__
-        if doc:
-            self.description = doc
-        self._code = getsourcelines(self._code_obj)
+        self._code_obj = None
+        self._code = None
+        code_obj = kwargs.pop('code')
+        description = kwargs.pop('description', None)
+        if code_obj is not None:
+            SardanaCode.set_code_object(self, code_obj)
+        elif description:
+            self.description = description
         name = kwargs['name']
         kwargs['full_name'] = "{0}.{1}".format(lib.name, name)
         kwargs['parent'] = kwargs.pop('parent', self.lib)
         SardanaBaseObject.__init__(self, **kwargs)
 
+    def set_code_object(self, code_obj):
+        """Sets the python code object of a code created only from its
+        metadata (called once its library is loaded).
+
+        :param code_obj: the python class or function
+        :type code_obj: object"""
+        self._code_obj = code_obj
+        doc = code_obj.__doc__
+        if doc:
+            self.description = doc
+        self._code = getsourcelines(code_obj)
+
     @property
     def code_object(self):
+        if self._code_obj is None:
+            self.lib.load()
         return self._code_obj
 
     @property
@@ -429,7 +492,7 @@ class SardanaCode(SardanaBaseObject):
 
         :return: the python module
         :rtype: object"""
-        return self.lib.module
+        return self.lib.get_module()
 
     @property
     def module_name(self):
@@ -471,6 +534,8 @@ class SardanaCode(SardanaBaseObject):
         """Returns a tuple (sourcelines, firstline) corresponding to the
         definition of this code object. sourcelines is a list of source code
         lines. firstline is the line number of the first source code line."""
+        if self._code_obj is None:
+            self.lib.load()
         code = self._code
         if code is None:
             raise IOError('source code not available')
@@ -509,7 +574,8 @@ class SardanaClass(SardanaCode):
     def __init__(self, **kwargs):
         klass = kwargs.pop('klass')
         kwargs['code'] = klass
-        kwargs['name'] = kwargs.pop('name', klass.__name__)
+        if 'name' not in kwargs:
+            kwargs['name'] = klass.__name__
         SardanaCode.__init__(self, **kwargs)
 
     @property
@@ -523,7 +589,8 @@ class SardanaFunction(SardanaCode):
     def __init__(self, **kwargs):
         function = kwargs.pop('function')
         kwargs['code'] = function
-        kwargs['name'] = kwargs.pop('name', function.__name__)
+        if 'name' not in kwargs:
+            kwargs['name'] = function.__name__
         SardanaCode.__init__(self, **kwargs)
 
     @property
@@ -0,0 +1,582 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""This module is part of the Python Sardana library. It defines the static
+(AST based) scanner of the python modules and the persistent index of their
+metadata used to create the meta objects (see :mod:`sardana.sardanameta`)
+without importing the modules"""
+
+__all__ = ["NotIndexable", "ModuleScanner", "MetaIndex"]
+
+__docformat__ = 'restructuredtext'
+
+import os
+import ast
+import json
+import numbers
+import hashlib
+import inspect
+import builtins
+import importlib
+
+from taurus.core.util.log import Logger
+
+# top-level statements which may bind names conditionally
+_COMPOUND_STATEMENTS = (ast.If, ast.For, ast.While, ast.Try, ast.With)
+
+# binary operations supported in the static expressions
+_BINARY_OPERATIONS = {
+    ast.Add: lambda left, right: left + right,
+    ast.Sub: lambda left, right: left - right,
+    ast.Mult: lambda left, right: left * right,
+}
+
+
+class NotIndexable(Exception):
+    """Raised by the :class:`ModuleScanner` when the information can not be
+    reliably extracted from the module source i.e. it may depend on the
+    module execution"""
+    pass
+
+
+class _ModuleRef(object):
+    """Reference to a module bound by an import statement"""
+
+    def __init__(self, name):
+        self.name = name
+
+
+def _get_bound_names(node):
+    """Returns the names bound (or unbound) by the statement"""
+    names = []
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            if not isinstance(child.ctx, ast.Load):
+                names.append(child.id)
+        elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef,
+                                ast.ClassDef)):
+            names.append(child.name)
+        elif isinstance(child, (ast.Import, ast.ImportFrom)):
+            for alias in child.names:
+                names.append(alias.asname or alias.name.split('.')[0])
+        elif isinstance(child, ast.ExceptHandler) and child.name:
+            names.append(child.name)
+    return names
+
+
+def _get_loaded_names(stmts):
+    """Returns the names used by the statements (excluding the function
+    bodies, which are not executed when the statements are)"""
+    names = set()
+    nodes = list(stmts)
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            names.add(node.id)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            nodes.extend(node.decorator_list)
+            nodes.extend(node.args.defaults)
+            continue
+        nodes.extend(ast.iter_child_nodes(node))
+    return names
+
+
+def _is_item_assignment(stmt):
+    """Returns True if the statement is an item assignment of a name e.g.
+    ``hints['scan'] = 'dscan'``"""
+    if not isinstance(stmt, ast.Assign) or len(stmt.targets) != 1:
+        return False
+    target = stmt.targets[0]
+    return isinstance(target, ast.Subscript) and \
+        isinstance(target.value, ast.Name)
+
+
+def _get_item_key(target):
+    """Returns the key expression of the subscript"""
+    key = target.slice
+    # python < 3.9 wraps the key expression
+    if isinstance(key, getattr(ast, "Index", ())):
+        key = key.value
+    return key
+
+
+def _c3_merge(seqs):
+    """C3 linearization merge of the given class sequences"""
+    result = []
+    seqs = [list(seq) for seq in seqs if seq]
+    while seqs:
+        for seq in seqs:
+            head = seq[0]
+            if not any(head in s[1:] for s in seqs):
+                break
+        else:
+            raise NotIndexable("inconsistent method resolution order")
+        result.append(head)
+        for seq in seqs:
+            if seq[0] is head:
+                del seq[0]
+        seqs = [seq for seq in seqs if seq]
+    return result
+
+
+class ModuleScanner(object):
+    """Static scanner of a python module source: it extracts information
+    (e.g. class attributes) without importing the module.
+
+    Only a conservative subset of python is understood: whenever the
+    information could depend on the module execution (e.g. conditionally
+    defined names, names bound more than once, unknown base classes)
+    :class:`NotIndexable` is raised. The names imported from the
+    :attr:`trusted_modules` (and the builtins) are resolved to the real
+    objects of these modules.
+
+    .. note::
+        The ModuleScanner class has been included in Sardana
+        on a provisional basis. Backwards incompatible changes
+        (up to and including removal of the class) may occur if
+        deemed necessary by the core developers.
+    """
+
+    #: modules whose objects may be referenced by the scanned module
+    trusted_modules = ()
+
+    #: callables which may be called in the static expressions
+    trusted_callables = ()
+
+    def __init__(self, source, file_name="<unknown>"):
+        try:
+            self.tree = ast.parse(source, file_name)
+        except (SyntaxError, ValueError) as e:
+            raise NotIndexable("can not parse: %s" % e)
+        self.file_name = file_name
+        self._bindings, self._nested = self._collect_bindings(self.tree.body)
+        # dict<str, list> (key: class name, value: class MRO)
+        self._mros = {}
+        # dict<str, dict> (key: class name, value: class body bindings)
+        self._class_bindings = {}
+
+    def _collect_bindings(self, stmts):
+        """Returns the names bound by the statements: the simple statements
+        binding each name and the names bound within compound statements"""
+        bindings, nested = {}, set()
+        for stmt in stmts:
+            if isinstance(stmt, ast.ImportFrom) and \
+                    stmt.names[0].name == "*":
+                module = self._get_trusted_module(stmt)
+                if module is None:
+                    raise NotIndexable("star import from %s" % stmt.module)
+                names = getattr(module, "__all__", ())
+            elif isinstance(stmt, _COMPOUND_STATEMENTS):
+                nested.update(_get_bound_names(stmt))
+                continue
+            elif isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef,
+                                   ast.ClassDef)):
+                names = stmt.name,
+            else:
+                names = _get_bound_names(stmt)
+            for name in names:
+                bindings.setdefault(name, []).append(stmt)
+        return bindings, nested
+
+    def _get_trusted_module(self, stmt):
+        if stmt.level > 0 or stmt.module not in self.trusted_modules:
+            return None
+        return importlib.import_module(stmt.module)
+
+    def get_local_names(self):
+        """Returns the names of the top-level classes and functions
+
+        :return: the class and function names
+        :rtype: list<str>"""
+        return [stmt.name for stmt in self.tree.body
+                if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef,
+                                     ast.ClassDef))]
+
+    def resolve_name(self, name):
+        """Returns the object bound to the module global name: the
+        ClassDef/FunctionDef node of the top-level classes and functions or
+        the real object for the names imported from the trusted modules and
+        the builtins
+
+        :param name: the global name
+        :type name: :obj:`str`
+        :return: the object bound to the name
+        :raises: NotIndexable if the name can not be resolved"""
+        if name in self._nested:
+            raise NotIndexable("%s is conditionally bound" % name)
+        stmts = self._bindings.get(name, ())
+        if len(stmts) > 1:
+            raise NotIndexable("%s is bound more than once" % name)
+        if not stmts:
+            if hasattr(builtins, name):
+                return getattr(builtins, name)
+            raise NotIndexable("%s is not defined" % name)
+        stmt = stmts[0]
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef,
+                             ast.ClassDef)):
+            return stmt
+        if isinstance(stmt, ast.ImportFrom):
+            module = self._get_trusted_module(stmt)
+            if module is not None:
+                for alias in stmt.names:
+                    if alias.name == "*" or \
+                            (alias.asname or alias.name) == name:
+                        orig_name = name if alias.name == "*" else alias.name
+                        try:
+                            return getattr(module, orig_name)
+                        except AttributeError:
+                            break
+        elif isinstance(stmt, ast.Import):
+            for alias in stmt.names:
+                if alias.asname == name:
+                    return _ModuleRef(alias.name)
+                if alias.asname is None and \
+                        alias.name.split('.')[0] == name:
+                    return _ModuleRef(name)
+        raise NotIndexable("%s (line %d) can not be resolved" %
+                           (name, stmt.lineno))
+
+    def resolve(self, node):
+        """Returns the object referenced by the name or attribute expression
+        (see :meth:`resolve_name`)
+
+        :param node: the expression
+        :type node: ast.AST
+        :return: the object referenced by the expression
+        :raises: NotIndexable if the expression can not be resolved"""
+        if isinstance(node, ast.Name):
+            return self.resolve_name(node.id)
+        if not isinstance(node, ast.Attribute):
+            raise NotIndexable("unsupported expression (line %d)" %
+                               node.lineno)
+        obj = self.resolve(node.value)
+        if isinstance(obj, _ModuleRef):
+            name = obj.name + "." + node.attr
+            for module_name in self.trusted_modules:
+                if module_name == name or module_name.startswith(name + "."):
+                    return _ModuleRef(name)
+            if obj.name not in self.trusted_modules:
+                raise NotIndexable("%s can not be resolved" % name)
+            obj = importlib.import_module(obj.name)
+        elif isinstance(obj, ast.ClassDef):
+            if obj.lineno >= node.lineno:
+                raise NotIndexable("class %s is defined later (line %d)" %
+                                   (obj.name, node.lineno))
+            return self.get_class_attribute(obj, node.attr)
+        elif isinstance(obj, ast.AST):
+            raise NotIndexable("attribute of %s (line %d)" %
+                               (obj.name, node.lineno))
+        try:
+            return getattr(obj, node.attr)
+        except AttributeError:
+            raise NotIndexable("%s has no attribute %s (line %d)" %
+                               (obj, node.attr, node.lineno))
+
+    def get_mro(self, klass):
+        """Returns the method resolution order of the class
+
+        :param klass: the ClassDef node of a top-level class or a real class
+        :return: the classes (ClassDef nodes and real classes) in the method
+            resolution order
+        :rtype: list
+        :raises: NotIndexable if it can not be statically determined"""
+        if not isinstance(klass, ast.ClassDef):
+            if not inspect.isclass(klass):
+                raise NotIndexable("%s is not a class" % klass)
+            return list(klass.__mro__)
+        mro = self._mros.get(klass.name)
+        if mro is not None:
+            return mro
+        if klass.decorator_list or klass.keywords:
+            raise NotIndexable("class %s (line %d) has decorators or "
+                               "keywords" % (klass.name, klass.lineno))
+        bases = []
+        for base_node in klass.bases:
+            base = self.resolve(base_node)
+            if isinstance(base, ast.ClassDef):
+                if base.lineno >= klass.lineno:
+                    raise NotIndexable("base %s of class %s is defined "
+                                       "later" % (base.name, klass.name))
+            elif not inspect.isclass(base):
+                raise NotIndexable("base of class %s (line %d) is not a "
+                                   "class" % (klass.name, klass.lineno))
+            bases.append(base)
+        if not bases:
+            bases.append(object)
+        seqs = [self.get_mro(base) for base in bases]
+        seqs.append(bases)
+        mro = [klass] + _c3_merge(seqs)
+        self._mros[klass.name] = mro
+        return mro
+
+    def get_class_attribute(self, klass, name):
+        """Returns the value of the class attribute looking it up in the
+        class method resolution order. The attributes of the top-level
+        classes must be assigned once with a static expression (see
+        :meth:`evaluate`), optionally followed by item assignments with
+        static keys and values (e.g. ``hints['scan'] = 'dscan'``), and not
+        used otherwise in the class body
+
+        :param klass: the ClassDef node of a top-level class or a real class
+        :param name: the attribute name
+        :type name: :obj:`str`
+        :return: the attribute value
+        :raises: NotIndexable if it can not be statically determined"""
+        for cls in self.get_mro(klass):
+            if isinstance(cls, ast.ClassDef):
+                binding = self._get_class_binding(cls, name)
+                if binding is not None:
+                    return self._evaluate_class_binding(cls, name, *binding)
+            elif name in vars(cls):
+                return vars(cls)[name]
+        raise NotIndexable("class %s has no attribute %s" %
+                           (getattr(klass, "name", klass), name))
+
+    def _evaluate_class_binding(self, klass, name, stmt, item_stmts):
+        if item_stmts and isinstance(stmt.value, (ast.Name, ast.Attribute)):
+            # the items would be assigned to the aliased object
+            raise NotIndexable("%s.%s is an alias" % (klass.name, name))
+        value = self.evaluate(stmt.value)
+        for item_stmt in item_stmts:
+            if item_stmt.lineno < stmt.lineno:
+                raise NotIndexable("%s.%s is used before assigned" %
+                                   (klass.name, name))
+            key = self.evaluate(_get_item_key(item_stmt.targets[0]))
+            try:
+                value[key] = self.evaluate(item_stmt.value)
+            except (TypeError, IndexError) as e:
+                raise NotIndexable("%s.%s item assignment: %s" %
+                                   (klass.name, name, e))
+        return value
+
+    def _get_class_binding(self, klass, name):
+        """Returns the assignment of the class attribute and its item
+        assignments or None if the class body does not bind the name"""
+        bindings = self._class_bindings.get(klass.name)
+        if bindings is None:
+            stmts, items, used = [], {}, []
+            for stmt in klass.body:
+                if _is_item_assignment(stmt):
+                    target = stmt.targets[0]
+                    items.setdefault(target.value.id, []).append(stmt)
+                    used.extend((_get_item_key(target), stmt.value))
+                else:
+                    stmts.append(stmt)
+                    used.append(stmt)
+            bindings = self._collect_bindings(stmts)
+            bindings += items, _get_loaded_names(used)
+            self._class_bindings[klass.name] = bindings
+        bindings, nested, items, loaded = bindings
+        if name in nested or name in loaded:
+            raise NotIndexable("%s.%s is conditionally bound or used in the "
+                               "class body" % (klass.name, name))
+        stmts = bindings.get(name)
+        if stmts is None:
+            if name in items:
+                raise NotIndexable("%s.%s is used before assigned" %
+                                   (klass.name, name))
+            return None
+        stmt = stmts[0]
+        if len(stmts) > 1 or not isinstance(stmt, ast.Assign) or \
+                len(stmt.targets) != 1 or \
+                not isinstance(stmt.targets[0], ast.Name):
+            raise NotIndexable("%s.%s is not a simple assignment" %
+                               (klass.name, name))
+        return stmt, items.get(name, ())
+
+    def evaluate(self, node):
+        """Evaluates the static expression i.e. literals, containers, names
+        and attributes which can be resolved (see :meth:`resolve`) and calls
+        to the :attr:`trusted_callables`
+
+        :param node: the expression
+        :type node: ast.AST
+        :return: the expression value
+        :raises: NotIndexable if the expression is not static"""
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            values = [self.evaluate(elt) for elt in node.elts]
+            if isinstance(node, ast.Tuple):
+                return tuple(values)
+            if isinstance(node, ast.Set):
+                return set(values)
+            return values
+        if isinstance(node, ast.Dict):
+            if None in node.keys:
+                raise NotIndexable("dict unpacking (line %d)" % node.lineno)
+            return dict(zip(map(self.evaluate, node.keys),
+                            map(self.evaluate, node.values)))
+        if isinstance(node, (ast.Name, ast.Attribute)):
+            obj = self.resolve(node)
+            if isinstance(obj, (ast.AST, _ModuleRef)):
+                raise NotIndexable("non static value (line %d)" %
+                                   node.lineno)
+            return obj
+        if isinstance(node, ast.Call):
+            func = self.resolve(node.func)
+            if not any(func is f for f in self.trusted_callables):
+                raise NotIndexable("call (line %d)" % node.lineno)
+            args = [self.evaluate(arg) for arg in node.args]
+            kwargs = {}
+            for keyword in node.keywords:
+                if keyword.arg is None:
+                    raise NotIndexable("keyword arguments unpacking (line "
+                                       "%d)" % node.lineno)
+                kwargs[keyword.arg] = self.evaluate(keyword.value)
+            return func(*args, **kwargs)
+        if isinstance(node, ast.BinOp) and \
+                type(node.op) in _BINARY_OPERATIONS:
+            left = self.evaluate(node.left)
+            right = self.evaluate(node.right)
+            both_numbers = isinstance(left, numbers.Number) and \
+                isinstance(right, numbers.Number)
+            same_sequences = type(left) is type(right) and \
+                isinstance(left, (str, list, tuple)) and \
+                isinstance(node.op, ast.Add)
+            if not (both_numbers or same_sequences):
+                raise NotIndexable("binary operation (line %d)" %
+                                   node.lineno)
+            return _BINARY_OPERATIONS[type(node.op)](left, right)
+        if isinstance(node, ast.UnaryOp) and \
+                isinstance(node.op, (ast.UAdd, ast.USub)):
+            operand = self.evaluate(node.operand)
+            if not isinstance(operand, numbers.Number):
+                raise NotIndexable("unary operation (line %d)" % node.lineno)
+            return -operand if isinstance(node.op, ast.USub) else +operand
+        try:
+            return ast.literal_eval(node)
+        except ValueError:
+            raise NotIndexable("non static expression (line %d)" %
+                               node.lineno)
+
+
+class MetaIndex(Logger):
+    """Persistent index of the metadata of python source files.
+
+    The metadata is extracted by the given scanner (without importing the
+    files) and cached (in a JSON file) together with the file modification
+    time, size and hash. A file whose modification time or size changed is
+    hashed again and only scanned if its contents changed.
+
+    .. note::
+        The MetaIndex class has been included in Sardana
+        on a provisional basis. Backwards incompatible changes
+        (up to and including removal of the class) may occur if
+        deemed necessary by the core developers.
+
+    :param name: the index name (for the logs)
+    :type name: :obj:`str`
+    :param file_name: the index file name or None to keep the index in memory
+    :type file_name: :obj:`str`
+    :param scanner: callable receiving the source (bytes) and the file name
+        and returning the (JSON serializable) metadata of the file. It raises
+        :class:`NotIndexable` if the file must be imported.
+    :type scanner: callable
+    :param version: version of the scanner (a different version invalidates
+        the whole index)
+    :type version: :obj:`str`"""
+
+    def __init__(self, name, file_name, scanner, version):
+        Logger.__init__(self, name)
+        self._file_name = file_name
+        self._scanner = scanner
+        self._version = version
+        # dict<str, dict> (key: absolute file name, value: file entry)
+        self._files = {}
+        self._used = set()
+        self._changed = False
+        if file_name is not None and os.path.exists(file_name):
+            try:
+                with open(file_name) as f:
+                    data = json.load(f)
+                if data.get("version") == version:
+                    self._files = data["files"]
+            except Exception:
+                self.warning("Failed to read index %s (will be rebuilt)",
+                             file_name)
+                self.debug("Details:", exc_info=1)
+
+    def get(self, file_name):
+        """Returns the metadata of the given python source file scanning it
+        only if it changed since it was indexed
+
+        :param file_name: the absolute file name
+        :type file_name: :obj:`str`
+        :return: the file metadata or None if the file is not indexable
+        :raises: OSError if the file can not be read"""
+        stat = os.stat(file_name)
+        self._used.add(file_name)
+        entry = self._files.get(file_name)
+        if entry is not None and entry["mtime"] == stat.st_mtime and \
+                entry["size"] == stat.st_size:
+            return entry["info"]
+        with open(file_name, "rb") as f:
+            source = f.read()
+        digest = hashlib.sha1(source).hexdigest()
+        if entry is None or entry["hash"] != digest:
+            try:
+                info = self._scanner(source, file_name)
+            except NotIndexable as e:
+                self.debug("%s is not indexable: %s", file_name, e)
+                info = None
+        else:
+            info = entry["info"]
+        self._files[file_name] = dict(mtime=stat.st_mtime,
+                                      size=stat.st_size, hash=digest,
+                                      info=info)
+        self._changed = True
+        return info
+
+    def update(self, file_name, info):
+        """Updates the metadata of a python source file previously got with
+        :meth:`get` e.g. completed with information obtained importing it.
+        It is kept until the file contents change.
+
+        :param file_name: the absolute file name
+        :type file_name: :obj:`str`
+        :param info: the file metadata (JSON serializable)
+        :type info: object"""
+        self._files[file_name]["info"] = info
+        self._changed = True
+
+    def save(self):
+        """Writes (atomically) the index file, only with the files used since
+        the index was opened"""
+        unused = set(self._files) - self._used
+        if unused:
+            self._changed = True
+            for file_name in unused:
+                del self._files[file_name]
+        if self._file_name is None or not self._changed:
+            return
+        data = dict(version=self._version, files=self._files)
+        tmp_file_name = self._file_name + ".tmp"
+        try:
+            with open(tmp_file_name, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_file_name, self._file_name)
+            self._changed = False
+        except Exception:
+            self.warning("Failed to write index %s", self._file_name)
+            self.debug("Details:", exc_info=1)
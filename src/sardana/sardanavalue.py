@@ -28,14 +28,25 @@ classes for Sardana values"""
 
 
 
-__all__ = ["SardanaValue"]
+__all__ = ["SardanaValue", "SardanaValueChunk"]
 
 __docformat__ = 'restructuredtext'
 
 import time
 
+import numpy
+
 
 class SardanaValue(object):
+    """A value (or an error) of a sardana element or attribute together with
+    its timestamp.
+
+    Values are created for every readout so the class uses slots to keep
+    them small. Values created by the same readout should share a single
+    timestamp (passed explicitly) instead of taking one each."""
+
+    __slots__ = ("value", "error", "exc_info", "timestamp", "dtype",
+                 "dformat")
 
     def __init__(self, value=None, exc_info=None, timestamp=None,
                  dtype=None, dformat=None):
@@ -58,3 +69,110 @@ class SardanaValue(object):
 
     def __str__(self):
         return repr(self)
+
+
+class SardanaValueChunk(object):
+    """Chunk of consecutive values stored as a structure of arrays.
+
+    Instead of one :class:`SardanaValue` per point, values, timestamps and
+    indexes are kept in three NumPy arrays of the same length. The chunk
+    mimics the read-only part of the mapping interface of the *last chunk*
+    of a :class:`~sardana.sardanabuffer.SardanaBuffer` (keys are indexes,
+    values are :class:`SardanaValue` objects created on demand), so it can
+    be passed to the existing value buffer listeners.
+
+    .. note::
+        The SardanaValueChunk class has been included in Sardana
+        on a provisional basis. Backwards incompatible changes
+        (up to and including removal of the class) may occur if
+        deemed necessary by the core developers.
+    """
+
+    def __init__(self, value, timestamp=None, index=None):
+        """Construct SardanaValueChunk object
+
+        :param value: values, the first dimension iterates over the points
+        :type value: :class:`numpy.ndarray` or seq<object>
+        :param timestamp: timestamps of the values, either one per value or
+            a single one shared by all of them [default: None, meaning
+            create a 'now' timestamp]
+        :type timestamp: :class:`numpy.ndarray` or seq<float> or float
+        :param index: indexes of the values [default: None, meaning
+            consecutive indexes starting from 0]
+        :type index: :class:`numpy.ndarray` or seq<int>
+        """
+        value = numpy.asarray(value)
+        if value.ndim == 0:
+            value = value.reshape(1)
+        length = len(value)
+        if timestamp is None:
+            timestamp = time.time()
+        timestamp = numpy.asarray(timestamp, dtype=numpy.float64)
+        if timestamp.ndim == 0:
+            timestamp = numpy.full(length, timestamp)
+        if index is None:
+            index = numpy.arange(length, dtype=numpy.int64)
+        else:
+            index = numpy.asarray(index, dtype=numpy.int64)
+        if len(timestamp) != length or len(index) != length:
+            raise ValueError("value, timestamp and index must have the same "
+                             "length")
+        self.value = value
+        self.timestamp = timestamp
+        self.index = index
+
+    def __len__(self):
+        return len(self.value)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, idx):
+        return self._find(idx) is not None
+
+    def __getitem__(self, idx):
+        pos = self._find(idx)
+        if pos is None:
+            raise KeyError(idx)
+        return self.get_value_obj_at(pos)
+
+    def __repr__(self):
+        return "{0.__class__.__name__}(index={0.index}, " \
+               "value={0.value})".format(self)
+
+    def _find(self, idx):
+        index = self.index
+        pos = int(numpy.searchsorted(index, idx))
+        if pos < len(index) and index[pos] == idx:
+            return pos
+        return None
+
+    def get_value_obj_at(self, pos):
+        """Return the value object at a given position of the chunk.
+
+        :param pos: position (not index!) of the value in the chunk
+        :type pos: int
+        :return: the value object
+        :rtype: SardanaValue
+        """
+        return SardanaValue(value=self.value[pos],
+                            timestamp=float(self.timestamp[pos]))
+
+    def get_last_value_obj(self):
+        """Return the value object of the last value in the chunk.
+
+        :return: the value object
+        :rtype: SardanaValue
+        """
+        return self.get_value_obj_at(-1)
+
+    def keys(self):
+        return self.index.tolist()
+
+    def values(self):
+        for pos in range(len(self)):
+            yield self.get_value_obj_at(pos)
+
+    def items(self):
+        for pos, idx in enumerate(self.index.tolist()):
+            yield idx, self.get_value_obj_at(pos)
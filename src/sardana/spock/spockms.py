@@ -30,6 +30,7 @@ __all__ = ['GUIViewer', 'SpockBaseDoor', 'QSpockDoor', 'SpockDoor',
            'SpockMacroServer']
 
 import os
+import json
 import ctypes
 import PyTango
 
@@ -426,12 +427,28 @@ class SpockBaseDoor(BaseDoor):
             self._plotter.show_scan()
             return
         env = self.getEnvironment()
-        scan_history_info = env.get("ScanHistory")
+        scan_history_info = self._find_scans(scan_nb)
+        if not scan_history_info:
+            scan_history_info = env.get("ScanHistory")
         directory_map = env.get("DirectoryMap")
         self._plotter.show_scan(scan_nb=scan_nb,
                                 scan_history_info=scan_history_info,
                                 directory_map=directory_map)
 
+    def _find_scans(self, scan_nb=None):
+        """Returns the given scan (or the latest scan stored in a file)
+        from the MacroServer scan catalog or None if not available"""
+        if scan_nb is None:
+            query = dict(saved=True, limit=1)
+        else:
+            query = dict(serialno=scan_nb, limit=1)
+        try:
+            scans = self.macro_server.command_inout("FindScans",
+                                                    json.dumps(query))
+        except Exception:
+            return None
+        return json.loads(scans)
+
     def stateChanged(self, s, t, v):
         old_sw_state = self._old_sw_door_state
         BaseDoor.stateChanged(self, s, t, v)
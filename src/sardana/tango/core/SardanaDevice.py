@@ -38,10 +38,11 @@ import PyTango.constants
 from PyTango import Device_4Impl, DeviceClass, Util, DevState, \
     AttrQuality, TimeVal, ArgType, ApiUtil, DevFailed, WAttribute
 
-from taurus.core.util.threadpool import ThreadPool
 from taurus.core.util.log import Logger
 
+from sardana import sardanacustomsettings
 from sardana.tango.core.util import to_tango_state, NO_DB_MAP
+from sardana.tango.core.eventdispatcher import EventDispatcher
 
 
 __thread_pool_lock = threading.Lock()
@@ -49,10 +50,10 @@ __thread_pool = None
 
 
 def get_thread_pool():
-    """Returns the global pool of threads for Sardana
+    """Returns the global dispatcher of the tango events for Sardana
 
-    :return: the global pool of threads object
-    :rtype: taurus.core.util.ThreadPool"""
+    :return: the global event dispatcher object
+    :rtype: :class:`~sardana.tango.core.eventdispatcher.EventDispatcher`"""
 
     global __thread_pool
 
@@ -62,7 +63,12 @@ def get_thread_pool():
     global __thread_pool_lock
     with __thread_pool_lock:
         if __thread_pool is None:
-            __thread_pool = ThreadPool(name="EventTH", Psize=1, Qsize=1000)
+            workers = getattr(sardanacustomsettings, "TANGO_EVENT_WORKERS",
+                              4)
+            queue_size = getattr(sardanacustomsettings,
+                                 "TANGO_EVENT_QUEUE_SIZE", 1000)
+            __thread_pool = EventDispatcher(name="EventTH", workers=workers,
+                                            queue_size=queue_size)
         return __thread_pool
 
 
@@ -218,11 +224,12 @@ class SardanaDevice(Device_4Impl, Logger):
         pass
 
     def get_event_thread_pool(self):
-        """Return the :class:`~taurus.core.util.ThreadPool` used by sardana to
-        send tango events.
+        """Return the
+        :class:`~sardana.tango.core.eventdispatcher.EventDispatcher` used by
+        sardana to send tango events.
 
-        :return: the sardana :class:`~taurus.core.util.ThreadPool`
-        :rtype: :class:`~taurus.core.util.ThreadPool`"""
+        :return: the sardana event dispatcher
+        :rtype: :class:`~sardana.tango.core.eventdispatcher.EventDispatcher`"""
         return self._event_thread_pool
 
     def get_attribute_by_name(self, attr_name):
@@ -302,8 +309,10 @@ class SardanaDevice(Device_4Impl, Logger):
         :type priority: int
         :param synch:
             If synch is set to True, wait for fire event to finish.
-            If False, a job is sent to the sardana thread pool and the method
-            returns immediately [default: True]
+            If False, a job is sent to the sardana event dispatcher and the
+            method returns immediately. While the job is pending, later
+            jobs of the same attribute with priority <= 1 replace it
+            [default: True]
         """
         set_attr = self.set_attribute_push
         if synch:
@@ -312,9 +321,11 @@ class SardanaDevice(Device_4Impl, Logger):
                      synch=synch)
         else:
             th_pool = self.get_event_thread_pool()
-            th_pool.add(set_attr, None, attr, value=value, w_value=w_value,
-                        timestamp=timestamp, quality=quality, error=error,
-                        priority=priority, synch=synch)
+            kwargs = dict(value=value, w_value=w_value, timestamp=timestamp,
+                          quality=quality, error=error, priority=priority,
+                          synch=synch)
+            th_pool.add_event(self.get_name(), attr.get_name().lower(),
+                              priority, set_attr, (attr,), kwargs)
 
     def set_attribute_push(self, attr, value=None, w_value=None, timestamp=None,
                            quality=None, error=None, priority=1, synch=True):
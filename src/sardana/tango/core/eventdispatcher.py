@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""This module contains the dispatcher of the asynchronous tango events of the
+sardana devices"""
+
+__all__ = ["EventDispatcher"]
+
+__docformat__ = 'restructuredtext'
+
+import zlib
+import threading
+import collections
+
+from taurus.core.util.log import Logger
+
+
+class _EventWorker(object):
+    """Worker thread which executes the jobs of a shard of devices in the
+    order in which they were added"""
+
+    def __init__(self, dispatcher, name, queue_size):
+        self.dispatcher = dispatcher
+        self.queue_size = queue_size
+        self.coalesced = 0
+        self.overflowed = 0
+        self._queue = collections.deque()
+        # coalescable jobs which found the queue full, waiting for room
+        self._overflow = collections.deque()
+        # latest pending (not yet executed) coalescable job of each key
+        # (either in the queue or in the overflow)
+        self._pending = {}
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def qsize(self):
+        return len(self._queue) + len(self._overflow)
+
+    def _is_full(self):
+        return len(self._overflow) > 0 or len(self._queue) >= self.queue_size
+
+    def put(self, key, job, args, kwargs, coalesce=False):
+        """Put a job to be executed by the worker.
+
+        :return: whether the job was queued (False if it was coalesced with
+            a pending job)
+        :rtype: bool"""
+        with self._cond:
+            if coalesce:
+                entry = self._pending.get(key)
+                if entry is not None:
+                    entry[1:] = job, args, kwargs
+                    self.coalesced += 1
+                    return False
+            entry = [key, job, args, kwargs]
+            if coalesce and self._is_full():
+                # keep it (coalesced with the later jobs of the same key)
+                # until there is room in the queue so the latest value is
+                # never lost
+                self._overflow.append(entry)
+                self._pending[key] = entry
+                self.overflowed += 1
+                return True
+            # the overflow jobs must go first
+            while self._is_full():
+                self._cond.wait()
+            self._queue.append(entry)
+            if coalesce:
+                self._pending[key] = entry
+            else:
+                # jobs put later must not be coalesced with the ones put
+                # before this one
+                self._pending.pop(key, None)
+            self._cond.notify_all()
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                entry = self._queue.popleft()
+                key = entry[0]
+                if self._pending.get(key) is entry:
+                    del self._pending[key]
+                while self._overflow and len(self._queue) < self.queue_size:
+                    self._queue.append(self._overflow.popleft())
+                self._cond.notify_all()
+            _, job, args, kwargs = entry
+            try:
+                job(*args, **kwargs)
+            except Exception:
+                self.dispatcher.warning("Error executing %s", job,
+                                        exc_info=1)
+
+
+class EventDispatcher(Logger):
+    """Dispatcher of the asynchronous tango events of the sardana devices.
+
+    The devices are sharded across several worker threads so the events of
+    each device are pushed in order while the events of different devices
+    are pushed concurrently. While an event of a non-priority attribute is
+    pending, later events of the same device attribute replace it so only
+    the latest value is pushed. When the worker queue is full the
+    non-priority events are kept aside (still coalesced) until there is room,
+    so the latest value of each attribute is never lost, while the priority
+    ones wait for room.
+
+    The :meth:`add` method is compatible with
+    :meth:`taurus.core.util.ThreadPool.add`.
+
+    .. note::
+        The EventDispatcher class has been included in Sardana
+        on a provisional basis. Backwards incompatible changes
+        (up to and including removal of the class) may occur if
+        deemed necessary by the core developers.
+    """
+
+    def __init__(self, name="EventTH", workers=4, queue_size=1000):
+        Logger.__init__(self, name)
+        self._workers = []
+        for i in range(max(1, workers)):
+            worker_name = "%s-%d" % (name, i)
+            self._workers.append(_EventWorker(self, worker_name, queue_size))
+
+    def _get_worker(self, device_name):
+        index = zlib.crc32(device_name.encode()) % len(self._workers)
+        return self._workers[index]
+
+    def add(self, job, callback=None, *args, **kwargs):
+        """Add a job (not related to any device) to be executed in the first
+        worker. If callback is given it is called with the job result."""
+        if callback is not None:
+            job, args, kwargs = self._call, (job, callback, args, kwargs), {}
+        self._workers[0].put(None, job, args, kwargs)
+
+    @staticmethod
+    def _call(job, callback, args, kwargs):
+        callback(job(*args, **kwargs))
+
+    def add_event(self, device_name, attr_name, priority, job, args=(),
+                  kwargs=None):
+        """Add a job which pushes an event of the given device attribute.
+        Events with priority > 1 are never coalesced.
+
+        :return: whether the job was queued (False if it was coalesced with
+            a pending job)
+        :rtype: bool"""
+        worker = self._get_worker(device_name)
+        key = device_name, attr_name
+        if kwargs is None:
+            kwargs = {}
+        return worker.put(key, job, args, kwargs, coalesce=priority <= 1)
+
+    @property
+    def qsize(self):
+        """Number of pending jobs (queue depth)"""
+        return sum([worker.qsize for worker in self._workers])
+
+    @property
+    def coalesced(self):
+        """Number of events replaced by a later event of the same attribute"""
+        return sum([worker.coalesced for worker in self._workers])
+
+    @property
+    def overflowed(self):
+        """Number of events which found the queue full (kept aside until
+        there was room)"""
+        return sum([worker.overflowed for worker in self._workers])
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""Unit tests for eventdispatcher module"""
+
+import threading
+
+from taurus.external import unittest
+
+from sardana.tango.core.eventdispatcher import EventDispatcher
+
+
+class EventDispatcherTestCase(unittest.TestCase):
+    """Unit tests of the dispatcher of the tango events"""
+
+    def setUp(self):
+        self.dispatcher = EventDispatcher(name="TestEventTH", workers=2,
+                                          queue_size=3)
+        self.events = []
+        # blocks the workers until it is set
+        self.gate = threading.Event()
+
+    def tearDown(self):
+        self.gate.set()
+
+    def _push(self, device_name, attr_name, value):
+        self.gate.wait()
+        self.events.append((device_name, attr_name, value))
+
+    def _add_event(self, device_name, attr_name, value, priority=1):
+        return self.dispatcher.add_event(device_name, attr_name, priority,
+                                         self._push,
+                                         (device_name, attr_name, value))
+
+    def _block(self, device_name):
+        """Blocks the worker of the device with an event which will be
+        pushed first"""
+        self._add_event(device_name, "block", None, priority=2)
+
+    def _open_gate_later(self):
+        timer = threading.Timer(0.2, self.gate.set)
+        timer.daemon = True
+        timer.start()
+
+    def _wait(self):
+        self.gate.set()
+        # wait for all the workers to execute the jobs put so far
+        barrier = threading.Barrier(len(self.dispatcher._workers) + 1)
+        for worker in self.dispatcher._workers:
+            worker.put(None, barrier.wait, (5,), {})
+        barrier.wait(5)
+
+    def _values(self, device_name, attr_name):
+        return [value for dev, attr, value in self.events
+                if (dev, attr) == (device_name, attr_name)]
+
+    def test_coalesce(self):
+        """The pending events of the same attribute are coalesced"""
+        self._block("motor/1")
+        for value in range(10):
+            self._add_event("motor/1", "position", value)
+        self._wait()
+        self.assertEqual(self._values("motor/1", "position"), [9])
+        self.assertEqual(self.dispatcher.coalesced, 9)
+
+    def test_priority(self):
+        """The priority events are neither coalesced nor reordered"""
+        self._block("motor/1")
+        self._add_event("motor/1", "state", "Moving", priority=2)
+        self._add_event("motor/1", "state", "On", priority=2)
+        self._wait()
+        self.assertEqual(self._values("motor/1", "state"), ["Moving", "On"])
+
+    def test_device_order(self):
+        """The events of each device are pushed in order"""
+        devices = ["motor/%d" % i for i in range(5)]
+        self._block(devices[0])
+        # the priority events wait for room in the queue
+        self._open_gate_later()
+        for value in range(20):
+            for device_name in devices:
+                self._add_event(device_name, "attr%d" % (value % 4), value,
+                                priority=2)
+        self._wait()
+        for device_name in devices:
+            values = [value for dev, attr, value in self.events
+                      if dev == device_name and attr != "block"]
+            self.assertEqual(values, list(range(20)))
+
+    def test_full_queue(self):
+        """The latest value of each attribute is kept when the queue is
+        full"""
+        self._block("motor/1")
+        attr_names = ["attr%d" % i for i in range(10)]
+        for value in range(5):
+            for attr_name in attr_names:
+                self._add_event("motor/1", attr_name, value)
+        self._open_gate_later()
+        self._add_event("motor/1", "state", "On", priority=2)
+        self._wait()
+        for attr_name in attr_names:
+            self.assertEqual(self._values("motor/1", attr_name), [4])
+        self.assertGreater(self.dispatcher.overflowed, 0)
+        # the priority event put last is pushed last
+        self.assertEqual(self.events[-1], ("motor/1", "state", "On"))
@@ -27,6 +27,7 @@
 
 import os.path
 import sys
+import json
 
 from PyTango import Util, Except, DevVoid, DevLong, DevString, DevState, \
     DevEncoded, DevVarStringArray, READ, READ_WRITE, SCALAR, SPECTRUM, DebugIt
@@ -292,6 +293,20 @@ class MacroServer(SardanaDevice):
         ret = self.macro_server.get_or_create_macro_lib(*argin)
         return list(map(str, ret))
 
+    def FindScans(self, query):
+        """FindScans(string query) -> string
+
+           Returns the executed scans matching the query, the latest first.
+
+           Params:
+               - query: a JSON encoded dict with the criteria: serialno,
+                 start, end, title, channel, saved and limit
+           Returns:
+               - a JSON encoded list of the scans information
+        """
+        query = json.loads(query or "{}")
+        return json.dumps(self.macro_server.find_scans(**query))
+
     def SetMacroCode(self, argin):
         lib_name, code = argin[:2]
         auto_reload = True
@@ -433,6 +448,11 @@ class MacroServerClass(SardanaDeviceClass):
             [[DevVarStringArray, "<MacroLib name> [, <Macro name>]"],
              [DevVarStringArray, "result is a sequence of 3 strings:\n"
                 "<full path and file name>, <code>, <line number>"]],
+        'FindScans':
+            [[DevString, "query (a JSON encoded dict with the criteria: "
+                "serialno, start, end, title, channel, saved and limit)"],
+             [DevString, "the scans matching the query, the latest first "
+                "(a JSON encoded list)"]],
         'SetMacroCode':
             [[DevVarStringArray, "<MacroLib name>, <code> [, <Auto reload>=True]\n"
                 "- if macro lib is a simple module name:\n"
@@ -318,6 +318,7 @@ with this value is sent to clients using events.
     @DebugIt()
     def delete_device(self):
         PoolElementDevice.delete_device(self)
+        self.delete_position_limits()
         motor = self.motor
         if motor is not None:
             motor.remove_listener(self.on_motor_changed)
@@ -449,6 +450,7 @@ with this value is sent to clients using events.
         for attr_name in non_detect_evts:
             if attr_name in attrs:
                 self.set_change_event(attr_name, True, False)
+        self.init_position_limits()
 
     def read_Position(self, attr):
         motor = self.motor
@@ -40,13 +40,41 @@ from taurus.core.util.containers import CaselessDict
 from taurus.core.util.codecs import CodecFactory
 from taurus.core.util.log import Logger, DebugIt
 
+from sardana import sardanacustomsettings
 from sardana import State, SardanaServer, ElementType, Interface, \
     TYPE_ACQUIRABLE_ELEMENTS, TYPE_PSEUDO_ELEMENTS
+from sardana.sardanalock import enable_lock_profiling, get_lock_stats, \
+    reset_lock_stats, dump_lock_stats
 from sardana.pool.pool import Pool as POOL
 from sardana.pool.poolmetacontroller import TYPE_MAP_OBJ
 from sardana.tango.core.util import get_tango_version_number
+from sardana.tango.core.SardanaDevice import get_thread_pool
 import collections
 
+#: the element types listed by each of the list attributes
+#: (AcqChannelList lists the acquisition channels of all the acquirable
+#: elements)
+LIST_ATTRIBUTES = collections.OrderedDict((
+    ("ControllerLibList", (ElementType.ControllerLibrary,)),
+    ("ControllerClassList", (ElementType.ControllerClass,)),
+    ("ControllerList", (ElementType.Controller,)),
+    ("InstrumentList", (ElementType.Instrument,)),
+    ("ExpChannelList", (ElementType.CTExpChannel, ElementType.ZeroDExpChannel,
+                        ElementType.OneDExpChannel, ElementType.TwoDExpChannel,
+                        ElementType.PseudoCounter)),
+    ("MotorGroupList", (ElementType.MotorGroup,)),
+    ("MotorList", (ElementType.Motor, ElementType.PseudoMotor)),
+    ("TriggerGateList", (ElementType.TriggerGate,)),
+    ("MeasurementGroupList", (ElementType.MeasurementGroup,)),
+    ("IORegisterList", (ElementType.IORegister,)),
+    ("ComChannelList", (ElementType.ComChannel,)),
+))
+
+#: the element types which information embeds the names of other elements
+#: (e.g. the group members or the pseudo element physical elements)
+DEPENDENT_TYPES = (ElementType.MotorGroup, ElementType.MeasurementGroup,
+                   ElementType.PseudoMotor, ElementType.PseudoCounter)
+
 
 class Pool(PyTango.Device_4Impl, Logger):
 
@@ -113,14 +141,24 @@ class Pool(PyTango.Device_4Impl, Logger):
     @DebugIt()
     def init_device(self):
         self.set_state(PyTango.DevState.INIT)
+        # str info of the elements listed by the *List attributes updated
+        # incrementally on the pool events (built on the first use)
+        # dict<ElementType, OrderedDict<str, str>> where:
+        #  - key: element full name
+        #  - value: element str info
+        self._elements_str_info = {}
+        # OrderedDict<str, str> (the same for the acquisition channels)
+        self._acq_channels_str_info = None
         self.get_device_properties(self.get_device_class())
         p = self.pool
         p.set_python_path(self.PythonPath)
         p.set_path(self.PoolPath)
         p.set_motion_loop_sleep_time(self.MotionLoop_SleepTime / 1000)
+        p.set_motion_loop_max_sleep_time(self.MotionLoop_MaxSleepTime / 1000)
         p.set_motion_loop_states_per_position(
             self.MotionLoop_StatesPerPosition)
         p.set_acq_loop_sleep_time(self.AcqLoop_SleepTime / 1000)
+        p.set_acq_loop_max_sleep_time(self.AcqLoop_MaxSleepTime / 1000)
         p.set_acq_loop_states_per_value(self.AcqLoop_StatesPerValue)
         p.set_drift_correction(self.DriftCorrection)
         if self.RemoteLog is None:
@@ -139,6 +177,8 @@ class Pool(PyTango.Device_4Impl, Logger):
                 self.warning("Invalid property value for 'RemoteLog': %s",
                              self.RemoteLog)
                 p.clear_remote_logging()
+        if getattr(sardanacustomsettings, "LOCK_PROFILING", False):
+            enable_lock_profiling(True)
         self._recalculate_instruments()
         for attr in self.get_device_class().attr_list:
             if attr.lower().endswith("list"):
@@ -175,75 +215,174 @@ class Pool(PyTango.Device_4Impl, Logger):
 
     #@DebugIt()
     def read_ControllerLibList(self, attr):
-        info = self.pool.get_elements_str_info(ElementType.ControllerLibrary)
+        info = self._get_list_attribute_value("ControllerLibList")
         attr.set_value(info)
 
     #@DebugIt()
     def read_ControllerClassList(self, attr):
-        info = self.pool.get_elements_str_info(ElementType.ControllerClass)
+        info = self._get_list_attribute_value("ControllerClassList")
         attr.set_value(info)
 
     #@PyTango.DebugIt(show_args=True,show_ret=True)
     def read_ControllerList(self, attr):
-        info = self.pool.get_elements_str_info(ElementType.Controller)
+        info = self._get_list_attribute_value("ControllerList")
         attr.set_value(info)
 
     def read_InstrumentList(self, attr):
         #instruments = self._pool.get_elements_by_type(ElementType.Instrument)
         #instrument_names = map(PoolInstrument.get_full_name, instruments)
         # attr.set_value(instrument_names)
-        info = self.pool.get_elements_str_info(ElementType.Instrument)
+        info = self._get_list_attribute_value("InstrumentList")
         attr.set_value(info)
 
     #@DebugIt()
     def read_ExpChannelList(self, attr):
-        info = []
-        info.extend(self.pool.get_elements_str_info(ElementType.CTExpChannel))
-        info.extend(self.pool.get_elements_str_info(
-            ElementType.ZeroDExpChannel))
-        info.extend(self.pool.get_elements_str_info(
-            ElementType.OneDExpChannel))
-        info.extend(self.pool.get_elements_str_info(
-            ElementType.TwoDExpChannel))
-        info.extend(self.pool.get_elements_str_info(ElementType.PseudoCounter))
+        info = self._get_list_attribute_value("ExpChannelList")
         attr.set_value(info)
 
     #@DebugIt()
     def read_AcqChannelList(self, attr):
-        info = self.pool.get_acquisition_elements_str_info()
+        info = self._get_list_attribute_value("AcqChannelList")
         attr.set_value(info)
 
     #@DebugIt()
     def read_MotorGroupList(self, attr):
-        info = self.pool.get_elements_str_info(ElementType.MotorGroup)
+        info = self._get_list_attribute_value("MotorGroupList")
         attr.set_value(info)
 
     #@DebugIt()
     def read_MotorList(self, attr):
-        info = self.pool.get_elements_str_info(ElementType.Motor)
-        info.extend(self.pool.get_elements_str_info(ElementType.PseudoMotor))
+        info = self._get_list_attribute_value("MotorList")
         attr.set_value(info)
 
     #@DebugIt()
     def read_TriggerGateList(self, attr):
-        info = self.pool.get_elements_str_info(ElementType.TriggerGate)
+        info = self._get_list_attribute_value("TriggerGateList")
         attr.set_value(info)
 
     #@DebugIt()
     def read_MeasurementGroupList(self, attr):
-        info = self.pool.get_elements_str_info(ElementType.MeasurementGroup)
+        info = self._get_list_attribute_value("MeasurementGroupList")
         attr.set_value(info)
 
     #@DebugIt()
     def read_IORegisterList(self, attr):
-        info = self.pool.get_elements_str_info(ElementType.IORegister)
+        info = self._get_list_attribute_value("IORegisterList")
         attr.set_value(info)
 
     #@DebugIt()
     def read_ComChannelList(self, attr):
-        info = self.pool.get_elements_str_info(ElementType.Communication)
+        info = self._get_list_attribute_value("ComChannelList")
         attr.set_value(info)
 
+    def _get_elements_str_info_map(self, elem_type):
+        info = self._elements_str_info.get(elem_type)
+        if info is None:
+            pool = self.pool
+            if elem_type == ElementType.ControllerClass:
+                objs = pool.get_controller_classes()
+            elif elem_type == ElementType.ControllerLibrary:
+                objs = pool.get_controller_libs()
+            else:
+                objs = pool.get_elements_by_type(elem_type)
+            pool_name = pool.full_name
+            info = collections.OrderedDict()
+            for obj in objs:
+                info[obj.full_name] = obj.str(pool=pool_name)
+            self._elements_str_info[elem_type] = info
+        return info
+
+    def _get_acq_channels_str_info_map(self):
+        info = self._acq_channels_str_info
+        if info is None:
+            pool = self.pool
+            info = collections.OrderedDict()
+            for elem in list(pool.get_element_name_map().values()):
+                if elem.get_type() in TYPE_ACQUIRABLE_ELEMENTS:
+                    acq_info = pool.get_acquisition_element_info(elem)
+                    info[elem.full_name] = pool.str_object(acq_info)
+            self._acq_channels_str_info = info
+        return info
+
+    def _get_list_attribute_value(self, attr_name):
+        """Returns the value of the given list attribute (e.g. MotorList).
+        Once the server is running, the value is kept up to date
+        incrementally with the pool events (see
+        :meth:`_update_list_attributes`)"""
+        pool = self.pool
+        running = SardanaServer.server_state == State.Running
+        if attr_name == "AcqChannelList":
+            if not running:
+                return pool.get_acquisition_elements_str_info()
+            info = list(self._get_acq_channels_str_info_map().values())
+            extra_info = pool.get_extra_acquisition_elements_info()
+            info.extend(map(pool.str_object, extra_info))
+            return info
+        info = []
+        for elem_type in LIST_ATTRIBUTES[attr_name]:
+            if running:
+                elem_info = self._get_elements_str_info_map(elem_type)
+                info.extend(elem_info.values())
+            else:
+                info.extend(pool.get_elements_str_info(elem_type))
+        return info
+
+    def _update_list_attributes(self, evt_value):
+        """Updates the list attributes (e.g. MotorList) with the created,
+        changed and deleted elements and pushes (only once) each of the
+        affected attributes
+
+        :param evt_value: the created (key 'new'), changed (key 'change')
+            and deleted (key 'del') elements
+        :type evt_value: dict<str, seq<object>>"""
+        pool = self.pool
+        pool_name = pool.full_name
+        elem_types, acq_changed = set(), False
+        for key, elems in list(evt_value.items()):
+            for elem in elems:
+                elem_type = elem.get_type()
+                elem_types.add(elem_type)
+                full_name = elem.full_name
+                if elem_type in (ElementType.ControllerClass,
+                                 ElementType.ControllerLibrary):
+                    # reloaded as a whole (the changed objects may be the old
+                    # ones): just rebuild the list next time
+                    self._elements_str_info.pop(elem_type, None)
+                    # the controllers of the library are re-initialized
+                    # only after the event: rebuild their list next time
+                    # it is read
+                    self._elements_str_info.pop(ElementType.Controller, None)
+                    continue
+                if key == "change":
+                    # e.g. renamed element: the groups and the pseudo
+                    # elements may refer to it by its old name
+                    for dependent_type in DEPENDENT_TYPES:
+                        if dependent_type == elem_type:
+                            continue
+                        if self._elements_str_info.pop(dependent_type, None):
+                            elem_types.add(dependent_type)
+                info = self._get_elements_str_info_map(elem_type)
+                if key == "del":
+                    info.pop(full_name, None)
+                else:
+                    info[full_name] = elem.str(pool=pool_name)
+                if elem_type not in TYPE_ACQUIRABLE_ELEMENTS:
+                    continue
+                acq_changed = True
+                info = self._get_acq_channels_str_info_map()
+                if key == "del":
+                    info.pop(full_name, None)
+                else:
+                    acq_info = pool.get_acquisition_element_info(elem)
+                    info[full_name] = pool.str_object(acq_info)
+        for attr_name, attr_elem_types in list(LIST_ATTRIBUTES.items()):
+            if elem_types.intersection(attr_elem_types):
+                info = self._get_list_attribute_value(attr_name)
+                self.push_change_event(attr_name, info)
+        if acq_changed:
+            info = self._get_list_attribute_value("AcqChannelList")
+            self.push_change_event('AcqChannelList', info)
+
     #@DebugIt()
     def getElements(self, cache=True):
         value = self.ElementsCache
@@ -259,6 +398,15 @@ class Pool(PyTango.Device_4Impl, Logger):
         element_list = self.getElements()
         attr.set_value(*element_list)
 
+    def read_EventQueueDepth(self, attr):
+        attr.set_value(get_thread_pool().qsize)
+
+    def read_EventsCoalesced(self, attr):
+        attr.set_value(get_thread_pool().coalesced)
+
+    def read_EventsOverflowed(self, attr):
+        attr.set_value(get_thread_pool().overflowed)
+
     def is_Elements_allowed(self, req_type):
         return True
         return SardanaServer.server_state == State.Running
@@ -501,7 +649,11 @@ class Pool(PyTango.Device_4Impl, Logger):
         normal_name = '/'.join(element.full_name.split('/')[-3:])
         db.put_device_alias(normal_name, new_name)
 
-    def _create_single_element(self, kwargs):
+    def _check_create_element(self, kwargs):
+        """Checks if the element can be created
+
+        :return: the element type, the controller and the element full name
+        :rtype: tuple(ElementType, PoolController, str)"""
         elem_type_str = kwargs['type']
         ctrl_name = kwargs['ctrl_name']
         axis = kwargs['axis']
@@ -536,6 +688,14 @@ class Pool(PyTango.Device_4Impl, Logger):
                             (axis, elem_axis.get_name()))
 
         self._check_element(name, full_name)
+        return elem_type, ctrl, full_name
+
+    def _create_single_element(self, kwargs):
+        elem_type_str = kwargs['type']
+        axis = kwargs['axis']
+        name = kwargs['name']
+
+        elem_type, ctrl, full_name = self._check_create_element(kwargs)
 
         util = PyTango.Util.instance()
 
@@ -741,20 +901,6 @@ class Pool(PyTango.Device_4Impl, Logger):
 
         if evt_name in ("elementcreated", "elementdeleted", "elementchanged"):
             elem = evt_value
-            elem_type = elem.get_type()
-            td = TYPE_MAP_OBJ[elem_type]
-            attribute_list_name = td.family + "List"
-            info = self.pool.get_elements_str_info(elem_type)
-            self.push_change_event(attribute_list_name, info)
-
-            if elem_type in TYPE_ACQUIRABLE_ELEMENTS:
-                info = self.pool.get_acquisition_elements_str_info()
-                self.push_change_event('AcqChannelList', info)
-
-            # force the element list cache to be rebuild next time someone reads
-            # the element list
-            self.ElementsCache = None
-
             value = {}
             if evt_name == "elementcreated":
                 key = 'new'
@@ -762,11 +908,19 @@ class Pool(PyTango.Device_4Impl, Logger):
                 key = 'del'
             else:
                 key = 'change'
+            self._update_list_attributes({key: (elem,)})
+
+            # force the element list cache to be rebuild next time someone reads
+            # the element list
+            self.ElementsCache = None
+
             json_elem = elem.serialize(pool=self.pool.full_name)
             value[key] = json_elem,
             value = CodecFactory().getCodec('utf8_json').encode(('', value))
             self.push_change_event('Elements', *value)
         elif evt_name == "elementschanged":
+            self._update_list_attributes(evt_value)
+
             # force the element list cache to be rebuild next time someone reads
             # the element list
             self.ElementsCache = None
@@ -914,8 +1068,56 @@ class Pool(PyTango.Device_4Impl, Logger):
         ret['elements'] = channels
         return [ret]
 
+    #@DebugIt()
+    def CreateElements(self, argin):
+        kwargs_seq = self._format_create_json_arguments([argin])
+        # check all the elements before creating any of them
+        names, full_names, axes = set(), set(), set()
+        for kwargs in kwargs_seq:
+            kwargs['axis'] = axis = int(kwargs['axis'])
+            _, ctrl, full_name = self._check_create_element(kwargs)
+            kwargs['full_name'] = full_name
+            name = kwargs['name']
+            if name.lower() in names:
+                raise Exception("Element name '%s' is repeated" % name)
+            if full_name.lower() in full_names:
+                raise Exception("Element full name '%s' is repeated" %
+                                full_name)
+            if (ctrl.get_id(), axis) in axes:
+                raise Exception("Axis %d of controller %s is repeated" %
+                                (axis, ctrl.get_name()))
+            names.add(name.lower())
+            full_names.add(full_name.lower())
+            axes.add((ctrl.get_id(), axis))
+
+        # create the devices of each device class together
+        kwargs_per_class = collections.OrderedDict()
+        for kwargs in kwargs_seq:
+            kwargs_per_class.setdefault(kwargs['type'], []).append(kwargs)
+        created = []
+        with self.pool.batch_element_events():
+            try:
+                for class_kwargs_seq in list(kwargs_per_class.values()):
+                    for kwargs in class_kwargs_seq:
+                        self._create_single_element(kwargs)
+                        created.append(kwargs['full_name'])
+            except Exception:
+                # roll back the elements already created
+                for full_name in reversed(created):
+                    try:
+                        elem = self.pool.get_element(full_name=full_name)
+                        self._delete_single_element(elem)
+                    except Exception:
+                        self.warning("Failed to roll back creation of %s",
+                                     full_name, exc_info=1)
+                raise
+
     #@DebugIt()
     def DeleteElement(self, name):
+        elem = self._check_delete_element(name)
+        self._delete_single_element(elem)
+
+    def _check_delete_element(self, name):
         try:
             elem = self.pool.get_element(full_name=name)
         except:
@@ -926,13 +1128,16 @@ class Pool(PyTango.Device_4Impl, Logger):
             if len(elem.get_elements()) > 0:
                 raise Exception("Cannot delete controller with elements. "
                                 "Delete elements first")
+        return elem
 
+    def _delete_single_element(self, elem):
+        elem_type = elem.get_type()
         td = TYPE_MAP_OBJ[elem_type]
         type_name = td.name
 
         full_name = elem.get_full_name()
 
-        self.pool.delete_element(name)
+        self.pool.delete_element(full_name)
         if elem_type == ElementType.Instrument:
             # update database property
             il = self.InstrumentList
@@ -945,6 +1150,36 @@ class Pool(PyTango.Device_4Impl, Logger):
             util = PyTango.Util.instance()
             util.delete_device(type_name, full_name)
 
+    #@DebugIt()
+    def DeleteElements(self, argin):
+        names = json.loads(argin)
+        if isinstance(names, str):
+            names = [names]
+        elems = collections.OrderedDict()
+        for name in names:
+            try:
+                elem = self.pool.get_element(full_name=name)
+            except:
+                elem = self.pool.get_element(name=name)
+            elems[elem.get_id()] = elem
+        # check all the elements before deleting any of them: the controllers
+        # can be deleted only together with all their elements
+        for elem in list(elems.values()):
+            if elem.get_type() != ElementType.Controller:
+                continue
+            for elem_id in elem.get_element_ids():
+                if elem_id not in elems:
+                    raise Exception("Cannot delete controller %s with "
+                                    "elements. Delete elements first" %
+                                    elem.get_name())
+        # delete the controllers and the instruments after their elements
+        last_types = ElementType.Controller, ElementType.Instrument
+        elems = sorted(list(elems.values()),
+                       key=lambda elem: elem.get_type() in last_types)
+        with self.pool.batch_element_events():
+            for elem in elems:
+                self._delete_single_element(elem)
+
     #@DebugIt()
     def GetControllerClassInfo(self, names):
         if names.startswith('['):
@@ -983,6 +1218,17 @@ class Pool(PyTango.Device_4Impl, Logger):
             ctrl = self.pool.get_element_by_full_name(ctrl_name)
         return ctrl.send_to_controller(stream)
 
+    def SetLockProfiling(self, enabled):
+        if enabled:
+            reset_lock_stats()
+        enable_lock_profiling(enabled)
+
+    def GetLockStats(self):
+        return json.dumps(get_lock_stats())
+
+    def DumpLockStats(self, file_name):
+        return dump_lock_stats(file_name)
+
     def GetFile(self, name):
         p = self.pool
         manager = p.ctrl_manager
@@ -1181,6 +1427,52 @@ Tango command to delete element.
     {1}
 """.format(DELETE_ELEMENT_PAR_IN_DOC, DELETE_ELEMENT_PAR_OUT_DOC)
 
+CREATE_ELEMENTS_PAR_IN_DOC = """\
+A JSON encoded list of dicts, each one with the same keys as the
+    CreateElement JSON encoded dict.
+
+    Example::
+
+        data = [dict(type='Motor', ctrl_name='my_motor_ctrl_1', axis=axis,
+                     name='mot%02d' % axis) for axis in range(1, 101)]
+        pool.CreateElements(json.dumps(data))
+"""
+
+CREATE_ELEMENTS_PAR_OUT_DOC = "None"
+
+CREATE_ELEMENTS_DOC = """\
+Tango command to create a bulk of elements (motor, counter/timer, 0D, 1D, 2D,
+IORegister) in a single transaction: all of them are checked before creating
+any of them and, if the creation of one fails, the already created ones are
+deleted. The devices of each device class are created together and a single
+Elements event (and a single event per affected list attribute) is pushed.
+
+:param argin:
+    {0}
+:type argin: :obj:`str`
+:return:
+    {1}
+""".format(CREATE_ELEMENTS_PAR_IN_DOC, CREATE_ELEMENTS_PAR_OUT_DOC)
+
+DELETE_ELEMENTS_PAR_IN_DOC = """\
+A JSON encoded list of names of the elements to be deleted
+"""
+
+DELETE_ELEMENTS_PAR_OUT_DOC = "None"
+
+DELETE_ELEMENTS_DOC = """\
+Tango command to delete a bulk of elements. All of them are checked before
+deleting any of them. The controllers (and the instruments) are deleted after
+their elements. A single Elements event (and a single event per affected
+list attribute) is pushed.
+
+:param argin:
+    {0}
+:type argin: :obj:`str`
+:return:
+    {1}
+""".format(DELETE_ELEMENTS_PAR_IN_DOC, DELETE_ELEMENTS_PAR_OUT_DOC)
+
 GET_CONTROLLER_CLASS_INFO_PAR_IN_DOC = """\
 Must give either:
 
@@ -1301,18 +1593,76 @@ Sends a string to a controller.
     {1}
 """.format(SEND_TO_CONTROLLER_PAR_IN_DOC, SEND_TO_CONTROLLER_PAR_OUT_DOC)
 
+SET_LOCK_PROFILING_PAR_IN_DOC = """\
+True to reset the statistics and start profiling the element and controller
+locks, False to stop profiling
+"""
+
+SET_LOCK_PROFILING_PAR_OUT_DOC = "None"
+
+SET_LOCK_PROFILING_DOC = """\
+Enables or disables the profiling of the element and controller locks
+(wait time, hold time and owner threads). It is disabled by default
+(see LOCK_PROFILING in sardanacustomsettings).
+
+:param argin:
+    {0}
+:return:
+    {1}
+""".format(SET_LOCK_PROFILING_PAR_IN_DOC, SET_LOCK_PROFILING_PAR_OUT_DOC)
+
+GET_LOCK_STATS_PAR_IN_DOC = "None"
+
+GET_LOCK_STATS_PAR_OUT_DOC = """\
+the statistics of each profiled lock, the most contended first
+(a JSON encoded list of dict). The histograms have logarithmic buckets:
+bucket i counts the times between 2^(i-1) and 2^i microseconds
+"""
+
+GET_LOCK_STATS_DOC = """\
+Returns the statistics of the profiled element and controller locks
+
+:param argin:
+    {0}
+:return:
+    {1}
+""".format(GET_LOCK_STATS_PAR_IN_DOC, GET_LOCK_STATS_PAR_OUT_DOC)
+
+DUMP_LOCK_STATS_PAR_IN_DOC = """\
+the file name (empty means a file in the temporary directory)
+"""
+
+DUMP_LOCK_STATS_PAR_OUT_DOC = """\
+the file name
+"""
+
+DUMP_LOCK_STATS_DOC = """\
+Dumps the statistics of the profiled element and controller locks to a
+JSON file
+
+:param argin:
+    {0}
+:return:
+    {1}
+""".format(DUMP_LOCK_STATS_PAR_IN_DOC, DUMP_LOCK_STATS_PAR_OUT_DOC)
+
 Pool.CreateController.__doc__ = CREATE_CONTROLLER_DOC
 Pool.CreateElement.__doc__ = CREATE_ELEMENT_DOC
 Pool.CreateInstrument.__doc__ = CREATE_INSTRUMENT_DOC
 Pool.CreateMotorGroup.__doc__ = CREATE_MOTOR_GROUP_DOC
 Pool.CreateMeasurementGroup.__doc__ = CREATE_MEASUREMENT_GROUP_DOC
 Pool.DeleteElement.__doc__ = DELETE_ELEMENT_DOC
+Pool.CreateElements.__doc__ = CREATE_ELEMENTS_DOC
+Pool.DeleteElements.__doc__ = DELETE_ELEMENTS_DOC
 Pool.GetControllerClassInfo.__doc__ = GET_CONTROLLER_CLASS_INFO_DOC
 Pool.ReloadControllerLib.__doc__ = RELOAD_CONTROLLER_LIB_INFO_DOC
 Pool.ReloadControllerClass.__doc__ = RELOAD_CONTROLLER_CLASS_INFO_DOC
 Pool.RenameElement.__doc__ = RENAME_ELEMENT_CLASS_INFO_DOC
 Pool.Stop.__doc__ = STOP_DOC
 Pool.Abort.__doc__ = ABORT_DOC
+Pool.SetLockProfiling.__doc__ = SET_LOCK_PROFILING_DOC
+Pool.GetLockStats.__doc__ = GET_LOCK_STATS_DOC
+Pool.DumpLockStats.__doc__ = DUMP_LOCK_STATS_DOC
 
 
 class PoolClass(PyTango.DeviceClass):
@@ -1340,6 +1690,12 @@ class PoolClass(PyTango.DeviceClass):
              "Sleep time in the motion loop in mS [default: %dms]" %
              int(POOL.Default_MotionLoop_SleepTime * 1000),
              int(POOL.Default_MotionLoop_SleepTime * 1000)],
+        'MotionLoop_MaxSleepTime':
+            [PyTango.DevLong,
+             "Maximum sleep time in the motion loop in mS "
+             "[default: %dms]" %
+             int(POOL.Default_MotionLoop_MaxSleepTime * 1000),
+             int(POOL.Default_MotionLoop_MaxSleepTime * 1000)],
         'MotionLoop_StatesPerPosition':
             [PyTango.DevLong,
              "Number of State reads done before doing a position read in the "
@@ -1350,6 +1706,11 @@ class PoolClass(PyTango.DeviceClass):
              "Sleep time in the acquisition loop in mS [default: %dms]" %
              int(POOL.Default_AcqLoop_SleepTime * 1000),
              int(POOL.Default_AcqLoop_SleepTime * 1000)],
+        'AcqLoop_MaxSleepTime':
+            [PyTango.DevLong,
+             "Maximum sleep time in the acquisition loop in mS "
+             "[default: %dms]" % int(POOL.Default_AcqLoop_MaxSleepTime * 1000),
+             int(POOL.Default_AcqLoop_MaxSleepTime * 1000)],
         'AcqLoop_StatesPerValue':
             [PyTango.DevLong,
              "Number of State reads done before doing a value read in the "
@@ -1417,6 +1778,12 @@ class PoolClass(PyTango.DeviceClass):
         'DeleteElement':
             [[PyTango.DevString, DELETE_ELEMENT_PAR_IN_DOC],
              [PyTango.DevVoid, DELETE_ELEMENT_PAR_OUT_DOC]],
+        'CreateElements':
+            [[PyTango.DevString, CREATE_ELEMENTS_PAR_IN_DOC],
+             [PyTango.DevVoid, CREATE_ELEMENTS_PAR_OUT_DOC]],
+        'DeleteElements':
+            [[PyTango.DevString, DELETE_ELEMENTS_PAR_IN_DOC],
+             [PyTango.DevVoid, DELETE_ELEMENTS_PAR_OUT_DOC]],
         'GetControllerClassInfo':
             [[PyTango.DevString, GET_CONTROLLER_CLASS_INFO_PAR_IN_DOC],
              [PyTango.DevString, GET_CONTROLLER_CLASS_INFO_PAR_OUT_DOC]],
@@ -1453,6 +1820,15 @@ class PoolClass(PyTango.DeviceClass):
         'SendToController':
             [[PyTango.DevVarStringArray, SEND_TO_CONTROLLER_PAR_IN_DOC],
              [PyTango.DevString, SEND_TO_CONTROLLER_PAR_OUT_DOC]],
+        'SetLockProfiling':
+            [[PyTango.DevBoolean, SET_LOCK_PROFILING_PAR_IN_DOC],
+             [PyTango.DevVoid, SET_LOCK_PROFILING_PAR_OUT_DOC]],
+        'GetLockStats':
+            [[PyTango.DevVoid, GET_LOCK_STATS_PAR_IN_DOC],
+             [PyTango.DevString, GET_LOCK_STATS_PAR_OUT_DOC]],
+        'DumpLockStats':
+            [[PyTango.DevString, DUMP_LOCK_STATS_PAR_IN_DOC],
+             [PyTango.DevString, DUMP_LOCK_STATS_PAR_OUT_DOC]],
         'GetFile':
             [[PyTango.DevString, "name (may be module name, file name or full (with absolute path) file name"],
              [PyTango.DevVarStringArray, "[complete(with absolute path) file name, file contents]"]],
@@ -1567,6 +1943,34 @@ class PoolClass(PyTango.DeviceClass):
                 'label': "Elements",
                 'description': "the list of all elements (a JSON encoded dict)",
             }],
+        'EventQueueDepth':
+            [[PyTango.DevLong,
+              PyTango.SCALAR,
+              PyTango.READ],
+             {
+                'label': "Event queue depth",
+                'description': "number of asynchronous events pending to be "
+                               "pushed",
+            }],
+        'EventsCoalesced':
+            [[PyTango.DevLong64,
+              PyTango.SCALAR,
+              PyTango.READ],
+             {
+                'label': "Events coalesced",
+                'description': "number of asynchronous events replaced by a "
+                               "later event of the same attribute",
+            }],
+        'EventsOverflowed':
+            [[PyTango.DevLong64,
+              PyTango.SCALAR,
+              PyTango.READ],
+             {
+                'label': "Events overflowed",
+                'description': "number of asynchronous events which found "
+                               "the event queue full (kept aside until "
+                               "there was room)",
+            }],
     }
 
     def __init__(self, name):
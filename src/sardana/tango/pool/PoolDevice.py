@@ -37,13 +37,15 @@ import time
 from PyTango import Util, DevVoid, DevLong64, DevBoolean, DevString,\
     DevDouble, DevEncoded, DevVarStringArray, DispLevel, DevState, SCALAR, \
     SPECTRUM, IMAGE, READ_WRITE, READ, AttrData, CmdArgType, DevFailed,\
-    seqStr_2_obj, Except, ErrSeverity
+    seqStr_2_obj, Except, ErrSeverity, DeviceProxy, EventType
 
 from taurus.core.util.containers import CaselessDict
 from taurus.core.util.codecs import CodecFactory
 
 from sardana import InvalidId, InvalidAxis, ElementType
 from sardana import sardanacustomsettings
+from sardana.sardanavalue import SardanaValueChunk
+from sardana.util.codec import is_array_codec
 from sardana.pool.poolmetacontroller import DataInfo
 from sardana.tango.core.SardanaDevice import SardanaDevice, SardanaDeviceClass
 from sardana.tango.core.util import GenericScalarAttr, GenericSpectrumAttr, \
@@ -593,6 +595,62 @@ class PoolElementDevice(PoolDevice):
         except ValueError:
             pass
 
+    def init_position_limits(self):
+        """Initialize the position limits cache of the (moveable) element
+        from the ``Position`` attribute configuration and subscribe to the
+        attribute configuration change events to keep it updated. The
+        motion calculation checks the limits against this cache (without
+        network access)."""
+        multi_attr = self.get_device_attr()
+        try:
+            attr = multi_attr.get_attr_by_name("position")
+        except DevFailed:
+            return
+        self._update_position_limits(attr.get_properties())
+        if getattr(self, "_position_config_evt", None) is not None:
+            return
+        try:
+            proxy = DeviceProxy(self.get_name())
+            # stateless - the device may not be exported yet
+            evt_id = proxy.subscribe_event("position",
+                                           EventType.ATTR_CONF_EVENT,
+                                           self._on_position_config, [],
+                                           True)
+            self._position_config_evt = proxy, evt_id
+        except DevFailed:
+            self.warning("Failed to subscribe to position configuration "
+                         "events. Position limits changes will be "
+                         "applied on Init")
+            self.debug("Details:", exc_info=1)
+
+    def delete_position_limits(self):
+        """Unsubscribe from the ``Position`` attribute configuration change
+        events (see :meth:`init_position_limits`)"""
+        position_config_evt = getattr(self, "_position_config_evt", None)
+        if position_config_evt is None:
+            return
+        self._position_config_evt = None
+        proxy, evt_id = position_config_evt
+        try:
+            proxy.unsubscribe_event(evt_id)
+        except DevFailed:
+            self.debug("Failed to unsubscribe from position configuration "
+                       "events", exc_info=1)
+
+    def _on_position_config(self, event):
+        if event.err or event.attr_conf is None:
+            return
+        self._update_position_limits(event.attr_conf)
+
+    def _update_position_limits(self, config):
+        limits = []
+        for value in (config.min_value, config.max_value):
+            try:
+                limits.append(float(value))
+            except ValueError:
+                limits.append(None)
+        self.element.set_position_limits(limits)
+
     def read_Instrument(self, attr):
         """Read the value of the ``Instrument`` tango attribute.
         Returns the instrument full name or empty string if this element doesn't
@@ -843,6 +901,7 @@ class PoolExpChannelDevice(PoolElementDevice):
         PoolElementDevice.__init__(self, dclass, name)
         codec_name = getattr(sardanacustomsettings, "VALUE_BUFFER_CODEC")
         self._value_buffer_codec = CodecFactory().getCodec(codec_name)
+        self._value_buffer_array_codec = is_array_codec(codec_name)
         codec_name = getattr(sardanacustomsettings, "VALUE_REF_BUFFER_CODEC")
         self._value_ref_buffer_codec = CodecFactory().getCodec(codec_name)
 
@@ -850,15 +909,22 @@ class PoolExpChannelDevice(PoolElementDevice):
         """Prepare value chunk to be passed via communication channel.
 
         :param value_chunk: value chunk
-        :type value_chunk: seq<SardanaValue>
+        :type value_chunk: seq<SardanaValue> or
+            :class:`~sardana.sardanavalue.SardanaValueChunk`
 
         :return: json string representing value chunk
         :rtype: str"""
-        index = []
-        value = []
-        for idx, sdn_value in value_chunk.items():
-            index.append(idx)
-            value.append(sdn_value.value)
+        if isinstance(value_chunk, SardanaValueChunk):
+            index, value = value_chunk.index, value_chunk.value
+            if not self._value_buffer_array_codec:
+                # bulk conversion of the whole arrays
+                index, value = index.tolist(), value.tolist()
+        else:
+            index = []
+            value = []
+            for idx, sdn_value in value_chunk.items():
+                index.append(idx)
+                value.append(sdn_value.value)
         data = dict(index=index, value=value)
         encoded_data = self._value_buffer_codec.encode(('', data))
         return encoded_data
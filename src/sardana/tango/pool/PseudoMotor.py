@@ -70,6 +70,7 @@ class PseudoMotor(PoolElementDevice):
     @DebugIt()
     def delete_device(self):
         PoolElementDevice.delete_device(self)
+        self.delete_position_limits()
         pseudo_motor = self.pseudo_motor
         if pseudo_motor is not None:
             pseudo_motor.remove_listener(self.on_pseudo_motor_changed)
@@ -181,6 +182,7 @@ class PseudoMotor(PoolElementDevice):
         for attr_name in non_detect_evts:
             if attr_name in attrs:
                 self.set_change_event(attr_name, True, False)
+        self.init_position_limits()
         return
 
     def read_Position(self, attr):
@@ -241,6 +243,16 @@ class PseudoMotor(PoolElementDevice):
             throw_sardana_exception(result)
         return result.value
 
+    def CalcPhysicalArray(self, pseudo_positions):
+        """Returns the physical motor positions for each of the given pseudo
+        motor positions assuming the current pseudo motor write positions for
+        all the other sibling pseudo motors. The result is flattened (one
+        group of physical positions per given pseudo position)"""
+        result = self.pseudo_motor.calc_physical_array(pseudo_positions)
+        if result.error:
+            throw_sardana_exception(result)
+        return result.value.ravel()
+
     def CalcAllPseudo(self, physical_positions):
         """Returns the pseudo motor position(s) for the given physical positions"""
         result = self.pseudo_motor.calc_all_pseudo(physical_positions)
@@ -283,6 +295,7 @@ class PseudoMotorClass(PoolElementDeviceClass):
         'CalcPhysical': [[DevDouble, "pseudo position"], [DevVarDoubleArray, "physical positions"]],
         'CalcAllPseudo': [[DevVarDoubleArray, "physical positions"], [DevVarDoubleArray, "pseudo positions"]],
         'CalcAllPhysical': [[DevVarDoubleArray, "pseudo positions"], [DevVarDoubleArray, "physical positions"]],
+        'CalcPhysicalArray': [[DevVarDoubleArray, "pseudo positions"], [DevVarDoubleArray, "flattened physical positions"]],
         'MoveRelative': [[DevDouble, "amount to move"], [DevVoid, ""]],
     }
     cmd_list.update(PoolElementDeviceClass.cmd_list)
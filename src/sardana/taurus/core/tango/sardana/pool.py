@@ -65,6 +65,8 @@ from taurus.core.util.event import EventGenerator, AttributeEventWait, \
 from taurus.core.tango import TangoDevice, FROM_TANGO_TO_STR_TYPE
 
 from sardana import sardanacustomsettings
+# register sardana codecs e.g. binary value buffer codec
+import sardana.util.codec  # noqa
 from .sardana import BaseSardanaElementContainer, BaseSardanaElement
 from .motion import Moveable, MoveableSource
 
@@ -1885,7 +1887,8 @@ class MeasurementGroup(PoolElement):
             return
         _, value_buffer = self._value_buffer_codec.decode(value_buffer)
         values = value_buffer["value"]
-        if isinstance(values[0], list):
+        # binary codecs already provide numpy arrays
+        if len(values) > 0 and isinstance(values[0], list):
             np_values = list(map(numpy.array, values))
             value_buffer["value"] = np_values
         self._value_buffer_cb(channel, value_buffer)
@@ -2115,16 +2118,37 @@ class MeasurementGroup(PoolElement):
           channel values (or value references - experimental)
         """
         start_time = time.time()
-        cfg = self.getConfiguration()
-        cfg.prepare()
         integration_time = args[0]
         if integration_time is None or integration_time == 0:
+            self.getConfiguration().prepare()
             return self.getStateEG().readValue(), self.getValues()
+        self.prepare_count(integration_time)
+        return self.count_raw(start_time)
+
+    def prepare_count(self, integration_time, nb_starts=1):
+        """Configure and prepare measurement group for a number of counts.
+
+        Once prepared, each count requires just :meth:`count_raw` e.g. in a
+        step scan the measurement group can be prepared once for all the
+        scan points.
+
+        .. note::
+            The prepare_count method has been included in Sardana
+            on a provisional basis. Backwards incompatible changes
+            (up to and including removal of the method) may occur if
+            deemed necessary by the core developers.
+
+        :param integration_time: integration time
+        :type integration_time: :obj:`float`
+        :param nb_starts: number of starts (counts) [default: 1]
+        :type nb_starts: :obj:`int`
+        """
+        cfg = self.getConfiguration()
+        cfg.prepare()
         self.putIntegrationTime(integration_time)
         self.setMoveable(None)
-        self.setNbStarts(1)
+        self.setNbStarts(nb_starts)
         self.prepare()
-        return self.count_raw(start_time)
 
     def count_continuous(self, synchronization, value_buffer_cb=None):
         """Execute measurement process according to the given synchronization
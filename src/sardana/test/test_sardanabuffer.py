@@ -23,9 +23,13 @@
 ##
 ##############################################################################
 
+import numpy
+
 from taurus.external.unittest import TestCase
 
-from sardana.sardanabuffer import SardanaBuffer
+from sardana.sardanabuffer import SardanaBuffer, SardanaArrayBuffer, \
+    LateValueException, EarlyValueException
+from sardana.sardanavalue import SardanaValue, SardanaValueChunk
 
 
 class TestPersistentBuffer(TestCase):
@@ -44,6 +48,21 @@ class TestPersistentBuffer(TestCase):
         self.assertEqual(len(self.buffer), 6)
         self.assertEqual(len(self.buffer.last_chunk), 3)
 
+    def test_extend_timestamp(self):
+        """Test that the values of a chunk share the timestamp."""
+        self.buffer.extend([4, 5, 6])
+        timestamps = set([value.timestamp
+                          for value in self.buffer.last_chunk.values()])
+        self.assertEqual(len(timestamps), 1)
+
+    def test_extend_chunk(self):
+        """Test extend method with a value chunk."""
+        chunk = SardanaValueChunk(numpy.array([4, 5]), timestamp=1.)
+        self.buffer.extend(chunk)
+        self.assertEqual(self.buffer.get_value(4), 5)
+        self.assertEqual(self.buffer.get_value_obj(4).timestamp, 1.)
+        self.assertEqual(len(self.buffer.last_chunk), 2)
+
     def test_append(self):
         """Test if append correctly fills the last_chunk as well as permanently
         adds the value to the buffer.
@@ -51,3 +70,83 @@ class TestPersistentBuffer(TestCase):
         self.buffer.append(1)
         self.assertEqual(len(self.buffer), 4)
         self.assertEqual(len(self.buffer.last_chunk), 1)
+
+
+class TestPersistentArrayBuffer(TestCase):
+    """Unit tests for SardanaArrayBuffer class"""
+
+    def setUp(self):
+        self.buffer = SardanaArrayBuffer(persistent=True, capacity=4)
+        self.buffer.extend([1, 2, 3])
+
+    def test_extend(self):
+        """Test extend method with a list and a numpy array."""
+        self.buffer.extend([4, 5, 6])
+        self.buffer.extend(numpy.array([7, 8]))
+        self.assertEqual(self.buffer.get_value(0), 1)
+        self.assertEqual(self.buffer.get_value(7), 8)
+        self.assertEqual(len(self.buffer), 8)
+        self.assertEqual(len(self.buffer.last_chunk), 2)
+        self.assertEqual(self.buffer.next_idx, 8)
+
+    def test_append(self):
+        """Test if append correctly fills the last_chunk as well as permanently
+        adds the value to the buffer.
+        """
+        self.buffer.append(SardanaValue(4, timestamp=1.))
+        self.assertEqual(len(self.buffer), 4)
+        self.assertEqual(len(self.buffer.last_chunk), 1)
+        self.assertEqual(self.buffer.get_value_obj(3).timestamp, 1.)
+
+    def test_chunk(self):
+        """Test if the last chunk behaves like the dict chunk and stays
+        valid after the storage is reallocated."""
+        chunk = self.buffer.last_chunk
+        self.assertIsInstance(chunk, SardanaValueChunk)
+        self.assertEqual(chunk.keys(), [0, 1, 2])
+        self.assertEqual([v.value for _, v in chunk.items()], [1, 2, 3])
+        self.buffer.extend(range(3, 100))
+        self.assertEqual(chunk.value.tolist(), [1, 2, 3])
+
+    def test_remove(self):
+        """Test removal of values and the Late/Early exceptions."""
+        self.assertEqual(self.buffer.remove(0).value, 1)
+        self.assertEqual(len(self.buffer), 2)
+        self.assertRaises(LateValueException, self.buffer.get_value, 0)
+        self.assertRaises(EarlyValueException, self.buffer.get_value, 3)
+        self.assertRaises(KeyError, self.buffer.remove, 0)
+        self.buffer.remove(2)
+        self.assertEqual(self.buffer.get_value(1), 2)
+
+    def test_extend_drained(self):
+        """Test adding values after all the values were removed."""
+        chunk = self.buffer.last_chunk
+        for idx in range(3):
+            self.buffer.remove(idx)
+        self.assertEqual(len(self.buffer), 0)
+        self.assertRaises(ValueError, self.buffer.extend, [9], 2)
+        self.buffer.extend([4, 5])
+        self.assertEqual(len(self.buffer), 2)
+        self.assertEqual(self.buffer.get_values([3, 4]).tolist(), [4, 5])
+        self.assertRaises(LateValueException, self.buffer.get_value, 2)
+        self.assertEqual(chunk.value.tolist(), [1, 2, 3])
+
+    def test_array_values(self):
+        """Test buffer of 1D values."""
+        buf = SardanaArrayBuffer(persistent=True)
+        buf.extend(numpy.ones((5, 10)))
+        self.assertEqual(buf.get_value(4).shape, (10,))
+        self.assertEqual(buf.last_chunk.value.shape, (5, 10))
+        self.assertRaises(ValueError, buf.extend, numpy.ones((2, 3)))
+
+
+class TestArrayBuffer(TestCase):
+    """Unit tests for non persistent SardanaArrayBuffer class"""
+
+    def test_extend(self):
+        """Test that values are only kept in the last chunk."""
+        buf = SardanaArrayBuffer()
+        buf.extend([1, 2, 3], 5)
+        self.assertEqual(len(buf), 0)
+        self.assertEqual(buf.last_chunk.keys(), [5, 6, 7])
+        self.assertRaises(LateValueException, buf.get_value, 5)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""Unit tests for sardanalock module"""
+
+import os
+import json
+import tempfile
+import threading
+
+from taurus.external import unittest
+from sardana.sardanalock import SardanaLock, LockStats, \
+    enable_lock_profiling, get_lock_stats, reset_lock_stats, dump_lock_stats
+
+
+class ProfiledLockTestCase(unittest.TestCase):
+    """Test the profiling of the locks"""
+
+    def setUp(self):
+        self.lock = SardanaLock(name="ProfiledLockTest",
+                                lock=threading.RLock(), profile=True)
+        reset_lock_stats()
+
+    def tearDown(self):
+        enable_lock_profiling(False)
+
+    def _get_stats(self):
+        for stats in get_lock_stats():
+            if stats["name"] == "ProfiledLockTest":
+                return stats
+
+    def test_disabled(self):
+        """Test that nothing is recorded when the profiling is disabled"""
+        self.lock.acquire()
+        self.lock.release()
+        self.assertIsNone(self._get_stats())
+
+    def test_reentrant(self):
+        """Test that a reentrant acquisition is recorded only once"""
+        enable_lock_profiling(True)
+        with self.lock:
+            with self.lock:
+                pass
+        stats = self._get_stats()
+        self.assertEqual(stats["acquired"], 1)
+        self.assertEqual(sum(stats["hold_hist"]), 1)
+        self.assertEqual(stats["owners"],
+                         {threading.current_thread().name: 1})
+
+    def test_failed(self):
+        """Test that the failed non-blocking acquisitions are recorded"""
+        enable_lock_profiling(True)
+        acquired, release = threading.Event(), threading.Event()
+
+        def hold():
+            with self.lock:
+                acquired.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        acquired.wait()
+        self.assertFalse(self.lock.acquire(False))
+        release.set()
+        thread.join()
+        stats = self._get_stats()
+        self.assertEqual(stats["acquired"], 1)
+        self.assertEqual(stats["failed"], 1)
+
+    def test_disable_while_held(self):
+        """Test that a hold is recorded when the profiling is disabled
+        before the lock is released"""
+        enable_lock_profiling(True)
+        self.lock.acquire()
+        enable_lock_profiling(False)
+        self.lock.acquire()
+        self.lock.release()
+        self.lock.release()
+        stats = self._get_stats()
+        self.assertEqual(stats["acquired"], 1)
+        self.assertEqual(sum(stats["hold_hist"]), 1)
+
+    def test_dump(self):
+        """Test that the statistics are dumped to a JSON file"""
+        enable_lock_profiling(True)
+        with self.lock:
+            pass
+        file_name = os.path.join(tempfile.mkdtemp(), "locks.json")
+        self.assertEqual(dump_lock_stats(file_name), file_name)
+        with open(file_name) as f:
+            data = json.load(f)
+        os.remove(file_name)
+        names = [stats["name"] for stats in data["locks"]]
+        self.assertIn("ProfiledLockTest", names)
+
+
+class LockStatsTestCase(unittest.TestCase):
+    """Test the logarithmic histograms of the lock statistics"""
+
+    def test_buckets(self):
+        stats = LockStats("LockStatsTest")
+        stats.add_wait(0.5e-6, "t1")
+        stats.add_wait(3e-6, "t1")
+        stats.add_wait(1e6, "t2")
+        self.assertEqual(stats.wait_hist[0], 1)
+        self.assertEqual(stats.wait_hist[2], 1)
+        self.assertEqual(stats.wait_hist[-1], 1)
+        self.assertEqual(stats.owners, {"t1": 2, "t2": 1})
+        self.assertEqual(stats.wait_max, 1e6)
@@ -89,3 +89,13 @@ class SardanaValueTestCase(unittest.TestCase):
 
         self.assertEqual(sar_val.error, False,
                          'The error attribute should be False')
+
+    def testSardanaValueSlots(self):
+        """Verify that SardanaValue does not have instance dictionary and
+            that the given timestamp is kept (no 'now' timestamp is taken).
+            """
+        sar_val = SardanaValue(value=5, timestamp=1.)
+        self.assertFalse(hasattr(sar_val, '__dict__'),
+                         'SardanaValue should not have __dict__')
+        self.assertEqual(sar_val.timestamp, 1.)
+        self.assertRaises(AttributeError, setattr, sar_val, 'foo', 1)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.sardana-controls.org/
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""This module provides Taurus codecs used for transferring value buffers
+as binary NumPy arrays.
+
+The ``numpy`` codec encodes a dictionary with ``index`` and ``value`` keys
+(as used by the ValueBuffer attribute of the experimental channels) into
+a small JSON header followed by the raw little-endian bytes of the values
+(and of the indexes, but only if they are not consecutive). The decoded
+arrays are created directly on top of the received bytes so no copy is
+done.
+
+The ``lz4`` and ``zstd`` codecs compress any bytes and can be combined with
+the ``numpy`` codec in a Taurus codec pipeline e.g. ``lz4_numpy``. They
+require the optional `lz4 <https://pypi.org/project/lz4/>`_ and
+`zstandard <https://pypi.org/project/zstandard/>`_ packages respectively.
+
+.. note::
+    The codec module has been included in Sardana
+    on a provisional basis. Backwards incompatible changes
+    (up to and including removal of the module) may occur if
+    deemed necessary by the core developers.
+"""
+
+__all__ = ["NumpyCodec", "LZ4Codec", "ZstdCodec", "register_codecs",
+           "is_array_codec"]
+
+import json
+import pickle
+import struct
+
+import numpy
+
+from taurus.core.util.codecs import Codec, CodecFactory
+
+_HEADER_LEN = struct.Struct("<I")
+
+
+def _to_little_endian(array):
+    dtype = array.dtype
+    if dtype.byteorder == ">" or \
+            (dtype.byteorder == "=" and not numpy.little_endian):
+        array = array.astype(dtype.newbyteorder("<"))
+    return numpy.ascontiguousarray(array)
+
+
+class NumpyCodec(Codec):
+    """A codec able to encode/decode value buffers to/from raw NumPy
+    buffers.
+
+    Example::
+
+        >>> from taurus.core.util.codecs import CodecFactory
+        >>> import sardana.util.codec
+
+        >>> codec = CodecFactory().getCodec('numpy')
+        >>> data = dict(index=[0, 1, 2], value=[1., 2., 3.])
+        >>> format, encoded_data = codec.encode(("", data))
+        >>> format, decoded_data = codec.decode((format, encoded_data))
+        >>> decoded_data["value"]
+        array([1., 2., 3.])
+    """
+
+    def encode(self, data, *args, **kwargs):
+        """encodes the given value buffer to bytes.
+
+        :param data: (sequence[str, obj]) a sequence of two elements where
+                     the first item is the encoding format of the second item
+                     object - dictionary with *index* and *value* sequences
+
+        :return: (sequence[str, obj]) a sequence of two elements where the
+                 first item is the encoding format of the second item object
+        """
+        format = 'numpy'
+        if len(data[0]):
+            format += '_%s' % data[0]
+        index = numpy.asarray(data[1]["index"], dtype=numpy.int64)
+        value = numpy.asarray(data[1]["value"])
+        header = dict(shape=value.shape, length=len(index))
+        if len(index) > 0 and \
+                index[-1] - index[0] == len(index) - 1 and \
+                (len(index) < 2 or numpy.all(numpy.diff(index) == 1)):
+            header["index"] = [int(index[0]), int(index[-1]) + 1]
+            index = None
+        else:
+            header["index"] = None
+            index = _to_little_endian(index)
+        if value.dtype.hasobject:
+            # e.g. values in error - fallback to pickle
+            header["dtype"] = None
+            payload = pickle.dumps(value.tolist(),
+                                   protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            value = _to_little_endian(value)
+            header["dtype"] = value.dtype.str
+            payload = value.data
+        header = json.dumps(header).encode("utf-8")
+        chunks = [_HEADER_LEN.pack(len(header)), header, payload]
+        if index is not None:
+            chunks.append(index.data)
+        return format, b"".join(chunks)
+
+    def decode(self, data, *args, **kwargs):
+        """decodes the given bytes into a value buffer with NumPy arrays.
+
+        :param data: (sequence[str, obj]) a sequence of two elements where
+                     the first item is the encoding format of the second item
+                     object
+
+        :return: (sequence[str, obj]) a sequence of two elements where the
+                 first item is the encoding format of the second item object
+        """
+        if not data[0].startswith('numpy'):
+            return data
+        format = data[0].partition('_')[2]
+        buf = memoryview(data[1])
+        (header_len,) = _HEADER_LEN.unpack_from(buf)
+        offset = _HEADER_LEN.size
+        header = json.loads(bytes(buf[offset:offset + header_len]).decode(
+            "utf-8"))
+        offset += header_len
+        length = header["length"]
+        if header["dtype"] is None:
+            value = numpy.array(pickle.loads(buf[offset:]))
+            offset = len(buf)
+        else:
+            dtype = numpy.dtype(header["dtype"])
+            shape = tuple(header["shape"])
+            count = int(numpy.prod(shape))
+            value = numpy.frombuffer(buf, dtype=dtype, count=count,
+                                     offset=offset).reshape(shape)
+            offset += count * dtype.itemsize
+        if header["index"] is None:
+            index = numpy.frombuffer(buf, dtype="<i8", count=length,
+                                     offset=offset)
+        else:
+            index = numpy.arange(*header["index"], dtype=numpy.int64)
+        return format, dict(index=index, value=value)
+
+
+class LZ4Codec(Codec):
+    """A codec able to compress/decompress bytes with the LZ4 frame format.
+    It uses the :mod:`lz4.frame` module."""
+
+    def encode(self, data, *args, **kwargs):
+        """compresses the given bytes.
+
+        :param data: (sequence[str, obj]) a sequence of two elements where
+                     the first item is the encoding format of the second item
+                     object
+
+        :return: (sequence[str, obj]) a sequence of two elements where the
+                 first item is the encoding format of the second item object
+        """
+        import lz4.frame
+        format = 'lz4'
+        if len(data[0]):
+            format += '_%s' % data[0]
+        return format, lz4.frame.compress(data[1])
+
+    def decode(self, data, *args, **kwargs):
+        """decompresses the given bytes.
+
+        :param data: (sequence[str, obj]) a sequence of two elements where
+                     the first item is the encoding format of the second item
+                     object
+
+        :return: (sequence[str, obj]) a sequence of two elements where the
+                 first item is the encoding format of the second item object
+        """
+        import lz4.frame
+        if not data[0].startswith('lz4'):
+            return data
+        format = data[0].partition('_')[2]
+        return format, lz4.frame.decompress(data[1])
+
+
+class ZstdCodec(Codec):
+    """A codec able to compress/decompress bytes with the Zstandard format.
+    It uses the :mod:`zstandard` module."""
+
+    def encode(self, data, *args, **kwargs):
+        """compresses the given bytes.
+
+        :param data: (sequence[str, obj]) a sequence of two elements where
+                     the first item is the encoding format of the second item
+                     object
+
+        :return: (sequence[str, obj]) a sequence of two elements where the
+                 first item is the encoding format of the second item object
+        """
+        import zstandard
+        format = 'zstd'
+        if len(data[0]):
+            format += '_%s' % data[0]
+        return format, zstandard.ZstdCompressor().compress(data[1])
+
+    def decode(self, data, *args, **kwargs):
+        """decompresses the given bytes.
+
+        :param data: (sequence[str, obj]) a sequence of two elements where
+                     the first item is the encoding format of the second item
+                     object
+
+        :return: (sequence[str, obj]) a sequence of two elements where the
+                 first item is the encoding format of the second item object
+        """
+        import zstandard
+        if not data[0].startswith('zstd'):
+            return data
+        format = data[0].partition('_')[2]
+        return format, zstandard.ZstdDecompressor().decompress(data[1])
+
+
+def register_codecs():
+    """Register the sardana codecs in the Taurus codec factory."""
+    factory = CodecFactory()
+    factory.registerCodec('numpy', NumpyCodec)
+    factory.registerCodec('lz4', LZ4Codec)
+    factory.registerCodec('zstd', ZstdCodec)
+
+
+def is_array_codec(codec_name):
+    """Check whether the given codec (or codec pipeline) name transfers
+    NumPy arrays in their binary form.
+
+    :param codec_name: codec name e.g. "lz4_numpy"
+    :type codec_name: :obj:`str`
+    :return: True if the innermost codec is the numpy codec
+    :rtype: :obj:`bool`
+    """
+    return codec_name.split('_')[-1] == 'numpy'
+
+
+register_codecs()
@@ -22,8 +22,8 @@
 ##############################################################################
 
 import time
-import threading
 import math
+import threading
 import copy
 import numpy
 import traceback
@@ -36,18 +36,175 @@ from taurus.core.util.log import Logger
 
 def strictly_increasing(l):
     """Check whether list l has strictly increasing values"""
-    return all(x < y for x, y in zip(l, l[1:]))
+    return bool(numpy.all(numpy.diff(l) > 0))
 
 
 def strictly_decreasing(l):
     """Check whether list l has strictly deacreasing values"""
-    return all(x > y for x, y in zip(l, l[1:]))
+    return bool(numpy.all(numpy.diff(l) < 0))
+
+
+class PositionEstimator(object):
+    """Estimator of the position of a moveable between its (sparse) position
+    samples e.g. the position events of the motion loop.
+
+    The position is extrapolated from the last sample with a running
+    velocity estimate (from the last two samples). If the motor trapezoidal
+    profile (:class:`~sardana.util.motion.Motor`) is known, the velocity is
+    expected to increase with the motor acceleration up to its maximum
+    velocity. Each new sample corrects the estimation.
+
+    .. note::
+        The PositionEstimator class has been included in Sardana
+        on a provisional basis. Backwards incompatible changes
+        (up to and including removal of the class) may occur if
+        deemed necessary by the core developers.
+    """
+
+    def __init__(self, motor=None):
+        self.motor = motor
+        self.reset()
+
+    def reset(self):
+        self._times = []
+        self._positions = []
+        self._velocity = None
+
+    def get_samples(self):
+        """Returns the position samples
+
+        :return: the timestamps and the positions
+        :rtype: tuple(numpy.ndarray, numpy.ndarray)"""
+        return numpy.array(self._times), numpy.array(self._positions)
+
+    def add_sample(self, position, timestamp):
+        """Adds a position sample
+
+        :param position: the position
+        :type position: float
+        :param timestamp: the position timestamp (:func:`time.time` time)
+        :type timestamp: float"""
+        times, positions = self._times, self._positions
+        if times and timestamp <= times[-1]:
+            return
+        times.append(timestamp)
+        positions.append(position)
+        if len(times) < 2:
+            return
+        interval = times[-1] - times[-2]
+        # the mean velocity of the interval is the velocity at its middle
+        velocity = (positions[-1] - positions[-2]) / interval
+        acceleration = self._get_acceleration(velocity)
+        velocity += acceleration * interval / 2
+        self._velocity = self._limit_velocity(velocity)
+
+    def _get_acceleration(self, velocity):
+        motor = self.motor
+        if motor is None or velocity == 0 or math.isinf(motor.accel) or \
+                abs(velocity) >= motor.max_vel:
+            return 0
+        return math.copysign(motor.accel, velocity)
+
+    def _limit_velocity(self, velocity):
+        motor = self.motor
+        if motor is None or abs(velocity) <= motor.max_vel:
+            return velocity
+        return math.copysign(motor.max_vel, velocity)
+
+    def _get_acceleration_phase(self):
+        """Returns the acceleration, the time and the displacement until the
+        maximum velocity is reached from the last sample"""
+        velocity = self._velocity
+        acceleration = self._get_acceleration(velocity)
+        if acceleration == 0:
+            return 0, 0, 0
+        duration = (self.motor.max_vel - abs(velocity)) / abs(acceleration)
+        displacement = velocity * duration + acceleration * duration ** 2 / 2
+        return acceleration, duration, displacement
+
+    def predict_position(self, timestamp):
+        """Returns the estimated position at the given time
+
+        :param timestamp: the time (:func:`time.time` time)
+        :type timestamp: float
+        :return: the estimated position or None if there are no samples
+        :rtype: float"""
+        if not self._times:
+            return None
+        position, velocity = self._positions[-1], self._velocity
+        if velocity is None:
+            return position
+        elapsed = timestamp - self._times[-1]
+        acceleration, duration, displacement = \
+            self._get_acceleration_phase()
+        if acceleration == 0:
+            return position + velocity * elapsed
+        if elapsed <= duration:
+            return position + velocity * elapsed + \
+                acceleration * elapsed ** 2 / 2
+        return position + displacement + \
+            math.copysign(self.motor.max_vel, velocity) * (elapsed - duration)
+
+    def predict_crossing_time(self, position):
+        """Returns the estimated time when the moveable will cross the given
+        position
+
+        :param position: the position
+        :type position: float
+        :return: the estimated time (:func:`time.time` time) or None if the
+            moveable does not move towards the position
+        :rtype: float"""
+        velocity = self._velocity
+        if not velocity:
+            return None
+        distance = position - self._positions[-1]
+        if distance * velocity < 0:
+            return None
+        distance, speed = abs(distance), abs(velocity)
+        acceleration, duration, displacement = \
+            self._get_acceleration_phase()
+        acceleration, displacement = abs(acceleration), abs(displacement)
+        if acceleration == 0:
+            elapsed = distance / speed
+        elif distance <= displacement:
+            elapsed = (math.sqrt(speed ** 2 + 2 * acceleration * distance) -
+                       speed) / acceleration
+        else:
+            elapsed = duration + (distance - displacement) / \
+                self.motor.max_vel
+        return self._times[-1] + elapsed
+
+    def get_crossing_times(self, positions, direction):
+        """Returns the times when the moveable crossed the given positions,
+        interpolated from the position samples
+
+        :param positions: the positions
+        :type positions: numpy.ndarray
+        :param direction: the motion direction (1 or -1)
+        :type direction: int
+        :return: the crossing times (NaN if not crossed)
+        :rtype: numpy.ndarray"""
+        times, sampled = self.get_samples()
+        sampled = sampled * direction
+        positions = numpy.asarray(positions) * direction
+        # interpolate only in the monotonic part of the motion
+        monotonic = numpy.concatenate(([True], numpy.diff(sampled) > 0))
+        times, sampled = times[monotonic], sampled[monotonic]
+        if len(times) < 2:
+            return numpy.full(len(positions), numpy.nan)
+        return numpy.interp(positions, sampled, times, left=numpy.nan,
+                            right=numpy.nan)
 
 
 class FunctionGenerator(EventGenerator, Logger):
     """Generator of active and passive events describing a rectangular
     function.
 
+    The events are precomputed in a timeline (arrays of the active and
+    passive events) which is consumed with a cursor (the event id). After
+    the generation, the jitter and the missed events can be obtained with
+    :meth:`get_statistics`.
+
     .. note::
         The FunctionGenerator class has been included in Sardana
         on a provisional basis. Backwards incompatible changes
@@ -57,6 +214,10 @@ class FunctionGenerator(EventGenerator, Logger):
 
     MAX_NAP_TIME = 0.1
 
+    #: the last part of the waits in the time domain is done by busy waiting
+    #: (yielding the GIL) to achieve sub-millisecond accuracy
+    SPIN_TIME = 0.001
+
     def __init__(self, name="FunctionGenerator"):
         EventGenerator.__init__(self)
         Logger.__init__(self, name)
@@ -67,8 +228,19 @@ class FunctionGenerator(EventGenerator, Logger):
         self._position = None
         self._initial_domain_in_use = None
         self._active_domain_in_use = None
-        self._active_events = list()
-        self._passive_events = list()
+        self._active_events = numpy.empty(0)
+        self._passive_events = numpy.empty(0)
+        # active events multiplied by the direction (increasing)
+        self._sorted_active_events = numpy.empty(0)
+        # delays of the fired events with respect to the timeline (in the
+        # time or position units), NaN means not fired
+        self._active_delays = numpy.empty(0)
+        self._passive_delays = numpy.empty(0)
+        self._missed = 0
+        # fire time of the active events (time.time time)
+        self._active_fire_times = numpy.empty(0)
+        self._position_estimator = PositionEstimator()
+        self._position_prediction = False
         self._started = False
         self._stopped = False
         self._running = False
@@ -118,10 +290,11 @@ class FunctionGenerator(EventGenerator, Logger):
                                     set_active_domain_in_use)
 
     def add_active_event(self, event):
-        self._active_events.append(event)
+        self.active_events = numpy.append(self._active_events, event)
 
     def set_active_events(self, events):
-        self._active_events = events
+        self._active_events = numpy.asarray(events, dtype=float)
+        self._update_sorted_active_events()
 
     def get_active_events(self):
         return self._active_events
@@ -129,16 +302,36 @@ class FunctionGenerator(EventGenerator, Logger):
     active_events = property(get_active_events, set_active_events)
 
     def add_passive_event(self, event):
-        self._passive_events.append(event)
+        self.passive_events = numpy.append(self._passive_events, event)
 
     def set_passive_events(self, events):
-        self._passive_events = events
+        self._passive_events = numpy.asarray(events, dtype=float)
 
     def get_passive_events(self):
         return self._passive_events
 
     passive_events = property(get_passive_events, set_passive_events)
 
+    def set_position_estimator(self, estimator):
+        self._position_estimator = estimator
+
+    def get_position_estimator(self):
+        return self._position_estimator
+
+    position_estimator = property(get_position_estimator,
+                                  set_position_estimator)
+
+    def set_position_prediction(self, prediction):
+        self._position_prediction = prediction
+
+    def get_position_prediction(self):
+        return self._position_prediction
+
+    position_prediction = property(
+        get_position_prediction, set_position_prediction,
+        doc="fire the events in position domain at the crossing times "
+            "predicted by the position estimator")
+
     def set_direction(self, direction):
         self._direction = direction
         if direction == 1:
@@ -147,6 +340,11 @@ class FunctionGenerator(EventGenerator, Logger):
             self._condition = numpy.less_equal
         else:
             raise ValueError("direction can be -1 or 1 (negative or positive)")
+        self._update_sorted_active_events()
+
+    def _update_sorted_active_events(self):
+        direction = self._direction or 1
+        self._sorted_active_events = self._active_events * direction
 
     def get_direction(self):
         return self._direction
@@ -162,16 +360,24 @@ class FunctionGenerator(EventGenerator, Logger):
             self.debug(msg)
             return
         self._position = v.value
+        timestamp = getattr(v, "timestamp", None) or time.time()
+        self._position_estimator.add_sample(v.value, timestamp)
         self._position_event.set()
 
     def start(self):
-        self._start_time = time.time()
+        self._start_time = time.perf_counter()
         self._stopped = False
         self._started = True
         self._position = None
         self._start_fired = False
         self._position_event.clear()
         self._id = 0
+        nb_events = len(self._active_events)
+        self._active_delays = numpy.full(nb_events, numpy.nan)
+        self._passive_delays = numpy.full(nb_events, numpy.nan)
+        self._active_fire_times = numpy.full(nb_events, numpy.nan)
+        self._missed = 0
+        self._position_estimator.reset()
         self.fire_event(EventType("state"), State.Moving)
 
     def stop(self):
@@ -189,7 +395,8 @@ class FunctionGenerator(EventGenerator, Logger):
     def run(self):
         self._running = True
         try:
-            while len(self.active_events) > 0 and not self.is_stopped():
+            while self._id < len(self._active_events) \
+                    and not self.is_stopped():
                 self.wait_active()
                 self.fire_active()
                 self.wait_passive()
@@ -204,15 +411,85 @@ class FunctionGenerator(EventGenerator, Logger):
     def sleep(self, period):
         if period <= 0:
             return
-        necessary_naps = int(math.ceil(period / self.MAX_NAP_TIME))
-        if necessary_naps == 0:  # avoid zero ZeroDivisionError
-            nap = 0
-        else:
-            nap = period / necessary_naps
-        for _ in range(necessary_naps):
-            if self.is_stopped():
+        self._wait_until(time.perf_counter() + period)
+
+    def _wait_until(self, deadline):
+        """Waits until the deadline (:func:`time.perf_counter` time) or the
+        stop. Sleeps in naps of at most MAX_NAP_TIME and busy waits the
+        last SPIN_TIME."""
+        while not self.is_stopped():
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
                 break
-            time.sleep(nap)
+            if remaining > self.SPIN_TIME:
+                time.sleep(min(remaining - self.SPIN_TIME, self.MAX_NAP_TIME))
+            else:
+                time.sleep(0)
+
+    def _get_now(self, domain):
+        if domain == SynchDomain.Time:
+            return time.perf_counter() - self._start_time
+        if self._position_prediction:
+            position = self._position_estimator.predict_position(time.time())
+            if position is not None:
+                return position
+        return self._position
+
+    def _wait_position(self, candidate):
+        """Waits until the position crosses the candidate or the stop.
+        With the position prediction, waits until the predicted crossing
+        time (corrected on each new position)."""
+        while not self.is_stopped():
+            if self._position_event.isSet():
+                self._position_event.clear()
+                if self._position is not None and \
+                        self._condition(self._position, candidate):
+                    break
+            timeout = self.MAX_NAP_TIME
+            if self._position_prediction:
+                estimator = self._position_estimator
+                crossing_time = estimator.predict_crossing_time(candidate)
+                if crossing_time is not None:
+                    remaining = crossing_time - time.time()
+                    if remaining <= 0:
+                        break
+                    timeout = min(remaining, timeout)
+            self._position_event.wait(timeout)
+
+    def get_statistics(self):
+        """Returns the statistics of the last generation: number of events,
+        fired and missed (skipped because they were already due) active
+        events and delays of the active and passive events with respect to
+        the timeline in the time (seconds) or position units of the initial
+        and active domain respectively.
+
+        :return: the generation statistics
+        :rtype: dict"""
+        stats = dict(events=len(self._active_delays),
+                     fired=int(numpy.count_nonzero(
+                         ~numpy.isnan(self._active_delays))),
+                     missed=self._missed)
+        for name, delays in (("active", self._active_delays),
+                             ("passive", self._passive_delays)):
+            delays = delays[~numpy.isnan(delays)]
+            if len(delays) == 0:
+                continue
+            stats[name + "_delay_mean"] = float(delays.mean())
+            stats[name + "_delay_std"] = float(delays.std())
+            stats[name + "_delay_max"] = float(delays.max())
+        # error of the active events with respect to the ideal crossing
+        # times interpolated from the position samples
+        if self.initial_domain_in_use == SynchDomain.Position and \
+                self._direction is not None:
+            ideal_times = self._position_estimator.get_crossing_times(
+                self._active_events, self._direction)
+            errors = self._active_fire_times - ideal_times
+            errors = errors[~numpy.isnan(errors)]
+            if len(errors) > 0:
+                stats["active_error_mean"] = float(errors.mean())
+                stats["active_error_std"] = float(errors.std())
+                stats["active_error_max"] = float(numpy.abs(errors).max())
+        return stats
 
     def fire_start(self):
         self.fire_event(EventType("start"), self._id)
@@ -222,64 +499,47 @@ class FunctionGenerator(EventGenerator, Logger):
             self.warning(msg)
 
     def wait_active(self):
-        candidate = self.active_events[0]
+        candidate = self._active_events[self._id]
         if self.initial_domain_in_use == SynchDomain.Time:
-            now = time.time()
-            candidate += self._start_time
-            self.sleep(candidate - now)
+            self._wait_until(self._start_time + candidate)
         else:
-            while True:
-                if self.is_stopped():
-                    break
-                if self._position_event.isSet():
-                    self._position_event.clear()
-                    now = self._position
-                    if self._condition(now, candidate):
-                        break
-                else:
-                    self._position_event.wait(self.MAX_NAP_TIME)
+            self._wait_position(candidate)
 
     def fire_active(self):
-        # check if some events needs to be skipped
-        i = 0
-        while i < len(self.active_events) - 1:
-            candidate = self.active_events[i + 1]
-            if self.initial_domain_in_use is SynchDomain.Time:
-                candidate += self._start_time
-                now = time.time()
-            elif self.initial_domain_in_use is SynchDomain.Position:
-                now = self._position
-            if self._condition(now, candidate):
-                i += 1
-            else:
-                break
-        self._id += i
+        # check if some events needs to be skipped: the last active event
+        # which is already due (the sorted events are increasing)
+        now = self._get_now(self.initial_domain_in_use)
+        if now is not None:
+            direction = self._direction or 1
+            due = numpy.searchsorted(self._sorted_active_events,
+                                     now * direction, side="right")
+            i = min(due, len(self._active_events)) - 1
+            if i > self._id:
+                self._missed += int(i - self._id)
+                self._id = i
+            delay = (now - self._active_events[self._id]) * direction
+            self._active_delays[self._id] = delay
+        self._active_fire_times[self._id] = time.time()
         if not self._start_fired:
             self.fire_start()
         self.fire_event(EventType("active"), self._id)
-        self.active_events = self.active_events[i + 1:]
-        self.passive_events = self.passive_events[i:]
 
     def wait_passive(self):
+        candidate = self._passive_events[self._id]
         if self.active_domain_in_use == SynchDomain.Time:
-            now = time.time()
-            candidate = self._start_time + self.passive_events[0]
-            self.sleep(candidate - now)
+            self._wait_until(self._start_time + candidate)
         else:
-            while True:
-                if self._position_event.isSet():
-                    self._position_event.clear()
-                    if self._condition(self._position, self.passive_events[0]):
-                        break
-                else:
-                    self._position_event.wait(self.MAX_NAP_TIME)
-                    if self.is_stopped():
-                        break
+            self._wait_position(candidate)
 
     def fire_passive(self):
+        now = self._get_now(self.active_domain_in_use)
+        if now is not None:
+            delay = now - self._passive_events[self._id]
+            if self.active_domain_in_use == SynchDomain.Position:
+                delay *= self._direction or 1
+            self._passive_delays[self._id] = delay
         self.fire_event(EventType("passive"), self._id)
-        self.set_passive_events(self.passive_events[1:])
-        if len(self.passive_events) == 0:
+        if self._id == len(self._passive_events) - 1:
             self.fire_end()
 
     def fire_end(self):
@@ -342,22 +602,20 @@ class FunctionGenerator(EventGenerator, Logger):
             active = active_param[active_domain_in_use]
             initial_in_initial_domain = initial_param[initial_domain_in_use]
             initial_in_active_domain = initial_param[active_domain_in_use]
-            active_event_in_initial_domain = initial_in_initial_domain
-            active_event_in_active_domain = initial_in_active_domain
             if repeats > 1:
                 total_param = group[Total]
                 total_in_initial_domain = total_param[initial_domain_in_use]
                 total_in_active_domain = total_param[active_domain_in_use]
-                for _ in range(repeats):
-                    passive_event = active_event_in_active_domain + active
-                    active_events.append(active_event_in_initial_domain)
-                    passive_events.append(passive_event)
-                    active_event_in_initial_domain += total_in_initial_domain
-                    active_event_in_active_domain += total_in_active_domain
+                steps = numpy.arange(repeats)
+                active_events.append(initial_in_initial_domain +
+                                     steps * total_in_initial_domain)
+                passive_events.append(initial_in_active_domain + active +
+                                      steps * total_in_active_domain)
             else:
-                active_events.append(active_event_in_initial_domain)
-                passive_event = active_event_in_active_domain + active
-                passive_events.append(passive_event)
+                active_events.append([initial_in_initial_domain])
+                passive_events.append([initial_in_active_domain + active])
+        active_events = numpy.concatenate(active_events).astype(float)
+        passive_events = numpy.concatenate(passive_events).astype(float)
 
         # determine direction
         if self.direction is None:
@@ -25,8 +25,8 @@
 
 """This is the main device pool module"""
 
-__all__ = ["MotionPath", "Motion", "BaseMotor", "Motor"]
+__all__ = ["MotionPath", "Motion", "BaseMotor", "Motor", "motion_durations"]
 
 __docformat__ = 'restructuredtext'
 
-from .motion import MotionPath, Motion, BaseMotor, Motor
+from .motion import MotionPath, Motion, BaseMotor, Motor, motion_durations
@@ -25,13 +25,16 @@
 
 """This module contains the definition for a simulated motor"""
 
-__all__ = ["MotionPath", "Motion", "BaseMotor", "Motor", "DemoMotor"]
+__all__ = ["MotionPath", "Motion", "BaseMotor", "Motor", "DemoMotor",
+           "motion_durations"]
 
 __docformat__ = 'restructuredtext'
 
 import time
 from math import pow, sqrt
 
+import numpy
+
 
 class MotionPath(object):
     """Active motion path description"""
@@ -274,6 +277,56 @@ class MotionPath(object):
               self.displacement_reach_min_vel)
 
 
+def motion_durations(motor, initial_user_pos, final_user_pos):
+    """Calculate durations of many motions at once.
+
+    Vectorized equivalent of :attr:`MotionPath.duration` (without active
+    time) for arrays of initial and final positions e.g. all the steps of
+    a scan.
+
+    :param motor: motor which moves
+    :type motor: :class:`BaseMotor`
+    :param initial_user_pos: initial positions
+    :type initial_user_pos: :obj:`numpy.ndarray` or :obj:`float`
+    :param final_user_pos: final positions
+    :type final_user_pos: :obj:`numpy.ndarray` or :obj:`float`
+    :return: durations of the motions
+    :rtype: :obj:`numpy.ndarray`
+    """
+    spu = motor.step_per_unit
+    initial_pos = numpy.asarray(initial_user_pos, dtype=float) * spu
+    final_pos = numpy.asarray(final_user_pos, dtype=float) * spu
+    displacement = numpy.abs(final_pos - initial_pos)
+    positive_displacement = final_pos > initial_pos
+    displmnt_not_cnst = motor.displacement_reach_max_vel + \
+        motor.displacement_reach_min_vel
+    small_motion = displacement < displmnt_not_cnst
+    sign = numpy.where(positive_displacement, 1.0, -1.0)
+    accel = sign * motor.accel
+    decel = sign * motor.decel
+    inf = float("inf")
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        # maximum velocity possible in small motions
+        cnst = 2 * accel * decel * displacement / (decel - accel)
+        small_max_vel = numpy.sqrt(numpy.abs(pow(motor.min_vel, 2) + cnst))
+        delta_vel = numpy.where(small_motion,
+                                numpy.abs(small_max_vel - motor.min_vel),
+                                abs(motor.max_vel - motor.min_vel))
+        max_vel_time = numpy.where((accel == 0) | (delta_vel == inf),
+                                   0.0, numpy.abs(delta_vel / accel))
+        min_vel_time = numpy.where((decel == 0) | (delta_vel == inf),
+                                   0.0, numpy.abs(delta_vel / decel))
+        if abs(motor.max_vel) == inf:
+            at_max_vel_time = 0.0
+        else:
+            at_max_vel_displacement = displacement - displmnt_not_cnst
+            at_max_vel_time = numpy.where(
+                small_motion, 0.0,
+                numpy.abs(at_max_vel_displacement / motor.max_vel))
+        duration = max_vel_time + at_max_vel_time + min_vel_time
+    return numpy.where(displacement == 0, 0.0, duration)
+
+
 class Motion(object):
     """Active motion description"""
 
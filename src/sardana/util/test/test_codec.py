@@ -0,0 +1,76 @@
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.tango-controls.org/static/sardana/latest/doc/html/index.html
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import numpy
+
+from taurus.core.util.codecs import CodecFactory
+from taurus.external.unittest import TestCase
+
+from sardana.util.codec import NumpyCodec, is_array_codec
+
+
+class NumpyCodecTestCase(TestCase):
+
+    def setUp(self):
+        self.codec = CodecFactory().getCodec("numpy")
+
+    def _encode_decode(self, data):
+        encoded = self.codec.encode(("", data))
+        self.assertEqual(encoded[0], "numpy")
+        self.assertIsInstance(encoded[1], bytes)
+        return self.codec.decode(encoded)[1]
+
+    def test_factory(self):
+        self.assertIsInstance(self.codec, NumpyCodec)
+        self.assertTrue(is_array_codec("lz4_numpy"))
+        self.assertFalse(is_array_codec("pickle"))
+
+    def test_scalar_values(self):
+        data = dict(index=numpy.arange(10, 20), value=numpy.arange(10.))
+        decoded = self._encode_decode(data)
+        numpy.testing.assert_array_equal(decoded["index"], data["index"])
+        numpy.testing.assert_array_equal(decoded["value"], data["value"])
+
+    def test_image_values(self):
+        value = numpy.arange(24, dtype=">i4").reshape(2, 3, 4)
+        data = dict(index=[3, 7], value=value)
+        decoded = self._encode_decode(data)
+        self.assertEqual(decoded["index"].tolist(), [3, 7])
+        self.assertEqual(decoded["value"].shape, (2, 3, 4))
+        numpy.testing.assert_array_equal(decoded["value"], value)
+
+    def test_list_values(self):
+        data = dict(index=[0, 1], value=[1, None])
+        decoded = self._encode_decode(data)
+        self.assertEqual(decoded["value"].tolist(), [1, None])
+
+    def test_empty(self):
+        decoded = self._encode_decode(dict(index=[], value=[]))
+        self.assertEqual(len(decoded["index"]), 0)
+        self.assertEqual(len(decoded["value"]), 0)
+
+    def test_zip_pipeline(self):
+        codec = CodecFactory().getCodec("zip_numpy")
+        data = dict(index=[0, 1, 2], value=[1., 2., 3.])
+        decoded = codec.decode(codec.encode(("", data)))[1]
+        self.assertEqual(decoded["value"].tolist(), [1., 2., 3.])
@@ -32,7 +32,9 @@ from taurus.core.util import ThreadPool
 
 from sardana.pool.pooldefs import SynchDomain, SynchParam
 from sardana.sardanaevent import EventGenerator, EventType, EventReceiver
-from sardana.util.funcgenerator import FunctionGenerator
+from sardana.util.funcgenerator import FunctionGenerator, \
+    PositionEstimator
+from sardana.util.motion import Motor
 
 
 configuration_negative = [{SynchParam.Initial: {SynchDomain.Position: 0.},
@@ -134,6 +136,13 @@ class FuncGeneratorTestCase(TestCase):
         self.assertTrue(self.listener.start, "Start event is missing")
         self.assertTrue(self.listener.end, "End event is missing")
 
+    def test_statistics_time(self):
+        self.test_run_time()
+        stats = self.func_generator.get_statistics()
+        self.assertEqual(stats["events"], 10)
+        self.assertEqual(stats["fired"] + stats["missed"], 10)
+        self.assertGreaterEqual(stats["active_delay_mean"], 0)
+
     def test_stop_time(self):
         self.func_generator.initial_domain = SynchDomain.Time
         self.func_generator.set_configuration(configuration_positive)
@@ -237,3 +246,35 @@ class FuncGeneratorTestCase(TestCase):
 
     def tearDown(self):
         self.func_generator.remove_listener(self.listener)
+
+
+class PositionEstimatorTestCase(TestCase):
+
+    def test_constant_velocity(self):
+        estimator = PositionEstimator()
+        self.assertIsNone(estimator.predict_position(0))
+        estimator.add_sample(0., 10.)
+        estimator.add_sample(-.5, 10.5)
+        self.assertAlmostEqual(estimator.predict_position(11.), -1., 10)
+        self.assertAlmostEqual(estimator.predict_crossing_time(-2.), 12., 10)
+        self.assertIsNone(estimator.predict_crossing_time(1.))
+
+    def test_trapezoidal_profile(self):
+        # accelerate from 0 to 1 unit/s in 0.2 s
+        motor = Motor(min_vel=0, max_vel=1, accel_time=.2, decel_time=.2)
+        estimator = PositionEstimator(motor)
+        estimator.add_sample(0., 0.)
+        estimator.add_sample(.025, .1)
+        # velocity at the last sample is 0.5 units/s
+        self.assertAlmostEqual(estimator.predict_position(.2), .1, 10)
+        self.assertAlmostEqual(estimator.predict_position(.3), .2, 10)
+        self.assertAlmostEqual(estimator.predict_crossing_time(.1), .2, 10)
+        self.assertAlmostEqual(estimator.predict_crossing_time(.2), .3, 10)
+
+    def test_crossing_times(self):
+        estimator = PositionEstimator()
+        for timestamp, position in ((0, 0.), (1, 1.), (2, 3.), (3, 2.)):
+            estimator.add_sample(position, timestamp)
+        crossing_times = estimator.get_crossing_times([.5, 2., 4.], 1)
+        numpy.testing.assert_allclose(crossing_times[:2], [.5, 1.5])
+        self.assertTrue(numpy.isnan(crossing_times[2]))
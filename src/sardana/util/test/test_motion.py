@@ -0,0 +1,55 @@
+##############################################################################
+##
+# This file is part of Sardana
+##
+# http://www.tango-controls.org/static/sardana/latest/doc/html/index.html
+##
+# Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+# Sardana is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+##
+# Sardana is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+##
+# You should have received a copy of the GNU Lesser General Public License
+# along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import numpy
+
+from taurus.external.unittest import TestCase
+from taurus.test import insertTest
+
+from sardana.util.motion import Motor, MotionPath, motion_durations
+
+
+@insertTest(helper_name="durations", min_vel=0, max_vel=10, accel_time=0.1,
+            decel_time=0.2)
+@insertTest(helper_name="durations", min_vel=1, max_vel=10, accel_time=0.5,
+            decel_time=0.5)
+@insertTest(helper_name="durations", min_vel=2, max_vel=5, accel_time=0.2,
+            decel_time=0.3)
+@insertTest(helper_name="durations", min_vel=0, max_vel=float("inf"),
+            accel_time=0, decel_time=0)
+class MotionDurationsTestCase(TestCase):
+    """Compare motion_durations with MotionPath durations"""
+
+    def durations(self, min_vel, max_vel, accel_time, decel_time):
+        motor = Motor(min_vel=min_vel, max_vel=max_vel,
+                      accel_time=accel_time, decel_time=decel_time)
+        initial = numpy.linspace(-5, 5, 101)
+        # long, short and null motions in both directions
+        final = numpy.concatenate((initial[:50][::-1] * 2,
+                                   initial[50:60] + 0.05,
+                                   initial[60:70] - 0.01,
+                                   initial[70:]))
+        durations = motion_durations(motor, initial, final)
+        for i, (start, end) in enumerate(zip(initial, final)):
+            duration = MotionPath(motor, start, end).duration
+            self.assertAlmostEqual(durations[i], duration)